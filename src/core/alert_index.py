@@ -0,0 +1,225 @@
+"""alert_index.py
+Incremental alert index ordered by the next date on which each task's alert
+state changes.
+
+The rules are the ones documented in ``alert_manager``. Every task is
+evaluated once for the current day; the result is the set of alerts it
+raises that day and the first later day on which that set changes (a
+snooze expiring, the end date entering the threshold window or passing, or
+a reminder occurrence starting or ending, computed by ``core.reminder_rules``). Those
+days go into a min-heap, so moving the index to a new day only re-evaluates
+the tasks whose state actually changes, and "what fires today" is read from
+the tasks that currently have alerts.
+
+Tasks are re-evaluated when the fields that drive alerts change (end date,
+threshold, snooze and reminders), detected by a per-task signature exactly
+like ``TaskFilterIndex``. Days are Julian day numbers (``core.spatial_index``).
+"""
+from __future__ import annotations
+
+import heapq
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from core.reminder_rules import compile_reminder, normalize_reminder
+from core.spatial_index import day_number
+
+if TYPE_CHECKING:
+    from core.models import Task
+
+
+# Alert items are stored without the day-dependent ``days_remaining``:
+#   ("upcoming" | "overdue", end_day)
+#   ("extra_reminder", reminder_date, reminder_comment)
+AlertItem = tuple[Any, ...]
+
+
+def evaluate_task(
+    task: Task, today: int, threshold: int
+) -> tuple[tuple[AlertItem, ...], int | None]:
+    """Alert items raised by *task* on *today* and the next day they change."""
+    snoozed = task.alert_snoozed_until
+    if snoozed == "never":
+        return (), None
+    if snoozed:
+        until = day_number(snoozed)
+        if until is not None and today <= until:
+            return (), until + 1
+
+    items: list[AlertItem] = []
+    next_change: int | None = None
+
+    def changes_on(day: int | None) -> None:
+        nonlocal next_change
+        if day is not None and (next_change is None or day < next_change):
+            next_change = day
+
+    for rem in task.extra_reminders:
+        rule = compile_reminder(rem)
+        if rule is None:
+            continue
+        fires, change = rule.alert_state(today)
+        if fires:
+            rem = normalize_reminder(rem)
+            items.append(("extra_reminder", rem.get("date", ""), rem.get("comment", "")))
+        changes_on(change)
+
+    end = day_number(task.end_date)
+    if end is not None:
+        task_threshold = (
+            task.alert_threshold_days if task.alert_threshold_days is not None else threshold
+        )
+        remaining = end - today
+        if remaining < 0:
+            items.append(("overdue", end))
+        elif remaining <= task_threshold:
+            items.append(("upcoming", end))
+            changes_on(end + 1)
+        else:
+            changes_on(min(end - task_threshold, end + 1))
+
+    return tuple(items), next_change
+
+
+def _signature(task: Task) -> tuple[Any, ...]:
+    reminders = tuple(
+        tuple(rem.items()) if isinstance(rem, dict) else rem for rem in task.extra_reminders
+    ) if task.extra_reminders else ()
+    return (task.end_date, task.alert_threshold_days, task.alert_snoozed_until, reminders)
+
+
+@dataclass
+class _Record:
+    task: Task
+    signature: tuple[Any, ...]
+    items: tuple[AlertItem, ...]
+    next_change: int | None
+
+
+class AlertIndex:
+    """Alert state of a task list, kept for one current day (see module docstring)."""
+
+    # Stale heap entries tolerated before the heap is rebuilt.
+    _HEAP_SLACK = 64
+
+    def __init__(self) -> None:
+        self._records: dict[int, _Record] = {}
+        self._order: dict[int, int] = {}
+        self._active: set[int] = set()
+        self._heap: list[tuple[int, int]] = []   # (next_change, id(task))
+        self._day: int | None = None
+        self._threshold: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def day(self) -> int | None:
+        return self._day
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def sync(self, tasks: Sequence[Task], today: int, threshold: int) -> None:
+        """Aligns the index with *tasks* (order included) as of *today*."""
+        if threshold != self._threshold or self._day is None or today < self._day:
+            # The global threshold affects every task and going back in time
+            # (clock change) invalidates the computed next-change days.
+            self._reset(today, threshold)
+        else:
+            self.advance(today)
+        self._order = {id(task): position for position, task in enumerate(tasks)}
+        for key in [k for k in self._records if k not in self._order]:
+            self._drop(key)
+        for task in tasks:
+            self.update(task)
+
+    def advance(self, today: int) -> None:
+        """Moves the index to *today*, re-evaluating only the due tasks."""
+        if self._day is not None and today < self._day:
+            self._reset(today, self._threshold)
+            return
+        self._day = today
+        heap = self._heap
+        while heap and heap[0][0] <= today:
+            due, key = heapq.heappop(heap)
+            record = self._records.get(key)
+            if record is not None and record.next_change == due:
+                self._evaluate(key, record)
+
+    def update(self, task: Task) -> None:
+        """Re-evaluates *task* if the fields that drive its alerts changed."""
+        if self._day is None:
+            return
+        key = id(task)
+        signature = _signature(task)
+        record = self._records.get(key)
+        if record is not None and record.signature == signature:
+            return
+        if key not in self._order:
+            self._order[key] = len(self._order)
+        record = _Record(task, signature, (), None)
+        self._records[key] = record
+        self._evaluate(key, record)
+
+    def discard(self, task: Task) -> None:
+        key = id(task)
+        if key in self._records:
+            self._drop(key)
+
+    def _reset(self, today: int, threshold: int | None) -> None:
+        """Re-evaluates every known task as of *today*."""
+        self._active.clear()
+        self._heap.clear()
+        self._day = today
+        self._threshold = threshold
+        for key, record in self._records.items():
+            self._evaluate(key, record)
+
+    def _drop(self, key: int) -> None:
+        del self._records[key]
+        self._active.discard(key)
+
+    def _evaluate(self, key: int, record: _Record) -> None:
+        record.items, record.next_change = evaluate_task(
+            record.task, self._day, self._threshold if self._threshold is not None else 7
+        )
+        if record.items:
+            self._active.add(key)
+        else:
+            self._active.discard(key)
+        if record.next_change is not None:
+            heapq.heappush(self._heap, (record.next_change, key))
+            if len(self._heap) > 2 * len(self._records) + self._HEAP_SLACK:
+                self._heap = [
+                    (r.next_change, k) for k, r in self._records.items()
+                    if r.next_change is not None
+                ]
+                heapq.heapify(self._heap)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def active_items(self) -> list[tuple[Task, AlertItem]]:
+        """(task, item) pairs raised on the current day, in task order."""
+        order = self._order
+        keys = sorted(self._active, key=lambda k: order.get(k, 0))
+        return [
+            (self._records[key].task, item)
+            for key in keys
+            for item in self._records[key].items
+        ]
+
+    def next_change_day(self) -> int | None:
+        """First day after the current one on which any task's alerts change."""
+        heap = self._heap
+        while heap:
+            due, key = heap[0]
+            record = self._records.get(key)
+            if record is not None and record.next_change == due:
+                return due
+            heapq.heappop(heap)
+        return None
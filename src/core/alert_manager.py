@@ -9,12 +9,17 @@ Rules enforced:
   4. Only tasks whose end_date is in the *future* are shown as "upcoming".
   5. Overdue tasks (end_date < today) are shown as a secondary group.
   6. Extra reminders are compared against today independently.
+
+Detection is backed by ``AlertIndex`` (core.alert_index): each task is
+evaluated once and only re-evaluated when its alert fields change or when
+the day reaches its next state change.
 """
 from __future__ import annotations
 
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from datetime import datetime, time
 
 # Import Task lazily to avoid circular imports at module level.
 # alert_manager is imported by main_window; models imports command_system.
@@ -22,6 +27,8 @@ from typing import TYPE_CHECKING, Literal
 
 from PySide6.QtCore import QDate, QTimer
 
+from core.alert_index import AlertIndex
+from core.spatial_index import date_from_day
 from utils.config_manager import ConfigManager
 
 if TYPE_CHECKING:
@@ -41,16 +48,71 @@ class AlertEntry:
     days_remaining: int          # negative → already overdue
     reminder_date: str | None = None   # only set for extra_reminder kind
     reminder_comment: str | None = None # only set for extra_reminder kind
+    project: str | None = None   # .bpm path when the task is from another project
+
+
+def build_alert_entries(
+    pairs: Iterable[tuple[Task, tuple]], today: int, project: str | None = None
+) -> list[AlertEntry]:
+    """AlertEntry objects for the (task, item) pairs of an ``AlertIndex`` or
+    ``evaluate_task``, unsorted (see ``order_alerts``)."""
+    entries: list[AlertEntry] = []
+    for task, item in pairs:
+        kind = item[0]
+        if kind == "extra_reminder":
+            entries.append(
+                AlertEntry(
+                    task=task,
+                    kind="extra_reminder",
+                    days_remaining=0,
+                    reminder_date=item[1],
+                    reminder_comment=item[2],
+                    project=project,
+                )
+            )
+        else:
+            entries.append(
+                AlertEntry(task=task, kind=kind, days_remaining=item[1] - today, project=project)
+            )
+    return entries
+
+
+def order_alerts(entries: Iterable[AlertEntry]) -> list[AlertEntry]:
+    """Upcoming (soonest first) → extra reminders → overdue (most recent first)."""
+    upcoming: list[AlertEntry] = []
+    overdue: list[AlertEntry] = []
+    extra: list[AlertEntry] = []
+    for entry in entries:
+        if entry.kind == "upcoming":
+            upcoming.append(entry)
+        elif entry.kind == "overdue":
+            overdue.append(entry)
+        else:
+            extra.append(entry)
+    upcoming.sort(key=lambda e: e.days_remaining)
+    overdue.sort(key=lambda e: e.days_remaining, reverse=True)
+    return upcoming + extra + overdue
 
 
 class AlertManager:
-    """Manages alert detection, snooze state, and daily QTimer scheduling."""
+    """Manages alert detection, snooze state, and scheduling of the next check."""
 
     _DATE_FMT = "dd/MM/yyyy"
 
+    # Longest single wait of the check timer. QTimer counts monotonic time,
+    # which ignores wall-clock changes and may stop while the system sleeps;
+    # waking up at least this often lets the timer be re-armed against the
+    # wall clock (no alerts are evaluated on these wake-ups).
+    _MAX_WAIT_MS = 60 * 60 * 1000
+
     def __init__(self, config: ConfigManager) -> None:
         self._config = config
-        self._daily_timer: QTimer | None = None
+        self._check_timer: QTimer | None = None
+        self._check_callback: Callable[[], None] | None = None
+        self._next_check: datetime | None = None
+        self._index = AlertIndex()
+        # (tasks list, model revision, threshold) of the last full sync
+        self._synced: tuple[int, int, int] | None = None
 
     # ------------------------------------------------------------------
     # Public API — detection
@@ -82,91 +144,40 @@ class AlertManager:
         today_str = QDate.currentDate().toString(self._DATE_FMT)
         self._config.set("Alerts", "last_shown_date", today_str)
 
-    def get_active_alerts(self, tasks: list[Task]) -> list[AlertEntry]:
+    def get_active_alerts(
+        self, tasks: list[Task], revision: int | None = None
+    ) -> list[AlertEntry]:
         """
         Returns the list of AlertEntry items that should be shown right now.
 
         Order: upcoming (soonest first) → extra_reminders → overdue (most recent first).
         Silenced and snoozed tasks are excluded.
+
+        *revision* is the model's change counter (``TaskTableModel.revision``).
+        When it matches the previous call the task list is not rescanned and
+        only the tasks whose next state change is due are re-evaluated.
         """
-        today = QDate.currentDate()
+        today = QDate.currentDate().toJulianDay()
         threshold = self.global_threshold()
-        upcoming: list[AlertEntry] = []
-        overdue: list[AlertEntry] = []
-        extra: list[AlertEntry] = []
-
-        for task in tasks:
-            if self._is_silenced(task, today):
-                continue
-
-            # --- extra reminders (checked independently of end_date) ---
-            for rem in task.extra_reminders:
-                if isinstance(rem, str):
-                    rem = {"date": rem, "comment": "Recordatorio general", "frequency": "once"}
-
-                rem_str = rem.get("date", "")
-                comment = rem.get("comment", "")
-                freq = rem.get("frequency", "once")
-
-                rem_date = QDate.fromString(rem_str, self._DATE_FMT)
-                if not rem_date.isValid():
-                    continue
-
-                days_to_rem = today.daysTo(rem_date)
-                fires = False
-
-                if days_to_rem <= 0:  # Today is on or after the scheduled date
-                    if freq == "once":
-                        # For "once", we alert on the exact day. If missed, it still fires
-                        # until they delete it? Let's say if days_to_rem <= 0 it fires
-                        # so they don't miss it.
-                        fires = True
-                    elif freq == "daily":
-                        fires = True
-                    elif freq == "weekly":
-                        # Fires on the exact same day of the week, on or after the date
-                        fires = (abs(days_to_rem) % 7 == 0)
-                    elif freq == "monthly":
-                        # Fires on the same day of the month
-                        fires = (today.day() == rem_date.day())
-
-                if fires:
-                    extra.append(
-                        AlertEntry(
-                            task=task,
-                            kind="extra_reminder",
-                            days_remaining=0,  # Or days_to_rem if we want to show it's overdue
-                            reminder_date=rem_str,
-                            reminder_comment=comment
-                        )
-                    )
-
-            # --- end_date proximity ---
-            end_date = QDate.fromString(task.end_date, self._DATE_FMT)
-            if not end_date.isValid():
-                continue
-
-            days_remaining = today.daysTo(end_date)
-            task_threshold = (
-                task.alert_threshold_days
-                if task.alert_threshold_days is not None
-                else threshold
-            )
-
-            if days_remaining < 0:
-                overdue.append(
-                    AlertEntry(task=task, kind="overdue", days_remaining=days_remaining)
-                )
-            elif days_remaining <= task_threshold:
-                upcoming.append(
-                    AlertEntry(task=task, kind="upcoming", days_remaining=days_remaining)
-                )
+        key = (id(tasks), revision, threshold)
+        if revision is None or key != self._synced:
+            self._index.sync(tasks, today, threshold)
+            self._synced = key
+        else:
+            self._index.advance(today)
+        return order_alerts(build_alert_entries(self._index.active_items(), today))
 
-        # Sort: upcoming soonest first; overdue most-recent-first (least negative)
-        upcoming.sort(key=lambda e: e.days_remaining)
-        overdue.sort(key=lambda e: e.days_remaining, reverse=True)
+    def task_changed(self, task: Task) -> None:
+        """Re-evaluates *task* after its end date, threshold, snooze or
+        reminders were edited outside this manager."""
+        self._index.update(task)
+        self.reschedule()
 
-        return upcoming + extra + overdue
+    def next_change_date(self) -> QDate | None:
+        """First day after the last check on which the active alerts change,
+        or ``None`` if nothing is pending."""
+        day = self._index.next_change_day()
+        return QDate.fromJulianDay(day) if day is not None else None
 
     # ------------------------------------------------------------------
     # Snooze / silence helpers
@@ -182,6 +193,8 @@ class AlertManager:
         else:
             snooze_until = QDate.currentDate().addDays(days)
             task.alert_snoozed_until = snooze_until.toString(self._DATE_FMT)
+        self._index.update(task)
+        self.reschedule()
         logger.debug(
             "Task '%s' snoozed until %s", task.name, task.alert_snoozed_until
         )
@@ -189,62 +202,69 @@ class AlertManager:
     def unsnooze_task(self, task: Task) -> None:
         """Clears any active snooze/silence on *task*."""
         task.alert_snoozed_until = None
-
-    def _is_silenced(self, task: Task, today: QDate) -> bool:
-        """Returns True if the task should be excluded from alerts."""
-        val = task.alert_snoozed_until
-        if not val:
-            return False
-        if val == "never":
-            return True
-        snooze_date = QDate.fromString(val, self._DATE_FMT)
-        if not snooze_date.isValid():
-            return False
-        return today <= snooze_date
+        self._index.update(task)
+        self.reschedule()
 
     # ------------------------------------------------------------------
-    # Scheduling — daily background check
+    # Scheduling — next pending alert
     # ------------------------------------------------------------------
 
-    def schedule_daily_check(self, callback: Callable[[], None]) -> QTimer:
+    def schedule_alert_checks(self, callback: Callable[[], None]) -> QTimer:
         """
-        Returns a QTimer that fires *callback* at the configured check_time
-        each day, starting from the *next* occurrence.
+        Returns a single-shot QTimer that fires *callback* at the configured
+        check_time of the next day on which the active alerts change.
 
-        The timer chains itself: after firing it reschedules for 24 h later.
+        The timer is armed from the alert index, so it stays idle until
+        ``get_active_alerts`` has seen the tasks once. It is re-armed after
+        every check and whenever tasks, snoozes or settings change
+        (``reschedule``).
         """
         timer = QTimer()
         timer.setSingleShot(True)
-
-        def _fire() -> None:
-            logger.info("Daily alert check triggered.")
-            callback()
-            # Reschedule for exactly 24 hours later (drift-safe)
-            timer.start(24 * 60 * 60 * 1000)
-
-        timer.timeout.connect(_fire)
-        ms_until = self._ms_until_next_check()
-        timer.start(ms_until)
-        logger.debug(
-            "Daily alert timer scheduled: fires in %.1f h", ms_until / 3_600_000
-        )
-        self._daily_timer = timer
+        timer.timeout.connect(self._on_check_timer)
+        self._check_timer = timer
+        self._check_callback = callback
+        self.reschedule()
         return timer
 
-    def _ms_until_next_check(self) -> int:
-        """Milliseconds from now until the next configured check_time today or tomorrow."""
-        from datetime import datetime, timedelta
-
+    def next_check_time(self) -> datetime | None:
+        """Wall-clock time of the next alert check, or ``None`` if no alert
+        is pending. May be in the past if a check is overdue."""
+        if not self.is_enabled():
+            return None
+        day = self._index.next_change_day()
+        if day is None:
+            return None
+        return datetime.combine(date_from_day(day), self._check_time())
+
+    def reschedule(self) -> None:
+        """Re-arms the check timer for ``next_check_time``."""
+        if self._check_timer is None:
+            return
+        self._next_check = self.next_check_time()
+        if self._next_check is None:
+            self._check_timer.stop()
+            logger.debug("Alert timer idle: nothing pending.")
+            return
+        delta_ms = int((self._next_check - datetime.now()).total_seconds() * 1000)
+        # At least 1 s so an overdue check never fires in a tight loop.
+        self._check_timer.start(min(max(delta_ms, 1000), self._MAX_WAIT_MS))
+        logger.debug("Next alert check at %s", self._next_check.isoformat(timespec="minutes"))
+
+    def _on_check_timer(self) -> None:
+        if self._next_check is not None and datetime.now() >= self._next_check:
+            logger.info("Alert check triggered.")
+            if self._check_callback is not None:
+                self._check_callback()
+            # Move past the check even if the callback did not query the
+            # alerts, so the same moment is not scheduled again.
+            self._index.advance(QDate.currentDate().toJulianDay())
+        self.reschedule()
+
+    def _check_time(self) -> time:
         check_time_str = self._config.get("Alerts", "check_time", "08:00") or "08:00"
         try:
             hour, minute = (int(p) for p in check_time_str.split(":"))
+            return time(hour, minute)
         except (ValueError, AttributeError):
-            hour, minute = 8, 0
-
-        now = datetime.now()
-        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        if target <= now:
-            target += timedelta(days=1)
-
-        delta_ms = int((target - now).total_seconds() * 1000)
-        return max(delta_ms, 1000)   # at least 1 s to avoid immediate fire on startup
+            return time(8, 0)
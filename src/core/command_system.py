@@ -282,17 +282,43 @@ class EditTaskCommand(Command):
         task = self.main_window.model.getTask(self.task_index)
         if task:
             self.main_window.model.set_data_programmatically(task, self.field, self.new_value)
-            self.main_window.update_gantt_chart()
+            self.main_window.update_gantt_rows(self.task_index, self.task_index)
             self.main_window.set_unsaved_changes(True)
 
     def undo(self) -> None:
         task = self.main_window.model.getTask(self.task_index)
         if task:
             self.main_window.model.set_data_programmatically(task, self.field, self.old_value)
-            self.main_window.update_gantt_chart()
+            self.main_window.update_gantt_rows(self.task_index, self.task_index)
             self.main_window.set_unsaved_changes(True)
 
 
+class RescheduleTaskCommand(Command):
+    """Comando para mover o redimensionar una tarea (arrastre en el Gantt)."""
+
+    def __init__(
+        self,
+        main_window: MainWindow,
+        task: Task,
+        old_dates: tuple[str, str],
+        new_dates: tuple[str, str],
+    ) -> None:
+        super().__init__("mover tarea")
+        self.main_window = main_window
+        self.task = task
+        self.old_dates = old_dates
+        self.new_dates = new_dates
+
+    def execute(self) -> None:
+        # dataChanged del modelo refresca las filas afectadas del Gantt
+        self.main_window.model.set_task_dates(self.task, *self.new_dates)
+        self.main_window.set_unsaved_changes(True)
+
+    def undo(self) -> None:
+        self.main_window.model.set_task_dates(self.task, *self.old_dates)
+        self.main_window.set_unsaved_changes(True)
+
+
 class ChangeColorCommand(Command):
     """Comando para cambiar el color de una tarea."""
 
@@ -559,6 +585,7 @@ class EditNotesCommand(Command):
         self.task.notes_html = self.new_notes_html
         self.task.notes = self._extract_plain_text(self.new_notes_html)
         self.task.file_links = self.new_file_links.copy()
+        self.main_window.model.invalidate_filter_index()
         self.main_window.update_gantt_chart()
         self.main_window.set_unsaved_changes(True)
 
@@ -566,6 +593,7 @@ class EditNotesCommand(Command):
         self.task.notes_html = self.old_notes_html
         self.task.notes = self._extract_plain_text(self.old_notes_html)
         self.task.file_links = self.old_file_links.copy()
+        self.main_window.model.invalidate_filter_index()
         self.main_window.update_gantt_chart()
         self.main_window.set_unsaved_changes(True)
 
@@ -0,0 +1,166 @@
+"""import_cache.py
+On-disk cache of imported schedules (PDF, MPP and XLSX).
+
+Re-importing a file that did not change (a schedule re-issued as is) would
+run the whole pdfplumber / JVM / pandas pipeline again. The result of an
+import is stored under the configuration directory, keyed by the SHA-256 of
+the file contents plus the extractor kind and version, so a renamed or
+copied file still hits and an edited one never does. Bump the extractor's
+entry in ``EXTRACTOR_VERSIONS`` whenever its output changes.
+
+Entries are gzip-compressed JSON. Tasks are stored as rows of values with
+a shared list of key sets, and the tree as the task index and children of
+each node. The cache is bounded in total size; the least recently used
+entries (by modification time, refreshed on every hit) are evicted first.
+
+Cache errors are logged and never break an import.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from core.pdf_extractor import TaskTreeNode
+from utils.atomic_io import atomic_write_bytes
+from utils.config_manager import config_directory
+
+logger = logging.getLogger("bpm.import_cache")
+
+EXTRACTOR_VERSIONS = {"pdf": 2, "mpp": 1, "xlsx": 2, "mspdi": 1, "mpx": 1}
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_FORMAT = 1
+_SUFFIX = ".json.gz"
+_HASH_CHUNK = 1024 * 1024
+
+ImportResult = tuple[list[dict[str, Any]], list[TaskTreeNode]]
+
+
+def file_digest(path: str | Path) -> str:
+    """SHA-256 (hex) of the contents of *path*."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def encode_result(tasks: list[dict[str, Any]], tree: list[TaskTreeNode]) -> bytes:
+    schemas: dict[tuple[str, ...], int] = {}
+    rows = []
+    for task in tasks:
+        keys = tuple(task)
+        schema = schemas.setdefault(keys, len(schemas))
+        rows.append([schema, *task.values()])
+    task_index = {id(task): i for i, task in enumerate(tasks)}
+    node_index = {id(node): i for i, node in enumerate(tree)}
+    payload = {
+        "format": _FORMAT,
+        "schemas": [list(keys) for keys in schemas],
+        "rows": rows,
+        "nodes": [task_index[id(node.task)] for node in tree],
+        "children": [[node_index[id(child)] for child in node.children] for node in tree],
+    }
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return gzip.compress(data.encode("utf-8"), compresslevel=6)
+
+
+def decode_result(data: bytes) -> ImportResult:
+    payload = json.loads(gzip.decompress(data).decode("utf-8"))
+    if payload.get("format") != _FORMAT:
+        raise ValueError(f"unknown cache format {payload.get('format')!r}")
+    schemas = payload["schemas"]
+    tasks = [dict(zip(schemas[row[0]], row[1:], strict=True)) for row in payload["rows"]]
+    tree = [TaskTreeNode(tasks[i]) for i in payload["nodes"]]
+    for node, children in zip(tree, payload["children"], strict=True):
+        node.children = [tree[i] for i in children]
+    return tasks, tree
+
+
+class ImportCache:
+    """Import results on disk, keyed by file contents (see module docstring)."""
+
+    def __init__(
+        self, directory: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else (
+            config_directory() / "import_cache"
+        )
+        self.max_bytes = max_bytes
+
+    def key(self, file_path: str | Path, kind: str) -> str:
+        return f"{kind}-v{EXTRACTOR_VERSIONS[kind]}-{file_digest(file_path)}"
+
+    def lookup(self, file_path: str | Path, kind: str) -> tuple[str | None, ImportResult | None]:
+        """(key, cached result or ``None``); key is ``None`` if the file
+        cannot be hashed."""
+        try:
+            key = self.key(file_path, kind)
+        except OSError as err:
+            logger.debug("Import cache: cannot hash %s: %s", file_path, err)
+            return None, None
+        return key, self.load(key)
+
+    def load(self, key: str) -> ImportResult | None:
+        path = self.directory / f"{key}{_SUFFIX}"
+        try:
+            result = decode_result(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            logger.info("Import cache: discarding unreadable entry %s: %s", path.name, err)
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # most recently used
+        except OSError:
+            pass
+        logger.info("Import cache hit: %s (%d tasks)", key, len(result[0]))
+        return result
+
+    def store(self, key: str, tasks: list[dict[str, Any]], tree: list[TaskTreeNode]) -> None:
+        try:
+            data = encode_result(tasks, tree)
+            if len(data) > self.max_bytes:
+                return
+            atomic_write_bytes(self.directory / f"{key}{_SUFFIX}", data)
+            self._evict()
+        except Exception as err:
+            logger.warning("Import cache: could not store %s: %s", key, err)
+
+    def clear(self) -> None:
+        for path in self._entries():
+            self._remove(path)
+
+    def _entries(self) -> list[Path]:
+        try:
+            return [p for p in self.directory.iterdir() if p.name.endswith(_SUFFIX)]
+        except OSError:
+            return []
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,183 @@
+"""milestone_index.py
+Índice de hitos (inicio/fin de tarea) por día y por mes para las vistas de
+calendario.
+
+Cada tarea aporta un hito de inicio y, si termina otro día, uno de fin, con
+las mismas reglas que ``calendar_view._parse_task_dates`` (fechas inválidas
+se ignoran, un rango invertido se corrige). Las fechas se analizan una sola
+vez por tarea y el índice se actualiza de forma incremental, así que pintar
+un mes o navegar entre meses cuesta en proporción a los hitos mostrados y no
+al tamaño del proyecto.
+
+Cada mes lleva una versión que cambia cuando cambia algo de lo que se
+dibuja en él (hitos, su orden o el color de sus tareas), para que las vistas
+puedan cachear lo ya pintado.
+
+Los días son números de día juliano (``core.spatial_index``).
+"""
+from __future__ import annotations
+
+import bisect
+import itertools
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from core.spatial_index import date_from_day, day_number
+
+# Reloj global de versiones: únicas entre instancias, de modo que una caché
+# no confunde el mes de un índice con el del índice que lo reemplaza.
+_VERSION_CLOCK = itertools.count(1)
+
+
+def _milestone_days(task: Any) -> tuple[int, int | None] | None:
+    """(día de inicio, día de fin o ``None`` si coincide), o ``None``."""
+    start = day_number(task.start_date)
+    end = day_number(task.end_date)
+    if start is None or end is None:
+        return None
+    if end < start:
+        start, end = end, start
+    return start, (end if end != start else None)
+
+
+def _month_key(day: int) -> tuple[int, int]:
+    value = date_from_day(day)
+    return value.year, value.month
+
+
+class MilestoneIndex:
+    """Hitos agrupados por día, con el conjunto de días con hitos por mes.
+
+    ``sync`` alinea el índice con la lista de tareas (solo vuelve a analizar
+    las tareas cuyas cadenas de fecha cambiaron) y registra su orden, que se
+    usa para ordenar los hitos de un mismo día igual que la tabla.
+    """
+
+    def __init__(self, tasks: Iterable[Any] = ()) -> None:
+        # id(task) → (task, start_str, end_str, start_day, end_day, color)
+        self._entries: dict[int, tuple[Any, str, str, int | None, int | None, Any]] = {}
+        self._by_day: dict[int, list[tuple[Any, str]]] = {}
+        self._by_month: dict[tuple[int, int], set[int]] = {}
+        self._month_versions: dict[tuple[int, int], int] = {}
+        self._order: dict[int, int] = {}
+        # Días con hitos ordenados; se reconstruye al consultarlo tras un
+        # alta o baja de días.
+        self._sorted_days: list[int] | None = None
+        # Último valor del reloj aplicado a este índice: cambia con cualquier
+        # cambio visible, de modo que sirve como versión del índice completo.
+        self.revision = 0
+        self.sync(list(tasks))
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._by_day.values())
+
+    # ------------------------------------------------------------------
+    # Mantenimiento
+    # ------------------------------------------------------------------
+
+    def sync(self, tasks: Sequence[Any]) -> None:
+        """Alinea el índice con ``tasks`` (orden incluido)."""
+        order = {id(task): position for position, task in enumerate(tasks)}
+        if order != self._order:
+            # El orden decide qué hito se ve primero en cada día.
+            self.revision = next(_VERSION_CLOCK)
+            for month in self._by_month:
+                self._month_versions[month] = self.revision
+        self._order = order
+        for key in [k for k in self._entries if k not in self._order]:
+            self._remove(key)
+        for task in tasks:
+            self.update(task)
+
+    def update(self, task: Any) -> None:
+        """Refleja un cambio de fechas de ``task`` (o la añade si es nueva)."""
+        key = id(task)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] == task.start_date and entry[2] == task.end_date:
+                if entry[5] is not task.color:
+                    self._entries[key] = entry[:5] + (task.color,)
+                    self._touch(entry[3], entry[4])
+                return
+            self._remove(key)
+        days = _milestone_days(task)
+        start, end = days if days is not None else (None, None)
+        self._entries[key] = (task, task.start_date, task.end_date, start, end, task.color)
+        self._touch(start, end)
+        if key not in self._order:
+            self._order[key] = len(self._order)
+        for day, kind in ((start, "start"), (end, "end")):
+            if day is None:
+                continue
+            items = self._by_day.get(day)
+            if items is None:
+                items = self._by_day[day] = []
+                self._sorted_days = None
+                self._by_month.setdefault(_month_key(day), set()).add(day)
+            items.append((task, kind))
+
+    def _touch(self, *days: int | None) -> None:
+        for day in days:
+            if day is not None:
+                self.revision = next(_VERSION_CLOCK)
+                self._month_versions[_month_key(day)] = self.revision
+
+    def _remove(self, key: int) -> None:
+        task, _s, _e, start, end, _color = self._entries.pop(key)
+        self._touch(start, end)
+        for day in (start, end):
+            if day is None:
+                continue
+            items = [item for item in self._by_day.get(day, ()) if item[0] is not task]
+            if items:
+                self._by_day[day] = items
+                continue
+            self._by_day.pop(day, None)
+            self._sorted_days = None
+            month_days = self._by_month.get(_month_key(day))
+            if month_days is not None:
+                month_days.discard(day)
+                if not month_days:
+                    del self._by_month[_month_key(day)]
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def on_day(self, day: int) -> list[tuple[Any, str]]:
+        """[(task, kind)] del día ``day`` en el orden de la lista de tareas."""
+        items = self._by_day.get(day)
+        if not items:
+            return []
+        order = self._order
+        return sorted(items, key=lambda item: order.get(id(item[0]), 0))
+
+    def month_version(self, year: int, month: int) -> int:
+        """Versión del contenido dibujable del mes (0 si nunca tuvo hitos)."""
+        return self._month_versions.get((year, month), 0)
+
+    def days(self) -> list[int]:
+        """Todos los días con hitos, en orden. No modificar la lista devuelta."""
+        if self._sorted_days is None:
+            self._sorted_days = sorted(self._by_day)
+        return self._sorted_days
+
+    def days_between(self, first_day: int | None, last_day: int | None) -> list[int]:
+        """Días con hitos dentro de ``[first_day, last_day]`` (``None``: sin límite)."""
+        days = self.days()
+        lo = 0 if first_day is None else bisect.bisect_left(days, first_day)
+        hi = len(days) if last_day is None else bisect.bisect_right(days, last_day)
+        return days[lo:hi]
+
+    def days_in_month(self, year: int, month: int) -> list[int]:
+        """Días (ordenados) del mes que tienen al menos un hito."""
+        return sorted(self._by_month.get((year, month), ()))
+
+    def in_month(self, year: int, month: int) -> list[tuple[int, Any, int, str]]:
+        """[(posición, task, día, kind)] de los hitos del mes, por fecha."""
+        order = self._order
+        return [
+            (order.get(id(task), 0), task, day, kind)
+            for day in self.days_in_month(year, month)
+            for task, kind in self.on_day(day)
+        ]
@@ -5,18 +5,23 @@ No incluye lógica de interfaz gráfica.
 """
 from __future__ import annotations
 
+import heapq
 import logging
+from collections import Counter
+from collections.abc import Iterable
 from dataclasses import dataclass, field
-from datetime import timedelta
 
 from PySide6.QtCore import QAbstractTableModel, QDate, QModelIndex, Qt
 from PySide6.QtGui import QColor
-from workalendar.america import Colombia
 
 # command_system imports models indirectly (via main_window). To avoid a
 # circular import at module level we import EditTaskCommand here at the top
 # since command_system does NOT import models at module level.
 from core.command_system import EditTaskCommand  # noqa: E402
+from core.milestone_index import MilestoneIndex
+from core.spatial_index import day_number
+from core.task_filter import TaskFilter, TaskFilterIndex
+from core.work_calendar import end_after_working_days, working_days_between
 
 logger = logging.getLogger("bpm.models")
 
@@ -121,6 +126,122 @@ class Task:
                 self.file_links[key] = value
 
 
+# ---------------------------------------------------------------------------
+# DateRangeTracker
+# ---------------------------------------------------------------------------
+
+class DateRangeTracker:
+    """Mantiene de forma incremental el rango de fechas (inicio mínimo, fin
+    máximo) de un conjunto de tareas.
+
+    Los días de inicio y fin se guardan en multiconjuntos contados con un
+    montículo de mínimos (inicios) y otro de máximos (fines) con borrado
+    perezoso: actualizar una tarea es O(log n) y consultar el rango es O(1)
+    amortizado, sin volver a analizar las fechas de todo el proyecto.
+    """
+
+    # Entradas obsoletas toleradas en cada montículo antes de reconstruirlo.
+    _HEAP_SLACK = 64
+
+    def __init__(self) -> None:
+        # id(task) → (task, start_str, end_str, start_day, end_day)
+        self._entries: dict[int, tuple[Task, str, str, int | None, int | None]] = {}
+        self._start_counts: Counter[int] = Counter()
+        self._end_counts: Counter[int] = Counter()
+        self._start_heap: list[int] = []
+        self._end_heap: list[int] = []  # valores negados (montículo de máximos)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sync(self, tasks: list[Task]) -> None:
+        """Ajusta el conjunto seguido a ``tasks``; solo analiza fechas nuevas o
+        modificadas (comparación de cadenas para el resto)."""
+        current = {id(task): task for task in tasks}
+        gone = [k for k in self._entries if k not in current]
+        added = len(current) - (len(self._entries) - len(gone))
+        if len(gone) + added > len(current) // 2:
+            # El conjunto cambió casi por completo (p. ej. al filtrar):
+            # reconstruir en bloque es más barato que el diff elemento a elemento.
+            self._rebuild(current.values())
+            return
+        for key in gone:
+            self._remove(key)
+        for key, task in current.items():
+            if key in self._entries:
+                self.update(task)
+            else:
+                self._add(task)
+
+    def update(self, task: Task) -> None:
+        """Refleja un cambio de fechas de ``task`` (si está siendo seguida)."""
+        entry = self._entries.get(id(task))
+        if entry is None or (entry[1], entry[2]) == (task.start_date, task.end_date):
+            return
+        self._remove(id(task))
+        self._add(task)
+
+    def bounds(self) -> tuple[int, int] | None:
+        """(inicio mínimo, fin máximo) en días julianos, o ``None`` si vacío."""
+        heap, counts = self._start_heap, self._start_counts
+        while heap and counts[heap[0]] <= 0:
+            del counts[heapq.heappop(heap)]
+        heap_end, counts_end = self._end_heap, self._end_counts
+        while heap_end and counts_end[-heap_end[0]] <= 0:
+            del counts_end[-heapq.heappop(heap_end)]
+        if not heap or not heap_end:
+            return None
+        return heap[0], -heap_end[0]
+
+    def _rebuild(self, tasks: Iterable[Task]) -> None:
+        self._entries = {
+            id(task): (
+                task, task.start_date, task.end_date,
+                day_number(task.start_date), day_number(task.end_date),
+            )
+            for task in tasks
+        }
+        entries = self._entries.values()
+        self._start_counts = Counter(e[3] for e in entries if e[3] is not None)
+        self._end_counts = Counter(e[4] for e in entries if e[4] is not None)
+        self._start_heap = list(self._start_counts)
+        self._end_heap = [-day for day in self._end_counts]
+        heapq.heapify(self._start_heap)
+        heapq.heapify(self._end_heap)
+
+    def _add(self, task: Task) -> None:
+        start = day_number(task.start_date)
+        end = day_number(task.end_date)
+        self._entries[id(task)] = (task, task.start_date, task.end_date, start, end)
+        if start is not None:
+            if self._start_counts[start] <= 0:
+                heapq.heappush(self._start_heap, start)
+                if len(self._start_heap) > 2 * len(self._start_counts) + self._HEAP_SLACK:
+                    self._start_heap = list(self._start_counts)
+                    heapq.heapify(self._start_heap)
+            self._start_counts[start] += 1
+        if end is not None:
+            if self._end_counts[end] <= 0:
+                heapq.heappush(self._end_heap, -end)
+                if len(self._end_heap) > 2 * len(self._end_counts) + self._HEAP_SLACK:
+                    self._end_heap = [-day for day in self._end_counts]
+                    heapq.heapify(self._end_heap)
+            self._end_counts[end] += 1
+
+    def _remove(self, key: int) -> None:
+        _task, _s, _e, start, end = self._entries.pop(key)
+        # Los días sin tareas salen del contador; su entrada en el montículo
+        # queda obsoleta hasta que ``bounds`` la descarte o se reconstruya.
+        if start is not None:
+            self._start_counts[start] -= 1
+            if self._start_counts[start] <= 0:
+                del self._start_counts[start]
+        if end is not None:
+            self._end_counts[end] -= 1
+            if self._end_counts[end] <= 0:
+                del self._end_counts[end]
+
+
 # ---------------------------------------------------------------------------
 # TaskTableModel
 # ---------------------------------------------------------------------------
@@ -141,6 +262,26 @@ class TaskTableModel(QAbstractTableModel):
         self.actual_to_visible: dict[int, int] = {}
         # O(1) task → visible-row lookup (kept in sync with update_visible_tasks)
         self._task_to_row: dict[int, int] = {}  # id(task) → visible_row
+        # Rango de fechas de las filas visibles, mantenido por edición
+        self.date_range = DateRangeTracker()
+        # Filtro activo (máscara de visibilidad sobre ``tasks``)
+        self.filter_index = TaskFilterIndex()
+        self.task_filter: TaskFilter | None = None
+        self._filter_pinned: set[int] = set()  # tareas nuevas que no se ocultan
+        # El índice se resincroniza tras cualquier cambio del modelo; mientras
+        # solo cambia el filtro (cada pulsación) se reutiliza tal cual.
+        self._filter_index_stale = True
+        # Hitos de todas las tareas (no solo las visibles) para el calendario:
+        # las ediciones de filas se aplican al momento y los cambios de
+        # estructura lo marcan para resincronizarse en la siguiente consulta.
+        self._milestones = MilestoneIndex()
+        self._milestones_stale = True
+        # Contador de cambios (filas o estructura): permite a otros índices
+        # sobre las tareas (p. ej. el de alertas) saber si deben resincronizarse.
+        self.revision = 0
+        for signal in (self.layoutChanged, self.modelReset, self.rowsInserted, self.rowsRemoved):
+            signal.connect(self._on_structure_changed)
+        self.dataChanged.connect(self._on_rows_changed)
 
         self.update_visible_tasks()
 
@@ -154,6 +295,12 @@ class TaskTableModel(QAbstractTableModel):
         self.actual_to_visible = {}
         self._task_to_row = {}
 
+        if self.task_filter is not None:
+            self.filter_index.sync(self.tasks)
+            self._update_filtered_tasks()
+            self.date_range.sync(self.visible_tasks)
+            return
+
         idx = 0
         visible_idx = 0
         while idx < len(self.tasks):
@@ -168,6 +315,96 @@ class TaskTableModel(QAbstractTableModel):
                 while idx < len(self.tasks) and self.tasks[idx].is_subtask:
                     idx += 1
 
+        self.date_range.sync(self.visible_tasks)
+
+    def _update_filtered_tasks(self) -> None:
+        """Construye las filas visibles aplicando ``task_filter``.
+
+        Una tarea padre se muestra si coincide o si coincide alguna de sus
+        subtareas; una subtarea se muestra si coincide (aunque el padre esté
+        contraído) o si su padre coincide y está expandido.
+        """
+        matches = self.filter_index.matching_ids(self.task_filter)
+        matches |= self._filter_pinned
+
+        tasks = self.tasks
+        shown: list[int] = []
+        parent_pos = -1
+        parent_shown = parent_open = False
+        for idx, task in enumerate(tasks):
+            if task.is_subtask and parent_pos >= 0:
+                if parent_open or id(task) in matches:
+                    if not parent_shown:
+                        shown.append(parent_pos)
+                        parent_shown = True
+                    shown.append(idx)
+                continue
+            parent_pos = idx
+            parent_shown = id(task) in matches
+            parent_open = parent_shown and not task.is_collapsed
+            if parent_shown:
+                shown.append(idx)
+
+        self.visible_to_actual = shown
+        self.visible_tasks = [tasks[idx] for idx in shown]
+        self.actual_to_visible = {idx: row for row, idx in enumerate(shown)}
+        self._task_to_row = {id(task): row for row, task in enumerate(self.visible_tasks)}
+
+    def set_filter(self, task_filter: TaskFilter | None) -> None:
+        """Aplica (o quita, con ``None`` o un filtro vacío) el filtro de tareas."""
+        if task_filter is not None and task_filter.is_empty():
+            task_filter = None
+        self.beginResetModel()
+        self.task_filter = task_filter
+        self._filter_pinned = set()
+        if task_filter is None:
+            self.update_visible_tasks()
+        else:
+            if self._filter_index_stale:
+                self.filter_index.sync(self.tasks)
+            self._update_filtered_tasks()
+            self.date_range.sync(self.visible_tasks)
+        self.endResetModel()
+        self._filter_index_stale = task_filter is None
+
+    def invalidate_filter_index(self, *_args: object) -> None:
+        """Marca el índice de filtrado para resincronizarse en el próximo filtro."""
+        self._filter_index_stale = True
+        self.revision += 1
+
+    def invalidate_milestones(self) -> None:
+        """Marca el índice de hitos para resincronizarse en la próxima consulta
+        (fechas cambiadas directamente sobre las tareas, sin pasar por el modelo)."""
+        self._milestones_stale = True
+        self.revision += 1
+
+    def milestone_index(self) -> MilestoneIndex:
+        """Índice de hitos de ``tasks``, sincronizado si hace falta."""
+        if self._milestones_stale:
+            self._milestones.sync(self.tasks)
+            self._milestones_stale = False
+        return self._milestones
+
+    def _on_structure_changed(self, *_args: object) -> None:
+        self._filter_index_stale = True
+        self._milestones_stale = True
+        self.revision += 1
+
+    def _on_rows_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, *_args) -> None:
+        self._filter_index_stale = True
+        self.revision += 1
+        if self._milestones_stale:
+            return
+        last = min(bottom_right.row(), len(self.visible_tasks) - 1)
+        for row in range(max(0, top_left.row()), last + 1):
+            self._milestones.update(self.visible_tasks[row])
+
+    def refresh_filter_index(self) -> None:
+        """Sincroniza ya el índice de filtrado (p. ej. al abrir la barra de
+        filtro), para que la primera búsqueda no pague su construcción."""
+        self.filter_index.sync(self.tasks)
+        self._filter_index_stale = False
+
     def _get_visible_row(self, task: Task) -> int:
         """Retorna la fila visible de ``task`` en O(1). Lanza KeyError si no visible."""
         return self._task_to_row[id(task)]
@@ -247,6 +484,8 @@ class TaskTableModel(QAbstractTableModel):
         else:
             actual_position = len(self.tasks)
             position = self.rowCount()
+        if self.task_filter is not None:
+            self._filter_pinned.add(id(task))
         self.beginInsertRows(QModelIndex(), position, position)
         self.tasks.insert(actual_position, task)
         self.update_visible_tasks()
@@ -419,14 +658,38 @@ class TaskTableModel(QAbstractTableModel):
         finally:
             self._editing_programmatically = False
 
+    def set_task_dates(self, task: Task, start_date: str, end_date: str) -> None:
+        """Asigna inicio y fin a la vez (p. ej. al soltar una barra arrastrada
+        en el Gantt): la duración y el resumen de la tarea padre se recalculan
+        una sola vez, sin crear comandos."""
+        self._editing_programmatically = True
+        try:
+            task.start_date = start_date
+            task.end_date = end_date
+            self.recalculate_duration(task)
+            if task.is_subtask and task.parent_task:
+                self.update_parent_linked_duration(task.parent_task)
+
+            try:
+                row = self._get_visible_row(task)  # O(1)
+                self.dataChanged.emit(
+                    self.index(row, 2), self.index(row, 4), [Qt.ItemDataRole.EditRole]
+                )
+            except KeyError:
+                logger.debug("Task '%s' not in visible rows during set_task_dates", task.name)
+        finally:
+            self._editing_programmatically = False
+
     # ------------------------------------------------------------------
     # Date / duration recalculation
-    # Note: the day-loop is O(calendar_days) by design (workalendar).
-    # For very long projects caching holiday sets could help, but correctness
-    # is prioritised over micro-optimisation here.
+    # Working days come from the per-year prefix tables of core.work_calendar:
+    # a count between two dates, or the end date after N working days, costs
+    # one table lookup per calendar year spanned, not a day-by-day loop.
     # ------------------------------------------------------------------
 
     def recalculate_duration(self, task: Task) -> None:
+        self.date_range.update(task)
+        self._milestones.update(task)
         start_date = QDate.fromString(task.start_date, "dd/MM/yyyy")
         end_date = QDate.fromString(task.end_date, "dd/MM/yyyy")
         if not start_date.isValid() or not end_date.isValid():
@@ -434,15 +697,10 @@ class TaskTableModel(QAbstractTableModel):
         if end_date < start_date:
             end_date = start_date
             task.end_date = end_date.toString("dd/MM/yyyy")
+            self.date_range.update(task)
+            self._milestones.update(task)
 
-        cal = Colombia()
-        business_days = 0
-        current = start_date.toPython()
-        end = end_date.toPython()
-        while current <= end:
-            if cal.is_working_day(current):
-                business_days += 1
-            current += timedelta(days=1)
+        business_days = working_days_between(start_date.toJulianDay(), end_date.toJulianDay())
         task.duration = str(business_days)
 
         try:
@@ -461,15 +719,10 @@ class TaskTableModel(QAbstractTableModel):
             return
 
         target_days = int(task.duration)
-        cal = Colombia()
-        business_days = 0
-        end = start_date.toPython()
-        while business_days < target_days:
-            if cal.is_working_day(end):
-                business_days += 1
-            if business_days < target_days:
-                end += timedelta(days=1)
-        task.end_date = QDate(end).toString("dd/MM/yyyy")
+        end = end_after_working_days(start_date.toJulianDay(), target_days)
+        task.end_date = QDate.fromJulianDay(end).toString("dd/MM/yyyy")
+        self.date_range.update(task)
+        self._milestones.update(task)
 
         try:
             row = self._get_visible_row(task)  # O(1)
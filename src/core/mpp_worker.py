@@ -0,0 +1,306 @@
+"""mpp_worker.py
+Extracts tasks from Microsoft Project files in a separate process.
+
+Reading a ``.mpp`` goes through MPXJ on a JVM, and every task getter crosses
+the JPype boundary. Both the JVM and those calls live in a worker process
+(``multiprocessing`` "spawn") that stays alive between imports, so the JVM
+is started once and the GUI process never loads it. The worker reads all
+task fields of a file and sends them back in column chunks (one list per
+field) through a pipe; the GUI side turns each chunk into task dicts as it
+arrives, so the import window can stream them as before.
+
+If the worker dies (a JVM crash, or a request abandoned half way), the next
+request starts a new one; a request that fails before any task arrived is
+retried once on a fresh worker.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import re
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from PySide6.QtCore import QObject, Signal
+
+logger = logging.getLogger("bpm.mpp_worker")
+
+# Tareas por bloque de columnas enviado por el proceso (por defecto)
+CHUNK_ROWS = 500
+# Segundos de espera al cerrar el proceso antes de terminarlo
+_SHUTDOWN_TIMEOUT = 3.0
+
+# Estados de la JVM del proceso, publicados por MPPWorker.statusChanged
+JVM_IDLE = "idle"          # Sin iniciar
+JVM_STARTING = "starting"  # Iniciándose (o cargando las clases de MPXJ)
+JVM_READY = "ready"
+JVM_FAILED = "failed"
+
+_FIELDS = ("task_id", "level", "name", "start_date", "end_date", "outline_level")
+_ISO_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+
+
+class MPPWorkerError(Exception):
+    """El proceso de lectura no pudo extraer el archivo."""
+
+
+class _WorkerDied(Exception):
+    """El proceso de lectura dejó de responder (se reinicia en la siguiente petición)."""
+
+
+# ----------------------------------------------------------------------
+# Lado del proceso de lectura
+# ----------------------------------------------------------------------
+
+def _date_text(date: Any, fallback: Any) -> str:
+    """dd/mm/yyyy de una fecha de MPXJ con una sola llamada a Java
+    (``toString`` ISO de LocalDateTime); otros tipos, con ``fallback``."""
+    if date is None:
+        return ""
+    match = _ISO_DATE_RE.match(str(date))
+    if match:
+        year, month, day = match.groups()
+        return f"{day}/{month}/{year}"
+    return fallback(date)
+
+
+def _extract_columns(file_path: str, chunk_rows: int) -> Iterator[dict[str, list[Any]]]:
+    """Campos de las tareas importables del archivo, por bloques de columnas."""
+    import jpype.imports  # noqa: F401
+    from net.sf.mpxj.reader import UniversalProjectReader
+
+    from core.mpp_extractor import MPPReader
+    from utils.filter_util import is_start_end_task
+
+    format_date = MPPReader().format_date
+    project = UniversalProjectReader().read(file_path)
+    columns: dict[str, list[Any]] = {field: [] for field in _FIELDS}
+    for task in project.getTasks():
+        task_id = task.getID()
+        if task_id is None:
+            continue
+        name = task.getName()
+        task_name = str(name) if name is not None else ''
+        if is_start_end_task(task_name):
+            continue
+        duration = task.getDuration()
+        if duration is not None and duration.getDuration() == 0:
+            continue
+        outline_number = task.getOutlineNumber()
+        columns["task_id"].append(str(task_id))
+        columns["level"].append(str(outline_number) if outline_number is not None else '')
+        columns["name"].append(task_name)
+        columns["start_date"].append(_date_text(task.getStart(), format_date))
+        columns["end_date"].append(_date_text(task.getFinish(), format_date))
+        columns["outline_level"].append(int(task.getOutlineLevel()) - 1)
+        if len(columns["task_id"]) >= chunk_rows:
+            yield columns
+            columns = {field: [] for field in _FIELDS}
+    if columns["task_id"]:
+        yield columns
+
+
+def _serve(conn: Any) -> None:
+    """Bucle del proceso: atiende peticiones hasta recibir "quit" o perder
+    la conexión. Punto de entrada del proceso de lectura."""
+    from utils.jvm_manager import JVMManager
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        command = request[0]
+        if command == "quit":
+            return
+        if not JVMManager.start_jvm():
+            conn.send(("error", "No se pudo iniciar la JVM"))
+            continue
+        try:
+            if command == "warmup":
+                JVMManager.preload_mpxj()
+            elif command == "extract":
+                for columns in _extract_columns(request[1], request[2]):
+                    conn.send(("rows", columns))
+            conn.send(("done", None))
+        except Exception as err:
+            conn.send(("error", str(err)))
+
+
+# ----------------------------------------------------------------------
+# Lado de la aplicación
+# ----------------------------------------------------------------------
+
+def _column_rows(columns: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Diccionarios de tarea (los de ``MPPLoaderThread``) de un bloque."""
+    return [
+        {
+            'task_id': task_id,
+            'level': level,
+            'name': name,
+            'start_date': start_date,
+            'end_date': end_date,
+            'indentation': outline_level,
+            'outline_level': outline_level,
+        }
+        for task_id, level, name, start_date, end_date, outline_level in zip(
+            *(columns[field] for field in _FIELDS), strict=True
+        )
+    ]
+
+
+class MPPWorker(QObject):
+    """Cliente del proceso de lectura de MPP (ver el docstring del módulo).
+
+    Las peticiones se atienden de una en una; se pueden hacer desde
+    cualquier hilo. ``statusChanged`` publica el estado de la JVM del
+    proceso con los valores ``JVM_*`` de este módulo.
+    """
+
+    statusChanged = Signal(str)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._process: Any = None
+        self._conn: Any = None
+        self._status = JVM_IDLE
+        self._closed = False
+
+    def status(self) -> str:
+        return self._status
+
+    def _set_status(self, status: str) -> None:
+        if status != self._status:
+            self._status = status
+            self.statusChanged.emit(status)
+
+    def warm_up(self) -> None:
+        """Inicia el proceso y su JVM en segundo plano (no bloquea)."""
+        if self._status in (JVM_READY, JVM_STARTING):
+            return
+        self._set_status(JVM_STARTING)
+        threading.Thread(target=self._warm_up, name="bpm-mpp-warmup", daemon=True).start()
+
+    def _warm_up(self) -> None:
+        with self._lock:
+            try:
+                for _rows in self._stream(("warmup",)):
+                    pass
+            except (MPPWorkerError, _WorkerDied) as err:
+                logger.warning("No se pudo preparar el proceso de MPP: %s", err)
+                self._set_status(JVM_FAILED)
+            else:
+                self._set_status(JVM_READY)
+
+    def iter_batches(
+        self, file_path: str, batch_size: int = CHUNK_ROWS
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Tareas del archivo en bloques de hasta *batch_size*, en orden, a
+        medida que llegan. Lanza ``MPPWorkerError`` si no se pudo leer."""
+        with self._lock:
+            received = 0
+            for attempt in (1, 2):
+                try:
+                    for rows in self._stream(("extract", file_path, batch_size)):
+                        received += len(rows)
+                        yield rows
+                    self._set_status(JVM_READY)
+                    return
+                except _WorkerDied as err:
+                    if received or attempt == 2:
+                        raise MPPWorkerError(str(err)) from err
+                    logger.warning("El proceso de MPP terminó; se reintenta: %s", err)
+
+    def _stream(self, request: tuple[Any, ...]) -> Iterator[list[dict[str, Any]]]:
+        """Envía *request* y produce los bloques recibidos hasta "done"."""
+        self._ensure_process()
+        finished = False
+        try:
+            try:
+                self._conn.send(request)
+            except (OSError, ValueError) as err:
+                raise _WorkerDied(f"No se pudo enviar la petición: {err}") from err
+            while True:
+                try:
+                    kind, payload = self._conn.recv()
+                except (EOFError, OSError) as err:
+                    raise _WorkerDied("El proceso de lectura de MPP terminó inesperadamente") from err
+                if kind == "rows":
+                    yield _column_rows(payload)
+                elif kind == "done":
+                    finished = True
+                    return
+                else:
+                    finished = True
+                    raise MPPWorkerError(payload)
+        finally:
+            if not finished:
+                # Respuesta a medias en la tubería: el proceso no es reutilizable.
+                self._stop_process()
+
+    def _ensure_process(self) -> None:
+        if self._closed:
+            raise MPPWorkerError("El proceso de lectura de MPP está cerrado")
+        if self._process is not None and self._process.is_alive():
+            return
+        self._stop_process()
+        # "spawn": el proceso principal tiene hilos de Qt, y fork no es seguro con hilos.
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_serve, args=(child_conn,), name="bpm-mpp-worker", daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        logger.info("Proceso de lectura de MPP iniciado (pid %s)", self._process.pid)
+
+    def _stop_process(self) -> None:
+        process, conn = self._process, self._conn
+        self._process = self._conn = None
+        if conn is not None:
+            conn.close()
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join(_SHUTDOWN_TIMEOUT)
+        if process is not None:
+            self._set_status(JVM_IDLE)
+
+    def shutdown(self) -> None:
+        """Cierra el proceso (y su JVM) si está en marcha; después no se
+        atienden más peticiones.
+
+        No espera a una petición en curso (una importación o el arranque de
+        la JVM pueden tardar): si hay una, termina el proceso directamente y
+        la petición falla con ``MPPWorkerError`` sin reintentar.
+        """
+        self._closed = True
+        if not self._lock.acquire(blocking=False):
+            process = self._process
+            if process is not None and process.is_alive():
+                process.terminate()
+                process.join(_SHUTDOWN_TIMEOUT)
+            return
+        try:
+            if self._process is not None and self._process.is_alive():
+                try:
+                    self._conn.send(("quit",))
+                    self._process.join(_SHUTDOWN_TIMEOUT)
+                except (OSError, ValueError):
+                    pass
+            self._stop_process()
+        finally:
+            self._lock.release()
+
+
+_shared: MPPWorker | None = None
+
+
+def shared_worker() -> MPPWorker:
+    """Proceso de lectura compartido por toda la aplicación (crearlo en el
+    hilo de la UI)."""
+    global _shared
+    if _shared is None:
+        _shared = MPPWorker()
+    return _shared
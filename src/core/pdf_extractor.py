@@ -1,20 +1,60 @@
 """pdf_extractor.py
 Extracts task data from PDF project files in a background QThread.
+
+Pages are independent until the hierarchy is built, so large documents are
+split into contiguous page ranges that are parsed in a process pool (each
+worker opens the file itself) and reassembled in page order. Word positions,
+used for the indentation level, are extracted once per page.
+
+Tasks are produced in batches (``iter_task_batches``) so the import window
+can show them while the rest of the file is still being read.
+
+``PDFImportSession`` opens the document once per import: the encryption and
+permission flags are read from the same parsed document whose pages are
+then extracted.
 """
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import os
 import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import pdfplumber
 from PySide6.QtCore import QThread, Signal
 
+from core.pdf_security_checker import (
+    PDFRestrictedError,
+    document_restriction,
+    pdf_open_error_message,
+)
 from utils.filter_util import is_start_end_task
 
+if TYPE_CHECKING:
+    from core.import_cache import ImportCache
+
 logger = logging.getLogger("bpm.pdf_extractor")
 
+# "<id> <nombre> [<n> días] <inicio> <fin>" o "<nombre> <id> [<n> días] <inicio> <fin>"
+_ID_FIRST_RE = re.compile(
+    r"(\d+)\s+(.*?)\s+(\d+\s*(?:días|days))?\s*"
+    r"(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}/\d{1,2}/\d{4})"
+)
+_NAME_FIRST_RE = re.compile(
+    r"(.*?)\s+(\d+)\s+(\d+\s*(?:días|days))?\s*"
+    r"(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}/\d{1,2}/\d{4})"
+)
+
+# Below this many pages the process start-up costs more than it saves.
+PARALLEL_MIN_PAGES = 16
+# Contiguous pages handed to a worker at a time.
+_PAGES_PER_CHUNK = 8
+
 
 class TaskTreeNode:
     def __init__(self, task: dict[str, Any]) -> None:
@@ -22,116 +62,246 @@ class TaskTreeNode:
         self.children: list[TaskTreeNode] = []
 
 
-def extract_tasks(
-    file_path: str,
-) -> tuple[list[dict[str, Any]], list[TaskTreeNode]]:
-    """Extrae tareas y construye un árbol de tareas desde un archivo PDF."""
-    tasks: list[dict[str, Any]] = []
-    task_tree: list[TaskTreeNode] = []
+def _page_tasks(page: Any) -> list[dict[str, Any]]:
+    """Filas de tarea reconocidas en una página, en orden."""
+    text = page.extract_text()
+    if not text:
+        return []
+    rows: list[dict[str, Any]] = []
+    words: list[tuple[str, float]] | None = None
+    words_failed = False
+    for line in text.split("\n"):
+        match = _ID_FIRST_RE.match(line) or _NAME_FIRST_RE.match(line)
+        if not match:
+            continue
+        if match.group(1).isdigit():
+            task_id, task_name = match.group(1), match.group(2).strip()
+        else:
+            task_name, task_id = match.group(1).strip(), match.group(2)
+        start_date, end_date = match.group(4), match.group(5)
+
+        # Calcular nivel de indentación por posición x en página (las
+        # palabras se extraen una sola vez por página)
+        if words is None and not words_failed:
+            try:
+                words = [(w.get("text", ""), w["x0"]) for w in page.extract_words()]
+            except Exception as err:
+                logger.debug(
+                    "Word position extraction failed, using indentation fallback: %s", err
+                )
+                words_failed = True
+        if words_failed:
+            leading_spaces = len(line) - len(line.lstrip())
+            level = min(leading_spaces // 4, 10)
+        else:
+            level = next((int(x0 / 20) for text_, x0 in words if task_name in text_), 0)
+
+        if task_id and task_name and start_date and end_date:
+            rows.append({
+                "task_id": task_id,
+                "level": level,
+                "name": task_name,
+                "start_date": start_date,
+                "end_date": end_date,
+                "indentation": level,
+            })
+    return rows
 
+
+def _extract_page_range(file_path: str, first: int, last: int) -> list[dict[str, Any]]:
+    """Filas de las páginas ``[first, last)``; punto de entrada de los procesos."""
     with pdfplumber.open(file_path) as pdf:
+        return [row for page in pdf.pages[first:last] for row in _page_tasks(page)]
+
+
+def _iter_row_batches(
+    pdf: Any, file_path: str, workers: int | None = None
+) -> Iterator[list[dict[str, Any]]]:
+    """Filas por página (o por bloque de páginas en paralelo), en orden.
+
+    *pdf* es el documento ya abierto de *file_path*; los procesos del pool
+    abren el archivo por su cuenta.
+    """
+    page_count = len(pdf.pages)
+    workers = workers or min(os.cpu_count() or 1, 8)
+    if page_count < PARALLEL_MIN_PAGES or workers <= 1:
         for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
-                continue
-            for line in text.split("\n"):
-                task_id: str | None = None
-                task_name: str | None = None
-                start_date: str | None = None
-                end_date: str | None = None
-                level = 0
-
-                match = re.match(
-                    r"(\d+)\s+(.*?)\s+(\d+\s*(?:días|days))?\s*"
-                    r"(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}/\d{1,2}/\d{4})",
-                    line,
-                )
-                if not match:
-                    match = re.match(
-                        r"(.*?)\s+(\d+)\s+(\d+\s*(?:días|days))?\s*"
-                        r"(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}/\d{1,2}/\d{4})",
-                        line,
-                    )
-
-                if match and len(match.groups()) == 5:
-                    if match.group(1).isdigit():
-                        task_id = match.group(1)
-                        task_name = match.group(2).strip()
-                        start_date = match.group(4)
-                        end_date = match.group(5)
-                    else:
-                        task_name = match.group(1).strip()
-                        task_id = match.group(2)
-                        start_date = match.group(4)
-                        end_date = match.group(5)
-
-                    # Calcular nivel de indentación por posición x en página
-                    try:
-                        chars = page.extract_words()
-                        for char in chars:
-                            if task_name in char.get("text", ""):
-                                level = int(char["x0"] / 20)
-                                break
-                        else:
-                            level = 0
-                    except Exception as err:
-                        logger.debug(
-                            "Word position extraction failed, using indentation "
-                            "fallback: %s",
-                            err,
-                        )
-                        leading_spaces = len(line) - len(line.lstrip())
-                        level = min(leading_spaces // 4, 10)
-
-                    if task_id and task_name and start_date and end_date:
-                        task: dict[str, Any] = {
-                            "task_id": task_id,
-                            "level": level,
-                            "name": task_name,
-                            "start_date": start_date,
-                            "end_date": end_date,
-                            "indentation": level,
-                        }
-
-                        if not is_start_end_task(task_name):
-                            try:
-                                start = datetime.strptime(start_date, "%d/%m/%Y")
-                                end = datetime.strptime(end_date, "%d/%m/%Y")
-                                if start != end:
-                                    tasks.append(task)
-                                    task_tree.append(TaskTreeNode(task))
-                            except ValueError as err:
-                                logger.debug(
-                                    "Date parse error for task '%s' (%s / %s): %s"
-                                    " — adding task anyway",
-                                    task_name,
-                                    start_date,
-                                    end_date,
-                                    err,
-                                )
-                                tasks.append(task)
-                                task_tree.append(TaskTreeNode(task))
-
-    # Construir jerarquía de tareas
-    for i, node in enumerate(task_tree):
-        if i > 0:
-            for j in range(i - 1, -1, -1):
-                potential_parent = task_tree[j]
-                if potential_parent.task["level"] < node.task["level"]:
-                    potential_parent.children.append(node)
-                    break
-
-    return tasks, task_tree
+            yield _page_tasks(page)
+        return
+
+    chunk = max(1, min(_PAGES_PER_CHUNK, -(-page_count // workers)))
+    ranges = [(first, min(first + chunk, page_count)) for first in range(0, page_count, chunk)]
+    logger.info(
+        "Extrayendo %d páginas de PDF en %d procesos (%d bloques)",
+        page_count, workers, len(ranges),
+    )
+    done = 0
+    # "spawn": el proceso principal tiene hilos de Qt, y fork no es seguro con hilos.
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            # map conserva el orden de los bloques, y con él el de las páginas;
+            # cada bloque se entrega en cuanto él y los anteriores terminan.
+            for rows in pool.map(
+                _extract_page_range,
+                [file_path] * len(ranges),
+                [first for first, _last in ranges],
+                [last for _first, last in ranges],
+            ):
+                done += 1
+                yield rows
+    except (BrokenProcessPool, OSError) as err:
+        logger.warning("Process pool unavailable, extracting PDF pages serially: %s", err)
+        for first, last in ranges[done:]:
+            yield _extract_page_range(file_path, first, last)
+
+
+def _keep_task(task: dict[str, Any]) -> bool:
+    """Descarta hitos de inicio/fin y tareas de duración cero."""
+    task_name = task["name"]
+    if is_start_end_task(task_name):
+        return False
+    try:
+        start = datetime.strptime(task["start_date"], "%d/%m/%Y")
+        end = datetime.strptime(task["end_date"], "%d/%m/%Y")
+        return start != end
+    except ValueError as err:
+        logger.debug(
+            "Date parse error for task '%s' (%s / %s): %s — adding task anyway",
+            task_name,
+            task["start_date"],
+            task["end_date"],
+            err,
+        )
+        return True
+
+
+class PDFImportSession:
+    """Un PDF abierto una sola vez para verificar restricciones y extraer.
+
+    Abrir el archivo lanza ``PDFRestrictedError`` si no es un PDF legible o
+    pide contraseña; ``check_restrictions`` revisa cifrado y permisos sobre
+    el mismo documento que luego recorre ``task_batches``.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        try:
+            self.pdf = pdfplumber.open(file_path)
+        except Exception as err:
+            raise PDFRestrictedError(pdf_open_error_message(err)) from err
+
+    def __enter__(self) -> PDFImportSession:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.pdf.close()
+
+    def check_restrictions(self) -> None:
+        message = document_restriction(self.pdf.doc)
+        if message:
+            raise PDFRestrictedError(message)
+
+    def task_batches(self, workers: int | None = None) -> Iterator[list[dict[str, Any]]]:
+        """Tareas por lotes (una página o un bloque de páginas), en orden."""
+        for rows in _iter_row_batches(self.pdf, self.file_path, workers):
+            batch = [task for task in rows if _keep_task(task)]
+            if batch:
+                yield batch
+
+
+def iter_task_batches(
+    file_path: str, workers: int | None = None
+) -> Iterator[list[dict[str, Any]]]:
+    """Tareas del PDF por lotes (una página o un bloque de páginas), en orden."""
+    with PDFImportSession(file_path) as session:
+        yield from session.task_batches(workers)
+
+
+class TaskTreeBuilder:
+    """Construye la jerarquía a medida que llegan las tareas.
+
+    El padre de una tarea es la anterior más cercana con menor nivel. La
+    pila guarda los candidatos (niveles estrictamente crecientes), así que
+    cada nodo se apila y desapila una sola vez.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: list[TaskTreeNode] = []
+        self._stack: list[TaskTreeNode] = []
+
+    def add(self, task: dict[str, Any]) -> TaskTreeNode:
+        node = TaskTreeNode(task)
+        level = task["level"]
+        stack = self._stack
+        while stack and stack[-1].task["level"] >= level:
+            stack.pop()
+        if stack:
+            stack[-1].children.append(node)
+        stack.append(node)
+        self.nodes.append(node)
+        return node
+
+
+def extract_tasks(
+    file_path: str, workers: int | None = None
+) -> tuple[list[dict[str, Any]], list[TaskTreeNode]]:
+    """Extrae tareas y construye un árbol de tareas desde un archivo PDF.
+
+    ``workers`` limita los procesos usados en documentos grandes (por
+    defecto, los núcleos disponibles hasta 8; 1 lo hace todo en este proceso).
+    """
+    tasks: list[dict[str, Any]] = []
+    tree = TaskTreeBuilder()
+    for batch in iter_task_batches(file_path, workers):
+        tasks.extend(batch)
+        for task in batch:
+            tree.add(task)
+    return tasks, tree.nodes
 
 
 class PDFLoaderThread(QThread):
-    # Signal emits (tasks list, task_tree list)
+    # Each batch of tasks as soon as it is read (one page or page block)
+    tasks_batch: Signal = Signal(list)
+    # Signal emits (tasks list, task_tree list) once the whole file is read
     tasks_extracted: Signal = Signal(list, list)
+    # Message for the user when the PDF is encrypted, restricted or unreadable
+    restricted: Signal = Signal(str)
+    # Error message when reading fails after it started (batches already
+    # emitted are an incomplete schedule and must be discarded)
+    failed: Signal = Signal(str)
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, cache: ImportCache | None = None) -> None:
         super().__init__()
         self.file_path = file_path
+        self.cache = cache
 
     def run(self) -> None:
-        tasks, task_tree = extract_tasks(self.file_path)
-        self.tasks_extracted.emit(tasks, task_tree)
+        key, cached = self.cache.lookup(self.file_path, "pdf") if self.cache else (None, None)
+        if cached is not None:
+            self.tasks_batch.emit(cached[0])
+            self.tasks_extracted.emit(*cached)
+            return
+        tasks: list[dict[str, Any]] = []
+        tree = TaskTreeBuilder()
+        try:
+            with PDFImportSession(self.file_path) as session:
+                session.check_restrictions()
+                for batch in session.task_batches():
+                    tasks.extend(batch)
+                    for task in batch:
+                        tree.add(task)
+                    self.tasks_batch.emit(batch)
+        except PDFRestrictedError as err:
+            self.restricted.emit(str(err))
+            return
+        except Exception as err:
+            logger.warning("Error al extraer tareas PDF: %s", err, exc_info=True)
+            self.failed.emit(str(err))
+            return
+        if key and tasks:
+            self.cache.store(key, tasks, tree.nodes)
+        self.tasks_extracted.emit(tasks, tree.nodes)
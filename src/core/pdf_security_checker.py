@@ -1,6 +1,7 @@
 # pdf_security_checker.py
 
 import PyPDF2
+from pdfminer.pdfdocument import PDFPasswordIncorrect
 
 
 def check_pdf_restrictions(file_path):
@@ -27,3 +28,29 @@ def check_pdf_restrictions(file_path):
         return f"Error al leer el PDF: {e}"
     except Exception as e:
         return f"Error al abrir el PDF: {e}"
+
+
+class PDFRestrictedError(Exception):
+    """El PDF no se puede importar: cifrado, sin permiso de extracción o ilegible.
+
+    El mensaje es el mismo que devuelve ``check_pdf_restrictions``.
+    """
+
+
+def document_restriction(doc):
+    """Restricción de un documento ya abierto con pdfplumber (``pdf.doc`` de
+    pdfminer), o ``None`` si se puede importar. Rechaza los mismos documentos
+    que ``check_pdf_restrictions``: todo PDF cifrado."""
+    if doc.encryption is None:
+        return None
+    if not doc.is_extractable:
+        return "El PDF tiene restricciones de extracción de contenido."
+    return "El PDF está protegido con contraseña."
+
+
+def pdf_open_error_message(error):
+    """Mensaje para el usuario si pdfplumber no pudo abrir el documento."""
+    cause = error.args[0] if error.args and isinstance(error.args[0], Exception) else error
+    if isinstance(cause, PDFPasswordIncorrect):
+        return "El PDF está protegido con contraseña."
+    return f"Error al leer el PDF: {cause}"
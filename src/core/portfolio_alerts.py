@@ -0,0 +1,197 @@
+"""portfolio_alerts.py
+Alert scanning of the other projects in the recent-files list.
+
+The alerts of the open project come from ``AlertManager``; this module adds
+the ones of every other recent ``.bpm`` file so that a single dialog can show
+what is due across the whole portfolio.
+
+Files are read in a thread pool, off the UI thread, and only the fields
+that drive alerts are parsed (same keys as
+``TaskTableWidget.load_tasks_from_file``; notes and file links are skipped).
+Parsed files are cached by path, modification time and size, so a rescan
+only re-reads the projects that changed on disk. The day and the global
+threshold are taken on the UI thread when the scan starts, and the merged
+result is delivered through the ``scanFinished`` signal.
+"""
+from __future__ import annotations
+
+import ast
+import functools
+import logging
+import os
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from PySide6.QtCore import QDate, QObject, Signal
+
+from core.alert_index import evaluate_task
+from core.alert_manager import AlertEntry, build_alert_entries, order_alerts
+
+logger = logging.getLogger("bpm.portfolio_alerts")
+
+
+@dataclass
+class ProjectTask:
+    """Alert fields of a task read from a project file that is not open."""
+
+    name: str
+    end_date: str = ""
+    alert_threshold_days: int | None = None
+    alert_snoozed_until: str | None = None
+    extra_reminders: list[Any] = field(default_factory=list)
+
+
+def read_alert_tasks(path: str) -> list[ProjectTask]:
+    """Tasks of the ``.bpm`` file *path* with only their alert fields."""
+    tasks: list[ProjectTask] = []
+    with open(path, encoding="utf-8") as file:
+        content = file.read()
+    for block in content.split("[TASK]"):
+        if "[/TASK]" not in block:
+            continue
+        task = ProjectTask(name="Nueva Tarea")
+        skipping = False
+        for line in block.split("\n"):
+            line = line.strip()
+            if skipping:
+                # Notes and links may contain anything, including "END:" lines.
+                skipping = line not in ("NOTES_HTML_END", "FILE_LINKS_END")
+                continue
+            if line in ("NOTES_HTML_BEGIN", "FILE_LINKS_BEGIN"):
+                skipping = True
+            elif line.startswith("NAME:"):
+                task.name = line[5:].strip()
+            elif line.startswith("END:"):
+                task.end_date = line[4:].strip()
+            elif line.startswith("ALERT_THRESHOLD:"):
+                try:
+                    task.alert_threshold_days = int(line[16:].strip())
+                except ValueError:
+                    pass
+            elif line.startswith("ALERT_SNOOZED:"):
+                task.alert_snoozed_until = line[14:].strip()
+            elif line.startswith("REMINDERS:"):
+                try:
+                    task.extra_reminders = ast.literal_eval(line[10:].strip())
+                except Exception:
+                    pass
+        tasks.append(task)
+    return tasks
+
+
+def project_alerts(
+    path: str, tasks: Sequence[ProjectTask], today: int, threshold: int
+) -> list[AlertEntry]:
+    """Unsorted alerts raised on *today* by the tasks of the project *path*."""
+    pairs = [
+        (task, item)
+        for task in tasks
+        for item in evaluate_task(task, today, threshold)[0]
+    ]
+    return build_alert_entries(pairs, today, project=path)
+
+
+class PortfolioAlertScanner(QObject):
+    """Scans the alerts of a list of project files in a thread pool.
+
+    ``scan`` returns immediately; ``scanFinished`` is emitted on the UI
+    thread with the merged, ordered alerts of all readable files. A scan
+    requested while another is running is queued and replaces any earlier
+    queued one.
+    """
+
+    scanFinished = Signal(list)
+    # Emitted from the last worker; queued to the thread of the scanner.
+    _scanDone = Signal(list)
+
+    def __init__(self, max_workers: int = 4, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        # path → ((mtime_ns, size), tasks)
+        self._cache: dict[str, tuple[tuple[int, int], list[ProjectTask]]] = {}
+        self._running = False
+        self._pending: tuple[list[str], int, int] | None = None
+        self.alerts: list[AlertEntry] = []
+        self._scanDone.connect(self._finish)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def scan(self, paths: Sequence[str], threshold: int, today: int | None = None) -> None:
+        """Starts scanning *paths* (or queues the scan if one is running)."""
+        if today is None:
+            today = QDate.currentDate().toJulianDay()
+        request = (list(paths), threshold, today)
+        if self._running:
+            self._pending = request
+            return
+        self._start(*request)
+
+    def shutdown(self) -> None:
+        """Stops the pool without waiting for the files being read."""
+        self._pending = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _start(self, paths: list[str], threshold: int, today: int) -> None:
+        self._running = True
+        if not paths:
+            self._finish([])
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="bpm-portfolio"
+            )
+        # Results are kept in the order of *paths*, not of completion, so
+        # equal alerts of different projects always come out the same way.
+        results: list[list[AlertEntry]] = [[] for _ in paths]
+        remaining = [len(paths)]
+
+        def done(position: int, future: Future) -> None:
+            # Runs on a worker thread; the signal is queued to the UI thread.
+            with self._lock:
+                if not future.cancelled() and future.exception() is None:
+                    results[position] = future.result()
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                self._scanDone.emit(order_alerts(e for entries in results for e in entries))
+
+        for position, path in enumerate(paths):
+            future = self._pool.submit(self._scan_file, path, threshold, today)
+            future.add_done_callback(functools.partial(done, position))
+
+    def _scan_file(self, path: str, threshold: int, today: int) -> list[AlertEntry]:
+        try:
+            stat = os.stat(path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            with self._lock:
+                cached = self._cache.get(path)
+            if cached is not None and cached[0] == stamp:
+                tasks = cached[1]
+            else:
+                tasks = read_alert_tasks(path)
+                with self._lock:
+                    self._cache[path] = (stamp, tasks)
+            return project_alerts(path, tasks, today, threshold)
+        except (OSError, UnicodeDecodeError) as exc:
+            logger.info("Portfolio scan skipped %s: %s", path, exc)
+            with self._lock:
+                self._cache.pop(path, None)
+            return []
+
+    def _finish(self, alerts: list[AlertEntry]) -> None:
+        self.alerts = alerts
+        self._running = False
+        if self._pending is not None:
+            request, self._pending = self._pending, None
+            self._start(*request)
+        else:
+            self.scanFinished.emit(alerts)
@@ -0,0 +1,254 @@
+"""project_file_extractor.py
+Reads Microsoft Project exports without Java: MSPDI (``.xml``) and MPX
+(``.mpx``).
+
+Both readers stream the file and produce the same task dicts as the MPXJ
+import of a ``.mpp`` (``MPPLoaderThread``): tasks without an ID, start/end
+tasks and zero-duration tasks are skipped, dates are ``dd/mm/yyyy``, and
+``level`` is the outline number. MSPDI is parsed with ``iterparse``; each
+task element is cleared and detached once read, and so are the other
+sections of the project (calendars, resources, assignments), so memory
+stays flat for any schedule size. MPX is a delimited text file read one
+record at a time.
+"""
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from typing import Any
+
+from utils.filter_util import is_start_end_task
+
+logger = logging.getLogger("bpm.project_file")
+
+# Tareas por lote entregado a la ventana de importación
+BATCH_SIZE = 200
+# Extensiones que se leen con este módulo (sin JVM)
+PROJECT_FILE_EXTENSIONS = (".xml", ".mpx")
+
+_ISO_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)?")
+
+# Campos de tarea de MPX: número del registro 60 y nombre del registro 61
+_MPX_FIELDS = {
+    "name": (1, "Name"),
+    "outline_level": (3, "Outline Level"),
+    "duration": (40, "Duration"),
+    "start": (50, "Start"),
+    "finish": (51, "Finish"),
+    "id": (90, "ID"),
+    "outline_number": (99, "Outline Number"),
+}
+# Página de códigos del registro 0 de MPX
+_MPX_ENCODINGS = {"ANSI": "cp1252", "437": "cp437", "850": "cp850", "MAC": "mac_roman"}
+# Orden de la fecha del registro 12 de MPX
+_MPX_DATE_ORDERS = {"0": "mdy", "1": "dmy", "2": "ymd"}
+
+
+class ProjectFileError(Exception):
+    """El archivo no es un MSPDI/MPX válido."""
+
+
+def _task_dict(
+    task_id: str | None,
+    name: str | None,
+    duration_is_zero: bool,
+    start: str,
+    finish: str,
+    outline_number: str | None,
+    outline_level: str | None,
+) -> dict[str, Any] | None:
+    """Diccionario de tarea como el de ``MPPLoaderThread``, o ``None`` si la
+    tarea no se importa (sin ID, inicio/fin o duración cero)."""
+    if not task_id:
+        return None
+    task_name = name or ''
+    if is_start_end_task(task_name) or duration_is_zero:
+        return None
+    if outline_level:
+        level = int(outline_level) - 1
+    else:
+        # Sin nivel explícito: se deduce del número de esquema ("1.2.3" → 2)
+        level = outline_number.count('.') if outline_number else 0
+    return {
+        'task_id': task_id,
+        'level': outline_number or '',
+        'name': task_name,
+        'start_date': start,
+        'end_date': finish,
+        'indentation': level,
+        'outline_level': level,
+    }
+
+
+def _is_zero(duration: str | None) -> bool:
+    """``True`` si todas las cantidades de la duración son cero
+    ("PT0H0M0S", "0d", "0 edays"); una duración vacía no cuenta."""
+    if not duration:
+        return False
+    numbers = _NUMBER_RE.findall(duration)
+    return bool(numbers) and all(float(n.replace(',', '.')) == 0 for n in numbers)
+
+
+def _batches(tasks: Iterator[dict[str, Any]], batch_size: int) -> Iterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    for task in tasks:
+        batch.append(task)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ----------------------------------------------------------------------
+# MSPDI (.xml)
+# ----------------------------------------------------------------------
+
+def _local(tag: str) -> str:
+    """Nombre del elemento sin el espacio de nombres."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _mspdi_date(text: str | None) -> str:
+    if not text:
+        return ""
+    match = _ISO_DATE_RE.match(text)
+    if not match:
+        return text
+    year, month, day = match.groups()
+    return f"{day}/{month}/{year}"
+
+
+def iter_mspdi_tasks(file_path: str) -> Iterator[dict[str, Any]]:
+    """Tareas importables de un MSPDI, en el orden del archivo."""
+    parents: list[ET.Element] = []
+    try:
+        for event, elem in ET.iterparse(file_path, events=("start", "end")):
+            if event == "start":
+                if not parents and _local(elem.tag) != "Project":
+                    raise ProjectFileError("El XML no es un proyecto de Microsoft Project (MSPDI).")
+                parents.append(elem)
+                continue
+            parents.pop()
+            depth = len(parents)
+            if depth == 2 and _local(elem.tag) == "Task" and _local(parents[1].tag) == "Tasks":
+                fields = {_local(child.tag): child.text for child in elem}
+                task = _task_dict(
+                    fields.get("ID"),
+                    fields.get("Name"),
+                    _is_zero(fields.get("Duration")),
+                    _mspdi_date(fields.get("Start")),
+                    _mspdi_date(fields.get("Finish")),
+                    fields.get("OutlineNumber"),
+                    fields.get("OutlineLevel"),
+                )
+                if task is not None:
+                    yield task
+            if depth in (1, 2):
+                # Tareas y secciones ya leídas: se liberan de inmediato
+                elem.clear()
+                parents[-1].remove(elem)
+    except ET.ParseError as err:
+        raise ProjectFileError(f"Error al leer el XML: {err}") from err
+
+
+# ----------------------------------------------------------------------
+# MPX (.mpx)
+# ----------------------------------------------------------------------
+
+class _MPXDates:
+    """Convierte las fechas de MPX según el registro 12 (orden y separador)."""
+
+    def __init__(self, order: str = "mdy", separator: str = "/") -> None:
+        self.order = order
+        self.separator = separator
+
+    def format(self, text: str) -> str:
+        text = text.strip()
+        if not text or text.upper() == "NA":
+            return ""
+        parts = text.split()[0].split(self.separator)
+        if len(parts) != 3 or not all(part.isdigit() for part in parts):
+            return text
+        values = dict(zip(self.order, map(int, parts), strict=True))
+        year = values["y"]
+        if year < 100:
+            # Años de dos dígitos, como %y: 69-99 → 19xx, 00-68 → 20xx
+            year += 1900 if year >= 69 else 2000
+        return f"{values['d']:02d}/{values['m']:02d}/{year}"
+
+
+def _mpx_columns(codes: list[str] | None, names: list[str] | None) -> dict[str, int]:
+    """Posición de cada campo de ``_MPX_FIELDS`` en los registros 70."""
+    columns: dict[str, int] = {}
+    for field, (code, label) in _MPX_FIELDS.items():
+        if codes is not None and str(code) in codes:
+            columns[field] = codes.index(str(code))
+        elif names is not None and label in names:
+            columns[field] = names.index(label)
+    return columns
+
+
+def iter_mpx_tasks(file_path: str) -> Iterator[dict[str, Any]]:
+    """Tareas importables de un MPX, en el orden del archivo."""
+    with open(file_path, "rb") as fh:
+        header = fh.readline().decode("latin-1")
+    if not header.startswith("MPX") or len(header) < 4:
+        raise ProjectFileError("El archivo no es un MPX válido.")
+    delimiter = header[3]
+    code_page = header.rstrip("\r\n").split(delimiter)[-1].strip().upper()
+    encoding = _MPX_ENCODINGS.get(code_page, "cp1252")
+
+    dates = _MPXDates()
+    codes: list[str] | None = None
+    names: list[str] | None = None
+    columns: dict[str, int] | None = None
+    with open(file_path, encoding=encoding, errors="replace", newline="") as fh:
+        for record in csv.reader(fh, delimiter=delimiter):
+            if not record:
+                continue
+            kind = record[0].strip()
+            if kind == "12" and len(record) > 4:
+                dates = _MPXDates(_MPX_DATE_ORDERS.get(record[1].strip(), "mdy"),
+                                  record[4].strip() or "/")
+            elif kind == "60":
+                codes, columns = [value.strip() for value in record[1:]], None
+            elif kind == "61":
+                names, columns = [value.strip() for value in record[1:]], None
+            elif kind == "70":
+                if columns is None:
+                    columns = _mpx_columns(codes, names)
+                fields = {
+                    field: record[position + 1].strip()
+                    for field, position in columns.items()
+                    if position + 1 < len(record)
+                }
+                task = _task_dict(
+                    fields.get("id"),
+                    fields.get("name"),
+                    _is_zero(fields.get("duration")),
+                    dates.format(fields.get("start", "")),
+                    dates.format(fields.get("finish", "")),
+                    fields.get("outline_number"),
+                    fields.get("outline_level"),
+                )
+                if task is not None:
+                    yield task
+
+
+def iter_project_file(file_path: str, batch_size: int = BATCH_SIZE) -> Iterator[list[dict[str, Any]]]:
+    """Tareas de un MSPDI o MPX por lotes, según la extensión. Lanza
+    ``ProjectFileError`` si el archivo no tiene el formato esperado."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".mpx":
+        tasks = iter_mpx_tasks(file_path)
+    elif extension == ".xml":
+        tasks = iter_mspdi_tasks(file_path)
+    else:
+        raise ProjectFileError(f"Formato no soportado: {extension}")
+    yield from _batches(tasks, batch_size)
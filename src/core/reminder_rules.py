@@ -0,0 +1,314 @@
+"""reminder_rules.py
+Recurrence rules for the per-task extra reminders.
+
+A reminder is stored on the task as a plain dict (it is saved with ``repr``
+and read back with ``ast.literal_eval``)::
+
+    {"date": "dd/MM/yyyy", "comment": str, "frequency": "once" | "daily" |
+     "weekly" | "monthly",
+     # optional, rrule-style:
+     "interval": int,             # every N days / weeks / months (default 1)
+     "weekdays": [1..7],          # ISO weekdays, Monday = 1 (daily/weekly)
+     "month_days": [1..31 | -1],  # days of the month, -1 = last (monthly)
+     "until": "dd/MM/yyyy",       # last day an occurrence may fall on
+     "count": int,                # maximum number of occurrences
+     "business_days": bool}       # only working days (core.work_calendar)
+
+``compile_reminder`` turns that dict into an immutable ``ReminderRule``
+(cached by content). The rule answers "first occurrence on or after a day"
+arithmetically, so ``next_occurrence`` and ``occurs_on`` cost O(1) for
+plain rules and a few steps more for business-day rules, whatever the
+distance from the start date.
+
+Monthly rules whose day does not exist in a month (31 in April, 29-31 in
+February) fall on that month's last day instead of being skipped. With
+``business_days`` a daily rule skips non-working days, and weekly/monthly
+occurrences that land on one move to the next working day.
+
+Days are Julian day numbers (``core.spatial_index``).
+"""
+from __future__ import annotations
+
+import calendar
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from functools import cached_property
+from typing import Any
+
+from core.spatial_index import date_from_day, day_from_date, day_number
+from core.work_calendar import is_working_day
+
+FREQUENCIES = ("once", "daily", "weekly", "monthly")
+LAST_DAY = -1
+
+# Longest run of non-working days an occurrence can be moved across.
+_MAX_ROLL = 15
+# Safety bound for ``count`` rules (occurrences walked once per rule).
+_MAX_COUNT = 10_000
+
+_FREQ_LABELS = {"once": "Una vez", "daily": "Diario", "weekly": "Semanal", "monthly": "Mensual"}
+_UNIT_LABELS = {"daily": "días", "weekly": "semanas", "monthly": "meses"}
+_WEEKDAY_LETTERS = ("L", "M", "X", "J", "V", "S", "D")
+
+
+def weekday(day: int) -> int:
+    """ISO weekday (Monday = 1) of the Julian day *day*."""
+    return day % 7 + 1
+
+
+def _month_index(day: int) -> int:
+    value = date_from_day(day)
+    return value.year * 12 + value.month - 1
+
+
+def _day_in_month(month_index: int, month_day: int) -> int:
+    """Julian day of *month_day* (``LAST_DAY`` allowed) clamped to the month."""
+    year, month0 = divmod(month_index, 12)
+    length = calendar.monthrange(year, month0 + 1)[1]
+    dom = length if month_day == LAST_DAY else min(month_day, length)
+    return day_from_date(date(year, month0 + 1, dom))
+
+
+def normalize_reminder(rem: Any) -> dict[str, Any]:
+    """Reminders saved by old versions are plain "dd/MM/yyyy" strings."""
+    if isinstance(rem, str):
+        return {"date": rem, "comment": "Recordatorio general", "frequency": "once"}
+    return rem
+
+
+@dataclass(frozen=True)
+class ReminderRule:
+    """Occurrence generator of one reminder (see module docstring)."""
+
+    start: int
+    frequency: str = "once"
+    interval: int = 1
+    weekdays: tuple[int, ...] = ()
+    month_days: tuple[int, ...] = ()
+    until: int | None = None
+    count: int | None = None
+    business_days: bool = False
+    _week0: int = field(init=False, repr=False, compare=False)
+    _month0: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        set_ = object.__setattr__
+        set_(self, "interval", max(1, int(self.interval)))
+        if self.frequency == "weekly" and not self.weekdays:
+            set_(self, "weekdays", (weekday(self.start),))
+        if self.frequency == "monthly" and not self.month_days:
+            set_(self, "month_days", (date_from_day(self.start).day,))
+        set_(self, "weekdays", tuple(sorted(set(self.weekdays))))
+        set_(self, "_week0", self.start - weekday(self.start) + 1)
+        set_(self, "_month0", _month_index(self.start))
+
+    # ------------------------------------------------------------------
+    # Raw occurrences (before the business-day adjustment)
+    # ------------------------------------------------------------------
+
+    def _raw_next(self, day: int) -> int | None:
+        """First raw occurrence on or after *day*."""
+        day = max(day, self.start)
+        freq, step = self.frequency, self.interval
+        if freq == "once":
+            return day if day == self.start else None
+        if freq == "daily":
+            offset = (day - self.start) % step
+            candidate = day if offset == 0 else day + step - offset
+            if not self.weekdays:
+                return candidate
+            # The weekday sequence of c, c+step, ... repeats within 7 steps.
+            for _ in range(7):
+                if weekday(candidate) in self.weekdays:
+                    return candidate
+                candidate += step
+            return None
+        if freq == "weekly":
+            week = day - weekday(day) + 1
+            offset = (week - self._week0) // 7 % step
+            if offset:
+                week += 7 * (step - offset)
+            for week_start in (week, week + 7 * step):
+                for wd in self.weekdays:
+                    candidate = week_start + wd - 1
+                    if candidate >= day:
+                        return candidate
+            return None
+        if freq == "monthly":
+            month = _month_index(day)
+            offset = (month - self._month0) % step
+            if offset:
+                month += step - offset
+            for month_index in (month, month + step):
+                candidates = sorted({_day_in_month(month_index, d) for d in self.month_days})
+                for candidate in candidates:
+                    if candidate >= day:
+                        return candidate
+            return None
+        return None
+
+    def _roll(self, day: int) -> int:
+        while not is_working_day(day):
+            day += 1
+        return day
+
+    # ------------------------------------------------------------------
+    # Occurrences
+    # ------------------------------------------------------------------
+
+    def _next_unbounded(self, day: int) -> int | None:
+        """Like ``next_occurrence`` but ignoring ``until``/``count``."""
+        if not self.business_days:
+            return self._raw_next(day)
+        if self.frequency == "daily":
+            candidate = self._raw_next(day)
+            while candidate is not None and not is_working_day(candidate):
+                candidate = self._raw_next(candidate + 1)
+            return candidate
+        # Moved occurrences come from raw ones up to _MAX_ROLL days earlier.
+        raw = self._raw_next(day - _MAX_ROLL)
+        while raw is not None:
+            moved = self._roll(raw)
+            if moved >= day:
+                return moved
+            raw = self._raw_next(raw + 1)
+        return None
+
+    @cached_property
+    def last(self) -> int | None:
+        """Last occurrence allowed by ``until``/``count`` (``None``: no end)."""
+        last = self.until
+        if self.count is None:
+            return last
+        if self.count <= 0:
+            return self.start - 1
+        occurrence = None
+        day = self.start
+        for _ in range(min(self.count, _MAX_COUNT)):
+            occurrence = self._next_unbounded(day)
+            if occurrence is None or (last is not None and occurrence > last):
+                return last
+            day = occurrence + 1
+        return occurrence if last is None else min(last, occurrence)
+
+    def next_occurrence(self, day: int) -> int | None:
+        """First occurrence on or after *day*, or ``None`` if there is none."""
+        occurrence = self._next_unbounded(day)
+        if occurrence is None or (self.last is not None and occurrence > self.last):
+            return None
+        return occurrence
+
+    def first(self) -> int | None:
+        return self.next_occurrence(self.start)
+
+    def occurs_on(self, day: int) -> bool:
+        return self.next_occurrence(day) == day
+
+    def occurrences(self, first_day: int, last_day: int) -> Iterator[int]:
+        """Occurrences within ``[first_day, last_day]``, in order."""
+        day = self.next_occurrence(first_day)
+        while day is not None and day <= last_day:
+            yield day
+            day = self.next_occurrence(day + 1)
+
+    def alert_state(self, today: int) -> tuple[bool, int | None]:
+        """(reminder fires on *today*, first later day on which that changes).
+
+        A one-time reminder keeps firing from its day on until it is removed;
+        a recurring one fires on each occurrence day.
+        """
+        if self.frequency == "once":
+            first = self.first()
+            if first is None:
+                return False, None
+            return (True, None) if today >= first else (False, first)
+        if self.occurs_on(today):
+            if self.frequency == "daily" and self.interval == 1 and not (
+                self.weekdays or self.business_days
+            ):
+                # Fires every day until the rule ends.
+                return True, (self.last + 1 if self.last is not None else None)
+            return True, today + 1
+        return False, self.next_occurrence(today + 1)
+
+
+# ----------------------------------------------------------------------
+# Dict ↔ rule
+# ----------------------------------------------------------------------
+
+_cache: dict[tuple[Any, ...], ReminderRule | None] = {}
+
+
+def _cache_key(rem: dict[str, Any]) -> tuple[Any, ...]:
+    return tuple(
+        sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in rem.items()
+            if key != "comment"
+        )
+    )
+
+
+def compile_reminder(rem: Any) -> ReminderRule | None:
+    """``ReminderRule`` for the reminder dict *rem*, or ``None`` if its start
+    date or frequency is invalid. Rules are cached by content."""
+    rem = normalize_reminder(rem)
+    try:
+        key = _cache_key(rem)
+        cached = _cache.get(key, ...)
+    except TypeError:   # unhashable values from a hand-edited file
+        key, cached = None, ...
+    if cached is not ...:
+        return cached
+
+    rule = None
+    start = day_number(rem.get("date"))
+    frequency = rem.get("frequency", "once")
+    if start is not None and frequency in FREQUENCIES:
+        try:
+            rule = ReminderRule(
+                start=start,
+                frequency=frequency,
+                interval=int(rem.get("interval", 1) or 1),
+                weekdays=tuple(int(d) for d in rem.get("weekdays", ()) if 1 <= int(d) <= 7),
+                month_days=tuple(
+                    int(d) for d in rem.get("month_days", ())
+                    if int(d) == LAST_DAY or 1 <= int(d) <= 31
+                ),
+                until=day_number(rem.get("until")),
+                count=int(rem["count"]) if rem.get("count") is not None else None,
+                business_days=bool(rem.get("business_days", False)),
+            )
+        except (TypeError, ValueError):
+            rule = None
+    if key is not None:
+        if len(_cache) > 4096:
+            _cache.clear()
+        _cache[key] = rule
+    return rule
+
+
+def describe_reminder(rem: Any) -> str:
+    """Short Spanish summary of the recurrence of *rem* for the UI."""
+    rem = normalize_reminder(rem)
+    frequency = rem.get("frequency", "once")
+    interval = int(rem.get("interval", 1) or 1)
+    if frequency in _UNIT_LABELS and interval > 1:
+        text = f"Cada {interval} {_UNIT_LABELS[frequency]}"
+    else:
+        text = _FREQ_LABELS.get(frequency, _FREQ_LABELS["once"])
+    weekdays = rem.get("weekdays") or ()
+    if frequency in ("daily", "weekly") and weekdays:
+        text += " (" + ", ".join(_WEEKDAY_LETTERS[d - 1] for d in sorted(weekdays)) + ")"
+    month_days = rem.get("month_days") or ()
+    if frequency == "monthly" and month_days:
+        days = ["último" if d == LAST_DAY else str(d) for d in month_days]
+        text += " (día " + ", ".join(days) + ")"
+    if rem.get("business_days"):
+        text += " · solo hábiles"
+    if rem.get("until"):
+        text += f" · hasta {rem['until']}"
+    if rem.get("count"):
+        text += f" · {rem['count']} veces"
+    return text
@@ -0,0 +1,304 @@
+"""spatial_index.py
+Índices espaciales compartidos por el Gantt y las vistas de calendario.
+
+- ``IntervalIndex``: árbol de intervalos (arreglo ordenado por inicio con un
+  árbol de segmentos de máximos) para consultas de punto y de rango en
+  O(log n + k).
+- ``TaskSpatialIndex``: arreglo fila → tarea con los rangos de fechas ya
+  convertidos a números de día, sincronizado de forma incremental con la
+  lista de tareas visible (dibujo y clics del Gantt).
+- ``RectGridIndex``: cubetas de una rejilla uniforme para resolver en O(1)
+  qué rectángulo dibujado (hito del calendario, día del año) está bajo el
+  cursor.
+
+Los días se representan como números de día juliano, compatibles con
+``QDate.toJulianDay()``, para no depender de Qt en este módulo.
+"""
+from __future__ import annotations
+
+import bisect
+from collections.abc import Hashable, Iterable, Sequence
+from datetime import date
+from functools import lru_cache
+from typing import Any
+
+# Diferencia entre date.toordinal() (1 = 01/01/0001) y el día juliano de Qt.
+_JULIAN_OFFSET = 1721425
+
+
+@lru_cache(maxsize=65536)
+def day_number(text: str | None) -> int | None:
+    """Convierte "dd/MM/yyyy" a número de día juliano, o ``None`` si no es válida.
+
+    El resultado se cachea: las mismas cadenas de fecha se repiten en cada
+    repintado y clic, así que solo se analizan una vez.
+    """
+    if not text:
+        return None
+    parts = text.strip().split("/")
+    if len(parts) != 3:
+        return None
+    try:
+        day, month, year = (int(p) for p in parts)
+        return date(year, month, day).toordinal() + _JULIAN_OFFSET
+    except ValueError:
+        return None
+
+
+def day_from_date(value: date) -> int:
+    """Número de día juliano de un ``datetime.date``."""
+    return value.toordinal() + _JULIAN_OFFSET
+
+
+def date_from_day(number: int) -> date:
+    """Inversa de ``day_from_date``."""
+    return date.fromordinal(number - _JULIAN_OFFSET)
+
+
+# ---------------------------------------------------------------------------
+# IntervalIndex
+# ---------------------------------------------------------------------------
+
+class IntervalIndex:
+    """Índice de intervalos cerrados ``[inicio, fin]`` identificados por clave.
+
+    Los intervalos se guardan ordenados por inicio junto a un árbol de
+    segmentos con el máximo fin de cada rango, lo que permite podar ramas
+    completas en las consultas. Cambiar solo el fin de un intervalo existente
+    se aplica en O(log n); insertar, eliminar o mover el inicio marca el
+    índice para reconstruirse (O(n log n)) en la siguiente consulta, de modo
+    que una ráfaga de ediciones cuesta una sola reconstrucción.
+    """
+
+    def __init__(self, items: Iterable[tuple[Hashable, int, int]] = ()) -> None:
+        self._spans: dict[Hashable, tuple[int, int]] = {}
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._keys: list[Hashable] = []
+        self._position: dict[Hashable, int] = {}
+        self._tree: list[int] = []
+        self._size = 0
+        self._dirty = False
+        for key, start, end in items:
+            self.set(key, start, end)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._spans
+
+    def span(self, key: Hashable) -> tuple[int, int] | None:
+        return self._spans.get(key)
+
+    # ------------------------------------------------------------------
+    # Mutación
+    # ------------------------------------------------------------------
+
+    def set(self, key: Hashable, start: int, end: int) -> None:
+        """Inserta o actualiza el intervalo de ``key``."""
+        if end < start:
+            start, end = end, start
+        previous = self._spans.get(key)
+        if previous == (start, end):
+            return
+        self._spans[key] = (start, end)
+        if (
+            previous is not None
+            and previous[0] == start
+            and not self._dirty
+            and key in self._position
+        ):
+            self._update_end(self._position[key], end)
+        else:
+            self._dirty = True
+
+    def discard(self, key: Hashable) -> None:
+        if self._spans.pop(key, None) is not None:
+            self._dirty = True
+
+    def clear(self) -> None:
+        self._spans.clear()
+        self._dirty = True
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def at(self, point: int) -> list[Hashable]:
+        """Claves cuyos intervalos contienen ``point``."""
+        return self.overlapping(point, point)
+
+    def overlapping(self, low: int, high: int) -> list[Hashable]:
+        """Claves cuyos intervalos se solapan con ``[low, high]``, por inicio."""
+        self._ensure_built()
+        if high < low or not self._keys:
+            return []
+        limit = bisect.bisect_right(self._starts, high)
+        found: list[int] = []
+        if limit:
+            self._collect(1, 0, self._size, limit, low, found)
+        return [self._keys[i] for i in found]
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _ensure_built(self) -> None:
+        if not self._dirty:
+            return
+        ordered = sorted(self._spans.items(), key=lambda item: item[1])
+        self._keys = [key for key, _span in ordered]
+        self._starts = [span[0] for _key, span in ordered]
+        self._ends = [span[1] for _key, span in ordered]
+        self._position = {key: i for i, key in enumerate(self._keys)}
+        size = 1
+        while size < len(self._keys):
+            size *= 2
+        self._size = size
+        tree = [-(1 << 62)] * (2 * size)
+        tree[size:size + len(self._ends)] = self._ends
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._tree = tree
+        self._dirty = False
+
+    def _update_end(self, position: int, end: int) -> None:
+        self._ends[position] = end
+        node = self._size + position
+        self._tree[node] = end
+        node //= 2
+        while node:
+            self._tree[node] = max(self._tree[2 * node], self._tree[2 * node + 1])
+            node //= 2
+
+    def _collect(
+        self, node: int, lo: int, hi: int, limit: int, low: int, found: list[int]
+    ) -> None:
+        # Nodo que cubre las posiciones [lo, hi); solo interesan las < limit
+        # (inicio <= high) y con fin >= low.
+        if lo >= limit or self._tree[node] < low:
+            return
+        if hi - lo == 1:
+            found.append(lo)
+            return
+        mid = (lo + hi) // 2
+        self._collect(2 * node, lo, mid, limit, low, found)
+        self._collect(2 * node + 1, mid, hi, limit, low, found)
+
+
+# ---------------------------------------------------------------------------
+# TaskSpatialIndex
+# ---------------------------------------------------------------------------
+
+class TaskSpatialIndex:
+    """Arreglo fila → tarea con rangos de fechas precalculados.
+
+    ``sync`` compara la lista recibida con la anterior y solo vuelve a
+    analizar las filas cuya tarea o cuyas cadenas de fecha cambiaron, así que
+    llamarlo tras cada edición cuesta O(n) comparaciones y solo convierte las
+    fechas de las filas cambiadas.
+    """
+
+    def __init__(self) -> None:
+        self.rows: list[Any] = []
+        self._dates: list[tuple[str, str] | None] = []
+        self._spans: list[tuple[int, int] | None] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def sync(self, tasks: Sequence[Any]) -> None:
+        """Sincroniza el índice con ``tasks`` (una tarea por fila visible)."""
+        old_len = len(self.rows)
+        new_len = len(tasks)
+        del self.rows[new_len:]
+        del self._dates[new_len:]
+        del self._spans[new_len:]
+        for row, task in enumerate(tasks):
+            if row >= old_len:
+                self.rows.append(task)
+                self._dates.append(None)
+                self._spans.append(None)
+            elif self.rows[row] is not task:
+                self.rows[row] = task
+            self._refresh_row(row)
+
+    def update_row(self, row: int) -> None:
+        """Vuelve a leer las fechas de la tarea de ``row`` (tras una edición)."""
+        if 0 <= row < len(self.rows):
+            self._refresh_row(row)
+
+    def _refresh_row(self, row: int) -> None:
+        task = self.rows[row]
+        dates = (task.start_date, task.end_date)
+        if self._dates[row] == dates:
+            return
+        self._dates[row] = dates
+        start = day_number(dates[0])
+        end = day_number(dates[1])
+        if start is None or end is None:
+            self._spans[row] = None
+            return
+        if end < start:
+            start, end = end, start
+        self._spans[row] = (start, end)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def span(self, row: int) -> tuple[int, int] | None:
+        """(inicio, fin) en días julianos de la fila, o ``None``."""
+        if 0 <= row < len(self._spans):
+            return self._spans[row]
+        return None
+
+
+# ---------------------------------------------------------------------------
+# RectGridIndex
+# ---------------------------------------------------------------------------
+
+class RectGridIndex:
+    """Cubetas de una rejilla uniforme para localizar rectángulos por punto.
+
+    Admite cualquier rectángulo con ``left()/top()/right()/bottom()`` y
+    ``contains(point)`` (``QRect``/``QRectF``). Cada rectángulo se registra en
+    las celdas de la rejilla que toca, de modo que una consulta solo revisa
+    los pocos elementos de una celda.
+    """
+
+    def __init__(self, cell_size: float = 32.0) -> None:
+        self.cell_size = float(cell_size)
+        self._buckets: dict[tuple[int, int], list[tuple[Any, Any]]] = {}
+        self._items: list[tuple[Any, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._items.clear()
+
+    def insert(self, rect: Any, payload: Any) -> None:
+        entry = (rect, payload)
+        self._items.append(entry)
+        size = self.cell_size
+        for gx in range(int(rect.left() // size), int(rect.right() // size) + 1):
+            for gy in range(int(rect.top() // size), int(rect.bottom() // size) + 1):
+                self._buckets.setdefault((gx, gy), []).append(entry)
+
+    def at(self, point: Any) -> Any | None:
+        """Payload del primer rectángulo (en orden de inserción) que contiene ``point``."""
+        bucket = self._buckets.get(
+            (int(point.x() // self.cell_size), int(point.y() // self.cell_size))
+        )
+        if not bucket:
+            return None
+        for rect, payload in bucket:
+            if rect.contains(point):
+                return payload
+        return None
@@ -0,0 +1,241 @@
+"""task_filter.py
+Motor de filtrado de tareas para la tabla y el diagrama de Gantt.
+
+- ``TaskFilter``: criterios inmutables (texto, ventana de fechas, colores y
+  estados de alerta). Un filtro vacío no oculta nada.
+- ``TaskFilterIndex``: índices precalculados sobre la lista de tareas para
+  resolver un filtro sin recorrer ni normalizar cadenas en cada pulsación:
+
+  * nombre y notas ya normalizados (``normalize_string``) por tarea;
+  * índice invertido de trigramas → tareas, para reducir la búsqueda de
+    subcadenas a la intersección de unos pocos conjuntos; los términos de
+    una o dos letras se buscan con ``str.find`` sobre el texto de todas las
+    tareas concatenado (reconstruido solo cuando cambia el índice);
+  * ``IntervalIndex`` con los rangos de fechas como números de día;
+  * conjuntos por color y por tipo de alerta.
+
+El índice se sincroniza de forma incremental: cada tarea guarda una firma de
+los campos indexados y solo se reindexa cuando esta cambia. Las tareas se
+identifican por ``id(task)``, igual que en ``DateRangeTracker``.
+"""
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from core.spatial_index import IntervalIndex, day_number
+from utils.filter_util import normalize_string
+
+# Longitud de los n-gramas del índice invertido. Los términos más cortos se
+# resuelven sobre el texto concatenado.
+_GRAM = 3
+# Separador entre tareas en el texto concatenado; nunca aparece en un término.
+_SEP = "\x00"
+
+
+def _grams(text: str) -> set[str]:
+    return {text[i : i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+@dataclass(frozen=True)
+class TaskFilter:
+    """Criterios de filtrado; todos los criterios presentes deben cumplirse.
+
+    ``start``/``end`` son números de día juliano (``day_number``) y definen
+    una ventana cerrada; basta con que la tarea se solape con ella. ``colors``
+    contiene nombres ``QColor.name()`` ("#rrggbb") y ``alert_kinds`` tipos de
+    ``AlertEntry.kind``.
+    """
+
+    text: str = ""
+    start: int | None = None
+    end: int | None = None
+    colors: frozenset[str] = frozenset()
+    alert_kinds: frozenset[str] = frozenset()
+
+    def terms(self) -> list[str]:
+        """Términos de búsqueda normalizados, sin repetidos."""
+        return list(dict.fromkeys(normalize_string(self.text).split()))
+
+    def is_empty(self) -> bool:
+        return (
+            not self.terms()
+            and self.start is None
+            and self.end is None
+            and not self.colors
+            and not self.alert_kinds
+        )
+
+
+@dataclass
+class _Entry:
+    signature: tuple[Any, ...]
+    text: str
+    color: str
+
+
+class TaskFilterIndex:
+    """Índices de búsqueda sobre una lista de tareas (ver docstring del módulo)."""
+
+    def __init__(self) -> None:
+        self._entries: dict[int, _Entry] = {}
+        self._grams: dict[str, set[int]] = {}
+        self._dates = IntervalIndex()
+        self._by_color: dict[str, set[int]] = {}
+        self._alerts: dict[str, set[int]] = {}
+        # Texto concatenado para términos cortos (ver ``_short_term_ids``)
+        self._blob: str | None = None
+        self._blob_starts: list[int] = []
+        self._blob_keys: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # Sincronización
+    # ------------------------------------------------------------------
+
+    def sync(self, tasks: Sequence[Any]) -> None:
+        """Alinea el índice con ``tasks``; solo reindexa las tareas cambiadas."""
+        alive = set()
+        for task in tasks:
+            alive.add(id(task))
+            self.update(task)
+        for key in [k for k in self._entries if k not in alive]:
+            self._remove(key)
+
+    def update(self, task: Any) -> None:
+        """Reindexa ``task`` si cambió alguno de sus campos indexados."""
+        key = id(task)
+        color = task.color.name() if task.color is not None else ""
+        signature = (task.name, task.notes, task.start_date, task.end_date, color)
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            return
+        if entry is not None:
+            self._remove(key)
+
+        text = normalize_string(task.name)
+        if task.notes:
+            text += "\n" + normalize_string(task.notes)
+        self._entries[key] = _Entry(signature, text, color)
+        self._blob = None
+        for gram in _grams(text):
+            self._grams.setdefault(gram, set()).add(key)
+        self._by_color.setdefault(color, set()).add(key)
+
+        start = day_number(task.start_date)
+        end = day_number(task.end_date)
+        if start is not None and end is not None:
+            self._dates.set(key, min(start, end), max(start, end))
+
+    def set_alerts(self, entries: Iterable[Any]) -> None:
+        """Reemplaza el estado de alertas con objetos ``AlertEntry``."""
+        self._alerts = {}
+        for entry in entries:
+            self._alerts.setdefault(entry.kind, set()).add(id(entry.task))
+
+    def _remove(self, key: int) -> None:
+        entry = self._entries.pop(key)
+        self._blob = None
+        for gram in _grams(entry.text):
+            bucket = self._grams.get(gram)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._grams[gram]
+        bucket = self._by_color.get(entry.color)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._by_color[entry.color]
+        self._dates.discard(key)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def matching_ids(self, task_filter: TaskFilter) -> set[int]:
+        """Devuelve los ``id(task)`` indexados que cumplen ``task_filter``.
+
+        Los criterios se aplican del más selectivo al menos selectivo: los
+        conjuntos precalculados (color, alertas, fechas, trigramas) acotan los
+        candidatos y la comprobación de subcadena solo se hace sobre ellos.
+        """
+        candidates: set[int] | None = None
+
+        def narrow(ids: Iterable[int]) -> None:
+            nonlocal candidates
+            candidates = set(ids) if candidates is None else candidates.intersection(ids)
+
+        if task_filter.colors:
+            narrow(k for c in task_filter.colors for k in self._by_color.get(c, ()))
+        if task_filter.alert_kinds:
+            narrow(k for a in task_filter.alert_kinds for k in self._alerts.get(a, ()))
+        if task_filter.start is not None or task_filter.end is not None:
+            low = task_filter.start if task_filter.start is not None else -(1 << 62)
+            high = task_filter.end if task_filter.end is not None else 1 << 62
+            narrow(self._dates.overlapping(low, high))
+
+        terms = task_filter.terms()
+        unverified: list[str] = []
+        for term in terms:
+            if len(term) < _GRAM:
+                narrow(self._short_term_ids(term))
+            else:
+                # Intersección de las listas de trigramas, empezando por la
+                # menor. Un término de exactamente un trigrama queda resuelto;
+                # los más largos pueden dar falsos positivos y se verifican.
+                postings = sorted(
+                    (self._grams.get(g, set()) for g in _grams(term)), key=len
+                )
+                for posting in postings:
+                    narrow(posting)
+                    if not candidates:
+                        return set()
+                if len(term) > _GRAM:
+                    unverified.append(term)
+            if not candidates:
+                return set()
+
+        if candidates is None:
+            candidates = set(self._entries)
+        if unverified:
+            entries = self._entries
+            candidates = {
+                k for k in candidates
+                if all(t in entries[k].text for t in unverified)
+            }
+        return candidates
+
+    def _short_term_ids(self, term: str) -> set[int]:
+        """Tareas cuyo texto contiene ``term`` (de menos de ``_GRAM`` letras).
+
+        Busca con ``str.find`` sobre el texto concatenado de todas las tareas
+        y, en cada coincidencia, salta al inicio de la tarea siguiente: el
+        coste es proporcional al número de tareas que coinciden.
+        """
+        if self._blob is None:
+            parts: list[str] = []
+            self._blob_starts = []
+            self._blob_keys = []
+            offset = 0
+            for key, entry in self._entries.items():
+                self._blob_starts.append(offset)
+                self._blob_keys.append(key)
+                parts.append(entry.text)
+                offset += len(entry.text) + len(_SEP)
+            self._blob = _SEP.join(parts)
+
+        blob, starts, keys = self._blob, self._blob_starts, self._blob_keys
+        found: set[int] = set()
+        pos = blob.find(term)
+        while pos != -1:
+            slot = bisect.bisect_right(starts, pos) - 1
+            found.add(keys[slot])
+            if slot + 1 >= len(starts):
+                break
+            pos = blob.find(term, starts[slot + 1])
+        return found
@@ -0,0 +1,136 @@
+"""work_calendar.py
+Clasificación precalculada de días (hábil / fin de semana / festivo) para el
+calendario laboral de Colombia.
+
+``workalendar`` resuelve cada consulta recorriendo la lista de festivos del
+año; aquí se construye una sola vez por año una tabla con el tipo de cada
+día, los nombres de los festivos y la suma acumulada de días hábiles. Con
+ella las vistas de calendario sombrean cada celda con una indexación, y el
+conteo de días hábiles entre dos fechas (o la fecha final tras N días
+hábiles) cuesta O(años abarcados) en vez de un recorrido día a día.
+
+Las tablas viven en una caché acotada (``year_table``). Los días se
+representan como números de día juliano (``core.spatial_index``).
+"""
+from __future__ import annotations
+
+import bisect
+from datetime import date
+from functools import lru_cache
+
+from workalendar.america import Colombia
+
+from core.spatial_index import date_from_day, day_from_date
+
+WORKING = 0
+WEEKEND = 1
+HOLIDAY = 2
+
+_CALENDAR = Colombia()
+
+
+class YearTable:
+    """Tabla de un año: tipo de cada día, festivos y hábiles acumulados."""
+
+    __slots__ = ("year", "first_day", "kinds", "working_before", "labels")
+
+    def __init__(self, year: int) -> None:
+        self.year = year
+        self.first_day = day_from_date(date(year, 1, 1))
+        length = day_from_date(date(year + 1, 1, 1)) - self.first_day
+        self.labels: dict[int, str] = {}
+        for day, label in _CALENDAR.holidays(year):
+            self.labels[day_from_date(day)] = label
+
+        kinds = bytearray(length)
+        # working_before[i] = días hábiles en los primeros i días del año
+        working_before = [0] * (length + 1)
+        count = 0
+        for offset in range(length):
+            day = self.first_day + offset
+            if day in self.labels:
+                kinds[offset] = HOLIDAY
+            elif date_from_day(day).isoweekday() >= 6:
+                kinds[offset] = WEEKEND
+            else:
+                count += 1
+            working_before[offset + 1] = count
+        self.kinds = bytes(kinds)
+        self.working_before = working_before
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+
+@lru_cache(maxsize=32)
+def year_table(year: int) -> YearTable:
+    """Tabla del año ``year``; se conservan las 32 más recientes."""
+    return YearTable(year)
+
+
+_last_table: YearTable | None = None
+
+
+def _table_for(day: int) -> YearTable:
+    # Las consultas llegan en ráfagas del mismo año (una rejilla, un arrastre):
+    # recordar la última tabla evita convertir el día a fecha en cada llamada.
+    global _last_table
+    table = _last_table
+    if table is None or not (table.first_day <= day < table.first_day + len(table)):
+        table = year_table(date_from_day(day).year)
+        _last_table = table
+    return table
+
+
+def day_kind(day: int) -> int:
+    """``WORKING``, ``WEEKEND`` o ``HOLIDAY`` para el día juliano ``day``."""
+    table = _table_for(day)
+    return table.kinds[day - table.first_day]
+
+
+def is_working_day(day: int) -> bool:
+    return day_kind(day) == WORKING
+
+
+def holiday_label(day: int) -> str | None:
+    """Nombre del festivo del día ``day``, o ``None`` si no es festivo."""
+    return _table_for(day).labels.get(day)
+
+
+def holidays_in_year(year: int) -> list[tuple[date, str]]:
+    """Festivos del año como ``(fecha, nombre)``, igual que ``workalendar``."""
+    labels = year_table(year).labels
+    return [(date_from_day(day), labels[day]) for day in sorted(labels)]
+
+
+def working_days_between(first_day: int, last_day: int) -> int:
+    """Días hábiles en el intervalo cerrado ``[first_day, last_day]``."""
+    total = 0
+    day = first_day
+    while day <= last_day:
+        table = _table_for(day)
+        start = day - table.first_day
+        stop = min(last_day - table.first_day + 1, len(table))
+        total += table.working_before[stop] - table.working_before[start]
+        day = table.first_day + stop
+    return total
+
+
+def end_after_working_days(first_day: int, working_days: int) -> int:
+    """Último día de un tramo que empieza en ``first_day`` y contiene
+    ``working_days`` días hábiles. Con 0 o menos devuelve ``first_day``."""
+    if working_days <= 0:
+        return first_day
+    day = first_day
+    remaining = working_days
+    while True:
+        table = _table_for(day)
+        offset = day - table.first_day
+        cumulative = table.working_before
+        target = cumulative[offset] + remaining
+        if target <= cumulative[-1]:
+            # Menor j con cumulative[j] >= target: el día j-1 completa el tramo.
+            j = bisect.bisect_left(cumulative, target, offset + 1)
+            return table.first_day + j - 1
+        remaining = target - cumulative[-1]
+        day = table.first_day + len(table)
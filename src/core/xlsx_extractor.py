@@ -1,20 +1,83 @@
 """xlsx_extractor.py
 Extracts task data from Excel project files (.xlsx, .xls).
+
+Two engines produce the same tasks: pandas reads the whole sheet into a
+DataFrame, and the streaming engine reads it row by row with openpyxl in
+read-only mode, processing bounded blocks of rows. Files larger than
+``STREAMING_MIN_BYTES`` use the streaming engine, which also serves as the
+restriction check (the workbook is opened only once).
 """
 from __future__ import annotations
 
+import itertools
 import logging
-import re
+import os
 import unicodedata
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+import openpyxl
 import pandas as pd
 
+from core.xlsx_security_checker import XLSXRestrictedError, xlsx_restriction_message
 from utils.filter_util import is_start_end_task
 
 logger = logging.getLogger("bpm.xlsx_extractor")
 
+# Filas por lote entregado a la ventana de importación
+BATCH_SIZE = 200
+# Desde este tamaño de archivo se lee la hoja en streaming (openpyxl)
+STREAMING_MIN_BYTES = 4 * 1024 * 1024
+# Filas de la hoja procesadas juntas por el motor en streaming
+STREAM_CHUNK_ROWS = 5000
+
+# Formatos de fecha en texto, en orden de prueba
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y")
+_EXCEL_EPOCH = pd.Timestamp(1899, 12, 30)
+# Números de serie representables como pd.Timestamp
+_MIN_SERIAL = (pd.Timestamp.min.date() - _EXCEL_EPOCH.date()).days + 1
+_MAX_SERIAL = (pd.Timestamp.max.date() - _EXCEL_EPOCH.date()).days
+# Tipos de celda tratados como número de serie, fecha o texto
+_NUMBER_TYPES = np.array([int, float, np.int64, np.float64], dtype=object)
+_DATETIME_TYPES = np.array([datetime, pd.Timestamp], dtype=object)
+_TEXT_TYPES = np.array([str], dtype=object)
+
+
+def _column_labels(header: pd.Series) -> list[Any]:
+    """Nombres de columna como los pone ``pd.read_excel(header=...)``:
+    "Unnamed: i" para celdas vacías y sufijos ".1", ".2"… en duplicados."""
+    labels: list[Any] = []
+    seen: dict[Any, int] = {}
+    for position, value in enumerate(header):
+        label = f"Unnamed: {position}" if pd.isna(value) else value
+        if label in seen:
+            seen[label] += 1
+            label = f"{label}.{seen[label]}"
+        seen.setdefault(label, 0)
+        labels.append(label)
+    return labels
+
+
+def _cells(row: tuple[Any, ...]) -> pd.Series:
+    """Fila de openpyxl con las celdas vacías como NaN, igual que en pandas."""
+    return pd.Series([np.nan if value is None else value for value in row], dtype=object)
+
+
+def _restore_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Da a las columnas el tipo que pandas les asigna al leer con
+    ``header=``: fechas, y números también cuando vienen como texto ("1.2")."""
+    df = df.infer_objects()
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+            try:
+                df[col] = pd.to_numeric(values)
+            except (ValueError, TypeError):
+                pass
+    return df
+
 
 class XLSXReader:
     def __init__(self) -> None:
@@ -128,103 +191,252 @@ class XLSXReader:
             logger.debug("Unexpected error formatting date '%s': %s", date_value, err)
             return str(date_value)
 
-    def compare_dates(self, date1: str, date2: str) -> bool:
-        """Compara dos fechas en formato string dd/mm/yyyy."""
-        if not date1 or not date2:
-            return False
-        try:
-            return (
-                datetime.strptime(date1, "%d/%m/%Y")
-                == datetime.strptime(date2, "%d/%m/%Y")
-            )
-        except ValueError as err:
-            logger.debug(
-                "Date comparison failed '%s' vs '%s': %s", date1, date2, err
-            )
-            return False
-
-    def determine_outline_level(
-        self, row: pd.Series, columns: dict[str, str], text: str
-    ) -> int:
-        """Determina el nivel jerárquico de una tarea."""
-        if "level" in columns:
-            try:
-                level_value = row[columns["level"]]
-                if not pd.isna(level_value):
-                    if isinstance(level_value, (int, float)):
-                        return int(level_value)
-                    if isinstance(level_value, str):
-                        level_str = re.sub(r"[^\d]", "", level_value)
-                        if level_str:
-                            return int(level_str)
-            except (ValueError, TypeError) as err:
-                logger.debug("Could not parse level column value: %s", err)
-
-        leading_spaces = len(text) - len(text.lstrip())
-        return leading_spaces // 2 if leading_spaces > 0 else 0
-
     def read_xlsx(self, file_path: str) -> list[dict[str, Any]]:
         """Lee un archivo Excel y extrae las tareas."""
+        return [task for batch in self.iter_xlsx(file_path) for task in batch]
+
+    @staticmethod
+    def engine_for(file_path: str) -> str:
+        """Motor de lectura según el tamaño del archivo: "stream" o "pandas"."""
         try:
-            df_head = pd.read_excel(file_path, nrows=2, header=None)
-            first_row_is_header = self._is_header_row(df_head.iloc[0])
-            header_row = 0 if first_row_is_header else 1
-            df = pd.read_excel(file_path, header=header_row)
+            large = os.path.getsize(file_path) >= STREAMING_MIN_BYTES
+        except OSError:
+            large = False
+        return "stream" if large else "pandas"
+
+    def iter_xlsx(
+        self, file_path: str, batch_size: int = BATCH_SIZE, engine: str | None = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Tareas del archivo por lotes de hasta ``batch_size``, en orden.
 
+        *engine* es "pandas", "stream" o ``None`` para elegirlo por tamaño
+        (``engine_for``). Si el archivo no se puede leer se registra el error
+        y no se produce ningún lote (mismo resultado que una lista vacía en
+        ``read_xlsx``).
+        """
+        if (engine or self.engine_for(file_path)) == "stream":
+            try:
+                yield from self.stream_xlsx(file_path, batch_size)
+            except Exception as err:
+                logger.error(
+                    "Failed to read xlsx file '%s': %s", file_path, err, exc_info=True
+                )
+            return
+        try:
+            df = self._read_sheet(file_path)
             columns = self.identify_columns(df)
             if not columns:
                 raise ValueError("No se pudieron identificar las columnas necesarias")
+        except Exception as err:
+            logger.error(
+                "Failed to read xlsx file '%s': %s", file_path, err, exc_info=True
+            )
+            return
+        if "name" not in columns:
+            return
 
-            tasks: list[dict[str, Any]] = []
-            for idx, row in df.iterrows():
-                try:
-                    if "name" not in columns:
-                        continue
+        tasks = self.frame_tasks(df, columns)
+        for first in range(0, len(tasks), batch_size):
+            yield tasks[first:first + batch_size]
 
-                    task_name = str(row[columns["name"]]).strip()
-                    if pd.isna(task_name) or not task_name:
-                        continue
+    def _read_sheet(self, file_path: str) -> pd.DataFrame:
+        """Lee la hoja una sola vez y usa como encabezado la primera fila, o
+        la segunda si la primera no lo parece (p. ej. un título)."""
+        raw = pd.read_excel(file_path, header=None)
+        header_row = 0 if self._is_header_row(raw.iloc[0]) else 1
+        # Las filas vacías no son tareas ni deben volver decimales los IDs
+        df = raw.iloc[header_row + 1:].dropna(how="all").reset_index(drop=True)
+        df.columns = _column_labels(raw.iloc[header_row])
+        return _restore_types(df)
 
-                    start_date = ""
-                    end_date = ""
-                    if "start_date" in columns:
-                        start_date = self.format_date(row[columns["start_date"]])
-                    if "end_date" in columns:
-                        end_date = self.format_date(row[columns["end_date"]])
+    def stream_xlsx(
+        self, file_path: str, batch_size: int = BATCH_SIZE
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Tareas del archivo leyendo la primera hoja fila a fila.
 
-                    if is_start_end_task(task_name) or self.compare_dates(
-                        start_date, end_date
-                    ):
-                        continue
+        Usa openpyxl en modo de solo lectura y procesa bloques de
+        ``STREAM_CHUNK_ROWS`` filas con ``frame_tasks``, así que la memoria no
+        crece con el tamaño de la hoja. Abrir el libro es a la vez la
+        verificación de restricciones: si falla se lanza
+        ``XLSXRestrictedError`` con el mensaje de ``check_xlsx_restrictions``.
+        El tipo de cada columna se deduce por bloque, no sobre la hoja entera.
+        """
+        try:
+            wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        except Exception as err:
+            raise XLSXRestrictedError(xlsx_restriction_message(err)) from err
+        try:
+            rows = (
+                row for row in wb.worksheets[0].iter_rows(values_only=True)
+                if any(value is not None for value in row)
+            )
+            head = list(itertools.islice(rows, 2))
+            if not head:
+                return
+            if self._is_header_row(_cells(head[0])):
+                header, data = head[0], itertools.chain(head[1:], rows)
+            elif len(head) == 2:
+                header, data = head[1], rows
+            else:
+                return
+            labels = _column_labels(_cells(header))
+            width = len(labels)
 
-                    outline_level = self.determine_outline_level(row, columns, task_name)
+            columns: dict[str, str] | None = None
+            normalized: list[str] = []
+            pending: list[dict[str, Any]] = []
+            while chunk := list(itertools.islice(data, STREAM_CHUNK_ROWS)):
+                df = _restore_types(pd.DataFrame(
+                    [row[:width] + (None,) * (width - len(row)) for row in chunk],
+                    columns=labels,
+                ))
+                if columns is None:
+                    columns = self.identify_columns(df)
+                    if "name" not in columns:
+                        return
+                    normalized = list(df.columns)
+                else:
+                    df.columns = normalized
+                pending.extend(self.frame_tasks(df, columns))
+                while len(pending) >= batch_size:
+                    yield pending[:batch_size]
+                    del pending[:batch_size]
+            if pending:
+                yield pending
+        finally:
+            wb.close()
 
-                    task_id = ""
-                    if "task_id" in columns and not pd.isna(row[columns["task_id"]]):
-                        task_id = str(row[columns["task_id"]])
+    def frame_tasks(self, df: pd.DataFrame, columns: dict[str, str]) -> list[dict[str, Any]]:
+        """Tareas importables de *df* (columnas ya identificadas).
 
-                    task: dict[str, Any] = {
-                        "task_id": task_id,
-                        "name": task_name,
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "level": str(outline_level),
-                        "outline_level": outline_level,
-                        "indentation": outline_level,
-                    }
-                    tasks.append(task)
+        Fechas, niveles y filtros se calculan por columna; los diccionarios
+        solo se construyen para las filas que se conservan.
+        """
+        names = df[columns["name"]]
+        name_text = names.astype(str).str.strip()
+        keep = (names.notna() & (name_text != "")).to_numpy(copy=True)
 
-                except Exception as err:
-                    logger.debug("Skipping row %s due to error: %s", idx, err)
-                    continue
+        rows = len(df)
+        start = end = np.full(rows, "", dtype=object)
+        start_ok = end_ok = np.zeros(rows, dtype=bool)
+        if "start_date" in columns:
+            start, start_ok = self.format_date_column(df[columns["start_date"]])
+        if "end_date" in columns:
+            end, end_ok = self.format_date_column(df[columns["end_date"]])
+        # Hitos: misma fecha válida de inicio y fin
+        keep &= ~(start_ok & end_ok & (start == end))
 
-            return tasks
+        candidates = np.flatnonzero(keep)
+        start_end = np.fromiter(
+            (is_start_end_task(name) for name in name_text.to_numpy()[candidates]),
+            dtype=bool, count=len(candidates),
+        )
+        keep[candidates[start_end]] = False
 
-        except Exception as err:
-            logger.error(
-                "Failed to read xlsx file '%s': %s", file_path, err, exc_info=True
+        levels = (
+            self.outline_level_column(df[columns["level"]])
+            if "level" in columns else np.zeros(rows, dtype=np.int64)
+        )
+        if "task_id" in columns:
+            ids = df[columns["task_id"]]
+            task_ids = np.where(ids.notna(), ids.astype(str), "")
+        else:
+            task_ids = np.full(rows, "", dtype=object)
+
+        selected = np.flatnonzero(keep)
+        return [
+            {
+                "task_id": task_id,
+                "name": name,
+                "start_date": start_date,
+                "end_date": end_date,
+                "level": str(level),
+                "outline_level": level,
+                "indentation": level,
+            }
+            for task_id, name, start_date, end_date, level in zip(
+                task_ids[selected].tolist(),
+                name_text.to_numpy()[selected].tolist(),
+                start[selected].tolist(),
+                end[selected].tolist(),
+                levels[selected].tolist(),
+                strict=True,
             )
-            return []
+        ]
+
+    def format_date_column(self, values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+        """Versión por columna de ``format_date``.
+
+        Devuelve los textos y una máscara de las celdas que se convirtieron
+        a dd/mm/yyyy (las demás conservan su texto, o "" si están vacías).
+        """
+        rows = len(values)
+        text = np.full(rows, "", dtype=object)
+        converted = np.zeros(rows, dtype=bool)
+
+        def put(mask: np.ndarray, dates: pd.Series) -> None:
+            valid = dates.notna().to_numpy()
+            positions = np.flatnonzero(mask)[valid]
+            # Un cronograma repite pocas fechas: se formatea cada día una vez
+            codes, days = pd.factorize(dates[valid].dt.normalize())
+            text[positions] = days.strftime("%d/%m/%Y").to_numpy(dtype=object)[codes]
+            converted[positions] = True
+
+        present = values.notna().to_numpy()
+        if pd.api.types.is_datetime64_any_dtype(values):
+            put(present, values[present])
+            return text, converted
+        if pd.api.types.is_bool_dtype(values):
+            values = values.astype(object)
+
+        kinds = values.map(type).to_numpy()
+        is_number = present & np.isin(kinds, _NUMBER_TYPES)
+        is_datetime = present & np.isin(kinds, _DATETIME_TYPES)
+        is_text = present & np.isin(kinds, _TEXT_TYPES)
+
+        if is_number.any():
+            # Número de serie de Excel (días desde el 30/12/1899)
+            days = np.trunc(pd.to_numeric(values[is_number]).to_numpy(dtype=float))
+            in_range = (days >= _MIN_SERIAL) & (days <= _MAX_SERIAL)
+            is_number[is_number] = in_range
+            put(is_number, _EXCEL_EPOCH + pd.to_timedelta(pd.Series(days[in_range]), unit="D"))
+        if is_datetime.any():
+            put(is_datetime, pd.to_datetime(values[is_datetime], errors="coerce"))
+        if is_text.any():
+            strings = values[is_text].str.strip()
+            text[is_text] = strings.to_numpy()
+            pending = is_text.copy()
+            for fmt in _DATE_FORMATS:
+                if not pending.any():
+                    break
+                dates = pd.to_datetime(values[pending].str.strip(), format=fmt, errors="coerce")
+                put(pending, dates)
+                pending &= ~converted
+
+        leftover = present & ~converted & ~is_text
+        text[leftover] = values[leftover].astype(str).to_numpy()
+        return text, converted
+
+    def outline_level_column(self, values: pd.Series) -> np.ndarray:
+        """Nivel jerárquico por fila a partir de la columna de nivel: el
+        número, o los dígitos de un texto como "1.2" (0 si no hay)."""
+        levels = np.zeros(len(values), dtype=np.int64)
+        if pd.api.types.is_bool_dtype(values) or not (
+            pd.api.types.is_numeric_dtype(values) or pd.api.types.is_object_dtype(values)
+        ):
+            return levels
+        kinds = values.map(type).to_numpy()
+        numbers = pd.to_numeric(
+            values.where(np.isin(kinds, _NUMBER_TYPES)), errors="coerce"
+        ).to_numpy(dtype=float)
+        finite = np.isfinite(numbers)
+        levels[finite] = np.trunc(numbers[finite]).astype(np.int64)
+
+        is_text = np.isin(kinds, _TEXT_TYPES)
+        if is_text.any():
+            digits = values[is_text].str.replace(r"[^\d]", "", regex=True)
+            levels[is_text] = [int(d) if d else 0 for d in digits]
+        return levels
 
     def _is_header_row(self, row: pd.Series) -> bool:
         """Verifica si una fila parece un encabezado de columna."""
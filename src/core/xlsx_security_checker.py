@@ -4,21 +4,31 @@ import openpyxl
 from openpyxl.utils.exceptions import InvalidFileException
 
 
+class XLSXRestrictedError(Exception):
+    """El libro no se pudo abrir: protegido con contraseña, dañado o no es XLSX.
+
+    El mensaje es el mismo que devuelve ``check_xlsx_restrictions``.
+    """
+
+
+def xlsx_restriction_message(error):
+    """Mensaje para el usuario según el error al abrir el libro con openpyxl."""
+    if isinstance(error, InvalidFileException):
+        return f"Error al abrir el XLSX: {error}"
+    if isinstance(error, KeyError):
+        if 'workbook.xml' in str(error):
+            return "El XLSX está protegido o el archivo no es válido."
+        return f"Error al abrir el XLSX: {error}"
+    if 'File is not a zip file' in str(error):
+        return "El archivo no es un XLSX válido, está protegido con contraseña o está dañado."
+    return f"Error al abrir el XLSX: {error}"
+
+
 def check_xlsx_restrictions(file_path):
     """Verifica si el XLSX tiene contraseña o restricciones de lectura."""
     try:
         wb = openpyxl.load_workbook(file_path, read_only=False)
         wb.close()
         return None  # Sin restricciones
-    except InvalidFileException as e:
-        return f"Error al abrir el XLSX: {e}"
-    except KeyError as e:
-        if 'workbook.xml' in str(e):
-            return "El XLSX está protegido o el archivo no es válido."
-        else:
-            return f"Error al abrir el XLSX: {e}"
     except Exception as e:
-        if 'File is not a zip file' in str(e):
-            return "El archivo no es un XLSX válido, está protegido con contraseña o está dañado."
-        else:
-            return f"Error al abrir el XLSX: {e}"
+        return xlsx_restriction_message(e)
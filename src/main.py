@@ -2,6 +2,7 @@
 """
 Baby Project Manager - Main Entry Point
 """
+import multiprocessing
 import os
 import sys
 
@@ -26,4 +27,6 @@ def main():
     return app.exec()
 
 if __name__ == "__main__":
+    # Frozen builds: let the worker processes of the importers start here.
+    multiprocessing.freeze_support()
     sys.exit(main())
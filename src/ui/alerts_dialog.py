@@ -8,10 +8,13 @@ Design rules (anti-saturation):
  - Each row has a Snooze drop-down (1d / 3d / 7d) and a Silence button.
  - "Dismiss" closes without recording anything (dialog may reappear tomorrow).
  - "Don't show today" calls mark_shown_today() so it won't reopen same day.
+ - Alerts from other projects (portfolio view) show the project file name
+   and cannot be snoozed here: the task lives in a file that is not open.
 """
 from __future__ import annotations
 
 import logging
+import os
 from typing import TYPE_CHECKING
 
 from PySide6.QtCore import Qt
@@ -88,6 +91,9 @@ class _AlertRow(QWidget):
         name_text = f"<b>{task.name}</b>"
         if self._entry.kind == "extra_reminder" and self._entry.reminder_comment:
             name_text += f"<br><span style='color:#666; font-size:11px;'>{self._entry.reminder_comment}</span>"
+        if self._entry.project:
+            project_name = os.path.splitext(os.path.basename(self._entry.project))[0]
+            name_text += f"<br><span style='color:#888; font-size:10px;'>📁 {project_name}</span>"
 
         name_label = QLabel(name_text)
         name_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
@@ -106,6 +112,9 @@ class _AlertRow(QWidget):
         if self._entry.kind == "overdue":
             self._snooze_combo.setEnabled(False)
             self._snooze_combo.setToolTip("No disponible para tareas vencidas")
+        elif self._entry.project:
+            self._snooze_combo.setEnabled(False)
+            self._snooze_combo.setToolTip("Abra el proyecto para posponer o silenciar")
 
         layout.addWidget(name_label)
         layout.addWidget(badge_label)
@@ -134,10 +143,12 @@ class AlertsDialog(QDialog):
         alerts: list[AlertEntry],
         alert_manager: AlertManager,
         parent: QWidget | None = None,
+        title: str = "Recordatorios del proyecto",
     ) -> None:
         super().__init__(parent)
         self._alerts = alerts
         self._manager = alert_manager
+        self._title = title
         self._build_ui()
 
     # ------------------------------------------------------------------
@@ -148,7 +159,7 @@ class AlertsDialog(QDialog):
         from PySide6.QtCore import QDate
 
         today_str = QDate.currentDate().toString("dd/MM/yyyy")
-        self.setWindowTitle("Recordatorios del proyecto")
+        self.setWindowTitle(self._title)
         self.setMinimumWidth(520)
         self.setWindowFlags(
             self.windowFlags() | Qt.WindowType.WindowStaysOnTopHint
@@ -0,0 +1,237 @@
+import bisect
+import logging
+
+#calendar_agenda.py
+#Vista de agenda del calendario: lista cronológica de todos los hitos
+#(inicio/fin de tarea). El modelo recorre los días con hitos del índice
+#compartido (MilestoneIndex) y solo materializa filas a medida que la lista
+#se desplaza (canFetchMore/fetchMore), así que abrir la agenda o saltar a
+#una fecha no depende del tamaño del proyecto.
+#
+from PySide6.QtCore import QAbstractListModel, QDate, QModelIndex, QPoint, Qt, Signal
+from PySide6.QtGui import QColor, QFont
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+from core.milestone_index import MilestoneIndex
+
+logger = logging.getLogger("bpm.calendar")
+
+
+def milestone_entry_text(task, date, kind):
+    etiqueta = "Inicio" if kind == "start" else "Fin"
+    return f"{date.toString('dd/MM/yyyy')} · {etiqueta} · {task.name.strip()}"
+
+
+class MilestoneListModel(QAbstractListModel):
+    """Hitos ordenados por fecha (y, dentro de un día, por orden de tarea).
+
+    ``set_milestones`` fija el índice y, opcionalmente, un rango de días; las
+    filas se generan por lotes de días completos. ``row_for_day`` carga lo
+    necesario para llegar a una fecha, de modo que la vista pueda saltar a
+    ella aunque aún no se haya desplazado hasta allí.
+    """
+
+    FETCH_BATCH = 256  # filas mínimas por llamada a fetchMore
+
+    DayRole = Qt.ItemDataRole.UserRole + 1
+    TaskRole = Qt.ItemDataRole.UserRole + 2
+    KindRole = Qt.ItemDataRole.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._milestones = MilestoneIndex()
+        self._revision = None
+        self._range = (None, None)
+        self._days: list[int] = []       # días con hitos dentro del rango
+        self._day_rows: list[int] = []   # primera fila de cada día ya cargado
+        self._rows: list[tuple[int, object, str]] = []  # (día, task, kind)
+        self._today = QDate.currentDate().toJulianDay()
+
+    # ------------------------------------------------------------------
+    # Datos
+    # ------------------------------------------------------------------
+
+    def set_milestones(self, milestones, first_day=None, last_day=None) -> bool:
+        """Reinicia el modelo si cambió el índice, su contenido o el rango.
+
+        Devuelve ``True`` si hubo reinicio.
+        """
+        key = (first_day, last_day)
+        if (
+            milestones is self._milestones
+            and milestones.revision == self._revision
+            and key == self._range
+        ):
+            return False
+        self.beginResetModel()
+        self._milestones = milestones
+        self._revision = milestones.revision
+        self._range = key
+        self._days = milestones.days_between(first_day, last_day)
+        self._day_rows = []
+        self._rows = []
+        self._today = QDate.currentDate().toJulianDay()
+        self.endResetModel()
+        return True
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._day_rows) < len(self._days)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self._load_days(len(self._day_rows), self.FETCH_BATCH)
+
+    def _load_days(self, through_pos: int, min_rows: int = 0) -> None:
+        """Carga días hasta la posición ``through_pos`` y al menos ``min_rows`` filas."""
+        start = len(self._day_rows)
+        pos = start
+        new_rows = []
+        while pos < len(self._days) and (pos <= through_pos or len(new_rows) < min_rows):
+            day = self._days[pos]
+            self._day_rows.append(len(self._rows) + len(new_rows))
+            new_rows.extend((day, task, kind) for task, kind in self._milestones.on_day(day))
+            pos += 1
+        if not new_rows:
+            # Días sin hitos (índice cambiado sin reinicio): solo avanzar.
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self._rows.extend(new_rows)
+        self.endInsertRows()
+
+    def row_for_day(self, day: int) -> int | None:
+        """Primera fila con fecha igual o posterior a ``day`` (la última si no
+        hay ninguna posterior), o ``None`` si el modelo está vacío."""
+        if not self._days:
+            return None
+        pos = min(bisect.bisect_left(self._days, day), len(self._days) - 1)
+        if pos >= len(self._day_rows):
+            self._load_days(pos, self.FETCH_BATCH)
+        return self._day_rows[pos]
+
+    def entry(self, row: int):
+        """(día juliano, task, kind) de la fila ``row``."""
+        return self._rows[row]
+
+    def entries(self):
+        """Todas las entradas del rango, cargando las que falten."""
+        self._load_days(len(self._days) - 1)
+        return list(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        day, task, kind = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return milestone_entry_text(task, QDate.fromJulianDay(day), kind)
+        if role == Qt.ItemDataRole.DecorationRole:
+            return QColor(task.color)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            text = f"{task.name.strip()}\n{task.start_date} – {task.end_date}"
+            if task.has_notes:
+                text += "\n(tiene notas)"
+            return text
+        if role == Qt.ItemDataRole.FontRole and day == self._today:
+            font = QFont()
+            font.setBold(True)
+            return font
+        if role == self.DayRole:
+            return day
+        if role == self.TaskRole:
+            return task
+        if role == self.KindRole:
+            return kind
+        return None
+
+
+class AgendaView(QTableView):
+    """Lista virtualizada de hitos para el modo "Agenda" del calendario.
+
+    Es una tabla de una columna con filas de alto fijo: a diferencia de
+    ``QListView``, no recalcula la posición de cada fila cuando ``fetchMore``
+    añade un lote, así que el coste de cargar más no crece con lo ya cargado.
+
+    Emite ``dayChanged`` con el primer día visible al desplazarse, para que
+    la barra de navegación muestre el mes correspondiente.
+    """
+
+    dayChanged = Signal(QDate)
+
+    def __init__(self, main_window, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self.agenda_model = MilestoneListModel(self)
+        self.setModel(self.agenda_model)
+        self.horizontalHeader().hide()
+        self.horizontalHeader().setStretchLastSection(True)
+        rows = self.verticalHeader()
+        rows.hide()
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(self.fontMetrics().height() + 8)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setAlternatingRowColors(True)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
+        self.clicked.connect(self._reveal_in_table)
+        self.verticalScrollBar().valueChanged.connect(self._emit_top_day)
+        self._top_day = None
+
+    def set_milestones(self, milestones) -> None:
+        """Actualiza el índice conservando la fecha que estaba arriba."""
+        top = self.top_day()
+        if self.agenda_model.set_milestones(milestones) and top is not None:
+            self.scroll_to_day(top)
+
+    def top_day(self) -> QDate | None:
+        index = self.indexAt(QPoint(2, 2))
+        if not index.isValid():
+            return None
+        return QDate.fromJulianDay(self.agenda_model.entry(index.row())[0])
+
+    def scroll_to_day(self, date: QDate) -> None:
+        row = self.agenda_model.row_for_day(date.toJulianDay())
+        if row is None:
+            return
+        # Ajustar ya el rango de la barra a las filas recién cargadas; si no,
+        # scrollTo se queda corto al saltar más allá de lo que había.
+        self.updateGeometries()
+        self.scrollTo(
+            self.agenda_model.index(row, 0), QAbstractItemView.ScrollHint.PositionAtTop
+        )
+        self._emit_top_day()
+
+    def _emit_top_day(self, *_args) -> None:
+        top = self.top_day()
+        if top is not None and top != self._top_day:
+            self._top_day = top
+            self.dayChanged.emit(top)
+
+    def _reveal_in_table(self, index) -> None:
+        if self.main_window is None:
+            return
+        task = self.agenda_model.entry(index.row())[1]
+        # La tarea puede ser una subtarea oculta (padre contraído):
+        # reveal_task la expande primero y devuelve su fila visible.
+        row = self.main_window.reveal_task(task)
+        if row is not None:
+            table_view = self.main_window.task_table_widget.table_view
+            table_view.selectRow(row)
+            table_view.scrollTo(self.main_window.task_table_widget.model.index(row, 0))
+
+    def show_context_menu(self, position):
+        index = self.indexAt(position)
+        if not index.isValid() or self.main_window is None:
+            return
+        task = self.agenda_model.entry(index.row())[1]
+        row = self.main_window.reveal_task(task)
+        if row is not None:
+            self.main_window.show_task_context_menu(self.mapToGlobal(position), row)
@@ -5,29 +5,45 @@ import logging
 #año completo con un estilo minimalista tipo "calendario de pared": solo los
 #números de los días, resaltando el día de hoy y marcando con una pequeña
 #barra los días de inicio/fin de tarea (los "hitos"), incluyendo un punto
-#amarillo si la tarea tiene notas. Esta vista es intercambiable con el
-#diagrama de Gantt desde la ventana principal.
+#amarillo si la tarea tiene notas. En la vista mensual, los días con
+#recordatorios extra (incluidas las repeticiones de los recurrentes, ver
+#core.reminder_rules) llevan un pequeño punto en la esquina. Esta vista es
+#intercambiable con el diagrama de Gantt desde la ventana principal.
 #
 import math
-
-from PySide6.QtCore import QDate, QEvent, QPoint, QPointF, QRect, QRectF, Qt, Signal
-from PySide6.QtGui import QBrush, QColor, QFont, QFontMetrics, QPainter, QPalette, QPen
+from collections import OrderedDict
+
+from PySide6.QtCore import QDate, QEvent, QPoint, QPointF, QRect, QRectF, QSize, Qt, QTimer, Signal
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QFontMetrics,
+    QPainter,
+    QPalette,
+    QPen,
+    QPixmap,
+)
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
     QDialog,
     QHBoxLayout,
     QLabel,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QPushButton,
     QSizePolicy,
     QToolTip,
     QVBoxLayout,
     QWidget,
 )
-from workalendar.america import Colombia
 
+from core.milestone_index import MilestoneIndex
 from core.models import Task
+from core.reminder_rules import compile_reminder, normalize_reminder
+from core.spatial_index import RectGridIndex
+from core.work_calendar import HOLIDAY, WEEKEND, day_kind, holiday_label
+from ui.calendar_agenda import AgendaView, MilestoneListModel, milestone_entry_text
 from ui.gantt_views import FloatingTaskMenu
 
 logger = logging.getLogger("bpm.calendar")
@@ -38,32 +54,12 @@ MESES = (
 )
 DIAS_SEMANA = ("Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom")
 
-# Instancia compartida: workalendar cachea los festivos por año internamente,
-# así que reutilizarla evita recalcularlos en cada celda dibujada.
-_HOLIDAY_CALENDAR = Colombia()
-
-
-def _parse_task_dates(task):
-    """Devuelve (inicio, fin) como QDate, o (None, None) si no son válidas."""
-    start = QDate.fromString(task.start_date, "dd/MM/yyyy")
-    end = QDate.fromString(task.end_date, "dd/MM/yyyy")
-    if not start.isValid() or not end.isValid():
-        return None, None
-    if end < start:
-        start, end = end, start
-    return start, end
-
-
-def _milestone_entry_text(task, date, kind):
-    etiqueta = "Inicio" if kind == "start" else "Fin"
-    return f"{date.toString('dd/MM/yyyy')} · {etiqueta} · {task.name.strip()}"
-
-
 def _day_shade_kind(day: QDate):
     """'holiday' | 'weekend' | None: cómo debe sombrearse el día dado."""
-    if day.toPython() in {d for d, _label in _HOLIDAY_CALENDAR.holidays(day.year())}:
+    kind = day_kind(day.toJulianDay())
+    if kind == HOLIDAY:
         return "holiday"
-    if day.dayOfWeek() >= 6:  # Qt: sábado=6, domingo=7
+    if kind == WEEKEND:
         return "weekend"
     return None
 
@@ -86,16 +82,26 @@ class CalendarGridWidget(QWidget):
     MARKER_MARGIN = 3       # Margen horizontal de la barra respecto al borde de la celda
     ROW_GAP = 2             # Separación vertical entre filas de barras
     NOTE_DOT_D = 7          # Diámetro del punto indicador de notas
+    REMINDER_DOT_D = 6      # Diámetro del punto de recordatorio junto al número
     WHEEL_STEP = 120        # Paso estándar de la rueda del mouse
 
     def __init__(self, main_window, parent=None):
         super().__init__(parent)
         self.main_window = main_window
         self.tasks = []
+        self.milestones = MilestoneIndex()
         self.highlighted_task = None
         self.floating_menu = None
         self._month = QDate(QDate.currentDate().year(), QDate.currentDate().month(), 1)
-        self._marker_hits = []   # [(QRectF, Task, kind)] rellenado en cada paintEvent
+        # Rectángulos de las barras de hito → (Task, kind), rellenado en cada
+        # paintEvent y consultado por celda de rejilla en clics y tooltips
+        self._marker_hits = RectGridIndex()
+        # Día juliano → [(task, recordatorio)] de la rejilla pintada, válido
+        # para la clave (primer día, último día, revisión de las tareas)
+        self._reminders_by_day: dict[int, list] = {}
+        self._reminders_key: tuple[int, int, int] | None = None
+        # Cambia con cada ``set_tasks``: las tareas (o sus recordatorios) cambiaron
+        self._tasks_revision = 0
         self._wheel_accumulator = 0
         self.today_color = QColor(242, 211, 136)  # Mismo acento "Hoy" del Gantt
         self.setMouseTracking(True)
@@ -129,8 +135,12 @@ class CalendarGridWidget(QWidget):
     def go_to_today(self) -> None:
         self.set_month(QDate.currentDate())
 
-    def set_tasks(self, tasks) -> None:
+    def set_tasks(self, tasks, milestones: MilestoneIndex | None = None) -> None:
+        """Tareas a mostrar. ``milestones`` permite compartir un índice ya
+        mantenido (el del modelo); sin él se construye uno para ``tasks``."""
         self.tasks = tasks or []
+        self.milestones = milestones if milestones is not None else MilestoneIndex(self.tasks)
+        self._tasks_revision += 1
         self.update()
 
     def set_highlight(self, task: Task | None) -> None:
@@ -140,17 +150,30 @@ class CalendarGridWidget(QWidget):
 
     def milestones_in_month(self, month: QDate):
         """[(idx, task, fecha, kind)] de los hitos de inicio/fin dentro del mes dado."""
-        entries = []
-        for idx, task in enumerate(self.tasks):
-            start, end = _parse_task_dates(task)
-            if start is None:
+        return [
+            (idx, task, QDate.fromJulianDay(day), kind)
+            for idx, task, day, kind in self.milestones.in_month(month.year(), month.month())
+        ]
+
+    def reminders_between(self, first_day: int, last_day: int) -> dict[int, list]:
+        """{día juliano: [(task, recordatorio)]} con las repeticiones de los
+        recordatorios extra dentro de ``[first_day, last_day]``.
+
+        Las reglas están cacheadas por contenido y calculan cada repetición
+        directamente, así que el coste depende de las tareas con
+        recordatorios y no de lo lejos que quede la fecha de inicio.
+        """
+        by_day: dict[int, list] = {}
+        for task in self.tasks:
+            if not task.extra_reminders:
                 continue
-            if start.year() == month.year() and start.month() == month.month():
-                entries.append((idx, task, start, "start"))
-            if end != start and end.year() == month.year() and end.month() == month.month():
-                entries.append((idx, task, end, "end"))
-        entries.sort(key=lambda e: e[2])
-        return entries
+            for rem in task.extra_reminders:
+                rule = compile_reminder(rem)
+                if rule is None:
+                    continue
+                for day in rule.occurrences(first_day, last_day):
+                    by_day.setdefault(day, []).append((task, normalize_reminder(rem)))
+        return by_day
 
     # ------------------------------------------------------------------
     # Colores según la paleta (modo claro / oscuro)
@@ -168,11 +191,13 @@ class CalendarGridWidget(QWidget):
             self.weekday_color = QColor(100, 100, 100)
             self.weekend_shade_color = QColor(0, 0, 0, 32)
             self.holiday_shade_color = QColor(214, 69, 69, 65)
+            self.reminder_color = QColor(52, 120, 200)
         else:
             self.muted_text_color = QColor(110, 110, 110)
             self.weekday_color = QColor(170, 170, 170)
             self.weekend_shade_color = QColor(255, 255, 255, 30)
             self.holiday_shade_color = QColor(214, 90, 90, 78)
+            self.reminder_color = QColor(110, 170, 240)
 
     def changeEvent(self, event):
         if event.type() == QEvent.Type.PaletteChange:
@@ -195,24 +220,24 @@ class CalendarGridWidget(QWidget):
         total_days = grid_start.daysTo(last) + 1
         return max(1, math.ceil(total_days / 7))
 
-    def _milestones_by_day(self):
-        """dict[QDate] -> [(task, kind)] con los hitos de inicio/fin."""
-        by_day = {}
-        for task in self.tasks:
-            start, end = _parse_task_dates(task)
-            if start is None:
-                continue
-            by_day.setdefault(start, []).append((task, "start"))
-            if end != start:
-                by_day.setdefault(end, []).append((task, "end"))
-        return by_day
+    def _day_at(self, pos) -> QDate | None:
+        """Día de la celda bajo ``pos`` (``None`` fuera de la rejilla)."""
+        grid_top = self.WEEKDAY_HEADER_H
+        if pos.y() < grid_top or self.width() <= 0:
+            return None
+        weeks = self._week_count()
+        cell_w = self.width() / 7.0
+        cell_h = max(1, self.height() - grid_top) / weeks
+        col = min(6, int(pos.x() / cell_w))
+        row = min(weeks - 1, int((pos.y() - grid_top) / cell_h))
+        return self._grid_start().addDays(7 * row + col)
 
     # ------------------------------------------------------------------
     # Dibujo
     # ------------------------------------------------------------------
 
     def paintEvent(self, event):
-        self._marker_hits = []
+        self._marker_hits.clear()
         with QPainter(self) as painter:
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
             painter.fillRect(event.rect(), self.background_color)
@@ -254,7 +279,13 @@ class CalendarGridWidget(QWidget):
                 painter.drawLine(0, y, width, y)
 
             today = QDate.currentDate()
-            milestones_by_day = self._milestones_by_day()
+            milestones = self.milestones
+            first_jd = grid_start.toJulianDay()
+            reminders_key = (first_jd, first_jd + 7 * weeks - 1, self._tasks_revision)
+            if reminders_key != self._reminders_key:
+                # Los repintados por el cursor (mouse tracking) reutilizan el cálculo
+                self._reminders_by_day = self.reminders_between(*reminders_key[:2])
+                self._reminders_key = reminders_key
             fm_bar = QFontMetrics(QFont("Arial", 8, QFont.Weight.Bold))
 
             for row in range(weeks):
@@ -286,9 +317,16 @@ class CalendarGridWidget(QWidget):
                             str(day.day()),
                         )
 
+                    if day.toJulianDay() in self._reminders_by_day:
+                        dot = QRectF(0, 0, self.REMINDER_DOT_D, self.REMINDER_DOT_D)
+                        dot.moveCenter(QPointF(x + cell_w - 8, cell_top + self.DAY_NUM_H / 2))
+                        painter.setPen(Qt.PenStyle.NoPen)
+                        painter.setBrush(QBrush(self.reminder_color))
+                        painter.drawEllipse(dot)
+
                     # Barras de hito (inicio/fin de tarea) de este día, una por fila,
                     # con el ancho de la celda del día
-                    day_milestones = milestones_by_day.get(day, [])
+                    day_milestones = milestones.on_day(day.toJulianDay())
                     if not day_milestones:
                         continue
 
@@ -325,7 +363,7 @@ class CalendarGridWidget(QWidget):
                             painter.setBrush(Qt.BrushStyle.NoBrush)
                             painter.drawRoundedRect(rect.adjusted(-1, -1, 1, 1), 3, 3)
 
-                        self._marker_hits.append((rect.adjusted(0, -1, 0, 1), task, kind))
+                        self._marker_hits.insert(rect.adjusted(0, -1, 0, 1), (task, kind))
                         bar_y += row_step
 
                     if overflow:
@@ -353,10 +391,8 @@ class CalendarGridWidget(QWidget):
     # ------------------------------------------------------------------
 
     def _marker_at(self, pos) -> Task | None:
-        for rect, task, _kind in self._marker_hits:
-            if rect.contains(pos):
-                return task
-        return None
+        hit = self._marker_hits.at(pos)
+        return hit[0] if hit is not None else None
 
     def mouseMoveEvent(self, event):
         pos = event.position().toPoint()
@@ -417,6 +453,15 @@ class CalendarGridWidget(QWidget):
                 if task.has_notes:
                     text += "\n(tiene notas)"
                 QToolTip.showText(ev.globalPos(), text, self)
+                return True
+            day = self._day_at(ev.pos())
+            reminders = self._reminders_by_day.get(day.toJulianDay()) if day else None
+            if reminders:
+                lines = [f"Recordatorios del {day.toString('dd/MM/yyyy')}:"]
+                lines += [
+                    f"• {task.name.strip()}: {rem.get('comment', '')}" for task, rem in reminders
+                ]
+                QToolTip.showText(ev.globalPos(), "\n".join(lines), self)
             else:
                 QToolTip.hideText()
             return True
@@ -478,6 +523,12 @@ class YearOverviewWidget(QWidget):
     días de inicio/fin de tarea se marcan con un punto de color. Al hacer
     clic sobre un mes se solicita (vía `monthActivated`) mostrar ese mes en
     detalle en `CalendarGridWidget`.
+
+    Cada mes se pinta una vez en un ``QPixmap`` cacheado por (año, mes,
+    tamaño, paleta, versión de hitos del mes); en cada repintado solo se
+    dibujan en vivo el día de hoy y el realce del mes bajo el cursor. Tras
+    mostrar un año se pintan en tiempos muertos los meses de los años
+    vecinos, para que la rueda del mouse pase de año sin esperar.
     """
 
     monthActivated = Signal(QDate)
@@ -489,15 +540,30 @@ class YearOverviewWidget(QWidget):
     HEADER_H = 20
     WEEKDAY_H = 14
     WHEEL_STEP = 120
+    PIXMAP_CACHE_SIZE = 48  # meses: el año visible y sus dos vecinos, con holgura
 
     def __init__(self, main_window, parent=None):
         super().__init__(parent)
         self.main_window = main_window
         self.tasks = []
+        self.milestones = MilestoneIndex()
         self._year = QDate.currentDate().year()
         self._wheel_accumulator = 0
         self._month_rects = []   # [(QRect, mes 1..12)]
-        self._day_hits = []      # [(QRectF, QDate, [(task, kind), ...])]
+        self._day_hits = RectGridIndex()  # QRectF → (QDate, [(task, kind), ...])
+        self._hover_month: int | None = None
+        # Las exportaciones vectoriales (SVG/PDF) desactivan la caché para no
+        # incrustar mapas de bits.
+        self.use_pixmap_cache = True
+        # clave → (QPixmap, [(QRectF relativo al mes, (QDate, entradas))])
+        self._month_cache: OrderedDict = OrderedDict()
+        self._prerender_queue: list[tuple[int, int, QSize]] = []
+        # (año, tamaño, revisión de hitos) de la última cola de precarga: los
+        # repintados por el cursor no vuelven a encolar los años vecinos.
+        self._prerender_key: tuple | None = None
+        self._prerender_timer = QTimer(self)
+        self._prerender_timer.setInterval(0)
+        self._prerender_timer.timeout.connect(self._prerender_step)
         self.today_color = QColor(242, 211, 136)
         self.setMouseTracking(True)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -527,8 +593,9 @@ class YearOverviewWidget(QWidget):
     def go_to_today(self) -> None:
         self.set_year(QDate.currentDate().year())
 
-    def set_tasks(self, tasks) -> None:
+    def set_tasks(self, tasks, milestones: MilestoneIndex | None = None) -> None:
         self.tasks = tasks or []
+        self.milestones = milestones if milestones is not None else MilestoneIndex(self.tasks)
         self.update()
 
     # ------------------------------------------------------------------
@@ -550,6 +617,10 @@ class YearOverviewWidget(QWidget):
             self.weekday_color = QColor(170, 170, 170)
             self.weekend_shade_color = QColor(255, 255, 255, 30)
             self.holiday_shade_color = QColor(214, 90, 90, 78)
+        self.hover_color = QColor(palette.color(QPalette.ColorRole.Highlight))
+        self.hover_color.setAlpha(90)
+        self._month_cache.clear()
+        self._prerender_key = None
 
     def changeEvent(self, event):
         if event.type() == QEvent.Type.PaletteChange:
@@ -561,48 +632,138 @@ class YearOverviewWidget(QWidget):
     # Datos
     # ------------------------------------------------------------------
 
-    def _milestones_by_day(self):
-        """dict[(mes, día)] -> [(task, kind)] de los hitos del año visible."""
-        by_day = {}
-        for task in self.tasks:
-            start, end = _parse_task_dates(task)
-            if start is None:
-                continue
-            for date, kind in ((start, "start"), (end, "end")):
-                if kind == "end" and end == start:
-                    continue
-                if date.year() == self._year:
-                    by_day.setdefault((date.month(), date.day()), []).append((task, kind))
-        return by_day
+    def _month_milestones(self, year, month):
+        """dict[día del mes] -> [(task, kind)] con los hitos del mes dado."""
+        return {
+            QDate.fromJulianDay(day).day(): self.milestones.on_day(day)
+            for day in self.milestones.days_in_month(year, month)
+        }
 
     # ------------------------------------------------------------------
     # Dibujo
     # ------------------------------------------------------------------
 
+    def _month_areas(self):
+        """[(QRectF, mes 1..12)] de los mini-meses con el tamaño actual."""
+        cell_w = self.width() / self.COLS
+        cell_h = self.height() / self.ROWS
+        areas = []
+        for month_idx in range(12):
+            col = month_idx % self.COLS
+            row = month_idx // self.COLS
+            area = QRectF(col * cell_w, row * cell_h, cell_w, cell_h).adjusted(
+                self.MONTH_PADDING, self.MONTH_PADDING,
+                -self.MONTH_PADDING, -self.MONTH_PADDING,
+            )
+            areas.append((area, month_idx + 1))
+        return areas
+
     def paintEvent(self, event):
         self._month_rects = []
-        self._day_hits = []
+        self._day_hits.clear()
         with QPainter(self) as painter:
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
             painter.fillRect(event.rect(), self.background_color)
-
-            milestones_by_day = self._milestones_by_day()
             today = QDate.currentDate()
 
-            cell_w = self.width() / self.COLS
-            cell_h = self.height() / self.ROWS
-
-            for month_idx in range(12):
-                col = month_idx % self.COLS
-                row = month_idx // self.COLS
-                area = QRectF(col * cell_w, row * cell_h, cell_w, cell_h).adjusted(
-                    self.MONTH_PADDING, self.MONTH_PADDING,
-                    -self.MONTH_PADDING, -self.MONTH_PADDING,
-                )
-                self._month_rects.append((area.toRect(), month_idx + 1))
-                self._paint_month(painter, area, month_idx + 1, milestones_by_day, today)
+            for area, month in self._month_areas():
+                self._month_rects.append((area.toRect(), month))
+                if self.use_pixmap_cache:
+                    pixmap, hits = self._month_pixmap(self._year, month, area.size())
+                    painter.drawPixmap(area.topLeft(), pixmap)
+                else:
+                    hits = []
+                    painter.save()
+                    painter.translate(area.topLeft())
+                    self._paint_month(
+                        painter, QRectF(QPointF(0, 0), area.size()), self._year, month, hits
+                    )
+                    painter.restore()
+                for rect, payload in hits:
+                    self._day_hits.insert(rect.translated(area.topLeft()), payload)
+
+                if today.year() == self._year and today.month() == month:
+                    self._paint_today(painter, area, today)
+                if month == self._hover_month:
+                    painter.setPen(QPen(self.hover_color, 1.5))
+                    painter.setBrush(Qt.BrushStyle.NoBrush)
+                    painter.drawRoundedRect(area.adjusted(-6, -4, 6, 4), 6, 6)
+
+        if self.use_pixmap_cache and self.isVisible():
+            self._schedule_prerender()
+
+    def _month_layout(self, area, year, month):
+        """(primer día de la rejilla, y de la rejilla, ancho de columna, alto de fila)."""
+        first = QDate(year, month, 1)
+        grid_start = first.addDays(-(first.dayOfWeek() - 1))
+        last = first.addMonths(1).addDays(-1)
+        weeks = max(1, math.ceil((grid_start.daysTo(last) + 1) / 7))
+        grid_top = area.y() + self.HEADER_H + self.WEEKDAY_H
+        row_h = max(1, area.bottom() - grid_top) / weeks
+        return grid_start, grid_top, area.width() / 7.0, row_h, weeks
+
+    def _cache_key(self, year, month, size):
+        return (
+            year, month, size.width(), size.height(), self.devicePixelRatioF(),
+            self.milestones.month_version(year, month),
+        )
 
-    def _paint_month(self, painter, area, month, milestones_by_day, today):
+    def _month_pixmap(self, year, month, size):
+        """Mes pintado (y sus zonas de tooltip) desde la caché o recién pintado."""
+        key = self._cache_key(year, month, size)
+        cached = self._month_cache.get(key)
+        if cached is not None:
+            self._month_cache.move_to_end(key)
+            return cached
+
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(
+            max(1, math.ceil(size.width() * ratio)), max(1, math.ceil(size.height() * ratio))
+        )
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(self.background_color)
+        hits = []
+        with QPainter(pixmap) as painter:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self._paint_month(painter, QRectF(QPointF(0, 0), size), year, month, hits)
+
+        # Versiones anteriores del mismo mes ya no volverán a mostrarse.
+        for stale in [k for k in self._month_cache if k[:5] == key[:5]]:
+            del self._month_cache[stale]
+        self._month_cache[key] = (pixmap, hits)
+        while len(self._month_cache) > self.PIXMAP_CACHE_SIZE:
+            self._month_cache.popitem(last=False)
+        return pixmap, hits
+
+    def _schedule_prerender(self):
+        """Encola los meses de los años vecinos que aún no están en caché."""
+        areas = self._month_areas()
+        if not areas:
+            return
+        size = areas[0][0].size()
+        key = (self._year, size.width(), size.height(), self.devicePixelRatioF(),
+               self.milestones.revision)
+        if key == self._prerender_key:
+            return
+        self._prerender_key = key
+        self._prerender_queue = [
+            (year, month, size)
+            for year in (self._year + 1, self._year - 1)
+            for month in range(1, 13)
+        ]
+        if not self._prerender_timer.isActive():
+            self._prerender_timer.start()
+
+    def _prerender_step(self):
+        """Pinta un mes pendiente por vuelta del bucle de eventos."""
+        while self._prerender_queue:
+            year, month, size = self._prerender_queue.pop(0)
+            if self._cache_key(year, month, size) not in self._month_cache:
+                self._month_pixmap(year, month, size)
+                return
+        self._prerender_timer.stop()
+
+    def _paint_month(self, painter, area, year, month, hits):
         painter.setFont(QFont("Arial", 10, QFont.Weight.Bold))
         painter.setPen(self.text_color)
         header_rect = QRectF(area.x(), area.y(), area.width(), self.HEADER_H)
@@ -610,12 +771,7 @@ class YearOverviewWidget(QWidget):
             header_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, MESES[month - 1]
         )
 
-        first = QDate(self._year, month, 1)
-        grid_start = first.addDays(-(first.dayOfWeek() - 1))
-        last = first.addMonths(1).addDays(-1)
-        weeks = max(1, math.ceil((grid_start.daysTo(last) + 1) / 7))
-
-        col_w = area.width() / 7.0
+        grid_start, grid_top, col_w, row_h, weeks = self._month_layout(area, year, month)
         weekday_top = area.y() + self.HEADER_H
         painter.setFont(QFont("Arial", 6, QFont.Weight.Bold))
         painter.setPen(self.weekday_color)
@@ -623,18 +779,14 @@ class YearOverviewWidget(QWidget):
             rect = QRectF(area.x() + col * col_w, weekday_top, col_w, self.WEEKDAY_H)
             painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, name[0])
 
-        grid_top = weekday_top + self.WEEKDAY_H
-        grid_h = max(1, area.bottom() - grid_top)
-        row_h = grid_h / weeks
-
+        milestones_by_day = self._month_milestones(year, month)
         painter.setFont(QFont("Arial", 7))
         for r in range(weeks):
             week_start = grid_start.addDays(7 * r)
             for c in range(7):
                 day = week_start.addDays(c)
                 cell = QRectF(area.x() + c * col_w, grid_top + r * row_h, col_w, row_h)
-                in_month = day.month() == month and day.year() == self._year
-                label = str(day.day())
+                in_month = day.month() == month and day.year() == year
 
                 shade_kind = _day_shade_kind(day)
                 if shade_kind == "holiday":
@@ -642,29 +794,42 @@ class YearOverviewWidget(QWidget):
                 elif shade_kind == "weekend":
                     painter.fillRect(cell, self.weekend_shade_color)
 
-                if day == today and in_month:
-                    chip_d = min(col_w, row_h) - 4
-                    chip = QRectF(0, 0, chip_d, chip_d)
-                    chip.moveCenter(cell.center())
-                    painter.setPen(Qt.PenStyle.NoPen)
-                    painter.setBrush(QBrush(self.today_color))
-                    painter.drawEllipse(chip)
-                    painter.setPen(QColor(40, 40, 40))
-                    painter.drawText(cell, Qt.AlignmentFlag.AlignCenter, label)
-                else:
-                    painter.setPen(self.text_color if in_month else self.muted_text_color)
-                    painter.drawText(cell, Qt.AlignmentFlag.AlignCenter, label)
+                painter.setPen(self.text_color if in_month else self.muted_text_color)
+                painter.drawText(cell, Qt.AlignmentFlag.AlignCenter, str(day.day()))
 
                 if in_month:
-                    entries = milestones_by_day.get((day.month(), day.day()))
+                    entries = milestones_by_day.get(day.day())
                     if entries:
-                        dot_d = 6.0
-                        dot = QRectF(0, 0, dot_d, dot_d)
-                        dot.moveCenter(QPointF(cell.center().x(), cell.bottom() - dot_d))
-                        painter.setPen(Qt.PenStyle.NoPen)
-                        painter.setBrush(QBrush(QColor(entries[0][0].color)))
-                        painter.drawEllipse(dot)
-                        self._day_hits.append((cell, day, entries))
+                        self._paint_milestone_dot(painter, cell, entries)
+                        hits.append((cell, (day, entries)))
+
+    def _paint_milestone_dot(self, painter, cell, entries):
+        dot_d = 6.0
+        dot = QRectF(0, 0, dot_d, dot_d)
+        dot.moveCenter(QPointF(cell.center().x(), cell.bottom() - dot_d))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(QColor(entries[0][0].color)))
+        painter.drawEllipse(dot)
+
+    def _paint_today(self, painter, area, today):
+        """Resalta el día de hoy sobre el mes ya pintado (capa en vivo)."""
+        grid_start, grid_top, col_w, row_h, _weeks = self._month_layout(
+            area, today.year(), today.month()
+        )
+        r, c = divmod(grid_start.daysTo(today), 7)
+        cell = QRectF(area.x() + c * col_w, grid_top + r * row_h, col_w, row_h)
+        chip_d = min(col_w, row_h) - 4
+        chip = QRectF(0, 0, chip_d, chip_d)
+        chip.moveCenter(cell.center())
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(self.today_color))
+        painter.drawEllipse(chip)
+        painter.setFont(QFont("Arial", 7))
+        painter.setPen(QColor(40, 40, 40))
+        painter.drawText(cell, Qt.AlignmentFlag.AlignCenter, str(today.day()))
+        entries = self.milestones.on_day(today.toJulianDay())
+        if entries:
+            self._paint_milestone_dot(painter, cell, entries)
 
     # ------------------------------------------------------------------
     # Interacción
@@ -681,10 +846,26 @@ class YearOverviewWidget(QWidget):
 
     def mouseMoveEvent(self, event):
         pos = event.position().toPoint()
-        on_month = any(rect.contains(pos) for rect, _ in self._month_rects)
-        self.setCursor(Qt.CursorShape.PointingHandCursor if on_month else Qt.CursorShape.ArrowCursor)
+        hover = next((month for rect, month in self._month_rects if rect.contains(pos)), None)
+        self.setCursor(
+            Qt.CursorShape.PointingHandCursor if hover is not None else Qt.CursorShape.ArrowCursor
+        )
+        self._set_hover_month(hover)
         super().mouseMoveEvent(event)
 
+    def leaveEvent(self, event):
+        self._set_hover_month(None)
+        super().leaveEvent(event)
+
+    def _set_hover_month(self, month):
+        """Repinta solo los meses que ganan o pierden el realce del cursor."""
+        if month == self._hover_month:
+            return
+        for rect, m in self._month_rects:
+            if m in (month, self._hover_month):
+                self.update(rect.adjusted(-8, -6, 8, 6))
+        self._hover_month = month
+
     def wheelEvent(self, event):
         if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
             event.ignore()
@@ -700,15 +881,18 @@ class YearOverviewWidget(QWidget):
 
     def event(self, ev):
         if ev.type() == QEvent.Type.ToolTip:
-            pos = ev.pos()
-            for rect, _date, entries in self._day_hits:
-                if rect.contains(pos):
-                    lines = [
-                        f"{'Inicio' if kind == 'start' else 'Fin'}: {task.name.strip()}"
-                        for task, kind in entries
-                    ]
-                    QToolTip.showText(ev.globalPos(), "\n".join(lines), self)
-                    return True
+            hit = self._day_hits.at(ev.pos())
+            if hit is not None:
+                day, entries = hit
+                lines = [
+                    f"{'Inicio' if kind == 'start' else 'Fin'}: {task.name.strip()}"
+                    for task, kind in entries
+                ]
+                label = holiday_label(day.toJulianDay())
+                if label:
+                    lines.insert(0, f"Festivo: {label}")
+                QToolTip.showText(ev.globalPos(), "\n".join(lines), self)
+                return True
             QToolTip.hideText()
             return True
         return super().event(ev)
@@ -716,71 +900,66 @@ class YearOverviewWidget(QWidget):
 
 class MonthMilestonesDialog(QDialog):
     """Popup que lista los hitos (inicio/fin de tarea) de un mes y permite
-    copiar su información al portapapeles."""
+    copiar su información al portapapeles.
+
+    La lista usa el mismo modelo virtualizado que la agenda, acotado al mes,
+    así que un mes con miles de hitos no crea un widget por fila.
+    """
 
-    def __init__(self, month: QDate, tasks, parent=None):
+    def __init__(self, month: QDate, milestones: MilestoneIndex, parent=None):
         super().__init__(parent)
         self.setWindowTitle(f"Hitos de {MESES[month.month() - 1]} {month.year()}")
         self.setMinimumWidth(380)
 
-        entries = self._collect_entries(month, tasks)
+        first = QDate(month.year(), month.month(), 1)
+        self.model = MilestoneListModel(self)
+        self.model.set_milestones(
+            milestones, first.toJulianDay(), first.addMonths(1).toJulianDay() - 1
+        )
 
         layout = QVBoxLayout(self)
 
-        if not entries:
+        if not self.model.canFetchMore():
             layout.addWidget(QLabel("No hay hitos (inicio o fin de tarea) en este mes."))
         else:
-            list_widget = QListWidget()
-            list_widget.setAlternatingRowColors(True)
-            for _idx, task, date, kind in entries:
-                text = _milestone_entry_text(task, date, kind)
-
-                row = QWidget()
-                row_layout = QHBoxLayout(row)
-                row_layout.setContentsMargins(6, 4, 6, 4)
-
-                label = QLabel(text)
-                label.setWordWrap(True)
-                row_layout.addWidget(label, 1)
-
-                copy_btn = QPushButton("Copiar")
-                copy_btn.setFixedWidth(70)
-                copy_btn.setToolTip("Copiar este hito al portapapeles")
-                copy_btn.clicked.connect(lambda _checked=False, t=text: self._copy_to_clipboard(t))
-                row_layout.addWidget(copy_btn)
-
-                item = QListWidgetItem()
-                item.setSizeHint(row.sizeHint())
-                list_widget.addItem(item)
-                list_widget.setItemWidget(item, row)
-
-            layout.addWidget(list_widget)
-
-            full_text = "\n".join(
-                _milestone_entry_text(task, date, kind) for _idx, task, date, kind in entries
+            self.list_view = QListView()
+            self.list_view.setModel(self.model)
+            self.list_view.setUniformItemSizes(True)
+            self.list_view.setAlternatingRowColors(True)
+            self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+            self.list_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            self.list_view.doubleClicked.connect(
+                lambda index: self._copy_to_clipboard(index.data())
             )
+            layout.addWidget(self.list_view)
+
+            buttons = QHBoxLayout()
+            copy_btn = QPushButton("Copiar selección")
+            copy_btn.setToolTip("Copiar los hitos seleccionados (doble clic copia uno)")
+            copy_btn.clicked.connect(self._copy_selection)
+            buttons.addWidget(copy_btn)
             copy_all_btn = QPushButton("Copiar todo")
             copy_all_btn.setToolTip("Copiar todos los hitos del mes al portapapeles")
-            copy_all_btn.clicked.connect(lambda: self._copy_to_clipboard(full_text))
-            layout.addWidget(copy_all_btn)
+            copy_all_btn.clicked.connect(self._copy_all)
+            buttons.addWidget(copy_all_btn)
+            layout.addLayout(buttons)
 
         close_btn = QPushButton("Cerrar")
         close_btn.clicked.connect(self.accept)
         layout.addWidget(close_btn)
 
-    @staticmethod
-    def _collect_entries(month: QDate, tasks):
-        entries = []
-        for idx, task in enumerate(tasks or []):
-            start, end = _parse_task_dates(task)
-            if start is None:
-                continue
-            if start.year() == month.year() and start.month() == month.month():
-                entries.append((idx, task, start, "start"))
-            if end != start and end.year() == month.year() and end.month() == month.month():
-                entries.append((idx, task, end, "end"))
-        entries.sort(key=lambda e: e[2])
-        return entries
+    def _copy_selection(self) -> None:
+        rows = sorted(index.row() for index in self.list_view.selectionModel().selectedRows())
+        if rows:
+            self._copy_to_clipboard("\n".join(
+                self.model.index(row, 0).data() for row in rows
+            ))
+
+    def _copy_all(self) -> None:
+        self._copy_to_clipboard("\n".join(
+            milestone_entry_text(task, QDate.fromJulianDay(day), kind)
+            for day, task, kind in self.model.entries()
+        ))
 
     def _copy_to_clipboard(self, text: str) -> None:
         QApplication.clipboard().setText(text)
@@ -788,12 +967,14 @@ class MonthMilestonesDialog(QDialog):
 
 class CalendarViewWidget(QWidget):
     """Contenedor de la vista de calendario: barra de navegación + rejilla de
-    mes o de año (alternables), y acceso al popup de hitos del mes."""
+    mes, de año o agenda (alternables), y acceso al popup de hitos del mes."""
+
+    MODES = ("month", "year", "agenda")
 
     def __init__(self, main_window, parent=None):
         super().__init__(parent)
         self.main_window = main_window
-        self.mode = "month"  # "month" | "year"
+        self.mode = "month"  # "month" | "year" | "agenda"
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -813,6 +994,10 @@ class CalendarViewWidget(QWidget):
         self.btn_mode_year = QPushButton("Año")
         self.btn_mode_year.setCheckable(True)
         self.btn_mode_year.setFixedSize(44, 22)
+        self.btn_mode_agenda = QPushButton("Agenda")
+        self.btn_mode_agenda.setCheckable(True)
+        self.btn_mode_agenda.setFixedSize(56, 22)
+        self.btn_mode_agenda.setToolTip("Lista cronológica de todos los hitos")
 
         self.btn_prev = QPushButton("◀")
         self.btn_prev.setFixedSize(28, 22)
@@ -832,6 +1017,7 @@ class CalendarViewWidget(QWidget):
 
         nav_layout.addWidget(self.btn_mode_month)
         nav_layout.addWidget(self.btn_mode_year)
+        nav_layout.addWidget(self.btn_mode_agenda)
         nav_layout.addSpacing(8)
         nav_layout.addWidget(self.btn_prev)
         nav_layout.addWidget(self.btn_today)
@@ -843,19 +1029,24 @@ class CalendarViewWidget(QWidget):
         self.grid = CalendarGridWidget(main_window, self)
         self.year_grid = YearOverviewWidget(main_window, self)
         self.year_grid.setVisible(False)
+        self.agenda = AgendaView(main_window, self)
+        self.agenda.setVisible(False)
 
         layout.addWidget(nav_bar)
         layout.addWidget(self.grid, 1)
         layout.addWidget(self.year_grid, 1)
+        layout.addWidget(self.agenda, 1)
 
         self.btn_mode_month.clicked.connect(lambda: self.set_mode("month"))
         self.btn_mode_year.clicked.connect(lambda: self.set_mode("year"))
+        self.btn_mode_agenda.clicked.connect(lambda: self.set_mode("agenda"))
         self.btn_prev.clicked.connect(self._go_previous)
         self.btn_today.clicked.connect(self._go_today)
         self.btn_next.clicked.connect(self._go_next)
         self.grid.monthChanged.connect(self._update_period_label)
         self.year_grid.yearChanged.connect(self._update_period_label)
         self.year_grid.monthActivated.connect(self._activate_month)
+        self.agenda.dayChanged.connect(self._update_period_label)
 
         self._update_period_label()
 
@@ -868,18 +1059,25 @@ class CalendarViewWidget(QWidget):
         self.set_mode(saved_mode)
 
     # ------------------------------------------------------------------
-    # Alternancia mes / año
+    # Alternancia mes / año / agenda
     # ------------------------------------------------------------------
 
     def set_mode(self, mode: str) -> None:
-        if mode not in ("month", "year"):
+        if mode not in self.MODES:
             mode = "month"
+        entering_agenda = mode == "agenda" and self.mode != "agenda"
         self.mode = mode
         self.btn_mode_month.setChecked(mode == "month")
         self.btn_mode_year.setChecked(mode == "year")
+        self.btn_mode_agenda.setChecked(mode == "agenda")
         self.grid.setVisible(mode == "month")
         self.year_grid.setVisible(mode == "year")
+        self.agenda.setVisible(mode == "agenda")
         self.btn_milestones.setEnabled(mode == "month")
+        if entering_agenda:
+            # La agenda se abre en el mes que mostraba la rejilla.
+            self.agenda.set_milestones(self.grid.milestones)
+            self.agenda.scroll_to_day(self.grid.month())
         self._update_period_label()
         if self.main_window is not None:
             self.main_window.config.set("View", "calendar_mode", mode)
@@ -888,21 +1086,31 @@ class CalendarViewWidget(QWidget):
         self.grid.set_month(month)
         self.set_mode("month")
 
+    def _agenda_month(self) -> QDate:
+        top = self.agenda.top_day() or self.grid.month()
+        return QDate(top.year(), top.month(), 1)
+
     def _go_previous(self) -> None:
         if self.mode == "year":
             self.year_grid.previous_year()
+        elif self.mode == "agenda":
+            self.agenda.scroll_to_day(self._agenda_month().addMonths(-1))
         else:
             self.grid.previous_month()
 
     def _go_next(self) -> None:
         if self.mode == "year":
             self.year_grid.next_year()
+        elif self.mode == "agenda":
+            self.agenda.scroll_to_day(self._agenda_month().addMonths(1))
         else:
             self.grid.next_month()
 
     def _go_today(self) -> None:
         if self.mode == "year":
             self.year_grid.go_to_today()
+        elif self.mode == "agenda":
+            self.agenda.scroll_to_day(QDate.currentDate())
         else:
             self.grid.go_to_today()
 
@@ -911,16 +1119,21 @@ class CalendarViewWidget(QWidget):
     # ------------------------------------------------------------------
 
     def show_month_milestones(self) -> None:
-        dialog = MonthMilestonesDialog(self.grid.month(), self.grid.tasks, self)
+        dialog = MonthMilestonesDialog(self.grid.month(), self.grid.milestones, self)
         dialog.exec()
 
     # ------------------------------------------------------------------
     # API usada por la ventana principal
     # ------------------------------------------------------------------
 
-    def set_tasks(self, tasks) -> None:
-        self.grid.set_tasks(tasks)
-        self.year_grid.set_tasks(tasks)
+    def set_tasks(self, tasks, milestones: MilestoneIndex | None = None) -> None:
+        tasks = tasks or []
+        if milestones is None:
+            milestones = MilestoneIndex(tasks)
+        self.grid.set_tasks(tasks, milestones)
+        self.year_grid.set_tasks(tasks, milestones)
+        if self.mode == "agenda":
+            self.agenda.set_milestones(milestones)
 
     def set_highlight(self, task: Task | None) -> None:
         self.grid.set_highlight(task)
@@ -928,6 +1141,9 @@ class CalendarViewWidget(QWidget):
     def _update_period_label(self, *_args) -> None:
         if self.mode == "year":
             self.period_label.setText(str(self.year_grid.year()))
+        elif self.mode == "agenda":
+            month = self._agenda_month()
+            self.period_label.setText(f"Agenda · {MESES[month.month() - 1]} {month.year()}")
         else:
             month = self.grid.month()
             self.period_label.setText(f"{MESES[month.month() - 1]} {month.year()}")
@@ -0,0 +1,451 @@
+"""chart_export.py
+Exportación del diagrama de Gantt y de las vistas de calendario a PNG, SVG o
+PDF sin pasar por la pantalla.
+
+- PNG: el contenido se divide en mosaicos que se pintan en paralelo (hilos de
+  trabajo sobre ``QImage``) y se unen por franjas horizontales que se
+  comprimen y escriben al disco en cuanto están listas; nunca hace falta el
+  mapa de bits completo en memoria, así que un diagrama de 20.000 píxeles de
+  ancho cuesta lo mismo en RAM que una franja.
+- SVG y PDF: se dibuja en vectorial directamente sobre ``QSvgGenerator`` /
+  ``QPdfWriter`` (que escriben al archivo a medida que se pinta). En PDF el
+  diagrama se reparte en páginas, repitiendo el encabezado en cada una.
+
+Las funciones solo necesitan una ``QApplication`` (puede ser la plataforma
+``offscreen``) y una lista de tareas, de modo que también se pueden usar sin
+ventana principal::
+
+    export_gantt(tasks, "plan.png", pixels_per_day=4)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import zlib
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QDate, QMarginsF, QPoint, QRectF, QSize, QSizeF
+from PySide6.QtGui import QImage, QPageLayout, QPageSize, QPainter, QPdfWriter
+from PySide6.QtSvg import QSvgGenerator
+
+from core.models import DateRangeTracker, Task
+from ui.calendar_view import CalendarGridWidget, YearOverviewWidget
+from ui.gantt_views import GanttChart, GanttHeaderView
+
+logger = logging.getLogger("bpm.export")
+
+EXPORT_FORMATS = ("png", "svg", "pdf")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def export_format(path: str) -> str:
+    """Formato de exportación según la extensión de ``path``."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportación no soportado: '{extension or path}'")
+    return extension
+
+
+# ---------------------------------------------------------------------------
+# PNG por franjas
+# ---------------------------------------------------------------------------
+
+class PngStreamWriter:
+    """Escritor PNG (RGB de 8 bits) que recibe la imagen fila a fila.
+
+    Las filas se comprimen con un ``zlib.compressobj`` incremental y se
+    vuelcan en fragmentos IDAT a medida que se llenan, por lo que la memoria
+    usada no depende del tamaño de la imagen.
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, path: str, width: int, height: int) -> None:
+        self.path = path
+        self.width = width
+        self.height = height
+        self._rows_written = 0
+        self._file = open(path, "wb")
+        self._compressor = zlib.compressobj(6)
+        self._pending = bytearray()
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def __enter__(self) -> PngStreamWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Ya hay una excepción en curso: no lanzar otra desde aquí
+            self._discard()
+
+    def write_row(self, rgb: bytes) -> None:
+        """Añade una fila de ``width * 3`` bytes RGB."""
+        # Byte de filtro 0 (ninguno) al inicio de cada fila
+        self._pending += self._compressor.compress(b"\x00" + rgb)
+        self._rows_written += 1
+        if len(self._pending) >= self.CHUNK_SIZE:
+            self._write_chunk(b"IDAT", bytes(self._pending))
+            self._pending.clear()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        if self._rows_written != self.height:
+            self._discard()
+            raise ValueError(
+                f"PNG incompleto: {self._rows_written} de {self.height} filas escritas"
+            )
+        self._pending += self._compressor.flush()
+        self._write_chunk(b"IDAT", bytes(self._pending))
+        self._write_chunk(b"IEND", b"")
+        self._file.close()
+
+    def _discard(self) -> None:
+        """Cierra y borra el archivo, para no dejar un PNG a medio escribir."""
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _write_chunk(self, kind: bytes, data: bytes) -> None:
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def _image_rows(image: QImage):
+    """Filas RGB (sin relleno de alineación) de una imagen ``Format_RGB888``."""
+    bits = bytes(image.constBits())
+    stride = image.bytesPerLine()
+    row_bytes = image.width() * 3
+    for y in range(image.height()):
+        offset = y * stride
+        yield bits[offset:offset + row_bytes]
+
+
+# ---------------------------------------------------------------------------
+# Gantt
+# ---------------------------------------------------------------------------
+
+class GanttExporter:
+    """Pinta el diagrama de Gantt completo (encabezado + filas) fuera de
+    pantalla.
+
+    Usa instancias propias, nunca mostradas, de ``GanttHeaderView`` y
+    ``GanttChart`` con el mismo código de dibujo que la vista en pantalla.
+    """
+
+    TILE_SIZE = 512
+    PDF_PAGE_SIZE = QPageSize.PageSizeId.A3
+    PDF_RESOLUTION = 96  # 1 píxel de contenido ≈ 1 punto de dispositivo
+
+    def __init__(
+        self,
+        tasks: Sequence[Task],
+        pixels_per_day: float = 4.0,
+        row_height: int = 25,
+        header_height: int = 30,
+        visible_width: int | None = None,
+        min_date: QDate | None = None,
+        max_date: QDate | None = None,
+    ) -> None:
+        tasks = list(tasks)
+        if min_date is None or max_date is None:
+            tracker = DateRangeTracker()
+            tracker.sync(tasks)
+            bounds = tracker.bounds()
+            if bounds is None:
+                raise ValueError("No hay tareas con fechas válidas para exportar")
+            min_date = min_date or QDate.fromJulianDay(bounds[0])
+            max_date = max_date or QDate.fromJulianDay(bounds[1])
+
+        self.pixels_per_day = float(pixels_per_day)
+        self.row_height = row_height
+        self.header_height = header_height
+        days_total = min_date.daysTo(max_date) + 1
+        self.width = max(1, int(round(days_total * self.pixels_per_day)))
+        self.height = header_height + row_height * len(tasks)
+        # La granularidad del encabezado depende del ancho que "se ve de una
+        # vez"; por defecto, el de una pantalla típica.
+        self.visible_width = visible_width or min(self.width, 1200)
+
+        self.header = GanttHeaderView(header_height=header_height)
+        self.chart = GanttChart(tasks, row_height, header_height, None)
+        self.chart.set_tasks(tasks)
+        self.header.update_parameters(min_date, max_date, self.pixels_per_day)
+        self.chart.update_parameters(min_date, max_date, self.pixels_per_day)
+        self.background_color = self.chart.background_color
+
+    # ------------------------------------------------------------------
+    # Dibujo de una región del contenido
+    # ------------------------------------------------------------------
+
+    def paint_region(self, painter: QPainter, region: QRectF, repeat_header: bool = False) -> None:
+        """Dibuja la región ``region`` del contenido con su esquina superior
+        izquierda en el origen actual del ``painter``.
+
+        Con ``repeat_header`` el encabezado se dibuja arriba de la región
+        aunque ésta empiece más abajo (páginas de PDF).
+        """
+        header_offset = self.header_height if repeat_header else 0
+        area = QRectF(0, 0, region.width(), region.height() + header_offset)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setClipRect(area)
+        painter.fillRect(area, self.background_color)
+
+        if repeat_header or region.top() < self.header_height:
+            painter.save()
+            painter.translate(-region.left(), 0 if repeat_header else -region.top())
+            self.header.render_content(painter, self.visible_width, self.header_height)
+            painter.restore()
+
+        # Filas en su propio sistema de coordenadas (y = 0 en la primera fila)
+        rows_top = region.top() - self.header_height
+        rows_bottom = rows_top + region.height()
+        if rows_bottom > 0 and self.chart.tasks:
+            first_row = max(0, int(rows_top // self.row_height))
+            last_row = min(len(self.chart.tasks) - 1, int(rows_bottom // self.row_height))
+            painter.translate(-region.left(), header_offset - rows_top)
+            self.chart.render_rows(painter, first_row, last_row)
+            self.chart.render_today_line(painter, max(0.0, rows_top), rows_bottom)
+        painter.restore()
+
+    def render_tile(self, x: int, y: int, width: int, height: int) -> QImage:
+        """Mosaico RGB888 de la región dada (seguro en hilos de trabajo)."""
+        image = QImage(width, height, QImage.Format.Format_RGB32)
+        painter = QPainter(image)
+        try:
+            self.paint_region(painter, QRectF(x, y, width, height))
+        finally:
+            painter.end()
+        return image.convertToFormat(QImage.Format.Format_RGB888)
+
+    def _prime_render(self) -> None:
+        """Recorre una vez, en el hilo actual, cada camino de dibujo de los
+        mosaicos sobre una imagen de 1x1.
+
+        PySide crea sus tipos enum en el primer acceso, y crearlos desde
+        varios hilos a la vez puede fallar. El encabezado y la línea de hoy
+        siguen el mismo camino en cualquier mosaico, pero las filas dependen
+        del tipo de tarea: se dibuja una fila de cada tipo (tarea, subtarea,
+        con notas) para que los hilos de trabajo encuentren todo creado.
+        """
+        tasks = self.chart.tasks
+        subtask = next((i for i, task in enumerate(tasks) if task.is_subtask), None)
+        noted = next(
+            (i for i, task in enumerate(tasks) if task.notes_html and task.notes_html.strip()), None
+        )
+        rows = {row for row in (0 if tasks else None, subtask, noted) if row is not None}
+        image = QImage(1, 1, QImage.Format.Format_RGB32)
+        painter = QPainter(image)
+        try:
+            self.paint_region(painter, QRectF(0, 0, 1, self.header_height + 1))
+            for row in sorted(rows):
+                self.chart.render_rows(painter, row, row)
+            self.chart.render_today_line(painter, 0.0, 1.0)
+        finally:
+            painter.end()
+        image.convertToFormat(QImage.Format.Format_RGB888)
+
+    # ------------------------------------------------------------------
+    # Formatos
+    # ------------------------------------------------------------------
+
+    def export(self, path: str, workers: int | None = None,
+               progress: ProgressCallback | None = None) -> str:
+        fmt = export_format(path)
+        logger.info("Exportando Gantt %dx%d px a %s", self.width, self.height, path)
+        if fmt == "png":
+            self.export_png(path, workers, progress)
+        elif fmt == "svg":
+            self.export_svg(path)
+        else:
+            self.export_pdf(path, progress)
+        return path
+
+    def export_png(self, path: str, workers: int | None = None,
+                   progress: ProgressCallback | None = None) -> None:
+        tile = self.TILE_SIZE
+        columns = range(0, self.width, tile)
+        strips = range(0, self.height, tile)
+        total = len(columns) * len(strips)
+        done = 0
+        self._prime_render()
+        with ThreadPoolExecutor(max_workers=workers) as pool, \
+                PngStreamWriter(path, self.width, self.height) as writer:
+            for y in strips:
+                strip_height = min(tile, self.height - y)
+                futures = [
+                    pool.submit(self.render_tile, x, y, min(tile, self.width - x), strip_height)
+                    for x in columns
+                ]
+                tiles = [future.result() for future in futures]
+                for rows in zip(*(_image_rows(image) for image in tiles), strict=True):
+                    writer.write_row(b"".join(rows))
+                done += len(tiles)
+                if progress is not None:
+                    progress(done, total)
+
+    def export_svg(self, path: str) -> None:
+        generator = QSvgGenerator()
+        generator.setFileName(path)
+        generator.setSize(QSize(self.width, self.height))
+        generator.setViewBox(QRectF(0, 0, self.width, self.height))
+        generator.setTitle("Diagrama de Gantt")
+        painter = QPainter(generator)
+        try:
+            self.paint_region(painter, QRectF(0, 0, self.width, self.height))
+        finally:
+            painter.end()
+
+    def export_pdf(self, path: str, progress: ProgressCallback | None = None) -> None:
+        writer = QPdfWriter(path)
+        writer.setTitle("Diagrama de Gantt")
+        writer.setResolution(self.PDF_RESOLUTION)
+        writer.setPageLayout(QPageLayout(
+            QPageSize(self.PDF_PAGE_SIZE), QPageLayout.Orientation.Landscape, QMarginsF(10, 10, 10, 10)
+        ))
+        painter = QPainter(writer)
+        try:
+            page_width = painter.device().width()
+            # Cada página repite el encabezado sobre su tramo de filas
+            rows_per_page = max(1, (painter.device().height() - self.header_height) // self.row_height)
+            page_rows_height = rows_per_page * self.row_height
+            rows_height = max(self.height - self.header_height, 1)
+            pages = [
+                (x, y)
+                for x in range(0, self.width, page_width)
+                for y in range(0, rows_height, page_rows_height)
+            ]
+            for number, (x, y) in enumerate(pages):
+                if number:
+                    writer.newPage()
+                width = min(page_width, self.width - x)
+                height = min(page_rows_height, rows_height - y)
+                self.paint_region(
+                    painter, QRectF(x, self.header_height + y, width, height), repeat_header=True
+                )
+                if progress is not None:
+                    progress(number + 1, len(pages))
+        finally:
+            painter.end()
+
+
+def export_gantt(
+    tasks: Sequence[Task],
+    path: str,
+    pixels_per_day: float = 4.0,
+    workers: int | None = None,
+    progress: ProgressCallback | None = None,
+    **options,
+) -> str:
+    """Exporta el Gantt de ``tasks`` a ``path`` (.png, .svg o .pdf)."""
+    exporter = GanttExporter(tasks, pixels_per_day=pixels_per_day, **options)
+    return exporter.export(path, workers=workers, progress=progress)
+
+
+# ---------------------------------------------------------------------------
+# Calendario
+# ---------------------------------------------------------------------------
+
+def _calendar_periods(tasks: Sequence[Task], mode: str) -> list[QDate]:
+    tracker = DateRangeTracker()
+    tracker.sync(list(tasks))
+    bounds = tracker.bounds()
+    if bounds is None:
+        raise ValueError("No hay tareas con fechas válidas para exportar")
+    first = QDate.fromJulianDay(bounds[0])
+    last = QDate.fromJulianDay(bounds[1])
+    if mode == "year":
+        return [QDate(year, 1, 1) for year in range(first.year(), last.year() + 1)]
+    periods = []
+    month = QDate(first.year(), first.month(), 1)
+    while month <= last:
+        periods.append(month)
+        month = month.addMonths(1)
+    return periods
+
+
+def export_calendar(
+    tasks: Sequence[Task],
+    path: str,
+    mode: str = "month",
+    page_size: QSize | None = None,
+    progress: ProgressCallback | None = None,
+) -> str:
+    """Exporta el calendario mensual (``mode="month"``) o anual (``"year"``)
+    de todo el rango del proyecto: una página por periodo en PDF y los
+    periodos apilados verticalmente en PNG/SVG.
+
+    Los widgets de calendario solo se pueden pintar en el hilo de la
+    interfaz, así que aquí no hay mosaicos paralelos; en PNG cada periodo es
+    una franja que se escribe en cuanto se pinta.
+    """
+    fmt = export_format(path)
+    periods = _calendar_periods(tasks, mode)
+    size = page_size or (QSize(1000, 760) if mode == "year" else QSize(900, 640))
+    if mode == "year":
+        widget = YearOverviewWidget(None)
+        # Cada año se pinta una sola vez y el SVG/PDF debe quedar vectorial.
+        widget.use_pixmap_cache = False
+    else:
+        widget = CalendarGridWidget(None)
+    widget.set_tasks(list(tasks))
+    widget.resize(size)
+
+    def show_period(period: QDate) -> None:
+        if mode == "year":
+            widget.set_year(period.year())
+        else:
+            widget.set_month(period)
+
+    logger.info("Exportando calendario (%s, %d periodos) a %s", mode, len(periods), path)
+    total_height = size.height() * len(periods)
+    if fmt == "png":
+        with PngStreamWriter(path, size.width(), total_height) as writer:
+            for number, period in enumerate(periods):
+                show_period(period)
+                image = QImage(size, QImage.Format.Format_RGB32)
+                image.fill(widget.background_color)
+                widget.render(image)
+                for row in _image_rows(image.convertToFormat(QImage.Format.Format_RGB888)):
+                    writer.write_row(row)
+                if progress is not None:
+                    progress(number + 1, len(periods))
+        return path
+
+    if fmt == "svg":
+        device = QSvgGenerator()
+        device.setFileName(path)
+        device.setSize(QSize(size.width(), total_height))
+        device.setViewBox(QRectF(0, 0, size.width(), total_height))
+        device.setTitle("Calendario")
+    else:
+        device = QPdfWriter(path)
+        device.setTitle("Calendario")
+        # 72 ppp: un píxel del widget = un punto de la página
+        device.setResolution(72)
+        device.setPageSize(QPageSize(QSizeF(size), QPageSize.Unit.Point))
+        device.setPageMargins(QMarginsF(0, 0, 0, 0))
+    painter = QPainter(device)
+    try:
+        for number, period in enumerate(periods):
+            show_period(period)
+            if fmt == "pdf" and number:
+                device.newPage()
+            offset = QPoint(0, 0 if fmt == "pdf" else number * size.height())
+            widget.render(painter, offset)
+            if progress is not None:
+                progress(number + 1, len(periods))
+    finally:
+        painter.end()
+    return path
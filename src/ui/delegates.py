@@ -3,11 +3,8 @@
 from PySide6.QtCore import QDate, QEvent, QSize, Qt
 from PySide6.QtGui import QBrush, QColor, QFont, QTextCharFormat
 from PySide6.QtWidgets import QDateEdit, QLineEdit, QSpinBox, QStyledItemDelegate
-from workalendar.america import Colombia
 
-# Instancia compartida: workalendar cachea los festivos por año internamente,
-# así que reutilizarla evita recalcularlos en cada apertura del calendario.
-_HOLIDAY_CALENDAR = Colombia()
+from core.work_calendar import holidays_in_year
 
 _HOLIDAY_TEXT_FORMAT = QTextCharFormat()
 _HOLIDAY_TEXT_FORMAT.setForeground(QColor(214, 40, 40))
@@ -16,7 +13,7 @@ _HOLIDAY_TEXT_FORMAT.setFontWeight(QFont.Weight.Bold)
 
 def _mark_holidays(calendar_widget, year):
     """Resalta los festivos colombianos del año dado en el popup de QDateEdit."""
-    for day, _label in _HOLIDAY_CALENDAR.holidays(year):
+    for day, _label in holidays_in_year(year):
         calendar_widget.setDateTextFormat(QDate(day.year, day.month, day.day), _HOLIDAY_TEXT_FORMAT)
 
 
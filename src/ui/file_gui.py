@@ -5,7 +5,7 @@ import os
 #16
 import sys
 
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import QThread, QTimer, Signal
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import (
     QApplication,
@@ -19,8 +19,7 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QPushButton,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
@@ -32,102 +31,148 @@ except ImportError:
     QWebEngineView = None
     WEBENGINE_AVAILABLE = False
 
-import re
-
+from core.import_cache import ImportCache
+from core.mpp_worker import JVM_FAILED, JVM_READY, JVM_STARTING, shared_worker
 from core.pdf_extractor import PDFLoaderThread, TaskTreeNode
-from core.pdf_security_checker import check_pdf_restrictions
-from core.xlsx_security_checker import check_xlsx_restrictions
+from core.project_file_extractor import PROJECT_FILE_EXTENSIONS, iter_project_file
+from core.xlsx_security_checker import XLSXRestrictedError, check_xlsx_restrictions
+from ui.import_table import ImportTableModel
 from ui.loading_animation_widget import LoadingAnimationWidget
-from utils.filter_util import is_start_end_task, normalize_string
-from utils.jvm_manager import JVMManager
+from utils.filter_util import TermMatcher, is_start_end_task, split_terms
 
 logger = logging.getLogger("bpm.file_gui")
 
+# Tareas por lote emitido con tasks_batch mientras se lee el archivo
+LOADER_BATCH_SIZE = 200
+# Pausa de escritura (ms) antes de volver a filtrar la tabla
+FILTER_DELAY_MS = 150
+
+
 class MPPLoaderThread(QThread):
+    tasks_batch = Signal(list)
     tasks_extracted = Signal(list, list)
+    # Mensaje de error si la lectura falla (los lotes ya emitidos no valen)
+    failed = Signal(str)
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache=None):
         super().__init__()
         self.file_path = file_path
-
-    def format_outline_number(self, task):
-        """Genera el número de esquema jerárquico para una tarea"""
-        outline_number = task.getOutlineNumber()
-        if (outline_number is not None):
-            return str(outline_number)
-        return ''
+        self.cache = cache
 
     def run(self):
+        key, cached = self.cache.lookup(self.file_path, "mpp") if self.cache else (None, None)
+        if cached is not None:
+            self.tasks_batch.emit(cached[0])
+            self.tasks_extracted.emit(*cached)
+            return
         try:
-            from core.mpp_extractor import MPPReader
-            mpp_reader = MPPReader()
-
+            # MPXJ corre en el proceso de lectura (core.mpp_worker), que
+            # devuelve las tareas por bloques ya convertidas a diccionarios.
             tasks = []
             task_tree = []
+            for batch in shared_worker().iter_batches(self.file_path, LOADER_BATCH_SIZE):
+                tasks.extend(batch)
+                task_tree.extend(TaskTreeNode(task_dict) for task_dict in batch)
+                self.tasks_batch.emit(batch)
 
-            from net.sf.mpxj.reader import UniversalProjectReader
-            reader = UniversalProjectReader()
-            project = reader.read(self.file_path)
-
-            for task in project.getTasks():
-                if task.getID() is None:
-                    continue
-
-                task_name = str(task.getName()) if task.getName() is not None else ''
+            if key and tasks:
+                self.cache.store(key, tasks, task_tree)
+            # Solo emitir los datos extraídos
+            self.tasks_extracted.emit(tasks, task_tree)
 
-                if is_start_end_task(task_name) or (task.getDuration() is not None and task.getDuration().getDuration() == 0):
-                    continue
+        except Exception as e:
+            logger.warning(f"Error al extraer tareas MPP: {e}")
+            import traceback
+            traceback.print_exc()
+            self.failed.emit(str(e))
 
-                outline_number = self.format_outline_number(task)
+class ProjectFileLoaderThread(QThread):
+    """Importa exportaciones de Project (MSPDI .xml, MPX) sin JVM; produce
+    las mismas tareas que MPPLoaderThread."""
+    tasks_batch = Signal(list)
+    tasks_extracted = Signal(list, list)
+    failed = Signal(str)
 
-                task_dict = {
-                    'task_id': str(task.getID()),
-                    'level': outline_number,
-                    'name': task_name,
-                    'start_date': mpp_reader.format_date(task.getStart()),
-                    'end_date': mpp_reader.format_date(task.getFinish()),
-                    'indentation': task.getOutlineLevel() - 1,
-                    'outline_level': task.getOutlineLevel() - 1
-                }
+    def __init__(self, file_path, cache=None):
+        super().__init__()
+        self.file_path = file_path
+        self.cache = cache
 
-                tasks.append(task_dict)
-                task_tree.append(TaskTreeNode(task_dict))
+    def run(self):
+        kind = "mpx" if self.file_path.lower().endswith('.mpx') else "mspdi"
+        key, cached = self.cache.lookup(self.file_path, kind) if self.cache else (None, None)
+        if cached is not None:
+            self.tasks_batch.emit(cached[0])
+            self.tasks_extracted.emit(*cached)
+            return
+        try:
+            tasks = []
+            task_tree = []
+            for batch in iter_project_file(self.file_path, LOADER_BATCH_SIZE):
+                tasks.extend(batch)
+                task_tree.extend(TaskTreeNode(task_dict) for task_dict in batch)
+                self.tasks_batch.emit(batch)
 
-            # Solo emitir los datos extraídos
+            if key and tasks:
+                self.cache.store(key, tasks, task_tree)
             self.tasks_extracted.emit(tasks, task_tree)
 
         except Exception as e:
-            logger.warning(f"Error al extraer tareas MPP: {e}")
+            logger.warning(f"Error al extraer tareas de {self.file_path}: {e}")
             import traceback
             traceback.print_exc()
-            self.tasks_extracted.emit([], [])
+            self.failed.emit(str(e))
 
 class XLSXLoaderThread(QThread):
+    tasks_batch = Signal(list)
     tasks_extracted = Signal(list, list)
+    # Mensaje para el usuario si el libro está protegido o no se puede abrir
+    restricted = Signal(str)
+    failed = Signal(str)
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache=None):
         super().__init__()
         self.file_path = file_path
+        self.cache = cache
 
     def run(self):
+        key, cached = self.cache.lookup(self.file_path, "xlsx") if self.cache else (None, None)
+        if cached is not None:
+            self.tasks_batch.emit(cached[0])
+            self.tasks_extracted.emit(*cached)
+            return
         try:
             from core.xlsx_extractor import XLSXReader
             xlsx_reader = XLSXReader()
-            tasks = xlsx_reader.read_xlsx(self.file_path)
-
+            if xlsx_reader.engine_for(self.file_path) == "stream":
+                # Abrir el libro en streaming ya verifica las restricciones
+                batches = xlsx_reader.stream_xlsx(self.file_path, LOADER_BATCH_SIZE)
+            else:
+                restriction_message = check_xlsx_restrictions(self.file_path)
+                if restriction_message:
+                    raise XLSXRestrictedError(restriction_message)
+                batches = xlsx_reader.iter_xlsx(self.file_path, LOADER_BATCH_SIZE, "pandas")
+            tasks = []
             task_tree = []
-            for task in tasks:
-                if not is_start_end_task(task['name']):
-                    task_tree.append(TaskTreeNode(task))
-
+            for batch in batches:
+                tasks.extend(batch)
+                for task in batch:
+                    if not is_start_end_task(task['name']):
+                        task_tree.append(TaskTreeNode(task))
+                self.tasks_batch.emit(batch)
+
+            if key and tasks:
+                self.cache.store(key, tasks, task_tree)
             # Solo emitir los datos extraídos
             self.tasks_extracted.emit(tasks, task_tree)
 
+        except XLSXRestrictedError as e:
+            self.restricted.emit(str(e))
         except Exception as e:
             logger.warning(f"Error al extraer tareas XLSX: {e}")
             import traceback
             traceback.print_exc()
-            self.tasks_extracted.emit([], [])
+            self.failed.emit(str(e))
 
 class MainWindow(QMainWindow):
     tasks_imported = Signal(list)
@@ -142,16 +187,10 @@ class MainWindow(QMainWindow):
         'end_date': 100,   # Ancho de la columna "Fecha Fin"
     }
 
-    def table_cell_clicked(self, row, column):
-        # Si se hace clic en la columna del nombre (columna 3)
-        if column == 3:
-            checkbox_item = self.table.item(row, 0)
-            if checkbox_item:
-                # Cambiar el estado del checkbox
-                new_state = (Qt.CheckState.Unchecked
-                            if checkbox_item.checkState() == Qt.CheckState.Checked
-                            else Qt.CheckState.Checked)
-                checkbox_item.setCheckState(new_state)
+    def table_cell_clicked(self, index):
+        # Un clic en el nombre también marca o desmarca la tarea
+        if index.column() == ImportTableModel.COL_NAME:
+            self.table_model.toggle(index.row())
 
     def __init__(self):
         super().__init__()
@@ -162,14 +201,13 @@ class MainWindow(QMainWindow):
         self.selected_color = None
         self.default_color = QColor(34, 163, 159)
 
-        # Iniciar la JVM usando el manager
-        self.jvm_manager = JVMManager()
-        if not self.jvm_manager.start_jvm():
-            QMessageBox.critical(
-                self,
-                "Error",
-                "No se pudo iniciar la JVM. La funcionalidad de importación puede estar limitada."
-            )
+        # Importaciones ya extraídas, por contenido del archivo
+        self.import_cache = ImportCache()
+
+        # El proceso de lectura de MPP (con su JVM) se inicia en segundo
+        # plano si no se precalentó al arrancar la aplicación; la importación
+        # de MPP espera a que esté listo.
+        self.mpp_worker = shared_worker()
 
         # Inicializar botones
         self.init_buttons()
@@ -196,9 +234,17 @@ class MainWindow(QMainWindow):
         search_title = QLabel("Buscador")
         main_layout.addWidget(search_title)
 
+        # Los cambios de texto filtran cuando se deja de escribir
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self.filter_tasks)
+        # Filtro aplicado a todas las filas (para refinarlo sin recorrerlas)
+        self._matcher = None
+
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Buscar tareas (todas las palabras, separadas por comas)...")
-        self.search_bar.textChanged.connect(self.filter_tasks)
+        self.search_bar.textChanged.connect(self._filter_timer.start)
         main_layout.addWidget(self.search_bar)
 
         filter_title = QLabel("Filtro")
@@ -216,33 +262,34 @@ class MainWindow(QMainWindow):
         inputs_layout = QHBoxLayout()
         self.include_bar = QLineEdit()
         self.include_bar.setPlaceholderText("Palabras a incluir (separadas por comas)...")
-        self.include_bar.textChanged.connect(self.filter_tasks)
+        self.include_bar.textChanged.connect(self._filter_timer.start)
         inputs_layout.addWidget(self.include_bar)
 
         self.exclude_bar = QLineEdit()
         self.exclude_bar.setPlaceholderText("Palabras a excluir (separadas por comas)...")
-        self.exclude_bar.textChanged.connect(self.filter_tasks)
+        self.exclude_bar.textChanged.connect(self._filter_timer.start)
         inputs_layout.addWidget(self.exclude_bar)
 
         search_parent_layout.addLayout(inputs_layout)
         self.task_counter = QLabel("Tareas encontradas: 0")
         search_parent_layout.addWidget(self.task_counter)
+        self.jvm_status_label = QLabel()
+        search_parent_layout.addWidget(self.jvm_status_label)
+        self.mpp_worker.statusChanged.connect(self.on_jvm_status)
+        self.mpp_worker.warm_up()
+        self.on_jvm_status(self.mpp_worker.status())
 
         main_layout.addLayout(search_parent_layout)
 
-        # Tabla para mostrar tareas
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "", "ID", "Nivel", "Nombre de Tarea",
-            "Fecha Inicio", "Fecha Fin"
-        ])
-
-        # Conectar la señal de cambio de celda
-        self.table.itemChanged.connect(self.on_item_changed)
+        # Tabla para mostrar tareas: la vista pinta solo las filas a la vista
+        # y el modelo lleva la selección y los contadores
+        self.table_model = ImportTableModel(self)
+        self.table_model.countsChanged.connect(self.update_task_counter)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
 
         # Conectar la señal de clic en celda
-        self.table.cellClicked.connect(self.table_cell_clicked)
+        self.table.clicked.connect(self.table_cell_clicked)
 
         # Obtener el header horizontal
         header = self.table.horizontalHeader()
@@ -281,6 +328,7 @@ class MainWindow(QMainWindow):
         self.task_tree = []
         self.source_file = ""
         self.loader_thread = None
+        self._loading_rows = False
 
     def init_buttons(self):
         """Inicializa todos los botones de la interfaz."""
@@ -326,58 +374,116 @@ class MainWindow(QMainWindow):
         if file_type == 'pdf':
             file_filter = "Archivos PDF (*.pdf)"
         elif file_type == 'mpp':
-            file_filter = "Archivos MPP (*.mpp)"
+            file_filter = "Archivos de Project (*.mpp *.xml *.mpx)"
         elif file_type == 'xlsx':
             file_filter = "Archivos Excel (*.xlsx)"
         else:
-            file_filter = "Archivos (*.pdf *.mpp *.xlsx)"
+            file_filter = "Archivos (*.pdf *.mpp *.xml *.mpx *.xlsx)"
 
         file_name, _ = QFileDialog.getOpenFileName(self, "Abrir Archivo", "", file_filter)
         if file_name:
-            if file_type == 'pdf':
-                # Verificar restricciones
-                restriction_message = check_pdf_restrictions(file_name)
-                if restriction_message:
-                    QMessageBox.warning(self, "Restricción en PDF", restriction_message)
-                    return
-            elif file_type == 'xlsx':
-                # Verificar restricciones antes de continuar
-                restriction_message = check_xlsx_restrictions(file_name)
-                if restriction_message:
-                    QMessageBox.warning(self, "Restricción detectada", restriction_message)
-                    return
             self.source_file = file_name
             self.reset_color_selection()
+            # La tabla se llena por lotes a medida que se lee el archivo
+            self.tasks = []
+            self.task_tree = []
+            self._loading_rows = True
+            self._matcher = None
+            self.table_model.clear()
             self.show_loading(True)
             self.load_pdf_button.setEnabled(False)
             self.load_mpp_button.setEnabled(False)
             self.load_xlsx_button.setEnabled(False)
 
             if file_name.lower().endswith('.pdf'):
-                self.loader_thread = PDFLoaderThread(file_name)
+                self.loader_thread = PDFLoaderThread(file_name, self.import_cache)
             elif file_name.lower().endswith('.mpp'):
-                self.loader_thread = MPPLoaderThread(file_name)
+                self.loader_thread = MPPLoaderThread(file_name, self.import_cache)
+            elif file_name.lower().endswith(PROJECT_FILE_EXTENSIONS):
+                # MSPDI y MPX se leen en Python, sin esperar a la JVM
+                self.loader_thread = ProjectFileLoaderThread(file_name, self.import_cache)
             elif file_name.lower().endswith('.xlsx'):
-                self.loader_thread = XLSXLoaderThread(file_name)
+                self.loader_thread = XLSXLoaderThread(file_name, self.import_cache)
             else:
                 QMessageBox.warning(self, "Archivo no soportado",
-                                  "Por favor seleccione un archivo PDF, MPP o XLSX.")
+                                  "Por favor seleccione un archivo PDF, MPP, XML, MPX o XLSX.")
+                self._loading_rows = False
                 self.show_loading(False)
                 self.load_pdf_button.setEnabled(True)
                 self.load_mpp_button.setEnabled(True)
                 self.load_xlsx_button.setEnabled(True)
                 return
 
+            self.loader_thread.tasks_batch.connect(self.on_tasks_batch)
             self.loader_thread.tasks_extracted.connect(self.on_tasks_extracted)
+            self.loader_thread.failed.connect(self.on_load_failed)
+            if isinstance(self.loader_thread, (PDFLoaderThread, XLSXLoaderThread)):
+                # Las restricciones del PDF y del XLSX se verifican en el hilo
+                # de carga, al abrir el archivo para leerlo
+                self.loader_thread.restricted.connect(self.on_load_restricted)
             self.loader_thread.start()
 
-    def on_tasks_extracted(self, tasks, task_tree):
-        """Solo cargar las tareas en la tabla, sin emitir la señal de importación"""
+    def on_tasks_batch(self, batch):
+        """Agrega a la tabla un lote recién leído, ya filtrado, mientras el
+        resto del archivo se sigue leyendo."""
+        if not self.tasks:
+            # Con el primer lote el usuario ya puede revisar y seleccionar tareas
+            self.show_loading(False)
+        self.tasks.extend(batch)
+        self._filter_rows(self.table_model.append_tasks(batch))
+
+    def on_jvm_status(self, status):
+        """Muestra si Java está listo para importar archivos MPP."""
+        if status == JVM_READY:
+            self.jvm_status_label.setText("Java: listo para MPP")
+        elif status == JVM_STARTING:
+            self.jvm_status_label.setText("Java: iniciando…")
+        elif status == JVM_FAILED:
+            self.jvm_status_label.setText("Java: no disponible")
+            QMessageBox.critical(
+                self,
+                "Error",
+                "No se pudo iniciar la JVM. La funcionalidad de importación puede estar limitada."
+            )
+        else:
+            self.jvm_status_label.setText("")
+
+    def _end_loading(self):
+        """Quita la animación de carga y vuelve a habilitar los botones."""
+        self._loading_rows = False
         self.show_loading(False)
         self.load_pdf_button.setEnabled(True)
         self.load_mpp_button.setEnabled(True)
         self.load_xlsx_button.setEnabled(True)
 
+    def on_load_restricted(self, message):
+        """El hilo de carga no pudo abrir el archivo por restricciones."""
+        self._end_loading()
+        self.update_task_counter()
+        if self.source_file.lower().endswith('.pdf'):
+            QMessageBox.warning(self, "Restricción en PDF", message)
+        else:
+            QMessageBox.warning(self, "Restricción detectada", message)
+
+    def on_load_failed(self, message):
+        """La lectura falló a medias: las filas ya recibidas por lotes son
+        un cronograma incompleto, así que se descartan en vez de importarlas."""
+        self._end_loading()
+        self.tasks = []
+        self.task_tree = []
+        self._matcher = None
+        self.table_model.clear()
+        self.update_task_counter()
+        QMessageBox.warning(
+            self,
+            "Error al extraer tareas",
+            f"No se pudo leer el archivo completo y no se importó ninguna tarea.\n\n{message}"
+        )
+
+    def on_tasks_extracted(self, tasks, task_tree):
+        """Solo cargar las tareas en la tabla, sin emitir la señal de importación"""
+        self._end_loading()
+
         if not tasks:
             QMessageBox.warning(
                 self,
@@ -386,9 +492,14 @@ class MainWindow(QMainWindow):
             )
             return
 
+        streamed = len(self.tasks) == len(tasks)
         self.tasks = tasks
         self.task_tree = task_tree
-        self.populate_table()
+        if streamed:
+            # Las filas ya llegaron por lotes (tasks_batch)
+            self.update_task_counter()
+        else:
+            self.populate_table()
 
     def show_loading(self, show):
         if show:
@@ -403,16 +514,18 @@ class MainWindow(QMainWindow):
             self.loading_animation.start()
             self.loading_animation.raise_()
         else:
-            # Ocultar el overlay y la animación
-            if hasattr(self, 'overlay'):
+            # Ocultar el overlay y la animación (puede llamarse dos veces
+            # por carga: con el primer lote y al terminar)
+            if getattr(self, 'overlay', None) is not None:
                 self.overlay.hide()
                 self.overlay.deleteLater()
+                self.overlay = None
             self.loading_animation.stop()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
         # Actualizar tamaño y posición del overlay si existe
-        if hasattr(self, 'overlay') and self.overlay.isVisible():
+        if getattr(self, 'overlay', None) is not None and self.overlay.isVisible():
             self.overlay.setGeometry(self.rect())
             # Actualizar posición de la animación
             if self.loading_animation.isVisible():
@@ -421,109 +534,51 @@ class MainWindow(QMainWindow):
                 self.loading_animation.move(x, y)
 
     def populate_table(self):
-        self.table.setRowCount(len(self.tasks))
-        for row, task in enumerate(self.tasks):
-            try:
-                # Añadir checkbox
-                checkbox = QTableWidgetItem()
-                checkbox.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-                checkbox.setCheckState(Qt.CheckState.Checked)  # Seleccionado por defecto
-                self.table.setItem(row, 0, checkbox)
-
-                # ID de Tarea
-                id_item = QTableWidgetItem(str(task.get('task_id', '')))
-                id_item.setFlags(id_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 1, id_item)
-
-                # Nivel
-                level_item = QTableWidgetItem(str(task.get('level', '')))
-                level_item.setFlags(level_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 2, level_item)
-
-                # Nombre de la tarea con indentación visual
-                task_name = self.clean_task_name(task.get('name', ''))
-                indentation = task.get('outline_level', 0)
-                display_name = '    ' * indentation + task_name
-                name_item = QTableWidgetItem(display_name)
-                name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 3, name_item)
-
-                # Fechas
-                start_date = task.get('start_date', '')
-                end_date = task.get('end_date', '')
-                if not start_date:
-                    start_date = "N/A"
-                if not end_date:
-                    end_date = "N/A"
-
-                start_item = QTableWidgetItem(str(start_date))
-                start_item.setFlags(start_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 4, start_item)
-
-                end_item = QTableWidgetItem(str(end_date))
-                end_item.setFlags(end_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.table.setItem(row, 5, end_item)
-
-            except Exception as e:
-                logger.warning(f"Error al procesar tarea {row}: {str(e)}")
-                continue
-
-        self.update_task_counter()
-
-    def clean_task_name(self, name):
-        """Limpia el nombre de la tarea, maneja casos donde name no es string."""
-        if name is None:
-            return ""
-
-        # Convertir a string si no lo es
-        name = str(name)
-
-        cleaned_name = re.sub(r'^\d+[\.\-\s]+', '', name)
-        return cleaned_name
+        self._matcher = None
+        self.table_model.clear()
+        self.table_model.append_tasks(self.tasks)
+        self.filter_tasks()
 
     def filter_tasks(self):
-        search_terms = [normalize_string(term.strip()) for term in self.search_bar.text().split(',') if term.strip()]
-        include_terms = [normalize_string(term.strip()) for term in self.include_bar.text().split(',') if term.strip()]
-        exclude_terms = [normalize_string(term.strip()) for term in self.exclude_bar.text().split(',') if term.strip()]
-        visible_tasks = 0
-
-        for row in range(self.table.rowCount()):
-            task_name = self.table.item(row, 3).text()  # Cambiar índice de 2 a 3
-            normalized_task_name = normalize_string(task_name)
-            if self.table.item(row, 2).text() == "":  # Cambiar índice de 1 a 2
-                self.table.setRowHidden(row, True)
-                continue
-
-            search_match = all(term in normalized_task_name for term in search_terms) if search_terms else True
-            include_match = any(term in normalized_task_name for term in include_terms) if include_terms else True
-            exclude_match = any(term in normalized_task_name for term in exclude_terms) if exclude_terms else False
-
-            if search_match and include_match and not exclude_match:
-                self.table.setRowHidden(row, False)
-                visible_tasks += 1
-            else:
-                self.table.setRowHidden(row, True)
-
-        self.update_task_counter(visible_tasks)
-
-    def on_item_changed(self, item):
-        # Solo actualizar si el cambio fue en la columna de selección
-        if item.column() == 0:
-            self.update_task_counter()
-
-    def update_task_counter(self, visible_count=None):
-        if visible_count is None:
-            visible_count = sum(1 for row in range(self.table.rowCount())
-                          if not self.table.isRowHidden(row))
+        self._filter_timer.stop()
+        self._filter_rows(0)
+
+    def _filter_rows(self, first_row):
+        """Aplica búsqueda y filtro a las filas desde ``first_row`` (al llegar
+        un lote, solo a las nuevas). Si el filtro solo se hizo más estricto
+        (p. ej. se alargó un término), solo se revisan las filas visibles."""
+        matcher = TermMatcher(
+            split_terms(self.search_bar.text()),
+            split_terms(self.include_bar.text()),
+            split_terms(self.exclude_bar.text()),
+        )
+        model = self.table_model
+        names = model.search_names
+        matches = matcher.matches
 
-        # Contar tareas seleccionadas
-        selected_count = sum(1 for row in range(self.table.rowCount())
-                        if not self.table.isRowHidden(row)
-                        and self.table.item(row, 0)
-                        and self.table.item(row, 0).checkState() == Qt.CheckState.Checked)
+        # Actualiza el contador (countsChanged)
+        if first_row == 0 and matcher.narrows(self._matcher):
+            model.restrict([matches(names[index]) for index in model.visible_tasks()])
+        else:
+            has_level = model.has_level
+            model.set_visibility(first_row, [
+                has_level[index] and matches(names[index])
+                for index in range(first_row, model.task_count())
+            ])
+        if first_row == 0 or matcher == self._matcher:
+            self._matcher = matcher
+        else:
+            # Un lote filtrado con otro texto: las filas anteriores no
+            # reflejan este filtro hasta el próximo filtrado completo
+            self._matcher = None
 
+    def update_task_counter(self):
+        model = self.table_model
         file_name = os.path.basename(self.source_file) if self.source_file else "Ningún archivo cargado"
-        self.task_counter.setText(f"Archivo: {file_name}    |    Tareas encontradas: {selected_count}/{visible_count}")
+        status = "    |    Leyendo archivo…" if self._loading_rows else ""
+        self.task_counter.setText(
+            f"Archivo: {file_name}    |    Tareas encontradas: {model.selected_count}/{model.visible_count}{status}"
+        )
 
     def save_filter(self):
         file_name, _ = QFileDialog.getSaveFileName(self, "Guardar Filtro", "", "Archivos de Filtro (*.ft)")
@@ -609,28 +664,24 @@ class MainWindow(QMainWindow):
         task_hierarchy = {}
 
         # Primera pasada: crear un listado de tareas principales
-        for row in range(self.table.rowCount()):
-            if (not self.table.isRowHidden(row) and
-                self.table.item(row, 0).checkState() == Qt.CheckState.Checked):
-
-                level = self.table.item(row, 2).text().strip() # Nivel
-                name = self.table.item(row, 3).text().strip()
-                start_date = self.table.item(row, 4).text().strip()
-                end_date = self.table.item(row, 5).text().strip()
-
-                task_data = {
-                    'name': name,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'color': self.selected_color.name(),
-                    'level': level,
-                    'parent_task': None,
-                    'is_subtask': False  # Marcar todas como tareas padre
-                }
-
-                task_hierarchy[level] = task_data  # Agregar la tarea al diccionario de jerarquía
-
-                final_tasks.append(task_data)
+        for index in self.table_model.selected_tasks():
+            _task_id, level, name, start_date, end_date = (
+                text.strip() for text in self.table_model.row_texts(index)
+            )
+
+            task_data = {
+                'name': name,
+                'start_date': start_date,
+                'end_date': end_date,
+                'color': self.selected_color.name(),
+                'level': level,
+                'parent_task': None,
+                'is_subtask': False  # Marcar todas como tareas padre
+            }
+
+            task_hierarchy[level] = task_data  # Agregar la tarea al diccionario de jerarquía
+
+            final_tasks.append(task_data)
 
         if not final_tasks:
             QMessageBox.warning(
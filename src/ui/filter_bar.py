@@ -0,0 +1,174 @@
+"""filter_bar.py
+Barra de filtro de tareas (Ctrl+F) mostrada sobre la tabla y el Gantt.
+
+Solo construye un ``TaskFilter`` a partir de los controles; el filtrado en sí
+lo resuelve ``TaskTableModel.set_filter`` con los índices de
+``core.task_filter``.
+"""
+from __future__ import annotations
+
+from PySide6.QtCore import QDate, Qt, QTimer, Signal
+from PySide6.QtGui import QColor, QIcon, QPixmap
+from PySide6.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDateEdit,
+    QHBoxLayout,
+    QLineEdit,
+    QToolButton,
+    QWidget,
+)
+
+from core.spatial_index import day_from_date
+from core.task_filter import TaskFilter
+
+_ALERT_CHOICES = [
+    ("Todas las alertas", frozenset()),
+    ("Próximas a vencer", frozenset({"upcoming"})),
+    ("Vencidas", frozenset({"overdue"})),
+    ("Con recordatorio hoy", frozenset({"extra_reminder"})),
+]
+
+
+class TaskFilterBar(QWidget):
+    """Controles de filtro: texto, ventana de fechas, color y alertas.
+
+    Emite ``filter_changed(TaskFilter)`` tras una breve pausa en la escritura
+    y ``closed`` al pulsar el botón de cerrar o Escape en la búsqueda.
+    """
+
+    filter_changed = Signal(object)
+    closed = Signal()
+
+    DEBOUNCE_MS = 120
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 2, 4, 2)
+        layout.setSpacing(6)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Buscar en nombre y notas...")
+        self.search_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.search_edit, 1)
+
+        today = QDate.currentDate()
+        self.from_check = QCheckBox("Desde")
+        self.from_edit = self._date_edit(today.addMonths(-1))
+        self.to_check = QCheckBox("Hasta")
+        self.to_edit = self._date_edit(today.addMonths(1))
+        for widget in (self.from_check, self.from_edit, self.to_check, self.to_edit):
+            layout.addWidget(widget)
+
+        self.color_combo = QComboBox()
+        self.color_combo.addItem("Todos los colores", None)
+        layout.addWidget(self.color_combo)
+
+        self.alert_combo = QComboBox()
+        for label, kinds in _ALERT_CHOICES:
+            self.alert_combo.addItem(label, kinds)
+        layout.addWidget(self.alert_combo)
+
+        close_button = QToolButton()
+        close_button.setText("✕")
+        close_button.setToolTip("Quitar filtro (Esc)")
+        close_button.setAutoRaise(True)
+        close_button.clicked.connect(self.closed.emit)
+        layout.addWidget(close_button)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._emit_filter)
+
+        self.search_edit.textChanged.connect(self._debounce.start)
+        self.search_edit.returnPressed.connect(self._emit_filter)
+        for check in (self.from_check, self.to_check):
+            check.toggled.connect(self._emit_filter)
+        for edit in (self.from_edit, self.to_edit):
+            edit.dateChanged.connect(self._on_date_changed)
+        self.color_combo.currentIndexChanged.connect(self._emit_filter)
+        self.alert_combo.currentIndexChanged.connect(self._emit_filter)
+
+    @staticmethod
+    def _date_edit(value: QDate) -> QDateEdit:
+        edit = QDateEdit(value)
+        edit.setCalendarPopup(True)
+        edit.setDisplayFormat("dd/MM/yyyy")
+        return edit
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def set_colors(self, colors: list[QColor]) -> None:
+        """Rellena el combo de colores con los colores usados en el proyecto."""
+        current = self.color_combo.currentData()
+        self.color_combo.blockSignals(True)
+        self.color_combo.clear()
+        self.color_combo.addItem("Todos los colores", None)
+        names = sorted({c.name() for c in colors})
+        for name in names:
+            swatch = QPixmap(12, 12)
+            swatch.fill(QColor(name))
+            self.color_combo.addItem(QIcon(swatch), name, name)
+        index = self.color_combo.findData(current) if current else 0
+        self.color_combo.setCurrentIndex(max(index, 0))
+        self.color_combo.blockSignals(False)
+
+    def current_filter(self) -> TaskFilter:
+        start = end = None
+        if self.from_check.isChecked():
+            start = day_from_date(self.from_edit.date().toPython())
+        if self.to_check.isChecked():
+            end = day_from_date(self.to_edit.date().toPython())
+        color = self.color_combo.currentData()
+        return TaskFilter(
+            text=self.search_edit.text(),
+            start=start,
+            end=end,
+            colors=frozenset({color}) if color else frozenset(),
+            alert_kinds=self.alert_combo.currentData() or frozenset(),
+        )
+
+    def clear(self) -> None:
+        """Restablece los controles sin emitir ``filter_changed``."""
+        self._debounce.stop()
+        for widget in (
+            self.search_edit, self.from_check, self.to_check,
+            self.color_combo, self.alert_combo,
+        ):
+            widget.blockSignals(True)
+        self.search_edit.clear()
+        self.from_check.setChecked(False)
+        self.to_check.setChecked(False)
+        self.color_combo.setCurrentIndex(0)
+        self.alert_combo.setCurrentIndex(0)
+        for widget in (
+            self.search_edit, self.from_check, self.to_check,
+            self.color_combo, self.alert_combo,
+        ):
+            widget.blockSignals(False)
+
+    def focus_search(self) -> None:
+        self.search_edit.setFocus(Qt.FocusReason.ShortcutFocusReason)
+        self.search_edit.selectAll()
+
+    # ------------------------------------------------------------------
+    # Eventos
+    # ------------------------------------------------------------------
+
+    def keyPressEvent(self, event) -> None:
+        if event.key() == Qt.Key.Key_Escape:
+            self.closed.emit()
+            return
+        super().keyPressEvent(event)
+
+    def _on_date_changed(self, _date: QDate) -> None:
+        if self.from_check.isChecked() or self.to_check.isChecked():
+            self._emit_filter()
+
+    def _emit_filter(self) -> None:
+        self._debounce.stop()
+        self.filter_changed.emit(self.current_filter())
@@ -9,9 +9,23 @@ import logging
 import os
 import subprocess
 import sys
-from datetime import datetime, timedelta
-
-from PySide6.QtCore import QDate, QEvent, QPoint, QRect, QRectF, Qt, QTimer, Signal
+from datetime import datetime
+
+from PySide6.QtCore import (
+    QAbstractAnimation,
+    QDate,
+    QEasingCurve,
+    QElapsedTimer,
+    QEvent,
+    QObject,
+    QPoint,
+    QRect,
+    QRectF,
+    Qt,
+    QTimer,
+    QVariantAnimation,
+    Signal,
+)
 from PySide6.QtGui import QBrush, QColor, QFont, QPainter, QPainterPath, QPalette, QPen
 from PySide6.QtWidgets import (
     QApplication,
@@ -24,12 +38,52 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from workalendar.america import Colombia
 
+from core.spatial_index import TaskSpatialIndex, day_from_date
+from core.work_calendar import end_after_working_days, is_working_day, working_days_between
 from ui.hipervinculo import HyperlinkTextEdit
 
 logger = logging.getLogger("bpm.gantt")
 
+
+def _snap_to_working_day(day, step):
+    """Primer día hábil a partir de ``day`` avanzando en la dirección ``step``."""
+    for _ in range(31):
+        if is_working_day(day):
+            return day
+        day += step
+    return day
+
+
+class _BarDrag:
+    """Estado de un arrastre de barra en curso (mover o redimensionar)."""
+
+    __slots__ = ("row", "task", "mode", "press_x", "start", "end", "working_days",
+                 "active", "pending_x", "preview")
+
+    def __init__(self, row, task, mode, press_x, span):
+        self.row = row
+        self.task = task
+        self.mode = mode  # "move", "start" o "end"
+        self.press_x = press_x
+        self.start, self.end = span
+        self.working_days = working_days_between(*span)
+        self.active = False
+        self.pending_x = press_x
+        self.preview = span
+
+
+def _paint_zoom_frame(painter, widget, frame):
+    """Dibuja un cuadro intermedio del zoom: la última imagen renderizada
+    escalada horizontalmente (detalle reducido, coste independiente del
+    número de filas)."""
+    pixmap, offset, scale = frame
+    painter.fillRect(widget.rect(), widget.background_color)
+    ratio = pixmap.devicePixelRatio() or 1.0
+    target = QRectF(offset, 0, pixmap.width() / ratio * scale, pixmap.height() / ratio)
+    painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+
+
 class GanttHeaderView(QWidget):
     def __init__(self, header_height=30, parent=None):
         super().__init__(parent)
@@ -39,6 +93,7 @@ class GanttHeaderView(QWidget):
         self.header_height = header_height
         self.setFixedHeight(self.header_height)
         self.scroll_offset = 0
+        self.zoom_frame = None  # (pixmap, desplazamiento x, escala) durante el zoom animado
         self.update_colors()
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)  # Permitir expansión horizontal
 
@@ -72,146 +127,161 @@ class GanttHeaderView(QWidget):
         self.pixels_per_day = pixels_per_day
         self.update()  # Redibuja el encabezado
 
+    def set_zoom_frame(self, frame):
+        self.zoom_frame = frame
+        self.update()
+
     def paintEvent(self, event):
+        if self.zoom_frame is not None:
+            with QPainter(self) as painter:
+                _paint_zoom_frame(painter, self, self.zoom_frame)
+            return
         if not self.min_date or not self.max_date or not self.pixels_per_day:
             return
 
         with QPainter(self) as painter:
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
             painter.fillRect(event.rect(), self.background_color)
-
-            # La granularidad depende de los días visibles en pantalla (zoom),
-            # no del rango total, que ahora puede ser mucho mayor con el scroll
-            visible_days = self.width() / self.pixels_per_day if self.pixels_per_day else self.min_date.daysTo(self.max_date)
-            show_months = 30 < visible_days <= 366  # Mostrar meses si se ve entre 1 mes y 1 año
-            show_weeks = visible_days <= 100  # Mostrar semanas si se ven 3 meses o menos
-
-            if show_weeks:
-                year_font = QFont("Arial", 8, QFont.Weight.Bold)
-                week_font = QFont("Arial", 7)
-                half_height = self.height() // 2
-            elif show_months:
-                year_font = QFont("Arial", 9, QFont.Weight.Bold)
-                month_font = QFont("Arial", 8)
-                half_height = self.height() // 2
-            else:
-                year_font = QFont("Arial", 10, QFont.Weight.Bold)
-                half_height = self.height()
-
-            painter.setFont(year_font)
-
-            start_year = self.min_date.year()
-            end_year = self.max_date.year()
-
-            # Dibuja los años
-            for year in range(start_year, end_year + 1):
-                year_start = QDate(year, 1, 1)
-                if year_start < self.min_date:
-                    year_start = self.min_date
-
-                # El año termina un día antes del inicio del próximo año
-                year_end = QDate(year + 1, 1, 1).addDays(-1)
-                if year_end > self.max_date:
-                    year_end = self.max_date
-
-                start_x = self.min_date.daysTo(year_start) * self.pixels_per_day - self.scroll_offset
-                end_x = self.min_date.daysTo(year_end.addDays(1)) * self.pixels_per_day - self.scroll_offset  # Agregar un día para incluir el último día
-
-                # Dibuja líneas verticales para separar los años en el inicio del año
-                painter.setPen(QPen(self.year_separator_color, 1))
+            painter.translate(-self.scroll_offset, 0)
+            self.render_content(painter, self.width(), self.height())
+
+    def render_content(self, painter, visible_width, height):
+        """Dibuja el encabezado en coordenadas de contenido (x = 0 en
+        ``min_date``). ``visible_width`` es el ancho que se ve de una vez y
+        decide la granularidad (años, meses o semanas). No depende del widget
+        en pantalla, así que sirve también para exportar."""
+        # La granularidad depende de los días visibles en pantalla (zoom),
+        # no del rango total, que ahora puede ser mucho mayor con el scroll
+        visible_days = visible_width / self.pixels_per_day
+        show_months = 30 < visible_days <= 366  # Mostrar meses si se ve entre 1 mes y 1 año
+        show_weeks = visible_days <= 100  # Mostrar semanas si se ven 3 meses o menos
+
+        if show_weeks:
+            year_font = QFont("Arial", 8, QFont.Weight.Bold)
+            week_font = QFont("Arial", 7)
+            half_height = height // 2
+        elif show_months:
+            year_font = QFont("Arial", 9, QFont.Weight.Bold)
+            month_font = QFont("Arial", 8)
+            half_height = height // 2
+        else:
+            year_font = QFont("Arial", 10, QFont.Weight.Bold)
+            half_height = height
+
+        painter.setFont(year_font)
+
+        start_year = self.min_date.year()
+        end_year = self.max_date.year()
+
+        # Dibuja los años
+        for year in range(start_year, end_year + 1):
+            year_start = QDate(year, 1, 1)
+            if year_start < self.min_date:
+                year_start = self.min_date
+
+            # El año termina un día antes del inicio del próximo año
+            year_end = QDate(year + 1, 1, 1).addDays(-1)
+            if year_end > self.max_date:
+                year_end = self.max_date
+
+            start_x = self.min_date.daysTo(year_start) * self.pixels_per_day
+            end_x = self.min_date.daysTo(year_end.addDays(1)) * self.pixels_per_day  # Agregar un día para incluir el último día
+
+            # Dibuja líneas verticales para separar los años en el inicio del año
+            painter.setPen(QPen(self.year_separator_color, 1))
+            line_x = start_x
+            painter.drawLine(int(line_x), 0, int(line_x), height)
+
+            year_width = end_x - start_x
+            year_rect = QRect(int(start_x), 0, int(year_width), half_height)
+            painter.setPen(self.year_color)
+            painter.drawText(year_rect, Qt.AlignmentFlag.AlignCenter, str(year))
+
+        if show_weeks:
+            # Dibujar semanas
+            painter.setFont(week_font)
+            current_date = self.min_date
+
+            # Alinear current_date al inicio de la semana (por ejemplo, lunes)
+            day_of_week = current_date.dayOfWeek()
+            if day_of_week != 1:  # Si no es lunes
+                current_date = current_date.addDays(1 - day_of_week)  # Retroceder al lunes anterior
+
+            while current_date <= self.max_date:
+                week_start = current_date
+                week_end = week_start.addDays(6)
+                if week_end > self.max_date:
+                    week_end = self.max_date
+
+                start_x = self.min_date.daysTo(week_start) * self.pixels_per_day
+                end_x = self.min_date.daysTo(week_end.addDays(1)) * self.pixels_per_day  # Agregar un día para incluir el último día
+
+                # Dibuja líneas verticales para separar las semanas en el inicio de la semana
+                painter.setPen(QPen(self.week_separator_color, 1))
                 line_x = start_x
-                painter.drawLine(int(line_x), 0, int(line_x), self.height())
-
-                year_width = end_x - start_x
-                year_rect = QRect(int(start_x), 0, int(year_width), half_height)
-                painter.setPen(self.year_color)
-                painter.drawText(year_rect, Qt.AlignmentFlag.AlignCenter, str(year))
-
-            if show_weeks:
-                # Dibujar semanas
-                painter.setFont(week_font)
-                current_date = self.min_date
-
-                # Alinear current_date al inicio de la semana (por ejemplo, lunes)
-                day_of_week = current_date.dayOfWeek()
-                if day_of_week != 1:  # Si no es lunes
-                    current_date = current_date.addDays(1 - day_of_week)  # Retroceder al lunes anterior
-
-                while current_date <= self.max_date:
-                    week_start = current_date
-                    week_end = week_start.addDays(6)
-                    if week_end > self.max_date:
-                        week_end = self.max_date
-
-                    start_x = self.min_date.daysTo(week_start) * self.pixels_per_day - self.scroll_offset
-                    end_x = self.min_date.daysTo(week_end.addDays(1)) * self.pixels_per_day - self.scroll_offset  # Agregar un día para incluir el último día
-
-                    # Dibuja líneas verticales para separar las semanas en el inicio de la semana
-                    painter.setPen(QPen(self.week_separator_color, 1))
-                    line_x = start_x
-                    line_top = self.height() * 0.5  # Inicia la línea a la mitad del encabezado
-                    painter.drawLine(int(line_x), int(line_top), int(line_x), self.height())
-
-                    # Dibuja las etiquetas de las semanas
-                    week_width = end_x - start_x
-                    week_rect = QRect(int(start_x), int(line_top), int(week_width), int(self.height() - line_top))
-                    week_number = week_start.weekNumber()[0]
-                    week_label = f"Semana {week_number}"
-                    painter.setPen(self.week_color)
-                    painter.drawText(week_rect, Qt.AlignmentFlag.AlignCenter, week_label)
-
-                    # Avanzar a la siguiente semana
-                    current_date = week_end.addDays(1)
-
-            elif show_months:
-                # Dibujar meses
-                painter.setFont(month_font)
-                current_date = QDate(self.min_date.year(), self.min_date.month(), 1)
-                while current_date <= self.max_date:
-                    month_start = current_date
-                    month_end = current_date.addMonths(1).addDays(-1)
-                    if month_end > self.max_date:
-                        month_end = self.max_date
-
-                    start_x = self.min_date.daysTo(month_start) * self.pixels_per_day - self.scroll_offset
-                    end_x = self.min_date.daysTo(month_end.addDays(1)) * self.pixels_per_day - self.scroll_offset  # Agregar un día para incluir el último día
-
-                    # Dibuja líneas verticales para separar los meses en el inicio del mes
-                    painter.setPen(QPen(self.month_separator_color, 1))
-                    line_x = start_x
-                    line_top = self.height() * 0.5  # Inicia la línea a la mitad del encabezado
-                    painter.drawLine(int(line_x), int(line_top), int(line_x), self.height())
-
-                    # Dibuja las etiquetas de los meses
-                    month_width = end_x - start_x
-                    month_rect = QRect(int(start_x), int(line_top), int(month_width), int(self.height() - line_top))
-                    month_name = current_date.toString("MMM")
-                    painter.setPen(self.month_color)
-                    painter.drawText(month_rect, Qt.AlignmentFlag.AlignCenter, month_name)
-
-                    # Avanzar al siguiente mes
-                    current_date = current_date.addMonths(1)
-
-            # Dibujar la etiqueta para el día de hoy
-            today = QDate.currentDate()
-            if self.min_date <= today <= self.max_date:
-                today_x = self.min_date.daysTo(today) * self.pixels_per_day - self.scroll_offset
-
-                # Dibuja la etiqueta "Hoy" con un fondo gris redondeado
-                label_width = 50
-                label_height = 20
-                label_x = today_x - label_width / 2
-                label_y = self.height() - label_height
-
-                # Dibuja el fondo redondeado
-                painter.setPen(Qt.PenStyle.NoPen)
-                painter.setBrush(QColor(128, 128, 128, 180))
-                painter.drawRoundedRect(QRectF(label_x, label_y, label_width, label_height), 10, 10)
+                line_top = height * 0.5  # Inicia la línea a la mitad del encabezado
+                painter.drawLine(int(line_x), int(line_top), int(line_x), height)
+
+                # Dibuja las etiquetas de las semanas
+                week_width = end_x - start_x
+                week_rect = QRect(int(start_x), int(line_top), int(week_width), int(height - line_top))
+                week_number = week_start.weekNumber()[0]
+                week_label = f"Semana {week_number}"
+                painter.setPen(self.week_color)
+                painter.drawText(week_rect, Qt.AlignmentFlag.AlignCenter, week_label)
+
+                # Avanzar a la siguiente semana
+                current_date = week_end.addDays(1)
+
+        elif show_months:
+            # Dibujar meses
+            painter.setFont(month_font)
+            current_date = QDate(self.min_date.year(), self.min_date.month(), 1)
+            while current_date <= self.max_date:
+                month_start = current_date
+                month_end = current_date.addMonths(1).addDays(-1)
+                if month_end > self.max_date:
+                    month_end = self.max_date
+
+                start_x = self.min_date.daysTo(month_start) * self.pixels_per_day
+                end_x = self.min_date.daysTo(month_end.addDays(1)) * self.pixels_per_day  # Agregar un día para incluir el último día
+
+                # Dibuja líneas verticales para separar los meses en el inicio del mes
+                painter.setPen(QPen(self.month_separator_color, 1))
+                line_x = start_x
+                line_top = height * 0.5  # Inicia la línea a la mitad del encabezado
+                painter.drawLine(int(line_x), int(line_top), int(line_x), height)
+
+                # Dibuja las etiquetas de los meses
+                month_width = end_x - start_x
+                month_rect = QRect(int(start_x), int(line_top), int(month_width), int(height - line_top))
+                month_name = current_date.toString("MMM")
+                painter.setPen(self.month_color)
+                painter.drawText(month_rect, Qt.AlignmentFlag.AlignCenter, month_name)
+
+                # Avanzar al siguiente mes
+                current_date = current_date.addMonths(1)
+
+        # Dibujar la etiqueta para el día de hoy
+        today = QDate.currentDate()
+        if self.min_date <= today <= self.max_date:
+            today_x = self.min_date.daysTo(today) * self.pixels_per_day
+
+            # Dibuja la etiqueta "Hoy" con un fondo gris redondeado
+            label_width = 50
+            label_height = 20
+            label_x = today_x - label_width / 2
+            label_y = height - label_height
+
+            # Dibuja el fondo redondeado
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(128, 128, 128, 180))
+            painter.drawRoundedRect(QRectF(label_x, label_y, label_width, label_height), 10, 10)
 
-                # Dibuja el texto "Hoy"
-                painter.setFont(QFont("Arial", 9, QFont.Weight.Bold))
-                painter.setPen(QColor(242, 211, 136))  # Color del texto del día de hoy
-                painter.drawText(QRectF(label_x, label_y, label_width, label_height), Qt.AlignmentFlag.AlignCenter, "Hoy")
+            # Dibuja el texto "Hoy"
+            painter.setFont(QFont("Arial", 9, QFont.Weight.Bold))
+            painter.setPen(QColor(242, 211, 136))  # Color del texto del día de hoy
+            painter.drawText(QRectF(label_x, label_y, label_width, label_height), Qt.AlignmentFlag.AlignCenter, "Hoy")
 
     def scrollTo(self, value):
         self.scroll_offset = value
@@ -231,11 +301,17 @@ class GanttChart(QWidget):
     colorChanged = Signal(int, QColor)
     wheelScrolled = Signal(int)  # Nueva señal para eventos de rueda
     SINGLE_CLICK_INTERVAL = 100  # Intervalo en milisegundos para el clic simple
+    RESIZE_HANDLE_PX = 6  # Ancho de la zona de los bordes que redimensiona la barra
+    DRAG_FRAME_MS = 16  # Como mucho un recálculo de la vista previa por cuadro
 
     def __init__(self, tasks, row_height, header_height, main_window):
         super().__init__()
         self.main_window = main_window
         self.tasks = tasks
+        # Fila → rango de fechas precalculado para hit-testing y consultas
+        # por fecha sin volver a analizar las cadenas en cada evento del mouse
+        self.spatial_index = TaskSpatialIndex()
+        self.spatial_index.sync(tasks)
         self.row_height = row_height
         self.header_height = header_height
         self.min_date = None
@@ -255,6 +331,17 @@ class GanttChart(QWidget):
         self.vertical_offset = 0  # Nuevo atributo para el desplazamiento vertical
         self.horizontal_offset = 0  # Desplazamiento horizontal (scroll de tiempo)
         self.highlighted_task_index = None
+        # Duración del último repintado completo; decide si el zoom animado
+        # puede dibujar cuadros en vivo o debe escalar la última imagen.
+        self.last_paint_ms = 0
+        self.zoom_frame = None
+        # Arrastre de barras: las posiciones intermedias solo se dibujan como
+        # vista previa; el modelo se modifica una vez al soltar.
+        self._drag = None
+        self._drag_timer = QTimer(self)
+        self._drag_timer.setSingleShot(True)
+        self._drag_timer.setInterval(self.DRAG_FRAME_MS)
+        self._drag_timer.timeout.connect(self._update_drag_preview)
 
     def update_colors(self):
         palette = self.palette()
@@ -269,34 +356,90 @@ class GanttChart(QWidget):
         self.pixels_per_day = pixels_per_day
         self.update()  # Redibuja el diagrama de Gantt
 
+    def set_zoom_frame(self, frame):
+        self.zoom_frame = frame
+        self.update()
+
+    def set_tasks(self, tasks):
+        """Asigna las tareas visibles (una por fila) y sincroniza el índice
+        espacial; solo se vuelven a analizar las filas que cambiaron."""
+        self.tasks = tasks
+        self.spatial_index.sync(tasks)
+
+    def update_rows(self, first_row, last_row):
+        """Repinta solo la franja horizontal de las filas indicadas."""
+        top = first_row * self.row_height - self.vertical_offset
+        height = (last_row - first_row + 1) * self.row_height
+        self.update(QRect(0, int(top), self.width(), int(height) + 1))
+
+    def _bar_x_range(self, task_index):
+        """(x inicial, x final) de la barra de la fila en coordenadas de
+        contenido (sin scroll), o None si la tarea no tiene fechas válidas.
+        El fin incluye el día final, igual que la barra dibujada."""
+        span = self.spatial_index.span(task_index)
+        if span is None or not self.min_date or not self.pixels_per_day:
+            return None
+        origin = self.min_date.toJulianDay()
+        start_x = (span[0] - origin) * self.pixels_per_day
+        end_x = (span[1] - origin + 1) * self.pixels_per_day
+        return start_x, end_x
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.double_click_occurred = False
             # Verificar si se hizo clic fuera de una tarea
-            task_index = self.get_task_at_position(event.position().toPoint())
-            if task_index is None or not self.is_click_on_task_bar(event.position().toPoint(), task_index):
+            position = event.position().toPoint()
+            task_index = self.get_task_at_position(position)
+            if task_index is None or not self.is_click_on_task_bar(position, task_index):
                 self.highlighted_task_index = None
                 self.update()
                 # Deseleccionar cualquier selección en la tabla de tareas
                 self.main_window.task_table_widget.table_view.clearSelection()
+            else:
+                self._begin_drag(position, task_index)
         super().mousePressEvent(event)
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key.Key_Escape:
+            if self._drag is not None:
+                self._cancel_drag()
             self.highlighted_task_index = None
             self.update()
             self.main_window.task_table_widget.table_view.clearSelection()
         super().keyPressEvent(event)
 
     def mouseMoveEvent(self, event):
-        task_index = self.get_task_at_position(event.position().toPoint())
-        if task_index is not None and self.is_click_on_task_bar(event.position().toPoint(), task_index):
-            self.setCursor(Qt.CursorShape.PointingHandCursor)
+        position = event.position().toPoint()
+        drag = self._drag
+        if drag is not None and event.buttons() & Qt.MouseButton.LeftButton:
+            x = position.x() + self.horizontal_offset
+            if not drag.active and abs(x - drag.press_x) >= QApplication.startDragDistance():
+                drag.active = True
+            if drag.active:
+                # Se acumula la última posición y se recalcula como mucho una
+                # vez por cuadro, por rápido que lleguen los eventos del mouse.
+                drag.pending_x = x
+                if not self._drag_timer.isActive():
+                    self._drag_timer.start()
+                return
+
+        task_index = self.get_task_at_position(position)
+        if task_index is not None and self.is_click_on_task_bar(position, task_index):
+            if self._drag_mode_at(position, task_index) == "move":
+                self.setCursor(Qt.CursorShape.PointingHandCursor)
+            else:
+                self.setCursor(Qt.CursorShape.SizeHorCursor)
         else:
             self.setCursor(Qt.CursorShape.ArrowCursor)
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton and self._drag is not None:
+            drag = self._drag
+            if drag.active:
+                self._finish_drag()
+                return
+            self._drag = None
         if event.button() == Qt.MouseButton.LeftButton:
             # Almacenar las posiciones
             self.click_pos = event.position().toPoint()
@@ -308,6 +451,112 @@ class GanttChart(QWidget):
             self.single_click_timer.start(self.SINGLE_CLICK_INTERVAL)
         super().mouseReleaseEvent(event)
 
+    # ------------------------------------------------------------------
+    # Arrastrar y soltar barras
+    # ------------------------------------------------------------------
+
+    def _drag_mode_at(self, position, task_index):
+        """"start"/"end" sobre los bordes de la barra, "move" en el resto."""
+        bar_range = self._bar_x_range(task_index)
+        if bar_range is None:
+            return "move"
+        x = position.x() + self.horizontal_offset
+        handle = min(self.RESIZE_HANDLE_PX, (bar_range[1] - bar_range[0]) / 3)
+        if x - bar_range[0] <= handle:
+            return "start"
+        if bar_range[1] - x <= handle:
+            return "end"
+        return "move"
+
+    def _begin_drag(self, position, task_index):
+        task = self.tasks[task_index]
+        span = self.spatial_index.span(task_index)
+        # Las fechas de una tarea padre vinculada se derivan de sus subtareas
+        if span is None or (task.subtasks and task.linked_to_subtasks):
+            self._drag = None
+            return
+        self._drag = _BarDrag(
+            task_index,
+            task,
+            self._drag_mode_at(position, task_index),
+            position.x() + self.horizontal_offset,
+            span,
+        )
+
+    def _drag_preview_span(self, drag):
+        """Rango (inicio, fin) ajustado a días hábiles para la posición actual."""
+        delta = round((drag.pending_x - drag.press_x) / self.pixels_per_day)
+        step = -1 if delta < 0 else 1
+        if drag.mode == "move":
+            start = _snap_to_working_day(drag.start + delta, step)
+            if drag.working_days:
+                end = end_after_working_days(start, drag.working_days)
+            else:
+                end = start + (drag.end - drag.start)
+        elif drag.mode == "start":
+            start = min(_snap_to_working_day(drag.start + delta, step), drag.end)
+            end = drag.end
+        else:
+            start = drag.start
+            end = max(_snap_to_working_day(drag.end + delta, step), drag.start)
+        return start, end
+
+    def _update_drag_preview(self):
+        drag = self._drag
+        if drag is None or not drag.active or not self.pixels_per_day:
+            return
+        preview = self._drag_preview_span(drag)
+        if preview != drag.preview:
+            drag.preview = preview
+            self.update_rows(drag.row, drag.row)
+
+    def _finish_drag(self):
+        self._drag_timer.stop()
+        self._update_drag_preview()
+        drag = self._drag
+        self._drag = None
+        self.update_rows(drag.row, drag.row)
+        if drag.preview == (drag.start, drag.end):
+            return
+        if drag.row >= len(self.tasks) or self.tasks[drag.row] is not drag.task:
+            return
+        start_text = QDate.fromJulianDay(drag.preview[0]).toString("dd/MM/yyyy")
+        end_text = QDate.fromJulianDay(drag.preview[1]).toString("dd/MM/yyyy")
+        logger.debug("drag %s row %d → %s..%s", drag.mode, drag.row, start_text, end_text)
+        self.main_window.reschedule_task(drag.row, start_text, end_text)
+
+    def _cancel_drag(self):
+        self._drag_timer.stop()
+        drag = self._drag
+        self._drag = None
+        if drag is not None:
+            self.update_rows(drag.row, drag.row)
+
+    def _paint_drag_preview(self, painter, drag, min_day):
+        start, end = drag.preview
+        x = (start - min_day) * self.pixels_per_day
+        width = (end - start + 1) * self.pixels_per_day
+        y = drag.row * self.row_height
+        bar_height = self.row_height * 0.9
+        bar_y = y + (self.row_height - bar_height) / 2
+
+        preview_color = QColor(drag.task.color)
+        preview_color.setAlpha(120)
+        painter.setBrush(QBrush(preview_color))
+        painter.setPen(QPen(self.text_color, 1, Qt.PenStyle.DashLine))
+        painter.drawRect(QRectF(x, bar_y, width, bar_height))
+
+        start_text = QDate.fromJulianDay(start).toString("dd/MM/yyyy")
+        end_text = QDate.fromJulianDay(end).toString("dd/MM/yyyy")
+        label = f"{start_text} – {end_text} ({working_days_between(start, end)} días)"
+        painter.setPen(QPen(self.text_color))
+        painter.setFont(QFont("Arial", 9))
+        painter.drawText(
+            QRectF(x + width + 6, y, 400, self.row_height),
+            Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+            label,
+        )
+
     def handle_single_click(self):
         if not self.double_click_occurred:
             task_index = int((self.click_pos.y() + self.vertical_offset) / self.row_height)
@@ -341,16 +590,10 @@ class GanttChart(QWidget):
         task_index = int(y / row_height)
         if 0 <= task_index < len(self.tasks):
             task = self.tasks[task_index]
-
-            # Calcular la posición X de inicio y fin de la barra de la tarea
-            # (el fin incluye el día final, igual que la barra dibujada)
-            start_date = QDate.fromString(task.start_date, "dd/MM/yyyy")
-            end_date = QDate.fromString(task.end_date, "dd/MM/yyyy")
-            task_start_x = self.min_date.daysTo(start_date) * self.pixels_per_day if self.min_date else 0
-            task_end_x = (self.min_date.daysTo(end_date) + 1) * self.pixels_per_day if self.min_date else 0
+            bar_range = self._bar_x_range(task_index)
 
             # Verificar si el doble clic fue dentro de la barra de la tarea
-            if task_start_x <= x <= task_end_x:
+            if bar_range is not None and bar_range[0] <= x <= bar_range[1]:
                 # Abrir el diálogo de selección de color
                 color = QColorDialog.getColor(initial=task.color, parent=self)
                 if color.isValid():
@@ -414,9 +657,15 @@ class GanttChart(QWidget):
             self.main_window.set_unsaved_changes(True)
 
     def paintEvent(self, event):
+        if self.zoom_frame is not None:
+            with QPainter(self) as painter:
+                _paint_zoom_frame(painter, self, self.zoom_frame)
+            return
         if not self.min_date or not self.max_date or not self.pixels_per_day:
             return
 
+        paint_timer = QElapsedTimer()
+        paint_timer.start()
         with QPainter(self) as painter:
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
             painter.fillRect(event.rect(), self.background_color)
@@ -424,66 +673,39 @@ class GanttChart(QWidget):
             painter.save()
             painter.translate(-self.horizontal_offset, -self.vertical_offset)
 
-            for i, task in enumerate(self.tasks):
-                y = i * self.row_height
-
-                # Resaltar la fila si corresponde (a lo ancho del viewport visible)
-                if i == self.highlighted_task_index:
-                    highlight_color = QColor(200, 200, 255, 50)  # Color de resaltado
-                    painter.fillRect(QRectF(self.horizontal_offset, y, self.width(), self.row_height), highlight_color)
-
-                # Dibujar la barra de la tarea
-                start = QDate.fromString(task.start_date, "dd/MM/yyyy")
-                end = QDate.fromString(task.end_date, "dd/MM/yyyy")
-                if end < self.min_date or start > self.max_date:
-                    continue
-
-                x = self.min_date.daysTo(start) * self.pixels_per_day
-                width = start.daysTo(end) * self.pixels_per_day + self.pixels_per_day  # Incluye el día final
-                bar_height = self.row_height * 0.9
-                bar_y = y + (self.row_height - bar_height) / 2
-
-                if task.is_subtask:
-                    # Oscurecer el color para las subtareas
-                    darker_color = task.color.darker(120)  # Oscurecer el color en 20%
-                    painter.setBrush(QBrush(darker_color))
-                else:
-                    painter.setBrush(QBrush(task.color))
-
-                painter.setPen(Qt.PenStyle.NoPen)
-                painter.drawRect(QRectF(x, bar_y, width, bar_height))
-
-                # Agregar identificadores para subtareas
-                if hasattr(task, 'is_subtask') and task.is_subtask:
-                    painter.setPen(QPen(self.text_color))
-                    painter.setFont(QFont("Arial", 12))
-                    rect = QRectF(x, y, width, self.row_height)
-                    painter.drawText(rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, "↳")
-
-                # Después de dibujar la barra, verificar si tiene notas
-                if task.notes_html and task.notes_html.strip():
-                    # Dibujar indicador de notas (solo un pequeño círculo amarillo)
-                    note_indicator_size = 8
-                    note_x = x + width - note_indicator_size
-                    note_y = bar_y
-
-                    # Dibujar círculo amarillo
-                    painter.setPen(QPen(QColor(242, 211, 136)))  # Amarillo
-                    painter.setBrush(QBrush(QColor(242, 211, 136)))
-                    painter.drawEllipse(
-                        note_x, note_y,
-                        note_indicator_size, note_indicator_size
-                    )
+            # Solo las filas que cruzan el área a repintar (p. ej. la franja de
+            # una fila editada); los rangos de fechas vienen ya convertidos
+            # del índice espacial.
+            dirty = event.rect()
+            first_row = max(0, int((dirty.top() + self.vertical_offset) // self.row_height))
+            last_row = min(
+                len(self.tasks) - 1,
+                int((dirty.bottom() + self.vertical_offset) // self.row_height),
+            )
+            # Resaltar la fila si corresponde (a lo ancho del viewport visible)
+            highlighted = self.highlighted_task_index
+            if highlighted is not None and first_row <= highlighted <= last_row:
+                highlight_color = QColor(200, 200, 255, 50)  # Color de resaltado
+                painter.fillRect(
+                    QRectF(self.horizontal_offset, highlighted * self.row_height, self.width(), self.row_height),
+                    highlight_color,
+                )
+
+            self.render_rows(painter, first_row, last_row)
+            min_day = self.min_date.toJulianDay()
+
+            drag = self._drag
+            if drag is not None and drag.active and first_row <= drag.row <= last_row:
+                self._paint_drag_preview(painter, drag, min_day)
 
             painter.restore()
 
             # Dibujar la línea del día de hoy en coordenadas del viewport para
             # que ocupe toda la altura visible sin importar el scroll vertical
-            today = QDate.currentDate()
-            if self.min_date <= today <= self.max_date:
-                today_x = self.min_date.daysTo(today) * self.pixels_per_day - self.horizontal_offset
-                painter.setPen(QPen(self.today_line_color, 2))
-                painter.drawLine(int(today_x), 0, int(today_x), self.height())
+            painter.save()
+            painter.translate(-self.horizontal_offset, 0)
+            self.render_today_line(painter, 0, self.height())
+            painter.restore()
 
             # Si no hay tareas, mostrar mensaje de bienvenida (opcional)
             if not self.tasks:
@@ -492,6 +714,72 @@ class GanttChart(QWidget):
                 painter.setFont(QFont("Arial", 14))
                 painter.drawText(event.rect(), Qt.AlignmentFlag.AlignCenter, welcome_text)
 
+        # Solo los repintados completos sirven como estimación del coste de un cuadro
+        if event.rect().contains(self.rect()):
+            self.last_paint_ms = paint_timer.elapsed()
+
+    def render_rows(self, painter, first_row, last_row):
+        """Dibuja las barras de las filas ``first_row..last_row`` en
+        coordenadas de contenido (x = 0 en ``min_date``, y = 0 en la primera
+        fila). Solo lee el estado del gráfico, así que la exportación puede
+        llamarlo desde hilos de trabajo sobre imágenes fuera de pantalla."""
+        min_day = self.min_date.toJulianDay()
+        max_day = self.max_date.toJulianDay()
+
+        for i in range(first_row, last_row + 1):
+            task = self.tasks[i]
+            y = i * self.row_height
+
+            # Dibujar la barra de la tarea
+            span = self.spatial_index.span(i)
+            if span is None or span[1] < min_day or span[0] > max_day:
+                continue
+
+            x = (span[0] - min_day) * self.pixels_per_day
+            width = (span[1] - span[0] + 1) * self.pixels_per_day  # Incluye el día final
+            bar_height = self.row_height * 0.9
+            bar_y = y + (self.row_height - bar_height) / 2
+
+            if task.is_subtask:
+                # Oscurecer el color para las subtareas
+                darker_color = task.color.darker(120)  # Oscurecer el color en 20%
+                painter.setBrush(QBrush(darker_color))
+            else:
+                painter.setBrush(QBrush(task.color))
+
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.drawRect(QRectF(x, bar_y, width, bar_height))
+
+            # Agregar identificadores para subtareas
+            if hasattr(task, 'is_subtask') and task.is_subtask:
+                painter.setPen(QPen(self.text_color))
+                painter.setFont(QFont("Arial", 12))
+                rect = QRectF(x, y, width, self.row_height)
+                painter.drawText(rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, "↳")
+
+            # Después de dibujar la barra, verificar si tiene notas
+            if task.notes_html and task.notes_html.strip():
+                # Dibujar indicador de notas (solo un pequeño círculo amarillo)
+                note_indicator_size = 8
+                note_x = x + width - note_indicator_size
+                note_y = bar_y
+
+                # Dibujar círculo amarillo
+                painter.setPen(QPen(QColor(242, 211, 136)))  # Amarillo
+                painter.setBrush(QBrush(QColor(242, 211, 136)))
+                painter.drawEllipse(
+                    note_x, note_y,
+                    note_indicator_size, note_indicator_size
+                )
+
+    def render_today_line(self, painter, top, bottom):
+        """Línea del día de hoy en coordenadas de contenido (eje x)."""
+        today = QDate.currentDate()
+        if self.min_date <= today <= self.max_date:
+            today_x = self.min_date.daysTo(today) * self.pixels_per_day
+            painter.setPen(QPen(self.today_line_color, 2))
+            painter.drawLine(int(today_x), int(top), int(today_x), int(bottom))
+
     def changeEvent(self, event):
         if event.type() == QEvent.Type.PaletteChange:
             self.update_colors()
@@ -508,22 +796,18 @@ class GanttChart(QWidget):
 
     def is_click_on_task_bar(self, position, task_index):
         if 0 <= task_index < len(self.tasks):
-            task = self.tasks[task_index]
-            start_date = QDate.fromString(task.start_date, "dd/MM/yyyy")
-            end_date = QDate.fromString(task.end_date, "dd/MM/yyyy")
+            bar_range = self._bar_x_range(task_index)
+            if bar_range is None:
+                return False
 
             x = position.x() + self.horizontal_offset
             y = position.y() + self.vertical_offset
-
-            # El fin de la barra incluye el día final, igual que la barra dibujada
-            task_start_x = self.min_date.daysTo(start_date) * self.pixels_per_day if self.min_date else 0
-            task_end_x = (self.min_date.daysTo(end_date) + 1) * self.pixels_per_day if self.min_date else 0
             task_y = task_index * self.row_height
 
             # Añadir un pequeño margen para facilitar el clic
             margin = 2
 
-            if (task_start_x - margin <= x <= task_end_x + margin and
+            if (bar_range[0] - margin <= x <= bar_range[1] + margin and
                 task_y <= y <= task_y + self.row_height):
                 return True
 
@@ -561,6 +845,112 @@ class GanttChart(QWidget):
         super().resizeEvent(event)
         self.update()  # Asegura que el widget se redibuje cuando cambia de tamaño
 
+
+class GanttZoomAnimation(QObject):
+    """Zoom animado del Gantt alrededor de un punto de anclaje.
+
+    Interpola la escala (píxeles por día) manteniendo bajo el anclaje el mismo
+    día. Si el último repintado completo del gráfico cabe en el presupuesto
+    por cuadro, los cuadros intermedios se dibujan en vivo; si no (proyectos
+    muy grandes), se escala la última imagen renderizada del gráfico y del
+    encabezado. Al terminar se aplica la escala final con todo el detalle.
+    """
+
+    DURATION_MS = 200
+    FRAME_BUDGET_MS = 12
+
+    def __init__(self, gantt_widget):
+        super().__init__(gantt_widget)
+        self.gantt_widget = gantt_widget
+        self._animation = QVariantAnimation(self)
+        self._animation.setDuration(self.DURATION_MS)
+        self._animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self._animation.valueChanged.connect(self._on_frame)
+        self._animation.finished.connect(self._on_finished)
+        self._pixels_per_day = None
+        self._scroll = 0.0
+        self._anchor_x = 0.0
+        self._anchor_days = 0.0
+        self._snapshot = None  # (pixmap gráfico, pixmap encabezado, escala, scroll)
+        self._apply_frame = None
+        self._on_rest = None
+
+    def is_running(self):
+        return self._animation.state() == QAbstractAnimation.State.Running
+
+    def start(self, target_pixels_per_day, anchor_x, scroll, apply_frame, on_rest):
+        """Anima hasta ``target_pixels_per_day`` manteniendo fijo el día que
+        está en ``anchor_x`` (coordenadas del viewport).
+
+        ``apply_frame(ppd, scroll)`` aplica en vivo una escala intermedia y
+        ``on_rest(ppd, scroll)`` aplica la final. Si ya hay una animación en
+        curso continúa desde su escala actual (ruedas rápidas encadenadas).
+        """
+        chart = self.gantt_widget.chart
+        if self.is_running():
+            current, scroll = self._pixels_per_day, self._scroll
+            self._animation.stop()
+        else:
+            current = chart.pixels_per_day
+        self._pixels_per_day = current
+        self._scroll = scroll
+        self._anchor_x = anchor_x
+        self._anchor_days = (anchor_x + scroll) / current
+        self._apply_frame = apply_frame
+        self._on_rest = on_rest
+        if self._snapshot is None and chart.last_paint_ms > self.FRAME_BUDGET_MS:
+            self._take_snapshot()
+        self._animation.setStartValue(float(current))
+        self._animation.setEndValue(float(target_pixels_per_day))
+        self._animation.start()
+
+    def stop(self):
+        """Detiene la animación sin aplicar la escala final."""
+        self._animation.stop()
+        self._clear_snapshot()
+
+    def _take_snapshot(self):
+        chart = self.gantt_widget.chart
+        header = self.gantt_widget.header
+        self._snapshot = (chart.grab(), header.grab(), self._pixels_per_day, self._scroll)
+
+    def _clear_snapshot(self):
+        if self._snapshot is not None:
+            self._snapshot = None
+            self.gantt_widget.chart.set_zoom_frame(None)
+            self.gantt_widget.header.set_zoom_frame(None)
+
+    def _on_frame(self, value):
+        chart = self.gantt_widget.chart
+        if chart.pixels_per_day is None or not chart.min_date:
+            return
+        pixels_per_day = float(value)
+        days_total = chart.min_date.daysTo(chart.max_date) + 1
+        max_scroll = max(0.0, days_total * pixels_per_day - chart.width())
+        scroll = min(max(0.0, self._anchor_days * pixels_per_day - self._anchor_x), max_scroll)
+
+        # Si el cuadro en vivo resultó caro a mitad de animación, se pasa a
+        # escalar la imagen vigente durante el resto.
+        if self._snapshot is None and chart.last_paint_ms > self.FRAME_BUDGET_MS:
+            self._take_snapshot()
+        self._pixels_per_day = pixels_per_day
+        self._scroll = scroll
+
+        if self._snapshot is None:
+            self._apply_frame(pixels_per_day, scroll)
+            return
+        chart_pixmap, header_pixmap, snap_ppd, snap_scroll = self._snapshot
+        scale = pixels_per_day / snap_ppd
+        offset = snap_scroll * scale - scroll
+        chart.set_zoom_frame((chart_pixmap, offset, scale))
+        self.gantt_widget.header.set_zoom_frame((header_pixmap, offset, scale))
+
+    def _on_finished(self):
+        self._clear_snapshot()
+        if self._on_rest is not None:
+            self._on_rest(self._pixels_per_day, self._scroll)
+
+
 class GanttWidget(QWidget):
     def __init__(self, tasks, row_height, header_height, main_window):
         super().__init__()
@@ -591,6 +981,7 @@ class GanttWidget(QWidget):
         self.layout.addWidget(self.content_widget)
 
         self.pixels_per_day = 0
+        self.zoom_animation = GanttZoomAnimation(self)
 
         # Establecer la política de tamaño para permitir la expansión horizontal y vertical
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -608,7 +999,7 @@ class GanttWidget(QWidget):
         # La escala (píxeles por día) depende del modo de vista (zoom), que es
         # responsabilidad de la ventana principal; delegar el recálculo allí.
         if self.main_window and hasattr(self.main_window, 'gantt_hscroll'):
-            self.main_window.update_gantt_chart(set_unsaved=False)
+            self.main_window.update_gantt_geometry()
 
     def wheelEvent(self, event):
         if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
@@ -639,7 +1030,6 @@ class FloatingTaskMenu(QWidget):
     def __init__(self, task, parent=None):
         super().__init__(parent)
         self.task = task
-        self.cal = Colombia()
         self.setWindowFlags(Qt.WindowType.Popup | Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
@@ -706,14 +1096,7 @@ class FloatingTaskMenu(QWidget):
         else:
             count_from = start_date
 
-        working_days = 0
-        current_date = count_from
-        while current_date <= end_date:
-            if self.cal.is_working_day(current_date):
-                working_days += 1
-            current_date += timedelta(days=1)
-
-        return working_days
+        return working_days_between(day_from_date(count_from), day_from_date(end_date))
 
     def update_task_notes(self):
         # Evitar procesar cambios durante la inicialización
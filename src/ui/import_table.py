@@ -0,0 +1,204 @@
+import bisect
+import re
+
+#import_table.py
+#Modelo de la tabla de la ventana de importación (file_gui). Las celdas se
+#generan al pintarlas a partir de la lista de tareas extraídas. La selección
+#de cada tarea es una bandera de un byte (bytearray), las tareas visibles
+#son una lista ordenada de índices (las filas de la vista) y los contadores
+#de visibles/seleccionadas se mantienen al cambiar, así que marcar una
+#casilla no recorre la tabla.
+#
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+
+from utils.filter_util import normalize_string
+
+_NUMBER_PREFIX_RE = re.compile(r'^\d+[\.\-\s]+')
+
+
+def clean_task_name(name):
+    """Nombre de la tarea sin la numeración inicial ("1.2 - ")."""
+    if name is None:
+        return ""
+    return _NUMBER_PREFIX_RE.sub('', str(name))
+
+
+class ImportTableModel(QAbstractTableModel):
+    """Tareas extraídas de un archivo, con casilla de selección.
+
+    Las filas de la vista son solo las tareas visibles (``set_visibility``);
+    ``selected_count`` cuenta las visibles y marcadas. ``countsChanged`` se
+    emite cuando cambia alguno de los dos contadores.
+    """
+
+    COL_CHECK, COL_ID, COL_LEVEL, COL_NAME, COL_START, COL_END = range(6)
+    HEADERS = ("", "ID", "Nivel", "Nombre de Tarea", "Fecha Inicio", "Fecha Fin")
+
+    countsChanged = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks = []
+        self._names = []        # nombre mostrado, con sangría según el nivel
+        self.search_names = []  # nombre mostrado sin acentos ni mayúsculas
+        self.has_level = bytearray()  # 0: tarea sin nivel (nunca se muestra)
+        self._checked = bytearray()
+        self._rows = []         # fila de la vista -> índice de la tarea
+        self.selected_count = 0
+
+    # ------------------------------------------------------------------
+    # Contenido
+    # ------------------------------------------------------------------
+
+    def task_count(self):
+        return len(self._tasks)
+
+    def task(self, index):
+        return self._tasks[index]
+
+    @property
+    def visible_count(self):
+        return len(self._rows)
+
+    def clear(self):
+        self.beginResetModel()
+        self._tasks = []
+        self._names = []
+        self.search_names = []
+        self.has_level = bytearray()
+        self._checked = bytearray()
+        self._rows = []
+        self.selected_count = 0
+        self.endResetModel()
+        self.countsChanged.emit()
+
+    def append_tasks(self, tasks):
+        """Agrega tareas marcadas y aún ocultas; devuelve el índice de la
+        primera, para pasarlo a ``set_visibility``."""
+        first = len(self._tasks)
+        for task in tasks:
+            indentation = task.get('outline_level', 0) or 0
+            name = '    ' * indentation + clean_task_name(task.get('name', ''))
+            self._tasks.append(task)
+            self._names.append(name)
+            self.search_names.append(normalize_string(name))
+            self.has_level.append(str(task.get('level', '')) != "")
+        added = len(self._tasks) - first
+        self._checked.extend(b'\x01' * added)
+        return first
+
+    def set_visibility(self, first, visible):
+        """Fija la visibilidad de las tareas desde ``first`` (un valor por
+        tarea). Si ninguna tarea anterior a ``first`` cambia de fila, las
+        nuevas filas se insertan al final; si no, se reinicia el modelo."""
+        new_rows = [index for index, shown in enumerate(visible, first) if shown]
+        position = bisect.bisect_left(self._rows, first)
+        checked = self._checked
+        if position == len(self._rows):
+            if new_rows:
+                self.beginInsertRows(QModelIndex(), position, position + len(new_rows) - 1)
+                self._rows.extend(new_rows)
+                self.selected_count += sum(checked[index] for index in new_rows)
+                self.endInsertRows()
+        else:
+            self.beginResetModel()
+            self._rows[position:] = new_rows
+            self.selected_count = sum(checked[index] for index in self._rows)
+            self.endResetModel()
+        self.countsChanged.emit()
+
+    def visible_tasks(self):
+        """Índices de las tareas visibles, en orden (copia)."""
+        return list(self._rows)
+
+    def restrict(self, keep):
+        """Oculta tareas visibles: ``keep`` tiene un valor por cada índice de
+        ``visible_tasks()``. Para filtros que solo pueden ocultar filas."""
+        rows = [index for index, shown in zip(self._rows, keep, strict=True) if shown]
+        if len(rows) == len(self._rows):
+            return
+        self.beginResetModel()
+        self._rows = rows
+        checked = self._checked
+        self.selected_count = sum(checked[index] for index in rows)
+        self.endResetModel()
+        self.countsChanged.emit()
+
+    def selected_tasks(self):
+        """Índices de las tareas visibles y marcadas, en orden."""
+        checked = self._checked
+        return [index for index in self._rows if checked[index]]
+
+    def row_texts(self, index):
+        """Textos de las columnas de una tarea, como se muestran."""
+        task = self._tasks[index]
+        return (
+            str(task.get('task_id', '')),
+            str(task.get('level', '')),
+            self._names[index],
+            str(task.get('start_date') or "N/A"),
+            str(task.get('end_date') or "N/A"),
+        )
+
+    def toggle(self, row):
+        """Invierte la casilla de una fila de la vista."""
+        index = self.index(row, self.COL_CHECK)
+        state = Qt.CheckState.Unchecked if self._checked[self._rows[row]] else Qt.CheckState.Checked
+        self.setData(index, state, Qt.ItemDataRole.CheckStateRole)
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel
+    # ------------------------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        # Número de la tarea en el archivo, aunque haya filas filtradas
+        return str(self._rows[section] + 1) if section < len(self._rows) else None
+
+    def flags(self, index):
+        if index.column() == self.COL_CHECK:
+            return Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        task_index = self._rows[index.row()]
+        column = index.column()
+        if column == self.COL_CHECK:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self._checked[task_index] else Qt.CheckState.Unchecked
+            return None
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if column == self.COL_NAME:
+            return self._names[task_index]
+        task = self._tasks[task_index]
+        if column == self.COL_ID:
+            return str(task.get('task_id', ''))
+        if column == self.COL_LEVEL:
+            return str(task.get('level', ''))
+        key = 'start_date' if column == self.COL_START else 'end_date'
+        return str(task.get(key) or "N/A")
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if (not index.isValid() or index.column() != self.COL_CHECK
+                or role != Qt.ItemDataRole.CheckStateRole):
+            return False
+        task_index = self._rows[index.row()]
+        checked = 1 if value in (Qt.CheckState.Checked, Qt.CheckState.Checked.value) else 0
+        if self._checked[task_index] != checked:
+            self._checked[task_index] = checked
+            self.selected_count += 1 if checked else -1
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+            self.countsChanged.emit()
+        return True
@@ -8,7 +8,6 @@ import logging
 import math
 import os
 import sys
-from datetime import timedelta
 
 from PySide6.QtCore import (
     QDate,
@@ -36,16 +35,18 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from workalendar.america import Colombia
 
-from core.alert_manager import AlertManager
+from core.alert_manager import AlertManager, order_alerts
 from core.command_system import (
     CommandManager,
     ToggleLinkedDurationCommand,
 )
 from core.models import Task
+from core.portfolio_alerts import PortfolioAlertScanner
+from core.work_calendar import end_after_working_days, working_days_between
 from ui.about_dialog import AboutDialog
 from ui.calendar_view import CalendarViewWidget
+from ui.filter_bar import TaskFilterBar
 from ui.gantt_views import GanttWidget
 from ui.table_views import TaskTableWidget
 from ui.task_operations_mixin import TaskOperationsMixin
@@ -164,10 +165,18 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
         )
         self.gantt_hscroll.valueChanged.connect(self.on_gantt_hscroll)
 
-        main_layout.addWidget(left_widget, 0, 0)
-        main_layout.addWidget(self.view_stack, 0, 1)
-        main_layout.addWidget(self.shared_scrollbar, 0, 2)
-        main_layout.addWidget(self.gantt_hscroll, 1, 1)
+        # Barra de filtro (Ctrl+F), oculta hasta que se usa. Ocupa una fila
+        # propia para no desalinear las filas de la tabla y del Gantt.
+        self.filter_bar = TaskFilterBar(main_widget)
+        self.filter_bar.hide()
+        self.filter_bar.filter_changed.connect(self.apply_task_filter)
+        self.filter_bar.closed.connect(self.clear_task_filter)
+
+        main_layout.addWidget(self.filter_bar, 0, 0, 1, 3)
+        main_layout.addWidget(left_widget, 1, 0)
+        main_layout.addWidget(self.view_stack, 1, 1)
+        main_layout.addWidget(self.shared_scrollbar, 1, 2)
+        main_layout.addWidget(self.gantt_hscroll, 2, 1)
 
         # Botón superpuesto para alternar entre Gantt y Calendario
         self.view_toggle_button = QPushButton("📅", main_widget)
@@ -195,17 +204,39 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
         QShortcut(QKeySequence("Ctrl+S"), self).activated.connect(self.quick_save)
         QShortcut(QKeySequence("Ctrl+Z"), self).activated.connect(self.undo_action)
         QShortcut(QKeySequence("Ctrl+Y"), self).activated.connect(self.redo_action)
+        QShortcut(QKeySequence("Ctrl+F"), self).activated.connect(self.show_filter_bar)
 
         self.installEventFilter(self)
         QTimer.singleShot(0, self.load_last_file)
-        # Alerts: start the daily background timer and schedule startup check.
-        # The startup check fires 600 ms after the event loop is running so the
-        # main window is fully visible before the dialog appears.
+        # Alerts: one timer armed for the next day on which the active alerts
+        # change, and the startup check. The startup check fires 600 ms after
+        # the event loop is running so the main window is fully visible before
+        # the dialog appears.
         self.alert_manager = AlertManager(self.config)
-        self._daily_alert_timer = self.alert_manager.schedule_daily_check(
-            self._on_daily_alert_check
+        self._alert_check_timer = self.alert_manager.schedule_alert_checks(
+            self._on_alert_check
         )
+        # Task edits re-arm the timer once the editing settles.
+        self._alert_resync_timer = QTimer(self)
+        self._alert_resync_timer.setSingleShot(True)
+        self._alert_resync_timer.setInterval(2000)
+        self._alert_resync_timer.timeout.connect(self.refresh_alert_schedule)
+        for signal in (
+            self.model.dataChanged, self.model.layoutChanged, self.model.modelReset,
+            self.model.rowsInserted, self.model.rowsRemoved,
+        ):
+            signal.connect(self._alert_resync_timer.start)
         QTimer.singleShot(600, self._check_alerts_on_startup)
+        # Alerts of the other recent projects, read in a thread pool; the
+        # first scan waits until startup is over.
+        self.portfolio_scanner = PortfolioAlertScanner(parent=self)
+        self.portfolio_scanner.scanFinished.connect(self._on_portfolio_scanned)
+        self._show_portfolio_when_scanned = False
+        QTimer.singleShot(5000, self.scan_portfolio_alerts)
+        # Opt-in: the .mpp reader process and its JVM are started in the
+        # background once startup is over, so the first import does not wait.
+        if (self.config.get("Import", "prewarm_jvm") or "false").lower() == "true":
+            QTimer.singleShot(3000, self.prewarm_jvm)
 
         # Update manager initialization
         self.app_version = __version__
@@ -295,22 +326,71 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
 
     def _check_alerts_on_startup(self) -> None:
         """Show the alert summary dialog once per calendar day if relevant."""
-        if not self.alert_manager.should_show_dialog_today():
-            return
-        alerts = self.alert_manager.get_active_alerts(self.model.tasks)
-        if not alerts:
+        self._on_alert_check()
+        self.alert_manager.reschedule()
+
+    def _on_alert_check(self) -> None:
+        """Evaluates the alerts (startup or scheduled check) and shows the
+        summary dialog if it has not been shown today."""
+        alerts = self.alert_manager.get_active_alerts(self.model.tasks, self.model.revision)
+        logger.info("Alert check: %d active alert(s).", len(alerts))
+        if not alerts or not self.alert_manager.should_show_dialog_today():
             return
         from ui.alerts_dialog import AlertsDialog
         dlg = AlertsDialog(alerts, self.alert_manager, self)
         dlg.show()
         self.alert_manager.mark_shown_today()
 
-    def _on_daily_alert_check(self) -> None:
-        """Silent daily background check — resets the shown-today flag for tomorrow."""
-        alerts = self.alert_manager.get_active_alerts(self.model.tasks)
-        logger.info("Daily alert check: %d active alert(s).", len(alerts))
-        # Reset so that tomorrows startup will show the dialog again if needed.
-        self.config.set("Alerts", "last_shown_date", "")
+    def refresh_alert_schedule(self) -> None:
+        """Brings the alert index up to date with the tasks and re-arms the
+        check timer (after edits or a change of the alert settings)."""
+        self.alert_manager.get_active_alerts(self.model.tasks, self.model.revision)
+        self.alert_manager.reschedule()
+
+    def prewarm_jvm(self) -> None:
+        """Starts the .mpp reader process (JVM + MPXJ) if Java is installed."""
+        try:
+            from core.mpp_worker import shared_worker
+            from utils.jvm_manager import JVMManager
+        except ImportError as err:
+            logger.info("JVM warm-up skipped: %s", err)
+            return
+        if JVMManager.java_available():
+            shared_worker().warm_up()
+        else:
+            logger.info("JVM warm-up skipped: Java not found.")
+
+    def scan_portfolio_alerts(self) -> None:
+        """Starts a background scan of the alerts of the other recent projects."""
+        if not self.alert_manager.is_enabled():
+            return
+        current = getattr(self.task_table_widget, "current_file_path", None)
+        current = os.path.normcase(os.path.abspath(current)) if current else None
+        paths = [
+            path for path in self.config.get_recent_files()
+            if os.path.normcase(os.path.abspath(path)) != current
+        ]
+        self.portfolio_scanner.scan(paths, self.alert_manager.global_threshold())
+
+    def show_portfolio_alerts(self) -> None:
+        """Shows the alerts of the open project and of every recent project."""
+        self._show_portfolio_when_scanned = True
+        self.scan_portfolio_alerts()
+        if not self.alert_manager.is_enabled():
+            self._on_portfolio_scanned([])
+
+    def _on_portfolio_scanned(self, alerts: list) -> None:
+        logger.info("Portfolio alert scan: %d alert(s) in other projects.", len(alerts))
+        if not self._show_portfolio_when_scanned:
+            return
+        self._show_portfolio_when_scanned = False
+        current = self.alert_manager.get_active_alerts(self.model.tasks, self.model.revision)
+        from ui.alerts_dialog import AlertsDialog
+        dlg = AlertsDialog(
+            order_alerts(current + alerts), self.alert_manager, self,
+            title="Recordatorios de todos los proyectos",
+        )
+        dlg.show()
 
     def show_task_reminder_dialog(self, task_index: int) -> None:
         """Opens the per-task reminder configuration dialog."""
@@ -320,6 +400,8 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
         from ui.task_reminder_dialog import TaskReminderDialog
         dlg = TaskReminderDialog(task, self.config, self)
         if dlg.exec():
+            self.alert_manager.task_changed(task)
+            self._refresh_calendar()
             self.set_unsaved_changes(True)
 
 
@@ -468,18 +550,12 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
     # ------------------------------------------------------------------
 
     def validateAndCalculateDays(self, start_entry, end_entry, days_entry) -> None:
-        cal = Colombia()
-        start_date = start_entry.date().toPython()
-        end_date = end_entry.date().toPython()
+        start_date = start_entry.date()
+        end_date = end_entry.date()
         if end_date < start_date:
-            end_entry.setDate(QDate(start_date))
+            end_entry.setDate(start_date)
             end_date = start_date
-        business_days = 0
-        current_date = start_date
-        while current_date <= end_date:
-            if cal.is_working_day(current_date):
-                business_days += 1
-            current_date += timedelta(days=1)
+        business_days = working_days_between(start_date.toJulianDay(), end_date.toJulianDay())
         days_entry.setText(str(business_days))
         self.set_unsaved_changes(True)
         self.update_gantt_chart()
@@ -487,17 +563,9 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
     def calculateEndDateIfChanged(self, start_entry, days_entry, end_entry) -> None:
         if not days_entry.text().isdigit():
             return
-        cal = Colombia()
-        start_date = start_entry.date().toPython()
-        target_days = int(days_entry.text())
-        business_days = 0
-        end_date = start_date
-        while business_days < target_days:
-            if cal.is_working_day(end_date):
-                business_days += 1
-            if business_days < target_days:
-                end_date += timedelta(days=1)
-        end_entry.setDate(QDate(end_date))
+        start_day = start_entry.date().toJulianDay()
+        end_day = end_after_working_days(start_day, int(days_entry.text()))
+        end_entry.setDate(QDate.fromJulianDay(end_day))
         self.set_unsaved_changes(True)
         self.update_gantt_chart()
 
@@ -581,34 +649,112 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
             global_pos = self.table_view.viewport().mapToGlobal(position)
             self.show_task_context_menu(global_pos, index.row())
 
+    # ------------------------------------------------------------------
+    # Filtro de tareas
+    # ------------------------------------------------------------------
+
+    def show_filter_bar(self) -> None:
+        self.model.refresh_filter_index()
+        self.filter_bar.set_colors([t.color for t in self.model.tasks])
+        self.filter_bar.show()
+        self.filter_bar.focus_search()
+        QTimer.singleShot(0, self._position_view_toggle_button)
+
+    def toggle_filter_bar(self) -> None:
+        if self.filter_bar.isVisible():
+            self.clear_task_filter()
+        else:
+            self.show_filter_bar()
+
+    def apply_task_filter(self, task_filter) -> None:
+        """Aplica ``task_filter`` a la tabla y al Gantt (``None`` lo quita)."""
+        if task_filter is not None and task_filter.alert_kinds:
+            self.model.filter_index.set_alerts(
+                self.alert_manager.get_active_alerts(self.model.tasks, self.model.revision)
+            )
+        self.model.set_filter(task_filter)
+        self.adjust_all_row_heights()
+        self.update_gantt_chart(set_unsaved=False)
+        self.sync_scroll(0)
+
+    def clear_task_filter(self) -> None:
+        """Oculta la barra de filtro y vuelve a mostrar todas las tareas."""
+        self.filter_bar.clear()
+        self.filter_bar.hide()
+        QTimer.singleShot(0, self._position_view_toggle_button)
+        if self.model.task_filter is not None:
+            self.apply_task_filter(None)
+
     # ------------------------------------------------------------------
     # Gantt
     # ------------------------------------------------------------------
 
     def update_gantt_chart(self, set_unsaved: bool = True) -> None:
-        self.tasks = [
-            task
-            for row in range(self.model.rowCount())
-            if (task := self.model.getTask(row)) is not None
-        ]
+        """Refresco completo tras cambios estructurales (filas añadidas,
+        eliminadas, movidas o contraídas): sincroniza las tareas visibles y
+        luego recalcula la geometría. Las cadenas de fecha solo se vuelven a
+        analizar en las filas que cambiaron."""
+        self.tasks = list(self.model.visible_tasks)
+        self.gantt_chart.set_tasks(self.tasks)
+        # Recoge fechas modificadas directamente sobre la tarea (p. ej. al
+        # deshacer comandos) que no pasaron por los setters del modelo.
+        self.model.date_range.sync(self.model.visible_tasks)
+        self.model.invalidate_milestones()
+
+        self.update_gantt_geometry()
 
-        self.gantt_chart.tasks = self.tasks
-        today = QDate.currentDate()
+        if set_unsaved and self.tasks:
+            self.set_unsaved_changes(True)
 
-        # Estado previo del scroll para conservar la fecha visible tras recalcular
-        prev_min_date = self.gantt_chart.min_date
-        prev_ppd = self.gantt_chart.pixels_per_day
-        prev_scroll = self.gantt_hscroll.value()
+        # El calendario marca hitos de inicio/fin, incluidos los de subtareas
+        # cuya tarea padre esté contraída: a diferencia del Gantt (que oculta
+        # esas filas), el calendario debe seguir mostrando esos hitos, o un
+        # rango que solo se refleja en los hitos de las subtareas desaparecería
+        # de los meses intermedios al contraer la tarea.
+        self._refresh_calendar()
+
+    def update_gantt_rows(self, first_row: int, last_row: int) -> None:
+        """Refresco barato tras editar los datos de las filas visibles
+        ``first_row..last_row``: actualiza solo esas filas en los índices y
+        repinta su franja. Si cambia el rango del proyecto se recalcula la
+        geometría; si cambió la estructura se recurre al refresco completo."""
+        visible = self.model.visible_tasks
+        chart_tasks = self.gantt_chart.tasks
+        if len(chart_tasks) != len(visible):
+            self.update_gantt_chart(set_unsaved=False)
+            return
+        first_row = max(0, first_row)
+        last_row = min(last_row, len(visible) - 1)
+        for row in range(first_row, last_row + 1):
+            if chart_tasks[row] is not visible[row]:
+                self.update_gantt_chart(set_unsaved=False)
+                return
+            self.gantt_chart.spatial_index.update_row(row)
+            self.model.date_range.update(visible[row])
 
-        if self.tasks:
-            min_date = min(
-                (QDate.fromString(t.start_date, "dd/MM/yyyy") for t in self.tasks),
-                default=today,
-            )
-            max_date = max(
-                (QDate.fromString(t.end_date, "dd/MM/yyyy") for t in self.tasks),
-                default=today.addDays(30),
-            )
+        min_date, max_date = self._project_date_range()
+        if min_date != self.gantt_chart.min_date or max_date != self.gantt_chart.max_date:
+            self.update_gantt_geometry()
+        else:
+            self.gantt_chart.update_rows(first_row, last_row)
+
+        self._refresh_calendar()
+
+    def _refresh_calendar(self) -> None:
+        """Pasa al calendario el índice de hitos que mantiene el modelo. Con
+        el calendario oculto no hace nada: ``set_right_view`` lo refresca al
+        mostrarlo, y el índice solo se sincroniza cuando se consulta."""
+        if hasattr(self, "calendar_widget") and self.right_view_mode == "calendar":
+            self.calendar_widget.set_tasks(self.model.tasks, self.model.milestone_index())
+
+    def _project_date_range(self) -> tuple[QDate, QDate]:
+        """Rango de fechas mostrado: el del proyecto (mantenido por el modelo)
+        ampliado para incluir siempre el día de hoy."""
+        today = QDate.currentDate()
+        bounds = self.model.date_range.bounds() if self.tasks else None
+        if bounds is not None:
+            min_date = QDate.fromJulianDay(bounds[0])
+            max_date = QDate.fromJulianDay(bounds[1])
         else:
             min_date = today
             max_date = today.addDays(30)
@@ -622,17 +768,35 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
 
         if min_date == max_date:
             max_date = min_date.addDays(1)
+        return min_date, max_date
+
+    def _pixels_per_day_for(self, view: str, days_total: int) -> float:
+        """Escala del modo de vista: días visibles en el ancho del viewport
+        (la vista "completa" ajusta todo el rango al ancho)."""
+        viewport_width = max(1, self.gantt_widget.width())
+        window_days = min(self.VIEW_WINDOW_DAYS.get(view, days_total), days_total)
+        return max(0.1, viewport_width / window_days)
+
+    def update_gantt_geometry(self, pixels_per_day: float | None = None) -> None:
+        """Recalcula escala, rango y scroll del Gantt sin tocar los datos de
+        las tareas (redimensionado, zoom, cambio de ancho de columnas).
+        ``pixels_per_day`` fuerza una escala intermedia (zoom animado)."""
+        today = QDate.currentDate()
+
+        # Estado previo del scroll para conservar la fecha visible tras recalcular
+        prev_min_date = self.gantt_chart.min_date
+        prev_ppd = self.gantt_chart.pixels_per_day
+        prev_scroll = self.gantt_hscroll.value()
 
+        min_date, max_date = self._project_date_range()
         days_total = min_date.daysTo(max_date) + 1
 
         # El modo de vista define la escala (días visibles en el ancho del
         # viewport); el rango completo de fechas se recorre con el scroll
-        # horizontal. La vista "completa" ajusta todo el rango al ancho.
+        # horizontal.
         viewport_width = max(1, self.gantt_widget.width())
-        window_days = min(
-            self.VIEW_WINDOW_DAYS.get(self.current_view, days_total), days_total
-        )
-        pixels_per_day = max(0.1, viewport_width / window_days)
+        if pixels_per_day is None:
+            pixels_per_day = self._pixels_per_day_for(self.current_view, days_total)
 
         self.gantt_widget.update_parameters(min_date, max_date, pixels_per_day)
 
@@ -671,19 +835,8 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
         self.gantt_header.update()
         self.gantt_widget.updateGeometry()
 
-        if set_unsaved and self.tasks:
-            self.set_unsaved_changes(True)
-
         self.update_shared_scrollbar_range()
 
-        # El calendario marca hitos de inicio/fin, incluidos los de subtareas
-        # cuya tarea padre esté contraída: a diferencia del Gantt (que oculta
-        # esas filas), el calendario debe seguir mostrando esos hitos, o un
-        # rango que solo se refleja en los hitos de las subtareas desaparecería
-        # de los meses intermedios al contraer la tarea.
-        if hasattr(self, "calendar_widget"):
-            self.calendar_widget.set_tasks(self.model.tasks)
-
     # ------------------------------------------------------------------
     # Right panel view (Gantt / Calendar)
     # ------------------------------------------------------------------
@@ -702,7 +855,7 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
             # El scroll horizontal de tiempo solo aplica al Gantt
             self.gantt_hscroll.setVisible(False)
             self.view_toggle_button.setText("📊")
-            self.calendar_widget.set_tasks(self.model.tasks)
+            self._refresh_calendar()
         else:
             self.view_stack.setCurrentWidget(self.gantt_widget)
             self.gantt_hscroll.setVisible(True)
@@ -768,14 +921,17 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
         self.selected_period = days
         self.update_gantt_chart()
 
-    def _set_view_mode(self, view: str) -> None:
-        """Cambia el modo de vista (zoom temporal) manteniendo la línea del
-        día de hoy en la misma posición horizontal de la pantalla."""
+    def _set_view_mode(self, view: str, anchor_x: float | None = None) -> None:
+        """Cambia el modo de vista (zoom temporal) con una transición animada.
+
+        Se mantiene fijo el día bajo ``anchor_x`` (posición del cursor en el
+        viewport del Gantt); por defecto, la línea del día de hoy conserva su
+        posición horizontal en la pantalla."""
         chart = self.gantt_chart
         today = QDate.currentDate()
-        anchor_x = None
         if (
-            chart.min_date
+            anchor_x is None
+            and chart.min_date
             and chart.max_date
             and chart.pixels_per_day
             and chart.min_date <= today <= chart.max_date
@@ -787,11 +943,31 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
 
         self.current_view = view
         self.config.set("View", "gantt_zoom", view)
-        self.update_gantt_chart(set_unsaved=False)
 
-        if anchor_x is not None and chart.min_date and chart.pixels_per_day:
-            today_x = chart.min_date.daysTo(today) * chart.pixels_per_day
-            self.gantt_hscroll.setValue(int(round(today_x - anchor_x)))
+        animation = self.gantt_widget.zoom_animation
+        if anchor_x is None or not chart.pixels_per_day or not chart.isVisible():
+            animation.stop()
+            self.update_gantt_geometry()
+            return
+
+        days_total = chart.min_date.daysTo(chart.max_date) + 1
+        animation.start(
+            self._pixels_per_day_for(view, days_total),
+            anchor_x,
+            self.gantt_hscroll.value(),
+            self._apply_zoom_frame,
+            self._finish_zoom,
+        )
+
+    def _apply_zoom_frame(self, pixels_per_day: float, scroll: float) -> None:
+        """Cuadro intermedio del zoom animado dibujado en vivo."""
+        self.update_gantt_geometry(pixels_per_day)
+        self.gantt_hscroll.setValue(int(round(scroll)))
+
+    def _finish_zoom(self, pixels_per_day: float, scroll: float) -> None:
+        """Escala final del zoom animado, repintada con todo el detalle."""
+        self.update_gantt_geometry()
+        self.gantt_hscroll.setValue(int(round(scroll)))
 
     def set_year_view(self) -> None:
         self._set_view_mode("year")
@@ -814,41 +990,44 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
 
     def wheelEvent(self, event: QWheelEvent) -> None:
         if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            # El zoom se ancla en el día bajo el cursor si está sobre el Gantt
+            pos = self.gantt_chart.mapFrom(self, event.position().toPoint())
+            anchor_x = pos.x() if 0 <= pos.x() <= self.gantt_chart.width() else None
             delta = event.angleDelta().y()
             self.wheel_accumulator += delta
             if self.wheel_accumulator >= self.wheel_threshold:
-                self.zoom_in_view()
+                self.zoom_in_view(anchor_x)
                 self.wheel_accumulator = 0
             elif self.wheel_accumulator <= -self.wheel_threshold:
-                self.zoom_out_view()
+                self.zoom_out_view(anchor_x)
                 self.wheel_accumulator = 0
             event.accept()
         else:
             super().wheelEvent(event)
 
-    def zoom_in_view(self) -> None:
+    def zoom_in_view(self, anchor_x: float | None = None) -> None:
         transitions = {
-            "complete": self.set_year_view,
-            "year": self.set_six_month_view,
-            "six_month": self.set_three_month_view,
-            "three_month": self.set_one_month_view,
+            "complete": "year",
+            "year": "six_month",
+            "six_month": "three_month",
+            "three_month": "one_month",
         }
-        action = transitions.get(self.current_view)
-        if action:
-            action()
+        view = transitions.get(self.current_view)
+        if view:
+            self._set_view_mode(view, anchor_x)
         else:
             self.wheel_accumulator = 0
 
-    def zoom_out_view(self) -> None:
+    def zoom_out_view(self, anchor_x: float | None = None) -> None:
         transitions = {
-            "one_month": self.set_three_month_view,
-            "three_month": self.set_six_month_view,
-            "six_month": self.set_year_view,
-            "year": self.set_complete_view,
+            "one_month": "three_month",
+            "three_month": "six_month",
+            "six_month": "year",
+            "year": "complete",
         }
-        action = transitions.get(self.current_view)
-        if action:
-            action()
+        view = transitions.get(self.current_view)
+        if view:
+            self._set_view_mode(view, anchor_x)
         else:
             self.wheel_accumulator = 0
 
@@ -869,7 +1048,7 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
         if not getattr(self.model, "_editing_programmatically", False):
             self.set_unsaved_changes(True)
             if Qt.ItemDataRole.EditRole in roles:
-                self.update_gantt_chart(set_unsaved=False)
+                self.update_gantt_rows(topLeft.row(), bottomRight.row())
 
     def update_gantt_highlight(self, task_index: int | None) -> None:
         logger.debug("update_gantt_highlight: index=%s", task_index)
@@ -957,12 +1136,12 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
     def cleanup_and_exit(self, event) -> None:
         for window in self.file_gui_windows:
             window.close()
+        self.portfolio_scanner.shutdown()
         try:
-            from utils.jvm_manager import JVMManager
-            if JVMManager.is_jvm_started():
-                JVMManager.shutdown()
+            from core.mpp_worker import shared_worker
+            shared_worker().shutdown()
         except Exception as err:
-            logger.error("Error shutting down JVM: %s", err, exc_info=True)
+            logger.error("Error shutting down the MPP reader: %s", err, exc_info=True)
         event.accept()
 
     # ------------------------------------------------------------------
@@ -971,7 +1150,7 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
 
     def resizeEvent(self, event) -> None:
         super().resizeEvent(event)
-        self.update_gantt_chart(set_unsaved=False)
+        self.update_gantt_geometry()
         self.task_table_widget.adjust_button_size()
         self.update_shared_scrollbar_range()
         self._position_view_toggle_button()
@@ -992,6 +1171,48 @@ class MainWindow(TaskOperationsMixin, QMainWindow):
         about_dialog = AboutDialog(self)
         about_dialog.exec()
 
+    def export_chart(self) -> None:
+        """Exporta la vista derecha activa (Gantt o calendario) a PNG, SVG o PDF."""
+        from PySide6.QtWidgets import QFileDialog
+
+        from ui.chart_export import export_calendar, export_gantt
+
+        if not self.model.tasks:
+            QMessageBox.information(self, "Exportar diagrama", "No hay tareas para exportar.")
+            return
+        initial_dir = self.config.get("General", "last_directory") or ""
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Exportar diagrama",
+            initial_dir,
+            "Imagen PNG (*.png);;Imagen SVG (*.svg);;Documento PDF (*.pdf)",
+        )
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += "." + selected_filter.split("*.")[-1].rstrip(")")
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            if getattr(self, "right_view_mode", "gantt") == "calendar":
+                # La agenda no tiene salida propia: se exporta por meses.
+                mode = "year" if self.calendar_widget.mode == "year" else "month"
+                export_calendar(self.model.tasks, path, mode=mode)
+            else:
+                export_gantt(
+                    self.model.visible_tasks,
+                    path,
+                    pixels_per_day=self.gantt_chart.pixels_per_day,
+                    row_height=self.ROW_HEIGHT,
+                    header_height=self.HEADER_HEIGHT,
+                    visible_width=self.gantt_widget.width(),
+                )
+        except (OSError, ValueError) as exc:
+            logger.warning("Error al exportar el diagrama: %s", exc)
+            QMessageBox.warning(self, "Exportar diagrama", f"No se pudo exportar el diagrama:\n{exc}")
+        finally:
+            QApplication.restoreOverrideCursor()
+
     def show_report_dialog(self) -> None:
         """Opens the dual-option report problem dialog."""
         from ui.report_dialog import ReportDialog
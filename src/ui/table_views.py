@@ -10,7 +10,7 @@ import logging
 #con el resto de la aplicación.
 #1
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from PySide6.QtCore import QDate, QSize, Qt, QTimer, Signal
 from PySide6.QtGui import QColor, QKeySequence, QShortcut
@@ -25,10 +25,11 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from workalendar.america import Colombia
 
 from core.command_system import AddTaskCommand, ResetColorsCommand
 from core.models import Task, TaskTableModel
+from core.spatial_index import day_from_date
+from core.work_calendar import working_days_between
 from ui.delegates import DateEditDelegate, LineEditDelegate, SpinBoxDelegate, StateButtonDelegate
 from utils.atomic_io import atomic_write
 from utils.startup_manager import StartupManager
@@ -136,7 +137,7 @@ class TaskTableWidget(QWidget):
         self.table_view.setFixedWidth(total_width)
         # Actualizar el gráfico de Gantt (solo si main_window está completamente inicializado)
         if self.main_window and hasattr(self.main_window, 'model'):
-            self.main_window.update_gantt_chart(set_unsaved=False)
+            self.main_window.update_gantt_geometry()
         self.adjust_button_size()
 
     def save_column_widths(self) -> None:
@@ -170,7 +171,7 @@ class TaskTableWidget(QWidget):
             total_width = self.get_table_total_width()
             self.table_view.setFixedWidth(total_width)
             if self.main_window and hasattr(self.main_window, 'model'):
-                self.main_window.update_gantt_chart(set_unsaved=False)
+                self.main_window.update_gantt_geometry()
 
     # Definir el Método para Deseleccionar las Filas Seleccionadas
     def clear_selection(self):
@@ -217,7 +218,8 @@ class TaskTableWidget(QWidget):
                 # Solo marcar cambios sin guardar si no estamos cargando un archivo
                 if not hasattr(self.main_window, '_loading_file') or not self.main_window._loading_file:
                     self.main_window.set_unsaved_changes(True)
-                self.main_window.update_gantt_chart()
+                # Solo cambiaron datos de estas filas: refresco parcial del Gantt
+                self.main_window.update_gantt_rows(topLeft.row(), bottomRight.row())
 
     def show_menu(self):
         menu = QMenu(self)
@@ -280,6 +282,12 @@ class TaskTableWidget(QWidget):
             gantt_view_action.triggered.connect(self.main_window.show_gantt_view)
             calendar_view_action.triggered.connect(self.main_window.show_calendar_view)
         view_menu.addSeparator()
+        filter_action = view_menu.addAction("Filtrar tareas\tCtrl+F")
+        filter_action.setCheckable(True)
+        if self.main_window:
+            filter_action.setChecked(self.main_window.filter_bar.isVisible())
+            filter_action.triggered.connect(self.main_window.toggle_filter_bar)
+        view_menu.addSeparator()
         # Submenús de Vista (zoom temporal del Gantt)
         complete_action = view_menu.addAction("Completa")
         year_action = view_menu.addAction("Año")
@@ -303,6 +311,10 @@ class TaskTableWidget(QWidget):
         import_action = menu.addAction("Importar cronogramas")
         import_action.triggered.connect(lambda: self.show_file_gui())
 
+        export_action = menu.addAction("Exportar diagrama...")
+        export_action.setEnabled(bool(self.model.tasks))
+        export_action.triggered.connect(self.main_window.export_chart)
+
         config_menu = menu.addMenu("Configuración")
         language_menu = config_menu.addMenu("Idioma")
         language_menu.addAction("Español")
@@ -320,6 +332,18 @@ class TaskTableWidget(QWidget):
             startup_action.triggered.connect(self.toggle_startup)
         alerts_action = config_menu.addAction("Alertas...")
         alerts_action.triggered.connect(self._show_global_alerts_config)
+        if self.main_window:
+            prewarm_action = config_menu.addAction("Preparar Java al iniciar (importar MPP)")
+            prewarm_action.setCheckable(True)
+            prewarm_action.setChecked(
+                (self.main_window.config.get("Import", "prewarm_jvm") or "false").lower() == "true"
+            )
+            prewarm_action.toggled.connect(self._set_prewarm_jvm)
+
+        if self.main_window:
+            portfolio_action = menu.addAction("🔔 Alertas de todos los proyectos")
+            portfolio_action.setToolTip("Recordatorios de este proyecto y de los archivos recientes")
+            portfolio_action.triggered.connect(self.main_window.show_portfolio_alerts)
 
         report_action = menu.addAction("Reportar un problema")
         report_action.triggered.connect(self.main_window.show_report_dialog)
@@ -331,12 +355,18 @@ class TaskTableWidget(QWidget):
         if action:
             logger.debug(f"Acción seleccionada: {action.text()}")
 
+    def _set_prewarm_jvm(self, enabled: bool) -> None:
+        self.main_window.config.set("Import", "prewarm_jvm", "true" if enabled else "false")
+        if enabled:
+            self.main_window.prewarm_jvm()
+
     def _show_global_alerts_config(self) -> None:
         if not self.main_window:
             return
         from ui.global_alerts_dialog import GlobalAlertsDialog
         dlg = GlobalAlertsDialog(self.main_window.config, self)
-        dlg.exec()
+        if dlg.exec():
+            self.main_window.refresh_alert_schedule()
 
     def adjust_button_size(self):
         header = self.table_view.horizontalHeader()
@@ -469,6 +499,7 @@ class TaskTableWidget(QWidget):
                 self.main_window._loading_file = True
                 # Limpiar historial de comandos al cargar archivo
                 self.main_window.command_manager.clear()
+                self.main_window.clear_task_filter()
 
             self.model.beginResetModel()
             self.model.tasks = []
@@ -655,6 +686,7 @@ class TaskTableWidget(QWidget):
     def new_project(self):
         # Verificar si hay cambios sin guardar
         if self.main_window and self.main_window.check_unsaved_changes():
+            self.main_window.clear_task_filter()
             # Limpiar todas las tareas existentes
             self.model.beginResetModel()
             self.model.tasks = []
@@ -792,14 +824,9 @@ class TaskTableWidget(QWidget):
             start = datetime.strptime(start_date, "%d/%m/%Y")
             end = datetime.strptime(end_date, "%d/%m/%Y")
 
-            cal = Colombia()
-            business_days = 0
-            current_date = start
-            while current_date <= end:
-                if cal.is_working_day(current_date.date()):
-                    business_days += 1
-                current_date += timedelta(days=1)
-
+            business_days = working_days_between(
+                day_from_date(start.date()), day_from_date(end.date())
+            )
             return str(business_days)
         except Exception as e:
                logger.warning(f"Error al calcular duración: {e}")
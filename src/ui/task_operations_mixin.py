@@ -20,6 +20,7 @@ from core.command_system import (
     DuplicateTaskCommand,
     InsertTaskCommand,
     MoveTaskCommand,
+    RescheduleTaskCommand,
 )
 from core.models import Task
 
@@ -568,6 +569,23 @@ class TaskOperationsMixin:
             self.table_view.scrollTo(model.index(visible_index, 0))
             self.table_view.edit(model.index(visible_index, 1))
 
+    # ------------------------------------------------------------------
+    # Reschedule (arrastrar y soltar en el Gantt)
+    # ------------------------------------------------------------------
+
+    def reschedule_task(self, task_index: int, start_date: str, end_date: str) -> None:
+        """Aplica las fechas finales de un arrastre como un único comando."""
+        if not (0 <= task_index < len(self.tasks)):
+            return
+        task = self.tasks[task_index]
+        old_dates = (task.start_date, task.end_date)
+        if old_dates == (start_date, end_date):
+            return
+        command = RescheduleTaskCommand(  # type: ignore[arg-type]
+            self, task, old_dates, (start_date, end_date)
+        )
+        self.command_manager.execute_command(command)
+
     # ------------------------------------------------------------------
     # Color
     # ------------------------------------------------------------------
@@ -4,7 +4,9 @@ Per-task reminder configuration dialog, accessible via the task context menu.
 Allows the user to:
   - Override the global alert threshold for this specific task.
   - Permanently silence alerts for this task.
-  - Add / remove exact-date extra reminders.
+  - Add / remove extra reminders, one-time or recurring (interval, weekdays,
+    last day of the month, working days only, end date or count — see
+    core.reminder_rules).
 
 Changes are applied directly to the Task object on dialog acceptance.
 The caller is responsible for marking unsaved changes.
@@ -17,6 +19,7 @@ from typing import TYPE_CHECKING
 from PySide6.QtCore import QDate, Qt
 from PySide6.QtWidgets import (
     QButtonGroup,
+    QCheckBox,
     QComboBox,
     QDateEdit,
     QDialog,
@@ -38,6 +41,7 @@ from PySide6.QtWidgets import (
 
 if TYPE_CHECKING:
     from core.models import Task
+from core.reminder_rules import LAST_DAY, describe_reminder
 from utils.config_manager import ConfigManager
 
 logger = logging.getLogger("bpm.task_reminder_dialog")
@@ -48,6 +52,9 @@ _DATE_FMT = "dd/MM/yyyy"
 class TaskReminderDialog(QDialog):
     """Dialog for per-task reminder configuration."""
 
+    # Same order as the entries of the frequency combo
+    _FREQUENCIES = ("once", "daily", "weekly", "monthly")
+
     def __init__(
         self,
         task: Task,
@@ -170,8 +177,61 @@ class TaskReminderDialog(QDialog):
         date_freq_layout.addWidget(self._freq_combo)
 
         form_layout.addRow("Fecha:", date_freq_layout)
+
+        # Recurrence options (hidden for one-time reminders)
+        self._recurrence = QWidget()
+        rec_form = QFormLayout(self._recurrence)
+        rec_form.setContentsMargins(0, 0, 0, 0)
+
+        interval_row = QHBoxLayout()
+        self._spin_interval = QSpinBox()
+        self._spin_interval.setRange(1, 99)
+        self._interval_unit = QLabel()
+        interval_row.addWidget(self._spin_interval)
+        interval_row.addWidget(self._interval_unit)
+        interval_row.addStretch()
+        rec_form.addRow("Repetir cada:", interval_row)
+
+        self._weekdays_row = QWidget()
+        wd_layout = QHBoxLayout(self._weekdays_row)
+        wd_layout.setContentsMargins(0, 0, 0, 0)
+        self._weekday_checks: list[QCheckBox] = []
+        for letter in ("L", "M", "X", "J", "V", "S", "D"):
+            check = QCheckBox(letter)
+            self._weekday_checks.append(check)
+            wd_layout.addWidget(check)
+        wd_layout.addStretch()
+        rec_form.addRow("Días:", self._weekdays_row)
+
+        self._chk_last_day = QCheckBox("Último día de cada mes")
+        rec_form.addRow("", self._chk_last_day)
+        self._chk_business = QCheckBox("Solo días hábiles (mueve fines de semana y festivos)")
+        rec_form.addRow("", self._chk_business)
+
+        end_row = QHBoxLayout()
+        self._end_combo = QComboBox()
+        self._end_combo.addItems(["Nunca", "El día", "Tras"])
+        self._until_edit = QDateEdit()
+        self._until_edit.setCalendarPopup(True)
+        self._until_edit.setDisplayFormat(_DATE_FMT)
+        self._until_edit.setDate(QDate.currentDate().addMonths(3))
+        self._spin_count = QSpinBox()
+        self._spin_count.setRange(1, 999)
+        self._spin_count.setValue(10)
+        self._spin_count.setSuffix(" veces")
+        end_row.addWidget(self._end_combo)
+        end_row.addWidget(self._until_edit)
+        end_row.addWidget(self._spin_count)
+        end_row.addStretch()
+        rec_form.addRow("Termina:", end_row)
+
+        form_layout.addRow(self._recurrence)
         r_layout.addLayout(form_layout)
 
+        self._freq_combo.currentIndexChanged.connect(self._update_recurrence_fields)
+        self._end_combo.currentIndexChanged.connect(self._update_recurrence_fields)
+        self._update_recurrence_fields()
+
         add_btn = QPushButton("+ Añadir recordatorio")
         add_btn.clicked.connect(self._on_add_reminder)
         r_layout.addWidget(add_btn, alignment=Qt.AlignmentFlag.AlignRight)
@@ -202,6 +262,18 @@ class TaskReminderDialog(QDialog):
         except (ValueError, TypeError):
             return 7
 
+    def _update_recurrence_fields(self) -> None:
+        freq = self._FREQUENCIES[self._freq_combo.currentIndex()]
+        self._recurrence.setVisible(freq != "once")
+        self._interval_unit.setText(
+            {"daily": "día(s)", "weekly": "semana(s)", "monthly": "mes(es)"}.get(freq, "")
+        )
+        self._weekdays_row.setEnabled(freq in ("daily", "weekly"))
+        self._chk_last_day.setEnabled(freq == "monthly")
+        end_mode = self._end_combo.currentIndex()
+        self._until_edit.setVisible(end_mode == 1)
+        self._spin_count.setVisible(end_mode == 2)
+
     def _add_list_item(self, rem: dict) -> None:
         date_str = rem.get("date", "")
         comment = rem.get("comment", "")
@@ -210,10 +282,7 @@ class TaskReminderDialog(QDialog):
         icons = {"once": "📅", "daily": "🔁", "weekly": "🔁", "monthly": "🔁"}
         icon = icons.get(freq, "📅")
 
-        freq_es = {"once": "Una vez", "daily": "Diario", "weekly": "Semanal", "monthly": "Mensual"}
-        freq_label = freq_es.get(freq, "Una vez")
-
-        display_text = f"{icon} [{freq_label}] {date_str} - {comment}"
+        display_text = f"{icon} [{describe_reminder(rem)}] {date_str} - {comment}"
         item = QListWidgetItem(display_text)
         # We index it by reference or id? No, just store the dict string or index.
         # Actually storing the dict id could be problematic for deletion if copies are made.
@@ -231,10 +300,25 @@ class TaskReminderDialog(QDialog):
         if not comment:
             comment = "Sin título"
 
-        freq_map = {0: "once", 1: "daily", 2: "weekly", 3: "monthly"}
-        freq = freq_map.get(self._freq_combo.currentIndex(), "once")
+        freq = self._FREQUENCIES[self._freq_combo.currentIndex()]
 
         new_rem = {"date": date_str, "comment": comment, "frequency": freq}
+        if freq != "once":
+            # Only non-default rule keys are stored, so simple reminders keep
+            # the original three-key format.
+            if self._spin_interval.value() > 1:
+                new_rem["interval"] = self._spin_interval.value()
+            weekdays = [i + 1 for i, c in enumerate(self._weekday_checks) if c.isChecked()]
+            if freq in ("daily", "weekly") and weekdays:
+                new_rem["weekdays"] = weekdays
+            if freq == "monthly" and self._chk_last_day.isChecked():
+                new_rem["month_days"] = [LAST_DAY]
+            if self._chk_business.isChecked():
+                new_rem["business_days"] = True
+            if self._end_combo.currentIndex() == 1:
+                new_rem["until"] = self._until_edit.date().toString(_DATE_FMT)
+            elif self._end_combo.currentIndex() == 2:
+                new_rem["count"] = self._spin_count.value()
         self._reminders.append(new_rem)
 
         # Sort by date
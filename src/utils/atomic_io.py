@@ -15,7 +15,7 @@ import tempfile
 from collections.abc import Iterator
 from contextlib import contextmanager
 from pathlib import Path
-from typing import TextIO
+from typing import IO, TextIO
 
 
 @contextmanager
@@ -27,6 +27,18 @@ def atomic_write(path: str | Path, encoding: str = "utf-8") -> Iterator[TextIO]:
     ``fsync``-ed, then moved into place. If the body raises, the temporary file
     is removed and the original ``path`` is left untouched.
     """
+    with _atomic_open(path, "w", encoding) as handle:
+        yield handle
+
+
+def atomic_write_bytes(path: str | Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` atomically (same guarantees as ``atomic_write``)."""
+    with _atomic_open(path, "wb", None) as handle:
+        handle.write(data)
+
+
+@contextmanager
+def _atomic_open(path: str | Path, mode: str, encoding: str | None) -> Iterator[IO]:
     path = Path(path)
     directory = path.parent
     directory.mkdir(parents=True, exist_ok=True)
@@ -34,7 +46,7 @@ def atomic_write(path: str | Path, encoding: str = "utf-8") -> Iterator[TextIO]:
     fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=f".{path.name}.", suffix=".tmp")
     tmp_path = Path(tmp_name)
     try:
-        with os.fdopen(fd, "w", encoding=encoding) as tmp_file:
+        with os.fdopen(fd, mode, encoding=encoding) as tmp_file:
             yield tmp_file
             tmp_file.flush()
             os.fsync(tmp_file.fileno())
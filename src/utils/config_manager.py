@@ -14,17 +14,18 @@ from utils.atomic_io import atomic_write
 logger = logging.getLogger("bpm.config")
 
 
+def config_directory() -> Path:
+    """Directorio de configuración (y de datos locales) según el sistema operativo."""
+    if platform.system() == "Windows":
+        app_data = os.getenv("APPDATA")
+        if app_data:
+            return Path(app_data) / "BabyProjectManager"
+    return Path.home() / ".baby-project-manager"
+
+
 class ConfigManager:
     def __init__(self) -> None:
-        # Determinar el directorio de configuración según el sistema operativo
-        if platform.system() == "Windows":
-            app_data = os.getenv("APPDATA")
-            if app_data:
-                self.config_dir = Path(app_data) / "BabyProjectManager"
-            else:
-                self.config_dir = Path.home() / ".baby-project-manager"
-        else:
-            self.config_dir = Path.home() / ".baby-project-manager"
+        self.config_dir = config_directory()
 
         self.config_file = self.config_dir / "config.ini"
         self.config = configparser.ConfigParser()
@@ -64,6 +65,9 @@ class ConfigManager:
                 "show_on_startup": "true",
                 "last_shown_date": "",
             },
+            "Import": {
+                "prewarm_jvm": "false",
+            },
         }
 
         self.load_config()
@@ -3,7 +3,9 @@ Utility functions for normalizing and filtering task data.
 """
 from __future__ import annotations
 
+import re
 import unicodedata
+from collections.abc import Iterable
 from typing import Any
 
 
@@ -12,6 +14,9 @@ def normalize_string(s: str | None) -> str:
     if s is None:
         return ""
     s = str(s)
+    if s.isascii():
+        # Sin acentos posibles: evita la descomposición carácter a carácter.
+        return s.lower()
     return "".join(
         c for c in unicodedata.normalize("NFD", s)
         if unicodedata.category(c) != "Mn"
@@ -42,3 +47,70 @@ def filter_tasks(
         if all(term in normalized_task_name for term in search_terms):
             filtered_tasks.append(task)
     return filtered_tasks
+
+
+def split_terms(text: str) -> tuple[str, ...]:
+    """Términos normalizados de una lista separada por comas."""
+    return tuple(normalize_string(term.strip()) for term in text.split(',') if term.strip())
+
+
+def _any_term_pattern(terms: tuple[str, ...]) -> re.Pattern[str] | None:
+    if not terms:
+        return None
+    # Una sola alternancia: el texto se recorre una vez para todos los términos
+    return re.compile('|'.join(re.escape(term) for term in terms))
+
+
+class TermMatcher:
+    """Búsqueda (todos los términos), inclusión (alguno) y exclusión (ninguno)
+    sobre nombres ya normalizados, compiladas en una expresión cada una."""
+
+    __slots__ = ("search", "include", "exclude", "_search", "_include", "_exclude")
+
+    def __init__(
+        self,
+        search: Iterable[str] = (),
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+    ) -> None:
+        self.search = tuple(search)
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self._search = (
+            re.compile(''.join(f'(?=.*?{re.escape(term)})' for term in self.search), re.DOTALL)
+            if self.search else None
+        )
+        self._include = _any_term_pattern(self.include)
+        self._exclude = _any_term_pattern(self.exclude)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TermMatcher):
+            return NotImplemented
+        return (self.search, self.include, self.exclude) == (other.search, other.include, other.exclude)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def matches(self, name: str) -> bool:
+        if self._search is not None and self._search.match(name) is None:
+            return False
+        if self._include is not None and self._include.search(name) is None:
+            return False
+        return self._exclude is None or self._exclude.search(name) is None
+
+    def narrows(self, previous: TermMatcher | None) -> bool:
+        """``True`` si todo nombre que acepta este filtro también lo acepta
+        ``previous`` (por ejemplo, si solo se alargó un término de búsqueda);
+        entonces basta con volver a evaluar los nombres que ya pasaban."""
+        if previous is None:
+            return False
+        # Búsqueda: cada término anterior sigue contenido en alguno nuevo
+        if not all(any(old in new for new in self.search) for old in previous.search):
+            return False
+        # Inclusión: cada término nuevo contiene alguno anterior
+        if previous.include and not (
+            self.include
+            and all(any(old in new for old in previous.include) for new in self.include)
+        ):
+            return False
+        # Exclusión: cada término anterior contiene alguno nuevo
+        return all(any(new in old for new in self.exclude) for old in previous.exclude)
@@ -3,22 +3,58 @@ import logging
 # jvm_manager.py
 import os
 import platform
+import threading
 
 import jpype
 
 logger = logging.getLogger("bpm.jvm")
 
+
 class JVMManager:
     _instance = None
     _jvm_started = False
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
+    @staticmethod
+    def find_jvm_path():
+        """Ruta de la librería de la JVM; lanza una excepción si no hay Java."""
+        if platform.system() == "Windows":
+            java_home = os.environ.get("JAVA_HOME")
+            if not java_home:
+                raise OSError(
+                    "La variable de entorno JAVA_HOME no está configurada."
+                )
+
+            jvm_path = os.path.join(java_home, "bin", "server", "jvm.dll")
+            if not os.path.exists(jvm_path):
+                jvm_path = os.path.join(java_home, "bin", "client", "jvm.dll")
+                if not os.path.exists(jvm_path):
+                    raise FileNotFoundError("No se encontró jvm.dll")
+            return jvm_path
+        return jpype.getDefaultJVMPath()
+
+    @classmethod
+    def java_available(cls):
+        try:
+            cls.find_jvm_path()
+            return True
+        except Exception:
+            return False
+
     @classmethod
     def start_jvm(cls):
+        """Inicia la JVM si hace falta. Es seguro llamarla desde varios hilos:
+        si otro hilo la está iniciando, espera a que termine."""
+        with cls._lock:
+            return cls._start_jvm_locked()
+
+    @classmethod
+    def _start_jvm_locked(cls):
         if cls._jvm_started:
             return True
 
@@ -27,29 +63,14 @@ class JVMManager:
                 cls._jvm_started = True
                 return True
 
-            system = platform.system()
             jvm_args = [
                 "-Dlog4j2.loggerContextFactory=org.apache.logging.log4j.simple.SimpleLoggerContextFactory",
                 "-Dorg.apache.logging.log4j.simplelog.StatusLogger.level=OFF",
                 "-Dlog4j2.level=OFF"
             ]
-
-            if system == "Windows":
-                java_home = os.environ.get("JAVA_HOME")
-                if not java_home:
-                    raise OSError(
-                        "La variable de entorno JAVA_HOME no está configurada."
-                    )
-
-                jvm_path = os.path.join(java_home, "bin", "server", "jvm.dll")
-                if not os.path.exists(jvm_path):
-                    jvm_path = os.path.join(java_home, "bin", "client", "jvm.dll")
-                    if not os.path.exists(jvm_path):
-                        raise FileNotFoundError("No se encontró jvm.dll")
-
-                jpype.startJVM(jvm_path, *jvm_args)
-            else:
-                jpype.startJVM(jpype.getDefaultJVMPath(), *jvm_args)
+            # Los manejadores de señales solo se instalan desde el hilo principal
+            on_main_thread = threading.current_thread() is threading.main_thread()
+            jpype.startJVM(cls.find_jvm_path(), *jvm_args, interrupt=on_main_thread)
 
             cls._jvm_started = True
             logger.debug("JVM iniciada correctamente.")
@@ -59,6 +80,19 @@ class JVMManager:
             logger.warning(f"Error al iniciar la JVM: {e}")
             return False
 
+    @staticmethod
+    def preload_mpxj():
+        """Carga las clases del lector de MPXJ (con la JVM ya iniciada)."""
+        try:
+            import jpype.imports  # noqa: F401  (importación de clases Java)
+            from net.sf.mpxj.reader import UniversalProjectReader
+
+            UniversalProjectReader()
+            logger.debug("Clases de MPXJ precargadas.")
+        except Exception as e:
+            # La JVM está lista; el error de MPXJ se verá al importar.
+            logger.info(f"No se pudieron precargar las clases de MPXJ: {e}")
+
     @classmethod
     def is_jvm_started(cls):
         return cls._jvm_started
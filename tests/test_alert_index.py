@@ -0,0 +1,174 @@
+"""Tests for the incremental alert index behind AlertManager."""
+from __future__ import annotations
+
+import random
+
+from PySide6.QtCore import QDate
+
+from core.alert_index import AlertIndex
+from core.models import Task
+
+FMT = "dd/MM/yyyy"
+
+
+def _reference(tasks, today, threshold):
+    """Day-by-day scan with the rules documented in ``alert_manager``."""
+    found = []
+    for task in tasks:
+        snoozed = task.alert_snoozed_until
+        if snoozed == "never":
+            continue
+        if snoozed and QDate.fromString(snoozed, FMT).isValid():
+            if today <= QDate.fromString(snoozed, FMT):
+                continue
+        for rem in task.extra_reminders:
+            rem_date = QDate.fromString(rem["date"], FMT)
+            days = today.daysTo(rem_date)
+            freq = rem["frequency"]
+            if days <= 0 and (
+                freq in ("once", "daily")
+                or (freq == "weekly" and abs(days) % 7 == 0)
+                # Days missing from a month fall on its last day.
+                or (freq == "monthly" and today.day() == min(rem_date.day(), today.daysInMonth()))
+            ):
+                found.append((task.name, "extra_reminder", rem["date"]))
+        end = QDate.fromString(task.end_date, FMT)
+        if not end.isValid():
+            continue
+        remaining = today.daysTo(end)
+        limit = task.alert_threshold_days if task.alert_threshold_days is not None else threshold
+        if remaining < 0:
+            found.append((task.name, "overdue", task.end_date))
+        elif remaining <= limit:
+            found.append((task.name, "upcoming", task.end_date))
+    return found
+
+
+def _random_tasks(rng, base, count):
+    tasks = []
+    for i in range(count):
+        end = base.addDays(rng.randint(-20, 90))
+        task = Task(f"T{i}", base.toString(FMT), end.toString(FMT), "1", "40")
+        if rng.random() < 0.3:
+            task.alert_threshold_days = rng.randint(0, 15)
+        roll = rng.random()
+        if roll < 0.1:
+            task.alert_snoozed_until = "never"
+        elif roll < 0.3:
+            task.alert_snoozed_until = base.addDays(rng.randint(-5, 40)).toString(FMT)
+        task.extra_reminders = [
+            {
+                "date": base.addDays(rng.randint(-40, 60)).toString(FMT),
+                "comment": "c",
+                "frequency": rng.choice(["once", "daily", "weekly", "monthly"]),
+            }
+            for _ in range(rng.randint(0, 2))
+        ]
+        tasks.append(task)
+    return tasks
+
+
+def _as_tuples(index, tasks):
+    names = {id(t): t.name for t in tasks}
+    result = []
+    for task, item in index.active_items():
+        value = item[1] if item[0] == "extra_reminder" else QDate.fromJulianDay(item[1]).toString(FMT)
+        result.append((names[id(task)], item[0], value))
+    return sorted(result)
+
+
+def test_index_matches_a_daily_scan_while_days_advance(qapp):
+    rng = random.Random(7)
+    base = QDate(2026, 1, 28)
+    tasks = _random_tasks(rng, base, 120)
+    index = AlertIndex()
+    index.sync(tasks, base.toJulianDay(), 7)
+    for offset in range(120):
+        today = base.addDays(offset)
+        index.advance(today.toJulianDay())
+        assert _as_tuples(index, tasks) == sorted(_reference(tasks, today, 7)), today
+        next_day = index.next_change_day()
+        assert next_day is None or next_day > today.toJulianDay()
+
+
+def test_edits_and_threshold_changes_are_picked_up(qapp):
+    today = QDate(2026, 3, 10)
+    task = Task("A", "01/03/2026", "30/03/2026", "1", "40")
+    index = AlertIndex()
+    index.sync([task], today.toJulianDay(), 7)
+    assert index.active_items() == []
+    assert index.next_change_day() == QDate(2026, 3, 23).toJulianDay()
+
+    task.end_date = "12/03/2026"
+    index.update(task)
+    assert [item[0] for _t, item in index.active_items()] == ["upcoming"]
+
+    task.alert_snoozed_until = "15/03/2026"
+    index.update(task)
+    assert index.active_items() == []
+    assert index.next_change_day() == QDate(2026, 3, 16).toJulianDay()
+
+    task.alert_snoozed_until = None
+    task.end_date = "30/03/2026"
+    index.sync([task], today.toJulianDay(), 30)
+    assert [item[0] for _t, item in index.active_items()] == ["upcoming"]
+    index.sync([], today.toJulianDay(), 30)
+    assert len(index) == 0 and index.next_change_day() is None
+
+
+class _Config:
+    def __init__(self, **values):
+        self.values = {"days_before": "7", **values}
+
+    def get(self, section, key, fallback=None):
+        return self.values.get(key, fallback)
+
+
+def test_manager_rescans_only_when_the_model_changes(qapp):
+    from core.alert_manager import AlertManager
+    from core.models import TaskTableModel
+
+    soon = QDate.currentDate().addDays(3).toString(FMT)
+    later = QDate.currentDate().addDays(30).toString(FMT)
+    task = Task("A", QDate.currentDate().toString(FMT), later, "1", "40")
+    model = TaskTableModel(tasks=[task])
+    manager = AlertManager(_Config())
+    assert manager.get_active_alerts(model.tasks, model.revision) == []
+
+    # Same revision: the edit is not seen until the model reports it.
+    task.end_date = soon
+    assert manager.get_active_alerts(model.tasks, model.revision) == []
+    model.invalidate_milestones()
+    alerts = manager.get_active_alerts(model.tasks, model.revision)
+    assert [(a.kind, a.days_remaining) for a in alerts] == [("upcoming", 3)]
+
+    manager.snooze_task(task, 5)
+    assert manager.get_active_alerts(model.tasks, model.revision) == []
+    assert manager.next_change_date() == QDate.currentDate().addDays(6)
+
+
+def test_timer_is_armed_for_the_next_change_at_check_time(qapp):
+    from datetime import datetime, time
+
+    from core.alert_manager import AlertManager
+
+    end = QDate.currentDate().addDays(10)
+    task = Task("A", QDate.currentDate().toString(FMT), end.toString(FMT), "1", "40")
+    manager = AlertManager(_Config(check_time="09:30"))
+    calls = []
+    timer = manager.schedule_alert_checks(lambda: calls.append(1))
+    assert not timer.isActive()  # nothing known yet
+
+    manager.get_active_alerts([task])
+    manager.reschedule()
+    enters_window = end.addDays(-7).toPython()
+    assert manager.next_check_time() == datetime.combine(enters_window, time(9, 30))
+    assert timer.isActive()
+    assert timer.interval() == AlertManager._MAX_WAIT_MS  # woken hourly to track the wall clock
+
+    # An early wake-up (wall clock not there yet) only re-arms the timer.
+    manager._on_check_timer()
+    assert calls == [] and timer.isActive()
+
+    manager.snooze_task(task, None)
+    assert manager.next_check_time() is None and not timer.isActive()
@@ -0,0 +1,64 @@
+"""Tests for the lazily populated agenda model of the calendar."""
+from __future__ import annotations
+
+from PySide6.QtCore import QDate
+
+from core.milestone_index import MilestoneIndex
+from core.models import Task
+from core.spatial_index import day_number
+from ui.calendar_agenda import MilestoneListModel
+
+
+def _tasks(count):
+    base = QDate(2026, 1, 1)
+    return [
+        Task(
+            f"T{i}",
+            base.addDays(i).toString("dd/MM/yyyy"),
+            base.addDays(i + 3).toString("dd/MM/yyyy"),
+            "1", "40",
+        )
+        for i in range(count)
+    ]
+
+
+def test_rows_are_fetched_in_batches_and_sorted(qapp):
+    tasks = _tasks(600)
+    index = MilestoneIndex(tasks)
+    model = MilestoneListModel()
+    model.set_milestones(index)
+    assert model.rowCount() == 0 and model.canFetchMore()
+
+    model.fetchMore()
+    loaded = model.rowCount()
+    assert MilestoneListModel.FETCH_BATCH <= loaded < len(index)
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == len(index)
+    days = [model.entry(row)[0] for row in range(model.rowCount())]
+    assert days == sorted(days)
+
+
+def test_row_for_day_loads_through_the_target(qapp):
+    tasks = _tasks(600)
+    model = MilestoneListModel()
+    model.set_milestones(MilestoneIndex(tasks))
+
+    target = day_number("10/06/2027")
+    row = model.row_for_day(target)
+    assert model.entry(row)[0] >= target
+    assert model.entry(row - 1)[0] < target
+    # Same index and revision: no reset.
+    index = model._milestones
+    assert not model.set_milestones(index)
+
+
+def test_range_limits_rows_to_one_month(qapp):
+    tasks = _tasks(90)
+    model = MilestoneListModel()
+    model.set_milestones(MilestoneIndex(tasks), day_number("01/02/2026"), day_number("28/02/2026"))
+    entries = model.entries()
+    assert entries and all(
+        day_number("01/02/2026") <= day <= day_number("28/02/2026") for day, _t, _k in entries
+    )
+    assert len(entries) == 2 * 28
@@ -0,0 +1,73 @@
+"""Tests for ui.chart_export: streamed PNG writing, tiled Gantt rendering and
+vector/paginated outputs."""
+from __future__ import annotations
+
+import pytest
+from PySide6.QtGui import QColor, QImage
+
+from core.models import Task
+from ui.chart_export import GanttExporter, PngStreamWriter, export_calendar, export_gantt
+
+
+def _tasks():
+    return [
+        Task(f"T{i}", f"{1 + i:02d}/01/2026", f"{10 + i:02d}/02/2026", "1", "40")
+        for i in range(12)
+    ]
+
+
+def test_png_stream_writer_roundtrips_rows(qapp, tmp_path):
+    path = tmp_path / "rows.png"
+    with PngStreamWriter(str(path), 3, 2) as writer:
+        writer.write_row(bytes([255, 0, 0, 0, 255, 0, 0, 0, 255]))
+        writer.write_row(bytes([10, 20, 30] * 3))
+    image = QImage(str(path))
+    assert (image.width(), image.height()) == (3, 2)
+    assert image.pixelColor(0, 0) == QColor(255, 0, 0)
+    assert image.pixelColor(2, 0) == QColor(0, 0, 255)
+    assert image.pixelColor(1, 1) == QColor(10, 20, 30)
+
+
+def test_png_stream_writer_removes_partial_file_on_error(qapp, tmp_path):
+    path = tmp_path / "broken.png"
+    with pytest.raises(RuntimeError):
+        with PngStreamWriter(str(path), 1, 2) as writer:
+            writer.write_row(b"\x00\x00\x00")
+            raise RuntimeError("boom")
+    assert not path.exists()
+
+
+def test_png_stream_writer_rejects_missing_rows(qapp, tmp_path):
+    path = tmp_path / "short.png"
+    with pytest.raises(ValueError):
+        with PngStreamWriter(str(path), 1, 2) as writer:
+            writer.write_row(b"\x00\x00\x00")
+    assert not path.exists()
+
+
+def test_tiled_png_matches_single_render(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(GanttExporter, "TILE_SIZE", 64)
+    path = tmp_path / "gantt.png"
+    export_gantt(_tasks(), str(path), pixels_per_day=6, workers=3)
+
+    exporter = GanttExporter(_tasks(), pixels_per_day=6)
+    whole = exporter.render_tile(0, 0, exporter.width, exporter.height)
+    exported = QImage(str(path)).convertToFormat(QImage.Format.Format_RGB888)
+    assert exported.size() == whole.size()
+    assert exported == whole
+
+
+def test_vector_exports_write_expected_formats(qapp, tmp_path):
+    svg = tmp_path / "gantt.svg"
+    pdf = tmp_path / "calendar.pdf"
+    export_gantt(_tasks(), str(svg))
+    export_calendar(_tasks(), str(pdf))
+    assert b"<svg" in svg.read_bytes()[:1024]
+    assert pdf.read_bytes().startswith(b"%PDF")
+
+
+def test_unknown_format_and_empty_project_are_rejected(qapp, tmp_path):
+    with pytest.raises(ValueError):
+        export_gantt(_tasks(), str(tmp_path / "gantt.bmp"))
+    with pytest.raises(ValueError):
+        export_gantt([], str(tmp_path / "gantt.png"))
@@ -0,0 +1,39 @@
+"""Tests for the import dialog's text filter helpers."""
+from __future__ import annotations
+
+from utils.filter_util import TermMatcher, normalize_string, split_terms
+
+
+def test_matcher_agrees_with_substring_tests():
+    names = [normalize_string(n) for n in (
+        "Diseño de fachada", "Excavación (zona 1)", "Fundición de placa", "Diseño eléctrico",
+        "Revisión a+b", "",
+    )]
+    cases = [
+        ("diseño", "", ""),
+        ("de, a", "", "fachada"),
+        ("", "excavacion, electrico", ""),
+        ("", "a+b, (zona", "revision"),
+        ("", "", "de"),
+    ]
+    for search, include, exclude in cases:
+        s, i, e = split_terms(search), split_terms(include), split_terms(exclude)
+        matcher = TermMatcher(s, i, e)
+        expected = [
+            all(t in n for t in s) and (not i or any(t in n for t in i)) and not any(t in n for t in e)
+            for n in names
+        ]
+        assert [matcher.matches(n) for n in names] == expected, (search, include, exclude)
+
+
+def test_narrows_only_when_every_match_survives():
+    base = TermMatcher(("dis",), ("fa", "pl"), ("zona",))
+    assert TermMatcher(("diseno",), ("fa", "pl"), ("zona",)).narrows(base)
+    assert TermMatcher(("dis", "de"), ("fach",), ("zon", "x")).narrows(base)
+    assert not TermMatcher((), ("fa", "pl"), ("zona",)).narrows(base)
+    assert not TermMatcher(("dis",), ("fa", "pl", "x"), ("zona",)).narrows(base)
+    assert not TermMatcher(("dis",), (), ("zona",)).narrows(base)
+    assert not TermMatcher(("dis",), ("fa", "pl"), ("zona 1",)).narrows(base)
+    assert TermMatcher(("dis",), ("fa",)).narrows(TermMatcher(("dis",)))
+    assert not base.narrows(None)
+    assert base == TermMatcher(("dis",), ("fa", "pl"), ("zona",))
@@ -0,0 +1,66 @@
+"""Tests for the on-disk import cache."""
+from __future__ import annotations
+
+import os
+
+from core.import_cache import ImportCache
+from core.pdf_extractor import TaskTreeBuilder
+
+
+def _result():
+    tasks = [
+        {"task_id": "1", "name": "Fase", "level": 0, "start_date": "02/03/2026"},
+        {"task_id": "2", "name": "Diseño", "level": 1, "start_date": "02/03/2026"},
+        {"task_id": "3", "name": "Otra", "level": 0, "start_date": None, "extra": 1.5},
+    ]
+    tree = TaskTreeBuilder()
+    for task in tasks:
+        tree.add(task)
+    return tasks, tree.nodes
+
+
+def _summary(tree):
+    return [(node.task["name"], [c.task["name"] for c in node.children]) for node in tree]
+
+
+def test_roundtrip_keeps_tasks_and_tree(tmp_path):
+    source = tmp_path / "plan.pdf"
+    source.write_bytes(b"%PDF-1.4 uno")
+    cache = ImportCache(tmp_path / "cache")
+    key, cached = cache.lookup(source, "pdf")
+    assert cached is None
+
+    tasks, tree = _result()
+    cache.store(key, tasks, tree)
+    # Same contents under another name hit the same entry.
+    copy = tmp_path / "copia.pdf"
+    copy.write_bytes(source.read_bytes())
+    _key, (cached_tasks, cached_tree) = cache.lookup(copy, "pdf")
+    assert cached_tasks == tasks
+    assert _summary(cached_tree) == _summary(tree)
+    assert cached_tree[0].children[0].task is cached_tasks[1]
+
+    assert cache.lookup(copy, "xlsx")[1] is None
+    source.write_bytes(b"%PDF-1.4 dos")
+    assert cache.lookup(source, "pdf")[1] is None
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = ImportCache(tmp_path, max_bytes=10**6)
+    tasks, tree = _result()
+    for i, key in enumerate(("a", "b", "c")):
+        cache.store(key, tasks, tree)
+        os.utime(tmp_path / f"{key}.json.gz", ns=(i * 10**9, i * 10**9))
+    assert cache.load("a") is not None   # "a" becomes the most recent
+    entry_size = (tmp_path / "a.json.gz").stat().st_size
+    cache.max_bytes = 3 * entry_size
+    cache.store("d", tasks, tree)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.json.gz", "c.json.gz", "d.json.gz"]
+    assert cache.load("b") is None
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    (tmp_path / "x.json.gz").write_bytes(b"not gzip")
+    cache = ImportCache(tmp_path)
+    assert cache.load("x") is None
+    assert not (tmp_path / "x.json.gz").exists()
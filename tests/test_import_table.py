@@ -0,0 +1,65 @@
+"""Tests for the import window table model."""
+from __future__ import annotations
+
+from PySide6.QtCore import Qt
+
+from ui.import_table import ImportTableModel
+
+
+def _tasks(first, count):
+    return [
+        {"task_id": str(i), "level": f"1.{i}", "name": f"{i}. Tarea {i}",
+         "start_date": "02/03/2026", "end_date": "", "outline_level": i % 2}
+        for i in range(first, first + count)
+    ]
+
+
+def _check_index(model, row):
+    return model.index(row, ImportTableModel.COL_CHECK)
+
+
+def test_batches_filter_and_counters(qapp):
+    model = ImportTableModel()
+    inserted = []
+    resets = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.modelReset.connect(lambda: resets.append(True))
+
+    first = model.append_tasks(_tasks(0, 4))
+    model.set_visibility(first, [True, False, True, True])
+    first = model.append_tasks(_tasks(4, 3))
+    assert first == 4
+    model.set_visibility(first, [True, True, False])
+    assert inserted == [(0, 2), (3, 4)]
+    assert not resets
+    assert (model.visible_count, model.selected_count) == (5, 5)
+
+    # Rows show only visible tasks; the vertical header keeps the task number.
+    assert model.rowCount() == 5
+    assert model.headerData(1, Qt.Orientation.Vertical) == "3"
+    assert model.data(model.index(1, ImportTableModel.COL_NAME)) == "Tarea 2"
+    assert model.data(model.index(2, ImportTableModel.COL_NAME)) == "    Tarea 3"
+    assert model.data(model.index(1, ImportTableModel.COL_END)) == "N/A"
+    assert model.search_names[3] == "    tarea 3"
+
+    assert model.setData(_check_index(model, 1), Qt.CheckState.Unchecked.value,
+                         Qt.ItemDataRole.CheckStateRole)
+    model.toggle(3)
+    assert model.data(_check_index(model, 1), Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Unchecked
+    assert model.selected_count == 3
+    assert model.selected_tasks() == [0, 3, 5]
+
+    # Re-filtering everything resets the view and keeps the checkboxes.
+    model.set_visibility(0, [True] * 7)
+    assert resets
+    assert (model.visible_count, model.selected_count) == (7, 5)
+    assert model.row_texts(2) == ("2", "1.2", "Tarea 2", "02/03/2026", "N/A")
+
+    # Narrowing a filter only hides rows among the visible ones.
+    assert model.visible_tasks() == list(range(7))
+    model.restrict([i % 3 != 0 for i in range(7)])
+    assert model.visible_tasks() == [1, 2, 4, 5]
+    assert (model.visible_count, model.selected_count) == (4, 2)
+
+    model.clear()
+    assert (model.rowCount(), model.visible_count, model.selected_count) == (0, 0, 0)
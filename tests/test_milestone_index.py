@@ -0,0 +1,113 @@
+"""Tests for the calendar milestone index and its upkeep by TaskTableModel."""
+from __future__ import annotations
+
+from core.milestone_index import MilestoneIndex
+from core.models import Task, TaskTableModel
+from core.spatial_index import day_number
+
+
+def _task(name, start, end, is_subtask=False):
+    return Task(
+        name=name, start_date=start, end_date=end, duration="1", dedication="40",
+        is_subtask=is_subtask,
+    )
+
+
+def test_day_and_month_queries_follow_task_order(qapp):
+    a = _task("A", "05/03/2026", "20/03/2026")
+    b = _task("B", "05/03/2026", "05/03/2026")  # un solo hito (inicio == fin)
+    c = _task("C", "10/04/2026", "01/03/2026")  # rango invertido
+    bad = _task("X", "sin fecha", "05/03/2026")
+    index = MilestoneIndex([a, b, c, bad])
+
+    assert index.on_day(day_number("05/03/2026")) == [(a, "start"), (b, "start")]
+    assert index.on_day(day_number("01/03/2026")) == [(c, "start")]
+    assert len(index) == 5
+    march = index.in_month(2026, 3)
+    assert [(pos, task.name, kind) for pos, task, _day, kind in march] == [
+        (2, "C", "start"), (0, "A", "start"), (1, "B", "start"), (0, "A", "end"),
+    ]
+    assert index.days_in_month(2026, 5) == []
+
+
+def test_update_moves_milestones_between_months(qapp):
+    a = _task("A", "05/03/2026", "20/03/2026")
+    index = MilestoneIndex([a])
+    a.end_date = "02/05/2026"
+    index.update(a)
+    assert index.days_in_month(2026, 3) == [day_number("05/03/2026")]
+    assert index.on_day(day_number("02/05/2026")) == [(a, "end")]
+
+    index.sync([])
+    assert len(index) == 0
+    assert index.days_in_month(2026, 3) == []
+
+
+def test_model_keeps_index_current(qapp):
+    parent = _task("P", "01/03/2026", "10/03/2026")
+    child = _task("C", "02/03/2026", "05/03/2026", is_subtask=True)
+    child.parent_task = parent
+    parent.subtasks = [child]
+    model = TaskTableModel(tasks=[parent, child])
+    index = model.milestone_index()
+    assert index.on_day(day_number("05/03/2026")) == [(child, "end")]
+
+    # Row edits are applied in place, including the parent rollup.
+    model.set_task_dates(child, "02/03/2026", "20/03/2026")
+    assert model.milestone_index() is index
+    assert index.on_day(day_number("05/03/2026")) == []
+    assert index.on_day(day_number("20/03/2026")) == [(parent, "end"), (child, "end")]
+
+    # Structural changes resync on the next query.
+    extra = _task("E", "15/04/2026", "16/04/2026")
+    model.insertTask(extra)
+    assert model.milestone_index().on_day(day_number("15/04/2026")) == [(extra, "start")]
+
+
+def test_year_overview_reuses_month_pixmaps_until_an_edit(qapp):
+    from PySide6.QtCore import QSize
+
+    from ui.calendar_view import YearOverviewWidget
+
+    a = _task("A", "05/03/2026", "20/03/2026")
+    model = TaskTableModel(tasks=[a])
+    widget = YearOverviewWidget(None)
+    widget.set_tasks(model.tasks, model.milestone_index())
+    size = QSize(200, 160)
+
+    march, hits = widget._month_pixmap(2026, 3, size)
+    assert len(hits) == 2
+    assert widget._month_pixmap(2026, 3, size)[0] is march
+    april = widget._month_pixmap(2026, 4, size)[0]
+
+    # Moving the end date redraws only the months it touches.
+    model.set_task_dates(a, "05/03/2026", "25/03/2026")
+    assert widget._month_pixmap(2026, 3, size)[0] is not march
+    assert widget._month_pixmap(2026, 4, size)[0] is april
+    assert len(widget._month_cache) == 2
+
+
+def test_year_overview_prerender_queue_survives_repaints(qapp):
+    from ui.calendar_view import YearOverviewWidget
+
+    a = _task("A", "05/03/2026", "20/03/2026")
+    model = TaskTableModel(tasks=[a])
+    widget = YearOverviewWidget(None)
+    widget.set_tasks(model.tasks, model.milestone_index())
+    widget.resize(800, 600)
+
+    widget._schedule_prerender()
+    assert len(widget._prerender_queue) == 24
+    widget._prerender_step()
+    # A hover repaint of the same year does not refill the queue.
+    widget._schedule_prerender()
+    assert len(widget._prerender_queue) == 23
+
+    model.set_task_dates(a, "05/03/2026", "25/03/2026")
+    widget._schedule_prerender()
+    assert len(widget._prerender_queue) == 24
+    widget._prerender_step()
+    widget.set_year(widget.year() + 1)
+    widget._schedule_prerender()
+    assert widget._prerender_queue[0][0] == widget.year() + 1
+    assert len(widget._prerender_queue) == 24
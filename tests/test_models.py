@@ -3,7 +3,8 @@ from __future__ import annotations
 
 from PySide6.QtGui import QColor
 
-from core.models import Task, TaskTableModel
+from core.models import DateRangeTracker, Task, TaskTableModel
+from core.spatial_index import day_number
 
 
 def _task(name, is_subtask=False):
@@ -80,3 +81,64 @@ def test_reminders_repr_roundtrips_via_literal_eval(qapp):
 
     assert ast.literal_eval(repr(reminders)) == reminders
     assert ast.literal_eval(repr(file_links)) == file_links
+
+
+def test_date_range_tracker_follows_edits(qapp):
+    a = _task("A")
+    b = _task("B")
+    b.start_date, b.end_date = "10/01/2026", "20/01/2026"
+    tracker = DateRangeTracker()
+    tracker.sync([a, b])
+    assert tracker.bounds() == (day_number("01/01/2026"), day_number("20/01/2026"))
+
+    # Shrinking the task that held the maximum exposes the next one.
+    b.end_date = "11/01/2026"
+    tracker.update(b)
+    assert tracker.bounds()[1] == day_number("11/01/2026")
+
+    tracker.sync([b])
+    assert tracker.bounds() == (day_number("10/01/2026"), day_number("11/01/2026"))
+    tracker.sync([])
+    assert tracker.bounds() is None
+
+
+def test_date_range_tracker_heaps_stay_bounded(qapp):
+    task = _task("A")
+    other = _task("B")
+    tracker = DateRangeTracker()
+    tracker.sync([task, other])
+    for i in range(2000):
+        task.end_date = "15/01/2026" if i % 2 else "20/01/2026"
+        tracker.update(task)
+    assert tracker.bounds() == (day_number("01/01/2026"), day_number("15/01/2026"))
+    # Stale entries are compacted away instead of piling up per update.
+    limit = 2 * 2 + DateRangeTracker._HEAP_SLACK + 1
+    assert len(tracker._start_heap) <= limit
+    assert len(tracker._end_heap) <= limit
+    assert all(count > 0 for count in tracker._end_counts.values())
+
+
+def test_model_date_range_tracks_visible_rows(qapp):
+    parent = _task("Parent")
+    child = _task("Child", is_subtask=True)
+    child.end_date = "28/02/2026"
+    model = TaskTableModel(tasks=[parent, child])
+    assert model.date_range.bounds()[1] == day_number("28/02/2026")
+
+    parent.is_collapsed = True
+    model.update_visible_tasks()
+    assert model.date_range.bounds()[1] == day_number("02/01/2026")
+
+
+def test_set_task_dates_recalculates_duration_and_parent_once(qapp):
+    parent = _task("Parent")
+    child = _task("Child", is_subtask=True)
+    child.parent_task = parent
+    parent.subtasks = [child]
+    model = TaskTableModel(tasks=[parent, child])
+
+    # Mon 05/01/2026 → Fri 09/01/2026: five working days.
+    model.set_task_dates(child, "05/01/2026", "09/01/2026")
+    assert child.duration == "5"
+    assert (parent.start_date, parent.end_date) == ("05/01/2026", "09/01/2026")
+    assert model.date_range.bounds() == (day_number("05/01/2026"), day_number("09/01/2026"))
@@ -0,0 +1,209 @@
+"""Tests for the MPP reader process client (without a JVM).
+
+The worker process runs a stub of ``_serve`` whose behaviour depends on the
+requested file name; it is started with "fork" so the stub needs no import.
+"""
+from __future__ import annotations
+
+import datetime
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from core import mpp_worker
+from core.mpp_worker import (
+    JVM_FAILED,
+    JVM_IDLE,
+    JVM_READY,
+    JVM_STARTING,
+    MPPWorker,
+    MPPWorkerError,
+)
+
+_COLUMNS = {
+    "task_id": ["1", "2"],
+    "level": ["1", "1.1"],
+    "name": ["Fase", "Diseño"],
+    "start_date": ["02/03/2026", ""],
+    "end_date": ["13/03/2026", ""],
+    "outline_level": [0, 1],
+}
+# Reply of the stub to "warmup" (read by the forked process)
+_WARMUP_ERROR = None
+
+
+def _stub_serve(conn):
+    """Stand-in for ``_serve``. "ok" answers two chunks, "error" an error
+    message, "crash" dies after one chunk, "hang" never finishes after one
+    chunk and "flaky:<marker>" dies before answering unless *marker* exists
+    (it is created on the first try). "warmup" answers ``_WARMUP_ERROR``,
+    or "done" after a short delay."""
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request[0] == "quit":
+            return
+        if request[0] == "warmup":
+            time.sleep(0.2)
+            conn.send(("error", _WARMUP_ERROR) if _WARMUP_ERROR else ("done", None))
+            continue
+        name = request[1] if len(request) > 1 else "ok"
+        if name.startswith("flaky:"):
+            marker = name.split(":", 1)[1]
+            if not os.path.exists(marker):
+                open(marker, "w").close()
+                os._exit(1)
+            name = "ok"
+        if name == "error":
+            conn.send(("error", "archivo dañado"))
+            continue
+        conn.send(("rows", _COLUMNS))
+        if name == "crash":
+            os._exit(1)
+        if name == "hang":
+            time.sleep(60)
+        conn.send(("rows", _COLUMNS))
+        conn.send(("done", None))
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs the fork start method")
+    fork = multiprocessing.get_context("fork")
+    monkeypatch.setattr(mpp_worker, "_serve", _stub_serve)
+    monkeypatch.setattr(mpp_worker.multiprocessing, "get_context", lambda _method: fork)
+    worker = MPPWorker()
+    statuses = []
+    worker.statusChanged.connect(statuses.append)
+    worker.statuses = statuses
+    yield worker
+    worker.shutdown()
+
+
+def test_date_text_reads_iso_dates_and_falls_back():
+    assert mpp_worker._date_text(None, str) == ""
+    assert mpp_worker._date_text("2026-03-02T08:00", str) == "02/03/2026"
+    assert mpp_worker._date_text(datetime.date(2026, 3, 2), str) == "02/03/2026"
+    assert mpp_worker._date_text(42, lambda value: f"<{value}>") == "<42>"
+
+
+def test_column_rows_builds_task_dicts():
+    rows = mpp_worker._column_rows(_COLUMNS)
+    assert rows[1] == {
+        "task_id": "2", "level": "1.1", "name": "Diseño", "start_date": "",
+        "end_date": "", "indentation": 1, "outline_level": 1,
+    }
+    assert mpp_worker._column_rows({field: [] for field in mpp_worker._FIELDS}) == []
+    with pytest.raises(ValueError):
+        mpp_worker._column_rows({**_COLUMNS, "name": ["Fase"]})
+
+
+def test_batches_reuse_the_process(worker):
+    batches = list(worker.iter_batches("ok"))
+    assert [[row["task_id"] for row in batch] for batch in batches] == [["1", "2"], ["1", "2"]]
+    pid = worker._process.pid
+
+    with pytest.raises(MPPWorkerError, match="archivo dañado"):
+        list(worker.iter_batches("error"))
+    # An error reply leaves the pipe clean: the same process serves the next request.
+    assert len(list(worker.iter_batches("ok"))) == 2
+    assert worker._process.pid == pid
+    assert worker.statuses == [JVM_READY]
+
+
+def test_death_before_any_row_is_retried(worker, tmp_path):
+    marker = tmp_path / "started"
+    batches = list(worker.iter_batches(f"flaky:{marker}"))
+    assert marker.exists()
+    assert len(batches) == 2
+    assert worker.statuses == [JVM_READY]
+
+
+def test_death_after_rows_fails_and_restarts(worker):
+    received = []
+    with pytest.raises(MPPWorkerError):
+        for batch in worker.iter_batches("crash"):
+            received.append(batch)
+    # Rows already delivered are not repeated by a retry.
+    assert len(received) == 1
+    assert worker._process is None
+
+    assert len(list(worker.iter_batches("ok"))) == 2
+    assert worker._process.is_alive()
+
+
+def test_abandoned_request_discards_the_process(worker):
+    batches = worker.iter_batches("ok")
+    next(batches)
+    pid = worker._process.pid
+    batches.close()
+    assert worker._process is None
+    assert len(list(worker.iter_batches("ok"))) == 2
+    assert worker._process.pid != pid
+
+
+def test_shutdown_does_not_wait_for_a_request_in_flight(worker):
+    first_batch = threading.Event()
+    errors = []
+
+    def read():
+        try:
+            for _batch in worker.iter_batches("hang"):
+                first_batch.set()
+        except MPPWorkerError as err:
+            errors.append(err)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    assert first_batch.wait(10)
+    started = time.monotonic()
+    worker.shutdown()
+    assert time.monotonic() - started < 5
+    reader.join(10)
+    # The request fails instead of retrying on a new process.
+    assert len(errors) == 1
+    assert worker._process is None
+    with pytest.raises(MPPWorkerError):
+        list(worker.iter_batches("ok"))
+
+
+def _wait_while_starting(qapp, worker):
+    deadline = time.monotonic() + 10
+    while worker.status() == JVM_STARTING and time.monotonic() < deadline:
+        time.sleep(0.01)
+    qapp.processEvents()  # statusChanged is queued from the warm-up thread
+
+
+def test_warm_up_reports_starting_then_ready_once(qapp, worker):
+    calls = []
+    warm_up = worker._warm_up
+    worker._warm_up = lambda: calls.append(1) or warm_up()
+    assert worker.status() == JVM_IDLE
+
+    worker.warm_up()
+    assert worker.status() == JVM_STARTING
+    worker.warm_up()  # already starting: no second warm-up
+    _wait_while_starting(qapp, worker)
+    assert worker.status() == JVM_READY
+    worker.warm_up()  # already ready
+    assert len(calls) == 1
+    assert worker.statuses == [JVM_STARTING, JVM_READY]
+    # The warmed-up process serves the next import.
+    pid = worker._process.pid
+    assert len(list(worker.iter_batches("ok"))) == 2
+    assert worker._process.pid == pid
+
+
+def test_failed_warm_up_reports_failed(qapp, worker, monkeypatch):
+    monkeypatch.setattr(sys.modules[__name__], "_WARMUP_ERROR", "No se pudo iniciar la JVM")
+    worker.warm_up()
+    _wait_while_starting(qapp, worker)
+    assert worker.status() == JVM_FAILED
+    assert worker.statuses == [JVM_STARTING, JVM_FAILED]
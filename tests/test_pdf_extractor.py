@@ -0,0 +1,132 @@
+"""Tests for the PDF schedule extractor."""
+from __future__ import annotations
+
+import PyPDF2
+import pytest
+from PySide6.QtGui import QFont, QPageSize, QPainter, QPdfWriter
+
+from core import pdf_extractor
+from core.pdf_security_checker import PDFRestrictedError, check_pdf_restrictions
+
+# (indent, text) per line; two lines per page
+LINES = [
+    (0, "1 Fase A 10 días 02/03/2026 13/03/2026"),
+    (60, "2 Diseño 3 días 02/03/2026 04/03/2026"),
+    (60, "3 Revisión 2 días 05/03/2026 06/03/2026"),
+    (0, "4 Fin del proyecto 0 días 13/03/2026 13/03/2026"),
+    (0, "5 Fase B 5 días 16/03/2026 20/03/2026"),
+    (60, "6 Pruebas 5 días 16/03/2026 20/03/2026"),
+]
+
+
+def _write_pdf(path):
+    writer = QPdfWriter(str(path))
+    writer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+    writer.setResolution(72)
+    painter = QPainter(writer)
+    painter.setFont(QFont("Arial", 9))
+    for i, (indent, text) in enumerate(LINES):
+        if i and i % 2 == 0:
+            writer.newPage()
+        painter.drawText(20 + indent, 40 + (i % 2) * 20, text)
+    painter.end()
+
+
+def _summary(tree):
+    return [(node.task["name"], [c.task["name"] for c in node.children]) for node in tree]
+
+
+def test_extracts_rows_levels_and_hierarchy(qapp, tmp_path):
+    path = tmp_path / "plan.pdf"
+    _write_pdf(path)
+    tasks, tree = pdf_extractor.extract_tasks(str(path), workers=1)
+    # Milestones (same start and end) are skipped.
+    assert [t["task_id"] for t in tasks] == ["1", "2", "3", "5", "6"]
+    assert tasks[1]["start_date"] == "02/03/2026" and tasks[1]["end_date"] == "04/03/2026"
+    assert tasks[1]["level"] > tasks[0]["level"] == tasks[3]["level"]
+    assert _summary(tree) == [
+        ("Fase A", ["Diseño", "Revisión"]), ("Diseño", []), ("Revisión", []),
+        ("Fase B", ["Pruebas"]), ("Pruebas", []),
+    ]
+
+
+def test_process_pool_keeps_page_order(qapp, tmp_path, monkeypatch):
+    path = tmp_path / "plan.pdf"
+    _write_pdf(path)
+    serial, serial_tree = pdf_extractor.extract_tasks(str(path), workers=1)
+    monkeypatch.setattr(pdf_extractor, "PARALLEL_MIN_PAGES", 1)
+    monkeypatch.setattr(pdf_extractor, "_PAGES_PER_CHUNK", 1)
+    parallel, parallel_tree = pdf_extractor.extract_tasks(str(path), workers=2)
+    assert parallel == serial
+    assert _summary(parallel_tree) == _summary(serial_tree)
+
+
+def test_batches_arrive_per_page(qapp, tmp_path):
+    path = tmp_path / "plan.pdf"
+    _write_pdf(path)
+    batches = list(pdf_extractor.iter_task_batches(str(path), workers=1))
+    # Page 2 keeps one task: the other line is a zero-length milestone.
+    assert [[t["task_id"] for t in batch] for batch in batches] == [["1", "2"], ["3"], ["5", "6"]]
+
+
+def _encrypted_copy(source, target, user_password, permissions):
+    reader = PyPDF2.PdfReader(str(source))
+    writer = PyPDF2.PdfWriter()
+    for page in reader.pages:
+        writer.add_page(page)
+    writer.encrypt(user_password, "propietario", permissions_flag=permissions)
+    with open(target, "wb") as file:
+        writer.write(file)
+
+
+def test_session_reads_restrictions_from_the_opened_document(qapp, tmp_path):
+    path = tmp_path / "plan.pdf"
+    _write_pdf(path)
+    with pdf_extractor.PDFImportSession(str(path)) as session:
+        session.check_restrictions()
+        assert [len(b) for b in session.task_batches(workers=1)] == [2, 1, 2]
+
+    no_copy = tmp_path / "sin_extraccion.pdf"
+    _encrypted_copy(path, no_copy, "", permissions=-1 & ~16)
+    with pdf_extractor.PDFImportSession(str(no_copy)) as session:
+        with pytest.raises(PDFRestrictedError, match="restricciones de extracción"):
+            session.check_restrictions()
+    # Same documents rejected as by the standalone PyPDF2 check
+    assert check_pdf_restrictions(str(path)) is None
+    assert check_pdf_restrictions(str(no_copy))
+
+    locked = tmp_path / "con_clave.pdf"
+    _encrypted_copy(path, locked, "clave", permissions=-1)
+    with pytest.raises(PDFRestrictedError, match="protegido con contraseña"):
+        pdf_extractor.PDFImportSession(str(locked))
+
+
+def test_loader_reports_a_failure_after_streamed_batches(qapp, monkeypatch):
+    class BrokenSession:
+        def __init__(self, file_path):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            pass
+
+        def check_restrictions(self):
+            pass
+
+        def task_batches(self):
+            yield [{"name": "Fase A", "level": "1", "indentation": 0}]
+            raise OSError("página dañada")
+
+    monkeypatch.setattr(pdf_extractor, "PDFImportSession", BrokenSession)
+    loader = pdf_extractor.PDFLoaderThread("plan.pdf")
+    batches, extracted, failed = [], [], []
+    loader.tasks_batch.connect(batches.append)
+    loader.tasks_extracted.connect(lambda *args: extracted.append(args))
+    loader.failed.connect(failed.append)
+    loader.run()
+    # The partial schedule is never reported as a finished extraction.
+    assert len(batches) == 1
+    assert extracted == []
+    assert failed == ["página dañada"]
@@ -0,0 +1,70 @@
+"""Tests for the cross-project alert scanner."""
+from __future__ import annotations
+
+import time
+
+from core.portfolio_alerts import PortfolioAlertScanner, read_alert_tasks
+from core.spatial_index import day_number
+
+TODAY = day_number("10/03/2026")
+
+
+def _block(name, end, extra=""):
+    return (
+        f"[TASK]\nNAME: {name}\nPARENT:\nSTART: 01/03/2026\nEND: {end}\nDURATION: 1\n"
+        f"DEDICATION: 40\nCOLOR: #22a39f\n{extra}"
+        "NOTES_HTML_BEGIN\n<p>END: 11/03/2026</p>\nNOTES_HTML_END\n"
+        "FILE_LINKS_BEGIN\n{}\nFILE_LINKS_END\n[/TASK]\n\n"
+    )
+
+
+def _wait(qapp, scanner, results):
+    deadline = time.monotonic() + 5
+    while not results and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    assert results, "scan did not finish"
+    return results.pop()
+
+
+def test_reader_ignores_notes_and_parses_alert_fields(tmp_path):
+    path = tmp_path / "a.bpm"
+    path.write_text(
+        _block("A", "20/03/2026", "ALERT_THRESHOLD: 3\nALERT_SNOOZED: never\n")
+        + _block("B", "31/03/2026", "REMINDERS: [{'date': '10/03/2026', 'comment': 'x'}]\n"),
+        encoding="utf-8",
+    )
+    a, b = read_alert_tasks(str(path))
+    assert (a.name, a.end_date, a.alert_threshold_days, a.alert_snoozed_until) == (
+        "A", "20/03/2026", 3, "never",
+    )
+    assert b.end_date == "31/03/2026"
+    assert b.extra_reminders == [{"date": "10/03/2026", "comment": "x"}]
+
+
+def test_scan_merges_projects_and_reuses_unchanged_files(qapp, tmp_path):
+    first = tmp_path / "first.bpm"
+    second = tmp_path / "second.bpm"
+    first.write_text(_block("Late", "05/03/2026") + _block("Soon", "12/03/2026"), encoding="utf-8")
+    second.write_text(_block("Sooner", "11/03/2026"), encoding="utf-8")
+    missing = tmp_path / "gone.bpm"
+
+    scanner = PortfolioAlertScanner(max_workers=2)
+    results = []
+    scanner.scanFinished.connect(results.append)
+    try:
+        scanner.scan([str(first), str(second), str(missing)], threshold=7, today=TODAY)
+        alerts = _wait(qapp, scanner, results)
+        assert [(e.task.name, e.kind, e.days_remaining) for e in alerts] == [
+            ("Sooner", "upcoming", 1), ("Soon", "upcoming", 2), ("Late", "overdue", -5),
+        ]
+        assert [e.project for e in alerts] == [str(second), str(first), str(first)]
+
+        cached = scanner._cache[str(first)][1]
+        second.write_text(_block("Sooner", "30/04/2026"), encoding="utf-8")
+        scanner.scan([str(first), str(second)], threshold=7, today=TODAY)
+        alerts = _wait(qapp, scanner, results)
+        assert scanner._cache[str(first)][1] is cached
+        assert [e.task.name for e in alerts] == ["Soon", "Late"]
+    finally:
+        scanner.shutdown()
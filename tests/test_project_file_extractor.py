@@ -0,0 +1,96 @@
+"""Tests for the MSPDI / MPX readers (Project exports read without Java)."""
+from __future__ import annotations
+
+import pytest
+
+from core.project_file_extractor import ProjectFileError, iter_project_file
+
+_MSPDI_TASK = """
+    <Task>
+      <UID>{uid}</UID><ID>{id}</ID><Name>{name}</Name>
+      <OutlineNumber>{number}</OutlineNumber><OutlineLevel>{level}</OutlineLevel>
+      <Start>2026-03-{day:02d}T08:00:00</Start><Finish>2026-04-{day:02d}T17:00:00</Finish>
+      <Duration>{duration}</Duration>
+      <ExtendedAttribute><FieldID>188743731</FieldID><Value>x</Value></ExtendedAttribute>
+    </Task>"""
+
+
+def _mspdi(tasks):
+    body = "".join(_MSPDI_TASK.format(**task) for task in tasks)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<Project xmlns="http://schemas.microsoft.com/project">'
+        "<Name>plan.xml</Name><Calendars><Calendar><UID>1</UID></Calendar></Calendars>"
+        f"<Tasks>{body}</Tasks>"
+        "<Assignments><Assignment><TaskUID>1</TaskUID></Assignment></Assignments>"
+        "</Project>"
+    )
+
+
+def _task(i, name=None, duration="PT8H0M0S", level=2, number=None):
+    return {
+        "uid": i, "id": i, "name": name or f"Tarea {i}", "day": i % 28 + 1,
+        "duration": duration, "level": level, "number": number or f"1.{i}",
+    }
+
+
+def test_mspdi_tasks_match_mpp_import(tmp_path):
+    tasks = [
+        _task(0, "Proyecto", level=0, number="0"),
+        _task(1, "Fase", level=1, number="1"),
+        *(_task(i) for i in range(2, 12)),
+        _task(12, "Hito", duration="PT0H0M0S"),
+        _task(13, "Inicio"),
+    ]
+    path = tmp_path / "plan.xml"
+    path.write_text(_mspdi(tasks), encoding="utf-8")
+
+    batches = list(iter_project_file(str(path), batch_size=5))
+    assert [len(b) for b in batches] == [5, 5, 2]
+    result = [t for batch in batches for t in batch]
+    # Zero-duration and start/end tasks are skipped, like the .mpp import.
+    assert [t["task_id"] for t in result] == [str(i) for i in range(12)]
+    assert result[0]["outline_level"] == -1
+    assert result[2] == {
+        "task_id": "2", "level": "1.2", "name": "Tarea 2", "start_date": "03/03/2026",
+        "end_date": "03/04/2026", "indentation": 1, "outline_level": 1,
+    }
+
+
+def test_mpx_tasks_use_field_definition_and_date_settings(tmp_path):
+    lines = [
+        "MPX;Microsoft Project for Windows;4.0;ANSI",
+        "12;1;1;08:00;/;:;am;pm;0;0",          # dd/mm/yy
+        "60;90;1;99;3;40;50;51",
+        "61;ID;Name;Outline Number;Outline Level;Duration;Start;Finish",
+        "70;1;Fase;1;1;10d;02/03/26 08:00;13/03/26 17:00",
+        '70;2;"Diseño; revisión";1.1;2;5d;02/03/26 08:00;06/03/26 17:00',
+        "70;3;Entrega;1.2;2;0d;13/03/26 17:00;13/03/26 17:00",
+        "70;;Sin ID;1.3;2;1d;NA;NA",
+        "70;4;Cierre;1.4;;1d;NA;NA",
+    ]
+    path = tmp_path / "plan.mpx"
+    path.write_bytes("\r\n".join(lines).encode("cp1252"))
+
+    result = [t for batch in iter_project_file(str(path)) for t in batch]
+    assert [(t["task_id"], t["name"]) for t in result] == [
+        ("1", "Fase"), ("2", "Diseño; revisión"), ("4", "Cierre"),
+    ]
+    assert result[1]["start_date"] == "02/03/2026"
+    assert result[1]["end_date"] == "06/03/2026"
+    assert result[1]["outline_level"] == 1
+    # Without an outline level, it comes from the outline number.
+    assert result[2]["outline_level"] == 1
+    assert result[2]["start_date"] == ""
+
+
+def test_other_files_are_rejected(tmp_path):
+    xml = tmp_path / "otro.xml"
+    xml.write_text("<Workbook><Task/></Workbook>", encoding="utf-8")
+    broken = tmp_path / "roto.xml"
+    broken.write_text("<Project><Tasks>", encoding="utf-8")
+    text = tmp_path / "otro.mpx"
+    text.write_text("ID,Nombre\n1,Tarea\n", encoding="utf-8")
+    for path in (xml, broken, text):
+        with pytest.raises(ProjectFileError):
+            list(iter_project_file(str(path)))
@@ -0,0 +1,143 @@
+"""Tests for the recurring reminder rules."""
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+
+from core.reminder_rules import LAST_DAY, compile_reminder, describe_reminder
+from core.spatial_index import date_from_day, day_from_date, day_number
+from core.work_calendar import is_working_day
+
+
+def _dates(rule, first, last):
+    return [str(date_from_day(d)) for d in rule.occurrences(day_number(first), day_number(last))]
+
+
+def _naive(rem, first, last):
+    """Day-by-day expansion of a rule without business days."""
+    start = date_from_day(day_number(rem["date"]))
+    step = rem.get("interval", 1)
+    freq = rem["frequency"]
+    weekdays = rem.get("weekdays") or ([start.isoweekday()] if freq == "weekly" else [])
+    found = []
+    day = start
+    while day <= last and len(found) < rem.get("count", 10**9):
+        if freq == "daily":
+            hit = (day - start).days % step == 0 and (not weekdays or day.isoweekday() in weekdays)
+        elif freq == "weekly":
+            week = (day - timedelta(day.weekday()) - (start - timedelta(start.weekday()))).days // 7
+            hit = week % step == 0 and day.isoweekday() in weekdays
+        else:
+            months = (day.year - start.year) * 12 + day.month - start.month
+            nxt = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+            length = (nxt - timedelta(days=1)).day
+            hit = months % step == 0 and day.day == min(start.day, length)
+        if hit:
+            found.append(day)
+        day += timedelta(days=1)
+    return [d for d in found if d >= first]
+
+
+def test_next_occurrence_matches_naive_expansion():
+    rng = random.Random(11)
+    first, last = date(2026, 1, 1), date(2027, 6, 30)
+    for _ in range(150):
+        rem = {
+            "date": (date(2025, 11, 1) + timedelta(rng.randint(0, 120))).strftime("%d/%m/%Y"),
+            "frequency": rng.choice(["daily", "weekly", "monthly"]),
+            "interval": rng.randint(1, 4),
+        }
+        if rem["frequency"] != "monthly" and rng.random() < 0.5:
+            rem["weekdays"] = rng.sample(range(1, 8), rng.randint(1, 3))
+        if rng.random() < 0.3:
+            rem["count"] = rng.randint(1, 20)
+        rule = compile_reminder(rem)
+        expected = _naive(rem, first, last)
+        got = [date_from_day(d) for d in rule.occurrences(day_from_date(first), day_from_date(last))]
+        assert got == expected, rem
+
+
+def test_monthly_rules_clamp_to_short_months():
+    rule = compile_reminder({"date": "31/01/2026", "frequency": "monthly", "comment": ""})
+    assert _dates(rule, "01/01/2026", "30/04/2026") == [
+        "2026-01-31", "2026-02-28", "2026-03-31", "2026-04-30",
+    ]
+    last = compile_reminder({
+        "date": "10/01/2028", "frequency": "monthly", "month_days": [LAST_DAY], "comment": "",
+    })
+    assert _dates(last, "01/01/2028", "31/03/2028") == ["2028-01-31", "2028-02-29", "2028-03-31"]
+
+
+def test_business_days_until_and_alert_state():
+    daily = compile_reminder({
+        "date": "30/12/2025", "frequency": "daily", "business_days": True, "until": "09/01/2026",
+    })
+    occurrences = list(daily.occurrences(day_number("01/12/2025"), day_number("31/01/2026")))
+    assert occurrences and all(is_working_day(d) for d in occurrences)
+    assert max(occurrences) <= day_number("09/01/2026")
+    # 1 May 2026 (holiday) → next working day, Monday 4 May.
+    monthly = compile_reminder({"date": "01/04/2026", "frequency": "monthly", "business_days": True})
+    assert monthly.next_occurrence(day_number("02/04/2026")) == day_number("04/05/2026")
+
+    weekly = compile_reminder({"date": "05/01/2026", "frequency": "weekly", "interval": 2})
+    assert weekly.alert_state(day_number("19/01/2026")) == (True, day_number("20/01/2026"))
+    assert weekly.alert_state(day_number("20/01/2026")) == (False, day_number("02/02/2026"))
+    once = compile_reminder({"date": "05/01/2026", "frequency": "once"})
+    assert once.alert_state(day_number("01/01/2026")) == (False, day_number("05/01/2026"))
+    assert once.alert_state(day_number("01/03/2026")) == (True, None)
+    assert compile_reminder({"date": "sin fecha", "frequency": "once"}) is None
+    assert describe_reminder(
+        {"frequency": "weekly", "interval": 2, "weekdays": [1, 3], "count": 4}
+    ) == "Cada 2 semanas (L, X) · 4 veces"
+
+
+def test_month_grid_marks_reminder_occurrences(qapp):
+    from core.models import Task
+    from ui.calendar_view import CalendarGridWidget
+
+    task = Task(
+        name="A", start_date="01/01/2026", end_date="05/01/2026", duration="1",
+        dedication="40",
+    )
+    task.extra_reminders = [
+        {"date": "06/01/2025", "comment": "Informe", "frequency": "weekly", "interval": 2},
+    ]
+    grid = CalendarGridWidget(None)
+    grid.set_tasks([task])
+    found = grid.reminders_between(day_number("01/03/2026"), day_number("31/03/2026"))
+    assert [str(date_from_day(d)) for d in sorted(found)] == [
+        "2026-03-02", "2026-03-16", "2026-03-30",
+    ]
+    assert found[day_number("16/03/2026")] == [(task, task.extra_reminders[0])]
+
+
+def test_month_grid_reuses_reminders_between_repaints(qapp, monkeypatch):
+    from PySide6.QtCore import QDate
+
+    from core.models import Task
+    from ui.calendar_view import CalendarGridWidget
+
+    task = Task(
+        name="A", start_date="01/01/2026", end_date="05/01/2026", duration="1",
+        dedication="40",
+    )
+    task.extra_reminders = [{"date": "06/01/2026", "comment": "Informe", "frequency": "weekly"}]
+    grid = CalendarGridWidget(None)
+    grid.set_tasks([task])
+    grid.set_month(QDate(2026, 1, 1))
+    grid.resize(700, 500)
+    calls = []
+    original = grid.reminders_between
+    monkeypatch.setattr(grid, "reminders_between", lambda *a: calls.append(a) or original(*a))
+
+    grid.grab()
+    grid.grab()
+    assert len(calls) == 1
+    assert day_number("13/01/2026") in grid._reminders_by_day
+
+    # New task data or another month recomputes the occurrences.
+    grid.set_tasks([task])
+    grid.grab()
+    grid.next_month()
+    grid.grab()
+    assert len(calls) == 3
@@ -0,0 +1,81 @@
+"""Tests for core.spatial_index: interval queries, incremental row sync and
+grid-bucketed rectangle lookups used by Gantt/calendar hit testing."""
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+
+from PySide6.QtCore import QDate, QPointF, QRectF
+
+from core.spatial_index import IntervalIndex, RectGridIndex, TaskSpatialIndex, day_number
+
+
+def _task(start, end):
+    return SimpleNamespace(start_date=start, end_date=end)
+
+
+def test_day_number_matches_qdate_julian_day():
+    assert day_number("15/03/2026") == QDate(2026, 3, 15).toJulianDay()
+    assert day_number("31/02/2026") is None
+    assert day_number("") is None
+    assert day_number("not a date") is None
+
+
+def test_interval_queries_match_brute_force():
+    rng = random.Random(7)
+    spans = {}
+    index = IntervalIndex()
+    for key in range(300):
+        start = rng.randint(0, 1000)
+        end = start + rng.randint(0, 60)
+        spans[key] = (start, end)
+        index.set(key, start, end)
+
+    for _ in range(100):
+        low = rng.randint(-10, 1060)
+        high = low + rng.randint(0, 30)
+        expected = {k for k, (s, e) in spans.items() if s <= high and e >= low}
+        assert set(index.overlapping(low, high)) == expected
+
+
+def test_interval_end_update_is_applied_in_place():
+    index = IntervalIndex([("a", 10, 12), ("b", 20, 25)])
+    assert index.at(30) == []
+    index.set("a", 10, 40)  # same start → in-place segment-tree update
+    assert index.at(30) == ["a"]
+    index.set("b", 31, 35)  # start moved → lazy rebuild
+    assert sorted(index.at(32)) == ["a", "b"]
+    index.discard("a")
+    assert index.at(32) == ["b"]
+
+
+def test_task_index_sync_only_tracks_changed_rows():
+    a = _task("01/01/2026", "10/01/2026")
+    b = _task("05/01/2026", "06/01/2026")
+    index = TaskSpatialIndex()
+    index.sync([a, b])
+    jan_5 = day_number("05/01/2026")
+    assert index.span(1) == (jan_5, day_number("06/01/2026"))
+
+    b.end_date = "20/01/2026"
+    index.sync([a, b])
+    assert index.span(1) == (jan_5, day_number("20/01/2026"))
+    b.start_date = "bad"
+    index.update_row(1)
+    assert index.span(1) is None
+
+    index.sync([b])  # shrinking drops stale rows
+    assert len(index) == 1
+    assert index.rows == [b]
+    assert index.span(1) is None
+
+
+def test_rect_grid_index_returns_payload_under_point(qapp):
+    grid = RectGridIndex(cell_size=16)
+    grid.insert(QRectF(0, 0, 40, 10), "first")
+    grid.insert(QRectF(50, 50, 10, 10), "second")
+    assert grid.at(QPointF(35, 5)) == "first"
+    assert grid.at(QPointF(55, 55)) == "second"
+    assert grid.at(QPointF(45, 45)) is None
+    grid.clear()
+    assert grid.at(QPointF(35, 5)) is None
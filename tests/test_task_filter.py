@@ -0,0 +1,109 @@
+"""Tests for the task filter indexes and the filtered TaskTableModel view."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from PySide6.QtGui import QColor
+
+from core.models import Task, TaskTableModel
+from core.spatial_index import day_number
+from core.task_filter import TaskFilter, TaskFilterIndex
+
+
+def _task(name, start="01/01/2026", end="10/01/2026", notes="", color=None, is_subtask=False):
+    return Task(
+        name=name,
+        start_date=start,
+        end_date=end,
+        duration="1",
+        dedication="40",
+        notes=notes,
+        color=color,
+        is_subtask=is_subtask,
+    )
+
+
+def test_text_terms_match_accent_insensitive_substrings(qapp):
+    a = _task("Construcción de muros", notes="Revisar planos")
+    b = _task("Pintura")
+    c = _task("Instalación eléctrica", notes="incluye tableros")
+    index = TaskFilterIndex()
+    index.sync([a, b, c])
+
+    assert index.matching_ids(TaskFilter(text="CION")) == {id(a), id(c)}
+    assert index.matching_ids(TaskFilter(text="muro constr")) == {id(a)}
+    # Notes are indexed too; two-letter terms fall back to a text scan.
+    assert index.matching_ids(TaskFilter(text="planos")) == {id(a)}
+    assert index.matching_ids(TaskFilter(text="pi")) == {id(b)}
+    assert index.matching_ids(TaskFilter(text="xyz")) == set()
+
+
+def test_date_color_and_alert_predicates(qapp):
+    red = QColor("#ff0000")
+    jan = _task("Enero", "05/01/2026", "20/01/2026", color=red)
+    feb = _task("Febrero", "01/02/2026", "15/02/2026")
+    mar = _task("Marzo", "01/03/2026", "31/03/2026", color=red)
+    index = TaskFilterIndex()
+    index.sync([jan, feb, mar])
+
+    window = TaskFilter(start=day_number("15/01/2026"), end=day_number("05/02/2026"))
+    assert index.matching_ids(window) == {id(jan), id(feb)}
+    assert index.matching_ids(TaskFilter(start=day_number("01/02/2026"))) == {id(feb), id(mar)}
+    assert index.matching_ids(TaskFilter(colors=frozenset({"#ff0000"}))) == {id(jan), id(mar)}
+
+    index.set_alerts([SimpleNamespace(task=mar, kind="upcoming")])
+    both = TaskFilter(colors=frozenset({"#ff0000"}), alert_kinds=frozenset({"upcoming"}))
+    assert index.matching_ids(both) == {id(mar)}
+
+
+def test_sync_reindexes_only_changed_tasks(qapp):
+    a = _task("Alfa")
+    b = _task("Beta")
+    index = TaskFilterIndex()
+    index.sync([a, b])
+
+    a.name = "Gamma"
+    index.sync([a])
+    assert len(index) == 1
+    assert index.matching_ids(TaskFilter(text="gam")) == {id(a)}
+    assert index.matching_ids(TaskFilter(text="alf")) == set()
+    assert index.matching_ids(TaskFilter(text="bet")) == set()
+
+
+def test_model_filter_keeps_parents_of_matching_subtasks(qapp):
+    parent = _task("Obra gris")
+    sub_hit = _task("Vaciado de placa", is_subtask=True)
+    sub_miss = _task("Formaleta", is_subtask=True)
+    other = _task("Acabados")
+    model = TaskTableModel(tasks=[parent, sub_hit, sub_miss, other])
+    parent.is_collapsed = True
+
+    model.set_filter(TaskFilter(text="placa"))
+    assert model.visible_tasks == [parent, sub_hit]
+    assert model.visible_row_for_task(sub_hit) == 1
+    assert model.visible_to_actual == [0, 1]
+
+    # A matching parent shows its subtasks only when expanded.
+    model.set_filter(TaskFilter(text="obra"))
+    assert model.visible_tasks == [parent]
+    parent.is_collapsed = False
+    model.update_visible_tasks()
+    assert model.visible_tasks == [parent, sub_hit, sub_miss]
+
+    # An empty filter removes the mask.
+    model.set_filter(TaskFilter(text="  "))
+    assert model.task_filter is None
+    assert model.rowCount() == 4
+
+
+def test_model_filter_keeps_inserted_tasks_visible(qapp):
+    model = TaskTableModel(tasks=[_task("Alfa"), _task("Beta")])
+    model.set_filter(TaskFilter(text="alfa"))
+    assert model.rowCount() == 1
+
+    new = _task("Nueva tarea")
+    model.insertTask(new)
+    assert model.rowCount() == 2
+    assert model.getTask(1) is new
+    # The visible date range follows the filtered rows.
+    assert model.date_range.bounds() == (day_number("01/01/2026"), day_number("10/01/2026"))
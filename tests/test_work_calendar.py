@@ -0,0 +1,50 @@
+"""Tests for the precomputed working-day tables."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from workalendar.america import Colombia
+
+from core.spatial_index import day_from_date
+from core.work_calendar import (
+    HOLIDAY,
+    WEEKEND,
+    WORKING,
+    day_kind,
+    end_after_working_days,
+    holiday_label,
+    holidays_in_year,
+    is_working_day,
+    working_days_between,
+)
+
+
+def test_day_kinds_match_workalendar():
+    cal = Colombia()
+    day = date(2025, 12, 1)
+    while day < date(2027, 2, 1):
+        assert is_working_day(day_from_date(day)) == cal.is_working_day(day), day
+        day += timedelta(days=1)
+
+
+def test_kind_priority_and_labels():
+    assert day_kind(day_from_date(date(2026, 1, 1))) == HOLIDAY
+    assert holiday_label(day_from_date(date(2026, 1, 1)))
+    assert day_kind(day_from_date(date(2026, 1, 3))) == WEEKEND  # sábado
+    assert day_kind(day_from_date(date(2026, 1, 2))) == WORKING
+    assert holiday_label(day_from_date(date(2026, 1, 2))) is None
+    assert holidays_in_year(2026) == sorted(Colombia().holidays(2026))
+
+
+def test_working_day_math_across_years():
+    first = day_from_date(date(2025, 12, 20))
+    last = day_from_date(date(2026, 1, 20))
+    count = working_days_between(first, last)
+    assert count == sum(1 for d in range(first, last + 1) if is_working_day(d))
+    # The span that starts on ``first`` with ``count`` working days ends on
+    # the last working day on or before ``last``.
+    end = end_after_working_days(first, count)
+    assert end <= last and is_working_day(end)
+    assert working_days_between(first, end) == count
+    assert end_after_working_days(first, 0) == first
+    assert working_days_between(last, first) == 0
@@ -0,0 +1,97 @@
+"""Tests for the Excel schedule extractor."""
+from __future__ import annotations
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from core import xlsx_extractor
+from core.xlsx_extractor import XLSXReader
+from core.xlsx_security_checker import XLSXRestrictedError
+
+
+def _write_xlsx(path, rows):
+    pd.DataFrame(rows, columns=["ID", "Nombre", "Inicio", "Fin", "Nivel"]).to_excel(
+        path, index=False
+    )
+
+
+def test_batches_concatenate_to_read_xlsx(tmp_path):
+    rows = [
+        (i, f"Tarea {i}", datetime(2026, 3, 2), datetime(2026, 3, 2 + i % 5), i % 3)
+        for i in range(1, 26)
+    ]
+    rows.append((99, "Inicio del proyecto", datetime(2026, 3, 1), datetime(2026, 3, 9), 0))
+    path = tmp_path / "plan.xlsx"
+    _write_xlsx(path, rows)
+
+    reader = XLSXReader()
+    tasks = reader.read_xlsx(str(path))
+    # Same start and end, and start/end milestones, are skipped.
+    assert [t["task_id"] for t in tasks] == [str(i) for i in range(1, 26) if i % 5]
+    assert tasks[0] == {
+        "task_id": "1", "name": "Tarea 1", "start_date": "02/03/2026",
+        "end_date": "03/03/2026", "level": "1", "outline_level": 1, "indentation": 1,
+    }
+    batches = list(reader.iter_xlsx(str(path), batch_size=7))
+    assert [len(b) for b in batches] == [7, 7, 6]
+    assert [t for batch in batches for t in batch] == tasks
+
+
+def test_unreadable_file_yields_nothing(tmp_path):
+    path = tmp_path / "roto.xlsx"
+    path.write_bytes(b"no es un excel")
+    assert XLSXReader().read_xlsx(str(path)) == []
+
+
+def test_mixed_cells_title_row_and_blank_rows(tmp_path):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Cronograma"])
+    ws.append(["ID", "Tarea", "Inicio", "Fin", "Nivel"])
+    # Texto numérico en Nivel se lee como número, igual que con pandas
+    ws.append([1, " Diseño ", "2026-03-02", "05/03/2026", "1.2"])
+    ws.append([])
+    ws.append([5, None, datetime(2026, 3, 2), datetime(2026, 3, 9), 1])
+    ws.append([2, "Obra", 46083, datetime(2026, 3, 9), 2.0])
+    ws.append([3, "Compras", "pendiente", "pendiente", None])
+    ws.append([4, "Hito", "09/03/2026", datetime(2026, 3, 9), 1])
+    path = tmp_path / "plan.xlsx"
+    wb.save(path)
+
+    tasks = XLSXReader().read_xlsx(str(path))
+    assert [(t["task_id"], t["name"], t["start_date"], t["end_date"], t["level"]) for t in tasks] == [
+        ("1", "Diseño", "02/03/2026", "05/03/2026", "1"),
+        ("2", "Obra", "02/03/2026", "09/03/2026", "2"),
+        ("3", "Compras", "pendiente", "pendiente", "0"),
+    ]
+
+
+def test_streaming_engine_matches_pandas(tmp_path, monkeypatch):
+    rows = [
+        (i, f"Tarea {i}", datetime(2026, 3, 2), datetime(2026, 3, 2 + i % 5), f"{i % 3}")
+        for i in range(1, 40)
+    ]
+    path = tmp_path / "plan.xlsx"
+    _write_xlsx(path, rows)
+    monkeypatch.setattr(xlsx_extractor, "STREAM_CHUNK_ROWS", 6)
+
+    reader = XLSXReader()
+    expected = reader.read_xlsx(str(path))
+    batches = list(reader.iter_xlsx(str(path), batch_size=7, engine="stream"))
+    assert [len(b) for b in batches] == [7, 7, 7, 7, 4]
+    assert [t for batch in batches for t in batch] == expected
+
+    monkeypatch.setattr(xlsx_extractor, "STREAMING_MIN_BYTES", 0)
+    assert reader.engine_for(str(path)) == "stream"
+    assert reader.read_xlsx(str(path)) == expected
+
+
+def test_streaming_open_failure_is_a_restriction(tmp_path):
+    path = tmp_path / "cifrado.xlsx"
+    path.write_bytes(b"\xd0\xcf\x11\xe0 no es un zip")
+    with pytest.raises(XLSXRestrictedError, match="protegido con contraseña"):
+        next(XLSXReader().stream_xlsx(str(path)))